@@ -1,4 +1,4 @@
-import pyarrow as pa, requests, sys
+import pyarrow as pa, requests, sys, threading
 from functools import lru_cache
 from typing import Any, Tuple, Optional
 from weakref import WeakKeyDictionary
@@ -15,6 +15,9 @@ NOTE: Will switch to pa.Table -> ... when RAPIDS upgrades from pyarrow,
      which adds weakref support
 """
 
+# Node and edge files upload concurrently, so cache reads and writes are serialized
+DF_TO_FILE_ID_CACHE_LOCK = threading.Lock()
+
 class ArrowFileUploader():
     """
         Implement file API with focus on Arrow support
@@ -75,7 +78,7 @@ class ArrowFileUploader():
             **file_opts
         }
 
-        res = requests.post(
+        res = self.uploader.session.post(
             self.uploader.server_base_path + '/api/v2/files/',
             verify=self.uploader.certificate_validation,
             headers={'Authorization': f'Bearer {tok}'},
@@ -93,19 +96,29 @@ class ArrowFileUploader():
         
         return out['file_id']
 
-    def post_arrow(self, arr: pa.Table, file_id: str, url_opts: str = 'erase=true') -> dict:
+    def post_arrow(
+        self, arr: pa.Table, file_id: str, url_opts: str = 'erase=true', chunk_size: Optional[int] = None,
+        compression: Optional[str] = None, compression_level: Optional[int] = None, dictionary_encode: Optional[bool] = None
+    ) -> dict:
         """
             Upload new data to existing file id
 
             Default url_opts='erase=true' throws exceptions on parse errors and deletes upload.
 
+            Optional chunk_size streams the upload as RecordBatches of up to that many rows.
+
+            Optional compression ('lz4', 'zstd'), compression_level, and dictionary_encode override the uploader's settings.
+
             See File REST API for url_opts (file upload)
         """
 
         sub_path = f'api/v2/upload/files/{file_id}'
         tok = self.uploader.token
 
-        res = self.uploader.post_arrow_generic(sub_path, tok, arr, url_opts)
+        res = self.uploader.post_arrow_generic(
+            sub_path, tok, arr, url_opts, chunk_size,
+            compression=compression, compression_level=compression_level, dictionary_encode=dictionary_encode
+        )
 
         try:
             out = res.json()
@@ -123,7 +136,9 @@ class ArrowFileUploader():
     ###
 
     def create_and_post_file(
-        self, arr: pa.Table, file_id: Optional[str] = None, file_opts: dict = {}, upload_url_opts: str = 'erase=true', memoize: bool = True
+        self, arr: pa.Table, file_id: Optional[str] = None, file_opts: dict = {}, upload_url_opts: str = 'erase=true', memoize: bool = True,
+        chunk_size: Optional[int] = None,
+        compression: Optional[str] = None, compression_level: Optional[int] = None, dictionary_encode: Optional[bool] = None
     ) -> Tuple[str, dict]:
         """
             Create file and upload data for it.
@@ -132,6 +147,12 @@ class ArrowFileUploader():
 
             Default memoize=True skips uploading 'arr' when previously uploaded in current session
 
+            Optional chunk_size streams the upload as RecordBatches of up to that many rows
+
+            Optional compression ('lz4', 'zstd') with compression_level compresses Arrow IPC buffers,
+            and dictionary_encode=True dictionary encodes low-cardinality string columns;
+            when None, these default to the uploader's settings
+
             See File REST API for file_opts (file create) and upload_url_opts (file upload)
         """
 
@@ -139,22 +160,27 @@ class ArrowFileUploader():
             #FIXME if pa.Table was hashable, could do direct set/get map
             wrapped_table : WrappedTable
             val : MemoizedFileUpload
-            for wrapped_table, val in DF_TO_FILE_ID_CACHE.items():
-                if wrapped_table.arr is arr:
-                    logger.debug('arrow->file_id memoization hit: %s', val.file_id)
-                    return val.file_id, val.output
-            logger.debug('arrow->file_id memoization miss (of %s)', len(DF_TO_FILE_ID_CACHE))
+            with DF_TO_FILE_ID_CACHE_LOCK:
+                for wrapped_table, val in DF_TO_FILE_ID_CACHE.items():
+                    if wrapped_table.arr is arr:
+                        logger.debug('arrow->file_id memoization hit: %s', val.file_id)
+                        return val.file_id, val.output
+                logger.debug('arrow->file_id memoization miss (of %s)', len(DF_TO_FILE_ID_CACHE))
 
         if file_id is None:
             file_id = self.create_file(file_opts)
         
-        resp = self.post_arrow(arr, file_id, upload_url_opts)
+        resp = self.post_arrow(
+            arr, file_id, upload_url_opts, chunk_size,
+            compression=compression, compression_level=compression_level, dictionary_encode=dictionary_encode
+        )
         out = MemoizedFileUpload(file_id, resp)
 
         if memoize:
             wrapped = WrappedTable(arr)
-            cache_arr(wrapped)
-            DF_TO_FILE_ID_CACHE[wrapped] = out
+            with DF_TO_FILE_ID_CACHE_LOCK:
+                cache_arr(wrapped)
+                DF_TO_FILE_ID_CACHE[wrapped] = out
             logger.debug('Memoized arrow->file_id %s', file_id)
         
         return out.file_id, out.output
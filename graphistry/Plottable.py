@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
 from typing_extensions import Literal
 import pandas as pd
 
@@ -77,10 +77,12 @@ class Plottable(object):
     _umap_params: Optional[Dict[str, Any]]
     _umap_fit_kwargs: Optional[Dict[str, Any]]
     _umap_transform_kwargs: Optional[Dict[str, Any]]
+    _umap_ids: Optional[Any]
+    _umap_knn: Optional[Tuple[Any, Any]]
 
     _adjacency : Optional[Any]
-    _entity_to_index : Optional[dict]
-    _index_to_entity : Optional[dict]
+    _entity_to_index : Optional[Mapping]
+    _index_to_entity : Optional[Mapping]
 
     DGL_graph: Optional[Any]
     
@@ -90,8 +92,13 @@ class Plottable(object):
     _triplets: Optional[List]  # actually torch.Tensor too
     _kg_embed_dim: int
 
+    # compute
+    _csr_index : Optional[Any]  # CSRIndex, via build_csr()
+    _node_id_encoding : Optional[Any]  # NodeIdEncoding, via encode_node_ids()
+
     # layout
     _partition_offsets: Optional[Dict[str, Dict[int, float]]]  # from gib
+    _layout_stats: Optional[Dict[str, Any]]  # from incremental_layout
 
 
     def __init__(self, *args, **kwargs):
@@ -150,6 +157,7 @@ class Plottable(object):
         col: str = "degree",
         degree_in: str = "degree_in",
         degree_out: str = "degree_out",
+        weight: Optional[str] = None
     ) -> 'Plottable':
         if 1 + 1:
             raise RuntimeError('should not happen')
@@ -160,6 +168,16 @@ class Plottable(object):
             raise RuntimeError('should not happen')
         return self
 
+    def build_csr(self) -> 'Plottable':
+        if 1 + 1:
+            raise RuntimeError('should not happen')
+        return self
+
+    def encode_node_ids(self) -> 'Plottable':
+        if 1 + 1:
+            raise RuntimeError('should not happen')
+        return self
+
     def get_topological_levels(
         self,
         level_col: str = 'level',
@@ -219,7 +237,9 @@ class Plottable(object):
         destination_node_query: Optional[str] = None,
         edge_query: Optional[str] = None,
         return_as_wave_front: bool = False,
-        target_wave_front: Optional[pd.DataFrame] = None
+        target_wave_front: Optional[pd.DataFrame] = None,
+        bidirectional: bool = False,
+        label_node_hops: Optional[str] = None
     ) -> 'Plottable':
         if 1 + 1:
             raise RuntimeError('should not happen')
@@ -353,6 +373,21 @@ class Plottable(object):
             raise RuntimeError('should not happen')
         return self
 
+    def incremental_layout(
+        self,
+        previous: Optional[Any] = None,
+        hops: int = 1,
+        max_iter: int = 50,
+        refine: bool = True,
+        stiffness: float = 1.0,
+        fa2_params: Optional[Dict[str, Any]] = None,
+        seed: Optional[int] = None,
+        engine: Union[EngineAbstract, str] = EngineAbstract.AUTO
+    ) -> 'Plottable':
+        if 1 + 1:
+            raise RuntimeError('should not happen')
+        return self
+
     def layout_settings(
         self,
 
@@ -22,9 +22,9 @@ from .plugins.cugraph import (
     layout_cugraph as layout_cugraph_base
 )
 from .util import (
-    error, hash_pdf, in_ipython, in_databricks, make_iframe, random_string, warn,
-    cache_coercion, cache_coercion_helper, WeakValueWrapper
+    error, hash_pdf, in_ipython, in_databricks, make_iframe, random_string, warn
 )
+from .utils.memo_cache import MemoCache, memo_cache
 
 from .bolt_util import (
     bolt_graph_to_edges_dataframe,
@@ -110,10 +110,11 @@ class PlotterBase(Plottable):
     _defaultEdgeSourceId = SRC
     _defaultEdgeDestinationId = DST
     
-    _pd_hash_to_arrow : WeakValueDictionary = WeakValueDictionary()
-    _cudf_hash_to_arrow : WeakValueDictionary = WeakValueDictionary()
-    _umap_param_to_g : WeakValueDictionary = WeakValueDictionary()
-    _feat_param_to_g : WeakValueDictionary = WeakValueDictionary()
+    # Bounded and shared across instances, see graphistry.utils.memo_cache for budgets, stats, and pinning
+    _pd_hash_to_arrow : MemoCache = memo_cache('pd_hash_to_arrow')
+    _cudf_hash_to_arrow : MemoCache = memo_cache('cudf_hash_to_arrow')
+    _umap_param_to_g : MemoCache = memo_cache('umap_param_to_g')
+    _feat_param_to_g : MemoCache = memo_cache('feat_param_to_g')
 
     def reset_caches(self): 
         """Reset memoization caches"""
@@ -121,7 +122,6 @@ class PlotterBase(Plottable):
         self._cudf_hash_to_arrow.clear()
         self._umap_param_to_g.clear()
         self._feat_param_to_g.clear()
-        cache_coercion_helper.cache_clear()
 
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -196,6 +196,8 @@ class PlotterBase(Plottable):
         self._umap_params : Optional[Dict[str, Any]] = None
         self._umap_fit_kwargs : Optional[Dict[str, Any]] = None
         self._umap_transform_kwargs : Optional[Dict[str, Any]] = None
+        self._umap_ids = None  # node ids of the embedded rows, for umap(update=True)
+        self._umap_knn = None  # (indices, distances) kNN graph of the embedded rows
 
         self._adjacency = None
         self._entity_to_index = None
@@ -214,6 +216,13 @@ class PlotterBase(Plottable):
         # DGL
         self.DGL_graph = None  # the DGL graph
 
+        # Compute
+        self._csr_index = None  # the CSR adjacency index, via build_csr()
+        self._node_id_encoding = None  # dense node id codes, via encode_node_ids()
+
+        # Layout
+        self._layout_stats = None  # displacement stats, via incremental_layout()
+
 
     def __repr__(self):
         bindings = ['edges', 'nodes', 'source', 'destination', 'node', 
@@ -1316,7 +1325,9 @@ class PlotterBase(Plottable):
 
     def plot(
         self, graph=None, nodes=None, name=None, description=None, render=None, skip_upload=False, as_files=False, memoize=True,
-        extra_html="", override_html_style=None, validate: bool = True
+        extra_html="", override_html_style=None, validate: bool = True, upload_chunk_size: Optional[int] = None,
+        upload_compression: Optional[str] = None, upload_compression_level: Optional[int] = None,
+        upload_dictionary_encode: bool = False
     ):  # noqa: C901
         """Upload data to the Graphistry server and show as an iframe of it.
 
@@ -1358,6 +1369,18 @@ class PlotterBase(Plottable):
         :param validate: Controls validations, including those for encodings.
         :type validate: Optional[bool]
 
+        :param upload_chunk_size: Stream node/edge uploads as Arrow record batches of up to this many rows instead of one in-memory buffer, lowering peak memory for large graphs. Default off.
+        :type upload_chunk_size: Optional[int]
+
+        :param upload_compression: Compress Arrow IPC buffers of node/edge uploads with 'lz4' or 'zstd', trading client CPU for fewer bytes on the wire. Default off.
+        :type upload_compression: Optional[str]
+
+        :param upload_compression_level: Codec level for upload_compression, such as 1 (fast) to 22 (small) for 'zstd'. Default codec default.
+        :type upload_compression_level: Optional[int]
+
+        :param upload_dictionary_encode: Dictionary encode low-cardinality string columns before uploading. Default False.
+        :type upload_dictionary_encode: bool
+
         **Example: Simple**
             ::
 
@@ -1410,7 +1433,10 @@ class PlotterBase(Plottable):
             if skip_upload:
                 return dataset
             dataset.token = PyGraphistry.api_token()
-            dataset.post(as_files=as_files, memoize=memoize, validate=validate)
+            dataset.compression = upload_compression
+            dataset.compression_level = upload_compression_level
+            dataset.dictionary_encode = upload_dictionary_encode
+            dataset.post(as_files=as_files, memoize=memoize, validate=validate, chunk_size=upload_chunk_size)
             dataset.maybe_post_share_link(self)
             info = {
                 'name': dataset.dataset_id,
@@ -1940,22 +1966,17 @@ class PlotterBase(Plottable):
                                 'try identifying which columns have types that Pandas cannot hash, and convert them '
                                 'to hashable types like strings.')
 
-                try:
-                    if hashed in PlotterBase._pd_hash_to_arrow:
+                if hashed is not None:
+                    hit = PlotterBase._pd_hash_to_arrow.get(hashed)
+                    if hit is not None:
                         logger.debug('pd->arrow memoization hit: %s', hashed)
-                        return PlotterBase._pd_hash_to_arrow[hashed].v
-                    else:
-                        logger.debug('pd->arrow memoization miss for id (of %s): %s', len(PlotterBase._pd_hash_to_arrow), hashed)
-                except:
-                    logger.debug('Failed to hash pdf', exc_info=True)
-                    1
+                        return hit
+                    logger.debug('pd->arrow memoization miss for id (of %s): %s', len(PlotterBase._pd_hash_to_arrow), hashed)
 
             out = pa.Table.from_pandas(table, preserve_index=False).replace_schema_metadata({})
 
             if memoize and (hashed is not None):
-                w = WeakValueWrapper(out)
-                cache_coercion(hashed, w)
-                PlotterBase._pd_hash_to_arrow[hashed] = w
+                PlotterBase._pd_hash_to_arrow[hashed] = out
 
             return out
 
@@ -1968,22 +1989,16 @@ class PlotterBase(Plottable):
                     hashlib.sha256(table.hash_values().to_numpy().tobytes()).hexdigest()
                     + hashlib.sha256(str(table.columns).encode('utf-8')).hexdigest()  # noqa: W503
                 )
-                try:
-                    if hashed in PlotterBase._cudf_hash_to_arrow:
-                        logger.debug('cudf->arrow memoization hit: %s', hashed)
-                        return PlotterBase._cudf_hash_to_arrow[hashed].v
-                    else:
-                        logger.debug('cudf->arrow memoization miss for id (of %s): %s', len(PlotterBase._cudf_hash_to_arrow), hashed)
-                except:
-                    logger.debug('Failed to hash cudf', exc_info=True)
-                    1
+                hit = PlotterBase._cudf_hash_to_arrow.get(hashed)
+                if hit is not None:
+                    logger.debug('cudf->arrow memoization hit: %s', hashed)
+                    return hit
+                logger.debug('cudf->arrow memoization miss for id (of %s): %s', len(PlotterBase._cudf_hash_to_arrow), hashed)
 
             out = table.to_arrow()
 
             if memoize:
-                w = WeakValueWrapper(out)
-                cache_coercion(hashed, w)
-                PlotterBase._cudf_hash_to_arrow[hashed] = w
+                PlotterBase._cudf_hash_to_arrow[hashed] = out
 
             return out
         
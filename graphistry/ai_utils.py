@@ -1,15 +1,16 @@
+from typing import Optional
 import pandas as pd
 import numpy as np
 
 import graphistry
 
-from .constants import DISTANCE, WEIGHT, BATCH
+from .constants import DISTANCE, QUERY, WEIGHT, BATCH, INFER_GRAPH_EPS_SAMPLE_PAIRS, INFER_GRAPH_QUERY_BATCH_SIZE
 from logging import getLogger
 
 try:
     import faiss  # type ignore
 except:
-    faiss = None
+    faiss = None  # type: ignore
 
 logger = getLogger(__name__)
 
@@ -137,8 +138,6 @@ def get_graphistry_from_milieu_search(
     return g
 
 
-
-
 # #########################################################################################################################
 #
 #  Graphistry Vector Search Index
@@ -146,49 +145,136 @@ def get_graphistry_from_milieu_search(
 ##########################################################################################################################
 
 
+FAISS_INDEX_TYPES = ['flat', 'ivf', 'hnsw', 'pq', 'ivfpq']
+
+
 class FaissVectorSearch:
-    def __init__(self, M):
+    """
+    Nearest neighbor index over the rows of a matrix, for semantic search
+
+    index_type selects between exact and approximate faiss indexes:
+
+    - 'flat': exact, brute force L2 (default)
+    - 'ivf': inverted file over nlist k-means cells, probing nprobe cells per query
+    - 'hnsw': hierarchical navigable small world graph with hnsw_m links per node, exploring ef_search candidates per query
+    - 'pq': product quantized codes of pq_m sub-vectors with pq_bits bits each, for a smaller memory footprint
+    - 'ivfpq': 'ivf' cells of 'pq' codes
+
+    Raising nprobe or ef_search trades latency for recall, see set_search_params(). Distances are squared L2.
+    """
+
+    def __init__(
+        self,
+        M,
+        index_type: str = 'flat',
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        hnsw_m: int = 32,
+        ef_search: int = 64,
+        pq_m: int = 8,
+        pq_bits: int = 8,
+        index=None
+    ):
+        import faiss
+        if index_type not in FAISS_INDEX_TYPES:
+            raise ValueError(f'Unknown index_type "{index_type}", expected one of: {FAISS_INDEX_TYPES}')
+        self.index_type = index_type
+        if index is not None:
+            self.index = index
+            return
+        M = as_search_matrix(M)
+        if not isinstance(M, np.ndarray):
+            logger.debug('Densifying sparse features for faiss index')
+            M = M.toarray()
+        n, d = M.shape
+        if nlist is None:
+            nlist = int(min(max(4 * np.sqrt(n), 1), max(n // 39, 1)))  # faiss wants ~39+ training points per cell
+        if index_type == 'flat':
+            self.index = faiss.IndexFlatL2(d)
+        elif index_type == 'ivf':
+            self.index = faiss.IndexIVFFlat(faiss.IndexFlatL2(d), d, nlist)
+        elif index_type == 'hnsw':
+            self.index = faiss.IndexHNSWFlat(d, hnsw_m)
+        elif index_type == 'pq':
+            self.index = faiss.IndexPQ(d, pq_m, pq_bits)
+        else:
+            self.index = faiss.IndexIVFPQ(faiss.IndexFlatL2(d), d, nlist, pq_m, pq_bits)
+        if not self.index.is_trained:
+            logger.debug('Training faiss %s index on %s rows', index_type, n)
+            self.index.train(M)
+        self.index.add(M)
+        self.set_search_params(nprobe=nprobe, ef_search=ef_search)
+
+    def set_search_params(self, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+        """
+        Tune recall of approximate indexes: cells probed per query for 'ivf'/'ivfpq', and candidates explored for 'hnsw'
+        """
         import faiss
-        self.index = faiss.IndexFlatL2(M.shape[1])
-        self.index.add(M.astype('float32'))
+        params = faiss.ParameterSpace()
+        if nprobe is not None and self.index_type in ['ivf', 'ivfpq']:
+            params.set_index_parameter(self.index, 'nprobe', nprobe)
+        if ef_search is not None and self.index_type == 'hnsw':
+            params.set_index_parameter(self.index, 'efSearch', ef_search)
+        return self
 
     def search(self, q, k=5):
         """
-        Search for the k nearest neighbors of a query vector q.
+        Search for the k nearest neighbors of a query vector q, or of each row of a batch of query vectors q.
 
         Parameters:
-        - q: the query vector to search for
+        - q: the query vector to search for, or a 2D array with one query vector per row
         - k: the number of nearest neighbors to return (default: 5)
 
         Returns:
-        - Index: a numpy array of size (k,) containing the indices of the k nearest neighbors
-        - Distances: a numpy array of size (k,) containing the distances to the k nearest neighbors
+        - Index: a numpy array of size (k,), or (len(q), k) for a batch, containing the indices of the k nearest neighbors
+        - Distances: a numpy array of the same shape containing the distances to the k nearest neighbors
+
+        Indices are -1 where fewer than k neighbors were found
         """
         q = np.asarray(q, dtype=np.float32)
-        Distances, Index = self.index.search(q.reshape(1, -1), k)
-        return Index[0], Distances[0]
+        Distances, Index = self.index.search(np.ascontiguousarray(q.reshape(-1, q.shape[-1])), k)
+        if q.ndim == 1:
+            return Index[0], Distances[0]
+        return Index, Distances
     
     def search_df(self, q, df, k):
         """ Query by vector using index and append distance to results
     
-        it is assumed len(vect) == len(df) == len(search_index)
+        it is assumed len(df) == len(search_index)
         args:
-            vect: query vector
+            q: query dataframe, one query vector per row, searched as one batch
             df: dataframe to query
-            search_index: annoy index
-            top_n: number of results to return
+            k: number of results to return per query
         returns:
-            sorted dataframe with top_n results and distance
+            sorted dataframe with top k results and distance, and for multiple queries,
+            the row position of the matching query in column QUERY
         """
 
-        indices, distances = self.search(q.values[0], k=k)
+        indices, distances = self.search(as_search_matrix(q), k=k)
+        queries = np.repeat(np.arange(indices.shape[0]), indices.shape[1])
+        indices, distances = indices.ravel(), distances.ravel()
+        found = indices >= 0
 
-        results = df.iloc[indices]
-        results.loc[:, DISTANCE] = distances
-        results = results.sort_values(by=[DISTANCE])
+        results = df.iloc[indices[found]].copy()
+        results[DISTANCE] = distances[found]
+        if q.shape[0] > 1:
+            results[QUERY] = queries[found]
+        results = results.sort_values(by=[DISTANCE], kind='stable')
 
         return results
 
+    def save(self, path):
+        """Write the index in faiss's native format"""
+        import faiss
+        faiss.write_index(self.index, path)
+
+    @classmethod
+    def load(cls, path, index_type='flat', mmap=False):
+        """Read an index written by save(), optionally memory mapping it instead of loading it into memory"""
+        import faiss
+        index = faiss.read_index(path, faiss.IO_FLAG_MMAP) if mmap else faiss.read_index(path)
+        return cls(None, index_type=index_type, index=index)
+
 
 # #########################################################################################################################
 #
@@ -207,6 +293,119 @@ def edgelist_to_weighted_adjacency(g, weights=None):
     M = ss.coo_matrix((weights, (rows, cols)))
     return M.tocsr()
 
+def as_search_matrix(X):
+    """Features or embedding frame -> float32 numpy array, or scipy.sparse CSR matrix for sparse features"""
+    if 'cudf.core.dataframe' in str(type(X)):
+        X = X.to_pandas()
+    if isinstance(X, pd.DataFrame) and len(X.columns) and all(isinstance(t, pd.SparseDtype) for t in X.dtypes):
+        return X.sparse.to_coo().tocsr().astype(np.float32)
+    return np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+
+
+def estimate_eps(M_fit, M_new, max_pairs=INFER_GRAPH_EPS_SAMPLE_PAIRS):
+    """
+    Mean and std of Euclidean distances between new and previously fit rows, over all pairs when there
+    are at most max_pairs of them, else over a random subsample of rows from each side
+    """
+    from sklearn.metrics.pairwise import euclidean_distances
+
+    n_fit, n_new = M_fit.shape[0], M_new.shape[0]
+    if n_fit * n_new > max_pairs:
+        side = max(int(np.sqrt(max_pairs)), 1)
+        n_new_sample = min(n_new, side)
+        n_fit_sample = min(n_fit, max(max_pairs // n_new_sample, 1))
+        M_new = M_new[np.sort(np.random.choice(n_new, n_new_sample, replace=False))]
+        M_fit = M_fit[np.sort(np.random.choice(n_fit, n_fit_sample, replace=False))]
+    dists = euclidean_distances(M_new, M_fit)
+    return float(np.mean(dists)), float(np.std(dists))
+
+
+def knn_search(M_fit, M_new, k, batch_size=INFER_GRAPH_QUERY_BATCH_SIZE):
+    """
+    Indices and Euclidean distances of the k nearest previously fit rows for each new row, each of shape (n_new, k)
+    and sorted by distance, via a faiss flat index when installed, else a scikit-learn ball tree (or brute force
+    over sparse features)
+    """
+    k = min(k, M_fit.shape[0])
+    if k == 0 or M_new.shape[0] == 0:
+        return np.zeros((M_new.shape[0], 0), dtype=np.int64), np.zeros((M_new.shape[0], 0), dtype=np.float32)
+    if faiss is not None and isinstance(M_fit, np.ndarray) and isinstance(M_new, np.ndarray):
+        index = faiss.IndexFlatL2(M_fit.shape[1])
+        index.add(M_fit)
+        dists, indices = [], []
+        for start in range(0, M_new.shape[0], batch_size):
+            D, idx = index.search(M_new[start:start + batch_size], k)
+            dists.append(np.sqrt(np.maximum(D, 0)))
+            indices.append(idx)
+        return np.concatenate(indices).astype(np.int64), np.concatenate(dists)
+    from sklearn.neighbors import NearestNeighbors
+    nn = NearestNeighbors(n_neighbors=k).fit(M_fit)
+    dists, indices = nn.kneighbors(M_new)
+    return indices.astype(np.int64), dists
+
+
+def infer_neighbors(X_previously_fit, X_new, eps="auto", n_neighbors=7, exclude_self=False, verbose=False):
+    """
+    Up to n_neighbors nearest previously fit rows within eps of each new row
+
+    returns:
+        (new row positions, previously fit row positions, distances, eps, neighbors within eps per new row)
+    """
+    M_fit = as_search_matrix(X_previously_fit)
+    M_new = as_search_matrix(X_new)
+
+    if eps == "auto":
+        m, std = estimate_eps(M_fit, M_new)
+        logger.info(f"--Mean distance to existing nodes  {m:.2f} +/- {std:.2f}")
+        print(f' Mean distance to existing nodes {m:.2f} +/- {std:.2f}') if verbose else None
+        eps = np.min([np.abs(m - std), m])
+    logger.info(
+        f"-epsilon = {eps:.2f} max distance threshold to be considered a neighbor"
+    )
+    print(f' Max distance threshold; epsilon = {eps:.2f}') if verbose else None
+
+    print(f' Finding {n_neighbors} nearest neighbors') if verbose else None
+    indices, dists = knn_search(M_fit, M_new, n_neighbors)
+    rows = np.repeat(np.arange(indices.shape[0], dtype=np.int64), indices.shape[1])
+    cols = indices.ravel()
+    dists = dists.ravel()
+    keep = (cols >= 0) & (dists < eps)
+    if exclude_self:
+        keep &= cols != rows
+    rows, cols, dists = rows[keep], cols[keep], dists[keep]
+    nn = np.bincount(rows, minlength=M_new.shape[0])
+    return rows, cols, dists, eps, nn
+
+
+def sample_local_edges(res, EDF, node_ids, sample):
+    """
+    For each node id (repeats allowed), sample `sample` of its in or out edges with replacement,
+    via the graph's CSR adjacency index instead of a per-node scan of the edge table
+    """
+    from graphistry.compute.csr import CSRIndex, csr_index_of
+
+    csr = csr_index_of(res)
+    if csr is None or csr.edges is not EDF:
+        csr = CSRIndex.build(EDF, res._source, res._destination)
+    codes = csr.node_ids.get_indexer(node_ids)
+    codes = codes[codes >= 0]
+    n_out = csr.fwd_indptr[codes + 1] - csr.fwd_indptr[codes]
+    n_in = csr.rev_indptr[codes + 1] - csr.rev_indptr[codes]
+    has_edges = (n_out + n_in) > 0
+    codes, n_out, n_in = codes[has_edges], n_out[has_edges], n_in[has_edges]
+
+    # pick the i-th of a node's out edges followed by its in edges, as runs of one combined perm
+    picks = (np.random.random((len(codes), sample)) * (n_out + n_in)[:, None]).astype(np.int64)
+    n_out = n_out[:, None]
+    perm = np.concatenate([csr.fwd_perm, csr.rev_perm])
+    positions = np.where(
+        picks < n_out,
+        csr.fwd_indptr[codes][:, None] + picks,
+        len(csr.fwd_perm) + csr.rev_indptr[codes][:, None] + picks - n_out
+    )
+    return EDF.iloc[perm[positions].ravel()]
+
+
 def hydrate_graph(res, new_nodes, new_edges, node, src, dst, new_emb, new_features, new_targets):
     # #########################################################
     g = res.nodes(new_nodes, node).edges(new_edges, src, dst)
@@ -237,6 +436,10 @@ def infer_graph(
         n_neighbors, int: number of nearest neighbors to include per batch point within epsilon.
             This sets the local stickiness of the graph, and is a good way to control the number of edges between 
             an added point and the existing graph.
+
+    Neighbors are found with a batched nearest neighbor index search, eps='auto' is estimated from sampled
+    distances, and old edges are sampled through the graph's CSR adjacency index, so memory stays
+    O(batch x n_neighbors) rather than O(batch x existing nodes)
     returns:
         graphistry Plottable object
     """
@@ -288,70 +491,36 @@ def infer_graph(
     src = res._source
     dst = res._destination
 
-    #new_nodes = []
-    new_edges = []
-    old_edges = []
-    old_nodes = []
-    mdists = []
-
-    # check if pandas or cudf
-    if 'cudf.core.dataframe' in str(type(X_previously_fit)):
-        #  move it out of memory...
-        X_previously_fit = X_previously_fit.to_pandas()
-
-    for i in range(X_new.shape[0]):
-        diff = X_previously_fit - X_new.iloc[i, :]
-        dist = np.linalg.norm(diff, axis=1)  # Euclidean distance
-        mdists.append(dist)
-
-    m, std = np.mean(mdists), np.std(mdists)
-    logger.info(f"--Mean distance to existing nodes  {m:.2f} +/- {std:.2f}")
-    print(f' Mean distance to existing nodes {m:.2f} +/- {std:.2f}') if verbose else None
-    if eps == "auto":
-        eps = np.min([np.abs(m - std), m])
-    logger.info(
-        f"-epsilon = {eps:.2f} max distance threshold to be considered a neighbor"
+    rows, cols, dists, eps, nn = infer_neighbors(
+        X_previously_fit, X_new, eps=eps, n_neighbors=n_neighbors, verbose=verbose
     )
-    print(f' Max distance threshold; epsilon = {eps:.2f}') if verbose else None
-    
-    print(f' Finding {n_neighbors} nearest neighbors') if verbose else None
-    nn = []
-    for i, dist in enumerate(mdists):
-        record_df = df.iloc[i, :]
-        nearest = np.where(dist < eps)[0]
-        nn.append(len(nearest))
-        for j in nearest[:n_neighbors]:  # add n_neighbors nearest neighbors, if any, super speedup hack
-            this_ndf = NDF.iloc[j, :]
-            if sample:
-                local_edges = EDF[
-                    (EDF[src] == this_ndf[node]) | (EDF[dst] == this_ndf[node])
-                ]
-                if not local_edges.empty:
-                    old_edges.append(local_edges.sample(sample, replace=True))
-                    
-            weight = min(1 / (dist[j] + 1e-3), 1)
-            new_edges.append([this_ndf[node], record_df[node], weight, 1])
-            old_nodes.append(this_ndf)
-            #new_nodes.extend([record_df, this_ndf])
-            
     print(f' {np.mean(nn):.2f} neighbors per node within epsilon {eps:.2f}') if verbose else None
-    
-    new_edges = pd.DataFrame(new_edges, columns=[src, dst, WEIGHT, BATCH])
+
+    neighbor_ids = NDF[node].values[cols]
+    new_edges = pd.DataFrame({
+        src: neighbor_ids,
+        dst: df[node].values[rows],
+        WEIGHT: np.minimum(1 / (dists + 1e-3), 1),
+        BATCH: 1
+    })
+    old_nodes = NDF.iloc[cols]
 
     all_nodes = []
+    old_edges = []
+    if sample and len(cols):
+        old_edges = sample_local_edges(res, EDF, neighbor_ids, sample)
     if len(old_edges):
-        old_edges = pd.concat(old_edges, axis=0).assign(_batch=0)
+        old_edges = old_edges.assign(_batch=0)
         all_nodes = pd.concat([old_edges[src], old_edges[dst], new_edges[src], new_edges[dst]]).drop_duplicates()
         print('', len(all_nodes), "nodes in new graph") if verbose else None
 
-    if sample:
+    if sample and len(old_edges):
         new_edges = pd.concat([new_edges, old_edges], axis=0).drop_duplicates()
         print(' Sampled', len(old_edges.drop_duplicates()), 'previous old edges') if verbose else None
     new_edges = new_edges.drop_duplicates()
     print('', len(new_edges), 'total edges after dropping duplicates') if verbose else None
 
     if len(old_nodes):
-        old_nodes = pd.DataFrame(old_nodes)
         old_nodes = pd.concat(
             [old_nodes, NDF[NDF[node].isin(all_nodes)]], axis=0
         ).drop_duplicates(subset=[node])
@@ -440,42 +609,19 @@ def infer_self_graph(res,
 
     src = res._source
     dst = res._destination
-    
-    old_nodes = []
-    new_edges = []
-    mdists = []
-
-    for i in range(X_new.shape[0]):
-        diff = X_previously_fit - X_new.iloc[i, :]
-        dist = np.linalg.norm(diff, axis=1)  # Euclidean distance
-        mdists.append(dist)
-
-    m, std = np.mean(mdists), np.std(mdists)
-    logger.info(f"--Mean distance to existing nodes  {m:.2f} +/- {std:.2f}")
-    print(f' Mean distance to existing nodes {m:.2f} +/- {std:.2f}') if verbose else None
-    if eps == "auto":
-        eps = np.min([np.abs(m - std), m])
-    logger.info(
-        f" epsilon = {eps:.2f} max distance threshold to be considered a neighbor"
+
+    # the batch is its own search index, so each point's nearest neighbor is typically itself
+    rows, cols, dists, eps, nn = infer_neighbors(
+        X_previously_fit, X_new, eps=eps, n_neighbors=n_neighbors, exclude_self=True, verbose=verbose
     )
-    print(f' Max distance threshold; epsilon = {eps:.2f}') if verbose else None
-    
-    print(f' Finding {n_neighbors} nearest neighbors') if verbose else None
-    nn = []
-    for i, dist in enumerate(mdists):
-        record_df = df.iloc[i, :]
-        nearest = np.where(dist < eps)[0]
-        nn.append(len(nearest))
-        for j in nearest[:n_neighbors]:  # add n_neighbors nearest neighbors, if any, super speedup hack
-            if i != j:
-                this_ndf = df.iloc[j, :]
-                weight = min(1 / (dist[j] + 1e-3), 1)
-                new_edges.append([this_ndf[node], record_df[node], weight, 1])
-                old_nodes.append(this_ndf)
-            
     print(f' {np.mean(nn):.2f} neighbors per node within epsilon {eps:.2f}') if verbose else None
-    
-    new_edges = pd.DataFrame(new_edges, columns=[src, dst, WEIGHT, BATCH])
+
+    new_edges = pd.DataFrame({
+        src: df[node].values[cols],
+        dst: df[node].values[rows],
+        WEIGHT: np.minimum(1 / (dists + 1e-3), 1),
+        BATCH: 1
+    })
     new_edges = new_edges.drop_duplicates()
     print('', len(new_edges), 'total edges after dropping duplicates') if verbose else None
     print(" ** Final graph has", len(df), "nodes") if verbose else None
@@ -1,7 +1,8 @@
-import json
-from typing import List, Optional
+import json, threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
 
-import io, pyarrow as pa, requests, sys
+import io, pyarrow as pa, pyarrow.compute as pc, requests, sys
 
 from graphistry.privacy import Mode, Privacy
 
@@ -9,10 +10,49 @@ from .ArrowFileUploader import ArrowFileUploader
 
 from .exceptions import TokenExpireException
 from .validate.validate_encodings import validate_encodings
-from .utils.requests import log_requests_error
+from .utils.requests import log_requests_error, session as pooled_session
 from .util import setup_logger
 logger = setup_logger(__name__)
 
+
+# String columns with at most this ratio of distinct values to rows get dictionary encoded
+DICTIONARY_ENCODE_MAX_DISTINCT_RATIO = 0.5
+
+
+def dictionary_encode_strings(table: pa.Table, max_distinct_ratio: float = DICTIONARY_ENCODE_MAX_DISTINCT_RATIO) -> pa.Table:
+    """
+    Dictionary encode low-cardinality string columns, with one dictionary per column across all batches
+
+    Arrow IPC files cannot replace dictionaries between batches, so per-chunk dictionaries get unified.
+    """
+    if table.num_rows == 0:
+        return table
+    encoded = False
+    columns = []
+    for col in table.columns:
+        if (pa.types.is_string(col.type) or pa.types.is_large_string(col.type)) \
+                and pc.count_distinct(col, mode='all').as_py() <= max_distinct_ratio * table.num_rows:
+            col = col.dictionary_encode()
+            encoded = True
+        columns.append(col)
+    if not encoded:
+        return table
+    return pa.Table.from_arrays(columns, names=table.column_names).unify_dictionaries()
+
+
+def ipc_write_options(compression: Optional[str] = None, compression_level: Optional[int] = None) -> pa.ipc.IpcWriteOptions:
+    """
+    IPC options for the Arrow file writer: compression is None, 'lz4' (lz4 frame), or 'zstd', with an optional codec level
+    """
+    if compression is None:
+        if compression_level is not None:
+            raise ValueError('compression_level requires compression, e.g., "zstd"')
+        return pa.ipc.IpcWriteOptions()
+    if compression not in ['lz4', 'zstd']:
+        raise ValueError(f'Unknown Arrow IPC compression "{compression}", expected one of: None, "lz4", "zstd"')
+    return pa.ipc.IpcWriteOptions(compression=pa.Codec(compression, compression_level))
+
+
 class ArrowUploader:
     
     @property
@@ -25,6 +65,16 @@ class ArrowUploader:
     def token(self, token: str):
         self.__token = token
 
+    @property
+    def session(self) -> requests.Session:
+        """
+        This uploader's requests.Session, over the process-wide connection pool
+        """
+        with self.__session_lock:
+            if self.__session is None:
+                self.__session = pooled_session()
+            return self.__session
+
     @property
     def org_name(self) -> Optional[str]:
         return self.__org_name
@@ -141,6 +191,32 @@ class ArrowUploader:
     def certificate_validation(self, certificate_validation):
         self.__certificate_validation = certificate_validation
 
+    #########################################################################
+
+    @property
+    def compression(self) -> Optional[str]:
+        return self.__compression
+
+    @compression.setter
+    def compression(self, compression: Optional[str]):
+        self.__compression = compression
+
+    @property
+    def compression_level(self) -> Optional[int]:
+        return self.__compression_level
+
+    @compression_level.setter
+    def compression_level(self, compression_level: Optional[int]):
+        self.__compression_level = compression_level
+
+    @property
+    def dictionary_encode(self) -> bool:
+        return self.__dictionary_encode
+
+    @dictionary_encode.setter
+    def dictionary_encode(self, dictionary_encode: bool):
+        self.__dictionary_encode = dictionary_encode
+
 
     ########################################################################3
 
@@ -166,7 +242,10 @@ class ArrowUploader:
             token = None, dataset_id = None,
             metadata = None,
             certificate_validation = True, 
-            org_name: Optional[str] = None):
+            org_name: Optional[str] = None,
+            compression: Optional[str] = None,
+            compression_level: Optional[int] = None,
+            dictionary_encode: bool = False):
 
         self.__name = name
         self.__description = description
@@ -181,6 +260,11 @@ class ArrowUploader:
         self.__metadata = metadata
         self.__certificate_validation = certificate_validation
         self.__org_name = org_name if org_name else None
+        self.__compression = compression
+        self.__compression_level = compression_level
+        self.__dictionary_encode = dictionary_encode
+        self.__session: Optional[requests.Session] = None
+        self.__session_lock = threading.Lock()
 
         if org_name:
             self.__org_name = org_name
@@ -406,7 +490,7 @@ class ArrowUploader:
         if self.org_name: 
             json['org_name'] = self.org_name
         logger.debug("@ArrowUploder create_dataset json: %s", json)
-        res = requests.post(
+        res = self.session.post(
             self.server_base_path + '/api/v2/upload/datasets/',
             verify=self.certificate_validation,
             headers={'Authorization': f'Bearer {tok}'},
@@ -426,13 +510,44 @@ class ArrowUploader:
         
     #PyArrow's table.getvalues().to_pybytes() fails to hydrate some reason, 
     #  so work around by consolidate into a virtual file and sending that
-    def arrow_to_buffer(self, table: pa.Table):
+    def arrow_to_buffer(
+        self, table: pa.Table,
+        compression: Optional[str] = None, compression_level: Optional[int] = None, dictionary_encode: bool = False
+    ):
+        """
+        Serialize as an Arrow file, optionally dictionary encoding low-cardinality strings and compressing buffers (lz4/zstd)
+        """
+        if dictionary_encode:
+            table = dictionary_encode_strings(table)
         b = io.BytesIO()
-        writer = pa.RecordBatchFileWriter(b, table.schema)
+        writer = pa.RecordBatchFileWriter(b, table.schema, options=ipc_write_options(compression, compression_level))
         writer.write_table(table)
         writer.close()
         return b.getvalue()
 
+    def arrow_to_chunks(
+        self, table: pa.Table, chunk_size: int,
+        compression: Optional[str] = None, compression_level: Optional[int] = None, dictionary_encode: bool = False
+    ) -> Iterator[bytes]:
+        """
+        Same Arrow file bytes as arrow_to_buffer(), generated one RecordBatch of up to chunk_size rows at a time
+
+        Lets requests stream the upload with chunked transfer encoding, so peak memory holds one
+        serialized batch instead of the whole table.
+        """
+        if dictionary_encode:
+            table = dictionary_encode_strings(table)
+        sink = ChunkSink()
+        writer = pa.RecordBatchFileWriter(sink, table.schema, options=ipc_write_options(compression, compression_level))
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            writer.write_batch(batch)
+            # skip empty chunks: in chunked transfer encoding, a zero-length chunk ends the body
+            chunk = sink.drain()
+            if len(chunk) > 0:
+                yield chunk
+        writer.close()
+        yield sink.drain()
+
 
     def maybe_bindings(self, g, bindings, base = {}):
         out = { **base }
@@ -509,9 +624,13 @@ class ArrowUploader:
         return encodings
 
 
-    def post(self, as_files: bool = True, memoize: bool = True, validate: bool = True):
+    def post(self, as_files: bool = True, memoize: bool = True, validate: bool = True, chunk_size: Optional[int] = None):
         """
         Note: likely want to pair with self.maybe_post_share_link(g)
+
+        Edges and nodes upload concurrently over a pooled session.
+
+        :param chunk_size: Stream each table as RecordBatches of up to this many rows instead of one in-memory buffer
         """
         logger.debug("@ArrowUploader.post, self.org_name : %s", self.org_name)
         if as_files:
@@ -521,10 +640,13 @@ class ArrowUploader:
             if self.org_name:
                 file_opts['org_name'] = self.org_name
 
-            e_file_id, _ = file_uploader.create_and_post_file(self.edges, file_opts=file_opts)
-
-            if not (self.nodes is None):
-                n_file_id, _ = file_uploader.create_and_post_file(self.nodes, file_opts=file_opts)
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                e_future = pool.submit(file_uploader.create_and_post_file, self.edges, file_opts=file_opts, chunk_size=chunk_size)
+                if not (self.nodes is None):
+                    n_future = pool.submit(file_uploader.create_and_post_file, self.nodes, file_opts=file_opts, chunk_size=chunk_size)
+                e_file_id, _ = e_future.result()
+                if not (self.nodes is None):
+                    n_file_id, _ = n_future.result()
 
             self.create_dataset({
                 "node_encodings": self.node_encodings,
@@ -545,11 +667,13 @@ class ArrowUploader:
                 "name": self.name,
                 "description": self.description
             }, validate)
-            
-            self.post_edges_arrow()
-            
-            if not (self.nodes is None):
-                self.post_nodes_arrow()
+
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [pool.submit(self.post_edges_arrow, chunk_size=chunk_size)]
+                if not (self.nodes is None):
+                    futures.append(pool.submit(self.post_nodes_arrow, chunk_size=chunk_size))
+                for future in futures:
+                    future.result()
         
         return self
 
@@ -658,23 +782,23 @@ class ArrowUploader:
     ###########################################
 
 
-    def post_edges_arrow(self, arr: Optional[pa.Table] = None, opts=''):
+    def post_edges_arrow(self, arr: Optional[pa.Table] = None, opts='', chunk_size: Optional[int] = None):
         if arr is None:
             arr = self.edges
-        return self.post_arrow(arr, 'edges', opts) 
+        return self.post_arrow(arr, 'edges', opts, chunk_size) 
 
-    def post_nodes_arrow(self, arr: Optional[pa.Table] = None, opts=''):
+    def post_nodes_arrow(self, arr: Optional[pa.Table] = None, opts='', chunk_size: Optional[int] = None):
         if arr is None:
             arr = self.nodes
-        return self.post_arrow(arr, 'nodes', opts) 
+        return self.post_arrow(arr, 'nodes', opts, chunk_size) 
 
-    def post_arrow(self, arr: pa.Table, graph_type: str, opts: str = ''):
+    def post_arrow(self, arr: pa.Table, graph_type: str, opts: str = '', chunk_size: Optional[int] = None):
         dataset_id = self.dataset_id
         tok = self.token
         sub_path = f'api/v2/upload/datasets/{dataset_id}/{graph_type}/arrow'
 
         try:
-            resp = self.post_arrow_generic(sub_path, tok, arr, opts)
+            resp = self.post_arrow_generic(sub_path, tok, arr, opts, chunk_size)
             out = resp.json()
             if not ('success' in out) or not out['success']:
                 raise Exception('No success indicator in server response')
@@ -688,19 +812,33 @@ class ArrowUploader:
             logger.error('Failed to post arrow to %s', sub_path, exc_info=True)
             raise e
 
-    def post_arrow_generic(self, sub_path: str, tok: str, arr: pa.Table, opts='') -> requests.Response:
-        buf = self.arrow_to_buffer(arr)
+    def post_arrow_generic(
+        self, sub_path: str, tok: str, arr: pa.Table, opts='', chunk_size: Optional[int] = None,
+        compression: Optional[str] = None, compression_level: Optional[int] = None, dictionary_encode: Optional[bool] = None
+    ) -> requests.Response:
+        """
+        Upload arr as an Arrow file, either as one buffer or, when chunk_size is set, streamed by RecordBatch
+
+        Compression and dictionary encoding default to this uploader's settings when None
+        """
+        compression = compression if compression is not None else self.compression
+        compression_level = compression_level if compression_level is not None else self.compression_level
+        dictionary_encode = dictionary_encode if dictionary_encode is not None else self.dictionary_encode
+        if chunk_size is None:
+            data = self.arrow_to_buffer(arr, compression, compression_level, dictionary_encode)
+        else:
+            data = self.arrow_to_chunks(arr, chunk_size, compression, compression_level, dictionary_encode)
 
         base_path = self.server_base_path
 
         url = f'{base_path}/{sub_path}'
         if len(opts) > 0:
             url = f'{url}?{opts}'
-        resp = requests.post(
+        resp = self.session.post(
             url,
             verify=self.certificate_validation,
             headers={'Authorization': f'Bearer {tok}'},
-            data=buf)
+            data=data)
         log_requests_error(resp)
 
         if resp.status_code != requests.codes.ok:
@@ -771,3 +909,36 @@ class ArrowUploader:
                 raise Exception(out)
             
             return out
+
+
+class ChunkSink():
+    """
+    Write-only file for Arrow writers that hands back what was written so far via drain()
+
+    Arrow file footers record batch offsets from tell(), so position keeps counting across drains.
+    """
+
+    def __init__(self):
+        self.closed = False
+        self.position = 0
+        self.chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        b = bytes(data)
+        self.chunks.append(b)
+        self.position += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b''.join(self.chunks)
+        self.chunks = []
+        return out
@@ -1,5 +1,5 @@
 import numpy as np, pandas as pd
-from typing import Any, List, Union, TYPE_CHECKING
+from typing import Any, List, Optional, Union, TYPE_CHECKING
 from inspect import getmodule
 
 from graphistry.Engine import Engine, EngineAbstract
@@ -7,7 +7,11 @@ from graphistry.Plottable import Plottable
 from graphistry.util import setup_logger
 from .chain import chain as chain_base
 from .collapse import collapse_by
+from .csr import CSRIndex
+from .degrees import get_degrees as get_degrees_base
+from .node_ids import NodeIdEncoding, node_id_encoding_of
 from .hop import hop as hop_base
+from .topological_levels import get_topological_levels as get_topological_levels_base
 from .filter_by_dict import (
     filter_edges_by_dict as filter_edges_by_dict_base,
     filter_nodes_by_dict as filter_nodes_by_dict_base
@@ -176,40 +180,93 @@ class ComputeMixin(MIXIN_BASE):
         nodes_df = concat_df.rename(node_id).drop_duplicates().to_frame().reset_index(drop=True)
         return g.nodes(nodes_df, node_id)
 
+    def build_csr(self) -> Plottable:
+        """
+        Build and cache a compressed sparse row adjacency index over g._edges
+
+        Subsequent hop() and chain() calls on the returned graph expand each wavefront
+        by gathering only the edges of the frontier nodes, instead of joining against the
+        full edge table, so multi-hop queries cost time proportional to the edges they touch.
+
+        The index is tied to the current edge table and source/destination bindings:
+        setting new edges or rebinding drops back to the join-based path until rebuilt.
+
+        Currently pandas-only; cudf graphs keep using join-based hops.
+
+        **Example: Reuse one index across several queries**
+
+            ::
+
+                g2 = g.build_csr()
+                g_a = g2.hop(pd.DataFrame({g2._node: ['a']}), hops=3)
+                g_b = g2.chain([n({'type': 'account'}), e_forward(hops=2)])
+
+        """
+        g = self
+        if g._edges is None:
+            raise ValueError("Missing edges")
+        if g._source is None or g._destination is None:
+            raise ValueError(
+                "Missing source/destination bindings; set via .bind() or .edges()"
+            )
+        res = g.bind()
+        res._csr_index = CSRIndex.build(g._edges, g._source, g._destination, node_id_encoding_of(g))
+        return res
+
+    def encode_node_ids(self) -> Plottable:
+        """
+        Materialize nodes and cache a dense integer encoding of node ids across g._nodes and g._edges
+
+        Node ids are factorized once into contiguous int32 (or int64) codes aligned with
+        the node and edge rows. Compute ops such as drop_nodes(), keep_nodes(), and
+        build_csr() then work over integer arrays instead of hashing ids, and results
+        they return keep a matching encoding, so repeated filtering stays encoded.
+
+        The encoding is tied to the current tables and bindings: setting new nodes or edges
+        drops back to id-based paths until re-encoded.
+
+        Currently pandas-only.
+
+        **Example: Encode once, filter repeatedly**
+
+            ::
+
+                g2 = g.encode_node_ids()
+                g3 = g2.drop_nodes(['a', 'b']).keep_nodes(['c', 'd', 'e'])
+                g4 = g3.build_csr()  # reuses the encoding
+
+        """
+        g = self.materialize_nodes()
+        assert g._source is not None and g._destination is not None
+        res = g.bind()
+        res._node_id_encoding = NodeIdEncoding.build(
+            g._edges, g._source, g._destination, g._nodes, g._node
+        )
+        return res
+
     def get_indegrees(self, col: str = "degree_in"):
         """See get_degrees"""
         g = self
         g_nodes = g.materialize_nodes()
-        in_degree_df = (
-            g._edges[[g._source, g._destination]]
-            .groupby(g._destination)
-            .agg({g._source: "count"})
-            .reset_index()
-            .rename(columns={g._source: col, g._destination: g_nodes._node})
-        )
-        nodes_df = g_nodes._nodes[
-            [c for c in g_nodes._nodes.columns if c != col]
-        ].merge(in_degree_df, how="left", on=g._node)
-        nodes_df = nodes_df.assign(**{
-            col: nodes_df[col].fillna(0).astype("int32")
-        })
-        return g.nodes(nodes_df, g_nodes._node)
+        return get_degrees_base(g_nodes, col=None, degree_in=col, degree_out=None)
 
     def get_outdegrees(self, col: str = "degree_out"):
         """See get_degrees"""
         g = self
-        g2 = g.edges(
-            g._edges.rename(
-                columns={g._source: g._destination, g._destination: g._source}
-            )
-        ).get_indegrees(col)
-        return g.nodes(g2._nodes, g2._node)
+        if g._nodes is None:
+            # materialize destinations first, matching prior node order, without copying edges
+            g_swapped = g.bind(source=g._destination, destination=g._source).materialize_nodes()
+            g_nodes = g.nodes(g_swapped._nodes, g_swapped._node)
+        else:
+            g_nodes = g.materialize_nodes()
+        return get_degrees_base(g_nodes, col=None, degree_in=None, degree_out=col)
 
     def get_degrees(
         self,
         col: str = "degree",
         degree_in: str = "degree_in",
         degree_out: str = "degree_out",
+        weight: Optional[str] = None
     ):
         """Decorate nodes table with degree info
 
@@ -217,8 +274,16 @@ class ComputeMixin(MIXIN_BASE):
 
         Parameters determine generated column names
 
+        In, out, and total degree are computed together in one pass over the edges.
+        In pandas mode, this is a bincount over node id codes, reusing any encode_node_ids() cache.
+
         Warning: Self-cycles are currently double-counted. This may change.
 
+        :param col: Output column for total degree
+        :param degree_in: Output column for in-degree
+        :param degree_out: Output column for out-degree
+        :param weight: Optional edge column to sum instead of counting edges, giving weighted degrees
+
         **Example: Generate degree columns**
 
             ::
@@ -228,11 +293,16 @@ class ComputeMixin(MIXIN_BASE):
                 print(g._nodes)  # None
                 g2 = g.get_degrees()
                 print(g2._nodes)  # pd.DataFrame with 'id', 'degree', 'degree_in', 'degree_out'
+
+        **Example: Weighted degrees**
+
+            ::
+
+                edges = pd.DataFrame({'s': ['a','b','c','d'], 'd': ['c','c','e','e'], 'w': [1.0, 0.5, 2.0, 1.0]})
+                g2 = graphistry.edges(edges, 's', 'd').get_degrees(weight='w')
         """
-        g = self
-        g2 = g.get_indegrees(degree_in).get_outdegrees(degree_out)
-        g2._nodes[col] = g2._nodes["degree_in"] + g2._nodes["degree_out"]
-        return g2
+        g = self.materialize_nodes()
+        return get_degrees_base(g, col=col, degree_in=degree_in, degree_out=degree_out, weight=weight)
 
     def drop_nodes(self, nodes):
         """
@@ -244,6 +314,24 @@ class ComputeMixin(MIXIN_BASE):
         if len(nodes) == 0:
             return g
 
+        enc = node_id_encoding_of(g)
+        if enc is not None and enc.nodes is not None:
+            hit = enc.membership(nodes)
+            assert enc.node_codes is not None
+            node_keep = ~hit[enc.node_codes]
+            edge_keep = ~(hit[enc.src_codes] | hit[enc.dst_codes])
+            g2 = g
+            new_nodes, new_edges = None, None
+            if not node_keep.all():
+                new_nodes = g._nodes[node_keep]
+                g2 = g2.nodes(new_nodes)
+            if not edge_keep.all():
+                new_edges = g._edges[edge_keep]
+                g2 = g2.edges(new_edges)
+            if g2 is not g:
+                g2._node_id_encoding = enc.subset(new_nodes, node_keep, new_edges, edge_keep)
+            return g2
+
         g2 = g
 
         if g2._nodes is not None:
@@ -270,6 +358,19 @@ class ComputeMixin(MIXIN_BASE):
         """
         g = self.materialize_nodes()
 
+        enc = node_id_encoding_of(g)
+        if enc is not None and enc.node_codes is not None and not isinstance(nodes, dict):
+            hit = enc.membership(nodes)
+            node_keep = hit[enc.node_codes]
+            new_nodes = g._nodes[node_keep]
+            kept = np.zeros(len(hit), dtype=bool)
+            kept[enc.node_codes[node_keep]] = True
+            edge_keep = kept[enc.src_codes] & kept[enc.dst_codes]
+            new_edges = g._edges[edge_keep]
+            res = g.nodes(new_nodes).edges(new_edges)
+            res._node_id_encoding = enc.subset(new_nodes, node_keep, new_edges, edge_keep)
+            return res
+
         #convert to Dict[Str, Union[Series, List-like]]
         if isinstance(nodes, dict):
             pass
@@ -330,9 +431,9 @@ class ComputeMixin(MIXIN_BASE):
     ) -> Plottable:
         """
         Label nodes on column level_col based on topological sort depth
-        Supports pandas + cudf, using parallelism within each level computation
+        Supports pandas + cudf, running in O(V + E): in-degrees are computed once, and each level only updates the neighbors of its nodes
         Options:
-        * allow_cycles: if False and detects a cycle, throw ValueException, else break cycle by picking a lowest-in-degree node
+        * allow_cycles: if False and detects a cycle, throw ValueException, else break cycle by picking a highest-degree node
         * warn_cycles: if True and detects a cycle, proceed with a warning
         * remove_self_loops: preprocess by removing self-cycles. Avoids allow_cycles=False, warn_cycles=True messages.
 
@@ -345,64 +446,13 @@ class ComputeMixin(MIXIN_BASE):
 
         """
 
-        g2_base = self.materialize_nodes()
-
-        g2 = g2_base
-        if (g2._nodes is None) or (len(g2._nodes) == 0):
-            return g2
-
-        g2 = g2.edges(g2._edges.drop_duplicates([g2._source, g2._destination]))
-        if remove_self_loops:
-            non_self_loops = g2._edges[g2._source] != g2._edges[g2._destination]
-            g2 = g2.edges(g2._edges[non_self_loops])
-
-        nodes_with_levels: List[Any] = []
-        while True:
-            if len(g2._nodes) == 0:
-                break
-            g2 = g2.get_degrees()
-
-            roots = g2._nodes[g2._nodes["degree_in"] == 0]
-            if len(roots) == 0:
-                if not allow_cycles:
-                    raise ValueError(
-                        "Cyclic graph in get_topological_levels(); remove cycles or set allow_cycles=True"
-                    )
-                # tie break by picking biggest node
-                max_degree = g2._nodes["degree"].max()
-                roots = g2._nodes[g2._nodes["degree"] == max_degree][:1]
-                if warn_cycles:
-                    logger.warning(
-                        "Cycle on computing level %s", len(nodes_with_levels)
-                    )
-
-            nodes_with_levels.append(
-                (
-                    roots[
-                        [
-                            c
-                            for c in roots
-                            if c not in ["degree_in", "degree_out", "degree"]
-                        ]
-                    ].assign(**{level_col: len(nodes_with_levels)})
-                )
-            )
-
-            g2 = g2.drop_nodes(roots[g2._node])
-        nodes_df0 = nodes_with_levels[0]
-        if len(nodes_with_levels) > 1:
-            nodes_df = pd.concat([nodes_df0] + nodes_with_levels[1:])
-        else:
-            nodes_df = nodes_df0
-
-        if self._nodes is None:
-            return self.nodes(nodes_df)
-        else:
-            # use orig cols, esp. in case collisions like degree
-            out_df = g2_base._nodes.merge(
-                nodes_df[[g2_base._node, level_col]], on=g2_base._node, how="left"
-            )
-            return self.nodes(out_df)
+        return get_topological_levels_base(
+            self,
+            level_col=level_col,
+            allow_cycles=allow_cycles,
+            warn_cycles=warn_cycles,
+            remove_self_loops=remove_self_loops
+        )
 
     def prune_self_edges(self):
         return self.edges(self._edges[ self._edges[self._source] != self._edges[self._destination] ])
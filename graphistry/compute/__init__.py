@@ -3,6 +3,7 @@ from .ast import (
     n, e, e_forward, e_reverse, e_undirected
 )
 from .chain import Chain
+from .chain_planner import ChainPlan
 from .predicates.is_in import (
     is_in, IsIn
 )
@@ -1,5 +1,5 @@
 import logging
-from typing import Any, Dict, Union, cast, List, Tuple, TYPE_CHECKING
+from typing import Any, Dict, Optional, Union, cast, List, Tuple, TYPE_CHECKING
 import pandas as pd
 from graphistry.Engine import Engine, EngineAbstract, df_concat, resolve_engine
 
@@ -8,6 +8,9 @@ from graphistry.compute.ASTSerializable import ASTSerializable
 from graphistry.util import setup_logger
 from graphistry.utils.json import JSONVal
 from .ast import ASTObject, ASTNode, ASTEdge, from_json as ASTObject_from_json
+from .chain_planner import ChainPlan, plan_chain
+from .csr import csr_index_of
+from .node_ids import node_id_encoding_of
 from .typing import DataFrameT
 
 logger = setup_logger(__name__)
@@ -54,9 +57,11 @@ class Chain(ASTSerializable):
 ###############################################################################
 
 
-def combine_steps(g: Plottable, kind: str, steps: List[Tuple[ASTObject,Plottable]], engine: Engine) -> DataFrameT:
+def combine_steps(g: Plottable, kind: str, steps: List[Tuple[ASTObject,Plottable]], engine: Engine, g_full: Optional[Plottable] = None) -> DataFrameT:
     """
     Collect nodes and edges, taking care to deduplicate and tag any names
+
+    Outputs are hydrated from g_full when traversal ran over column-pruned g
     """
 
     id = getattr(g, '_node' if kind == 'nodes' else '_edge')
@@ -111,7 +116,7 @@ def combine_steps(g: Plottable, kind: str, steps: List[Tuple[ASTObject,Plottable
                 how='left'
             )
             out_df[op._name] = out_df[op._name].fillna(False).astype(bool)
-    out_df = out_df.merge(getattr(g, df_fld), on=id, how='left')
+    out_df = out_df.merge(getattr(g_full if g_full is not None else g, df_fld), on=id, how='left')
 
     logger.debug('COMBINED[%s] >>\n%s', kind, out_df)
 
@@ -126,7 +131,8 @@ def combine_steps(g: Plottable, kind: str, steps: List[Tuple[ASTObject,Plottable
 #
 #     Each step is processed, yielding the nodes it matches based on the nodes reached by the previous step
 #
-#     Full node/edge table merges are happening, so any pre-filtering would help
+#     Full node/edge table merges are happening, so chain_planner first pushes node predicates into
+#     adjacent edge expansions, starts from the more selective end, and prunes unused columns
 #
 #     2. Reverse pruning pass  (fastish)
 #
@@ -146,7 +152,12 @@ def combine_steps(g: Plottable, kind: str, steps: List[Tuple[ASTObject,Plottable
 #
 ###############################################################################
 
-def chain(self: Plottable, ops: Union[List[ASTObject], Chain], engine: Union[EngineAbstract, str] = EngineAbstract.AUTO) -> Plottable:
+def chain(
+    self: Plottable,
+    ops: Union[List[ASTObject], Chain],
+    engine: Union[EngineAbstract, str] = EngineAbstract.AUTO,
+    explain: bool = False
+) -> Union[Plottable, ChainPlan]:
     """
     Chain a list of ASTObject (node/edge) traversal operations
 
@@ -158,10 +169,15 @@ def chain(self: Plottable, ops: Union[List[ASTObject], Chain], engine: Union[Eng
     Use `engine='cudf'` to force automatic GPU acceleration mode
 
     :param ops: List[ASTObject] Various node and edge matchers
+    :param explain: Return the execution plan instead of running it
 
-    :returns: Plotter
+    :returns: Plotter, or ChainPlan when explain=True
     :rtype: Plotter
 
+    Before running, the chain is planned: node predicates are pushed into adjacent single-hop edge matches,
+    traversal starts from whichever end node filter is more selective, and columns not referenced by any
+    predicate are pruned until outputs are hydrated. Results are the same as running the ops as written.
+
     **Example: Find nodes of some type**
 
     ::
@@ -240,6 +256,14 @@ def chain(self: Plottable, ops: Union[List[ASTObject], Chain], engine: Union[Eng
             g1 = graphistry.edges(e_gdf, 's', 'd')
             g2 = g1.chain([ ... ], engine='cudf')
 
+    **Example: Inspect the execution plan**
+
+    ::
+
+            from graphistry.ast import n, e_forward
+
+            print(g.chain([ n({"type": "person"}), e_forward(), n({g._node: "a"}) ], explain=True))
+
     """
 
     if isinstance(engine, str):
@@ -249,7 +273,7 @@ def chain(self: Plottable, ops: Union[List[ASTObject], Chain], engine: Union[Eng
         ops = ops.chain
 
     if len(ops) == 0:
-        return self
+        return self if not explain else ChainPlan([], False, None, None, (0, 0), False, [])
 
     logger.debug('orig chain >> %s', ops)
 
@@ -273,10 +297,23 @@ def chain(self: Plottable, ops: Union[List[ASTObject], Chain], engine: Union[Eng
             raise ValueError('Edges cannot have column "index", please remove or set as g._edge via bind() or edges()')
         added_edge_index = True
         indexed_edges_df = g._edges.reset_index()
+        csr = csr_index_of(g)
+        enc = node_id_encoding_of(g)
         g = g.edges(indexed_edges_df, edge='index')
+        # same rows in same order, so keep using any cached indexes
+        if csr is not None:
+            g._csr_index = csr.with_edges(indexed_edges_df)
+        if enc is not None:
+            g._node_id_encoding = enc.with_tables(edges=indexed_edges_df)
     else:
         added_edge_index = False
-    
+
+    plan = plan_chain(g, ops, engine_concrete)
+    if explain:
+        return plan
+    ops = plan.ops
+    g_full = g
+    g = plan.prune(g)
 
     logger.debug('======================== FORWARDS ========================')
 
@@ -348,14 +385,19 @@ def chain(self: Plottable, ops: Union[List[ASTObject], Chain], engine: Union[Eng
             logger.debug('nodes: %s', g_step._nodes)
             logger.debug('edges: %s', g_step._edges)
 
+    steps = list(zip(ops, reversed(g_stack_reverse)))
+    if plan.reverse:
+        # emit in the order of the chain as written
+        steps = list(reversed(steps))
+
     logger.debug('============ COMBINE NODES ============')
-    final_nodes_df = combine_steps(g, 'nodes', list(zip(ops, reversed(g_stack_reverse))), engine_concrete)
+    final_nodes_df = combine_steps(g, 'nodes', steps, engine_concrete, g_full)
 
     logger.debug('============ COMBINE EDGES ============')
-    final_edges_df = combine_steps(g, 'edges', list(zip(ops, reversed(g_stack_reverse))), engine_concrete)
+    final_edges_df = combine_steps(g, 'edges', steps, engine_concrete, g_full)
     if added_edge_index:
         final_edges_df = final_edges_df.drop(columns=['index'])
 
-    g_out = g.nodes(final_nodes_df).edges(final_edges_df)
+    g_out = g_full.nodes(final_nodes_df).edges(final_edges_df)
 
     return g_out
@@ -0,0 +1,284 @@
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
+
+from graphistry.Engine import Engine
+from graphistry.Plottable import Plottable
+from graphistry.util import setup_logger
+from .ast import ASTObject, ASTNode, ASTEdge
+from .csr import csr_index_of
+from .node_ids import node_id_encoding_of
+from .predicates.categorical import Duplicated
+
+
+logger = setup_logger(__name__)
+
+
+class ChainPlan(object):
+    """
+    Rewritten operations and execution choices for one chain() call over one graph
+
+    - ops: the operations to run, in execution order, with node predicates pushed into adjacent single-hop edges
+    - reverse: whether ops run from the last step of the original chain, because its node filter is more selective
+    - node_columns / edge_columns: columns traversal needs, or None to keep all
+    - estimates: starting-node counts of the first and last written steps, or None when direction was not up for choice
+    - notes: human-readable log of each rewrite
+
+    Returned by g.chain(..., explain=True); printing it shows the plan
+    """
+
+    def __init__(
+        self,
+        ops: List[ASTObject],
+        reverse: bool,
+        node_columns: Optional[List[str]],
+        edge_columns: Optional[List[str]],
+        estimates: Optional[Tuple[int, int]],
+        uses_csr: bool,
+        notes: List[str]
+    ) -> None:
+        self.ops = ops
+        self.reverse = reverse
+        self.node_columns = node_columns
+        self.edge_columns = edge_columns
+        self.estimates = estimates
+        self.uses_csr = uses_csr
+        self.notes = notes
+
+    def __repr__(self) -> str:
+        return self.explain()
+
+    def explain(self) -> str:
+        estimates = (
+            f'start_estimates(first={self.estimates[0]}, last={self.estimates[1]}), '
+            if self.estimates is not None else ''
+        )
+        lines = [
+            f'ChainPlan(direction={"reverse" if self.reverse else "forward"}, {estimates}csr={self.uses_csr})',
+            f'  node columns: {"all" if self.node_columns is None else self.node_columns}',
+            f'  edge columns: {"all" if self.edge_columns is None else self.edge_columns}',
+            '  ops:'
+        ] + [
+            f'    {i}: {op}' for i, op in enumerate(self.ops)
+        ] + (
+            ['  rewrites:'] + [f'    - {note}' for note in self.notes] if self.notes else []
+        )
+        return '\n'.join(lines)
+
+    def prune(self, g: Plottable) -> Plottable:
+        """
+        Narrow g's tables to the columns traversal needs, keeping any cached indexes over the same rows
+        """
+        if self.node_columns is None and self.edge_columns is None:
+            return g
+        csr = csr_index_of(g)
+        enc = node_id_encoding_of(g)
+        g2 = g
+        if self.node_columns is not None:
+            g2 = g2.nodes(g._nodes[self.node_columns])
+        if self.edge_columns is not None:
+            g2 = g2.edges(g._edges[self.edge_columns])
+        # same rows in same order, so keep using any cached indexes
+        if csr is not None:
+            g2._csr_index = csr.with_edges(g2._edges)
+        if enc is not None:
+            g2._node_id_encoding = enc.with_tables(nodes=g2._nodes, edges=g2._edges)
+        return g2
+
+
+###############################################################################
+
+
+def is_single_hop(op: ASTEdge) -> bool:
+    """
+    Whether hop() applies source/destination predicates exactly once, to the chain's adjacent node steps
+    """
+    return op.hops == 1 and not op.to_fixed_point
+
+
+def pushable_match(filter_dict: Optional[dict]) -> Dict[str, Any]:
+    """
+    Row-wise subset of a node filter_dict: duplicated() depends on which rows are filtered together, so stays put
+    """
+    if filter_dict is None:
+        return {}
+    return {k: v for k, v in filter_dict.items() if not isinstance(v, Duplicated)}
+
+
+def merge_match(existing: Optional[dict], pushed: Dict[str, Any]) -> Tuple[Optional[dict], List[str]]:
+    """
+    AND pushed into existing, skipping keys that existing already constrains differently
+    """
+    merged = dict(existing) if existing is not None else {}
+    added = []
+    for k, v in pushed.items():
+        if k in merged:
+            continue
+        merged[k] = v
+        added.append(k)
+    return (merged if merged else None), added
+
+
+def merge_query(existing: Optional[str], pushed: Optional[str]) -> Optional[str]:
+    if pushed is None or existing == pushed:
+        return existing
+    if existing is None:
+        return pushed
+    return f'({existing}) and ({pushed})'
+
+
+def with_name(op: ASTEdge, name: Optional[str]) -> ASTEdge:
+    op._name = name
+    return op
+
+
+def push_predicates(ops: List[ASTObject], notes: List[str]) -> List[ASTObject]:
+    """
+    Copy node step predicates into the source/destination matches of adjacent single-hop edges
+
+    Node steps stay in place, so results are unchanged, but each edge expansion only
+    emits edges whose endpoints can pass the neighboring node steps, instead of the
+    whole neighborhood. Multi-hop edges are left alone, as hop() applies its node
+    matches to intermediate nodes too.
+    """
+    out: List[ASTObject] = []
+    for i, op in enumerate(ops):
+        if not isinstance(op, ASTEdge) or not is_single_hop(op):
+            out.append(op)
+            continue
+        prev_op = ops[i - 1] if i > 0 and isinstance(ops[i - 1], ASTNode) else None
+        next_op = ops[i + 1] if i + 1 < len(ops) and isinstance(ops[i + 1], ASTNode) else None
+        source_node_match, source_keys = merge_match(
+            op.source_node_match,
+            pushable_match(cast(ASTNode, prev_op).filter_dict) if prev_op is not None else {}
+        )
+        destination_node_match, destination_keys = merge_match(
+            op.destination_node_match,
+            pushable_match(cast(ASTNode, next_op).filter_dict) if next_op is not None else {}
+        )
+        source_node_query = merge_query(op.source_node_query, cast(ASTNode, prev_op).query if prev_op is not None else None)
+        destination_node_query = merge_query(op.destination_node_query, cast(ASTNode, next_op).query if next_op is not None else None)
+        if (
+            not source_keys and not destination_keys
+            and source_node_query == op.source_node_query  # noqa: W503
+            and destination_node_query == op.destination_node_query  # noqa: W503
+        ):
+            out.append(op)
+            continue
+        out.append(with_name(ASTEdge(
+            direction=op.direction,
+            edge_match=op.edge_match,
+            hops=op.hops,
+            to_fixed_point=op.to_fixed_point,
+            source_node_match=source_node_match,
+            destination_node_match=destination_node_match,
+            source_node_query=source_node_query,
+            destination_node_query=destination_node_query,
+            edge_query=op.edge_query
+        ), op._name))
+        if source_keys or source_node_query != op.source_node_query:
+            notes.append(f'written step {i}: pushed step {i - 1} node predicates into source match ({source_keys}, query={source_node_query})')
+        if destination_keys or destination_node_query != op.destination_node_query:
+            notes.append(f'written step {i}: pushed step {i + 1} node predicates into destination match ({destination_keys}, query={destination_node_query})')
+    return out
+
+
+def reverse_ops(ops: List[ASTObject]) -> List[ASTObject]:
+    """
+    Same pattern read from the other end: reversed order, each edge flipped, names kept
+    """
+    return [
+        with_name(op.reverse(), op._name) if isinstance(op, ASTEdge) else op.reverse()
+        for op in reversed(ops)
+    ]
+
+
+def is_filtered(op: ASTObject) -> bool:
+    return isinstance(op, ASTNode) and (op.filter_dict is not None or op.query is not None)
+
+
+def estimate_matches(g: Plottable, op: ASTObject, engine: Engine) -> int:
+    """
+    Number of nodes a starting node step selects, by evaluating it over the nodes table
+    """
+    if not is_filtered(op):
+        return len(g._nodes)
+    return len(op(g=g, prev_node_wavefront=None, target_wave_front=None, engine=engine)._nodes)
+
+
+def referenced_columns(columns: Any, filter_dicts: List[Optional[dict]], queries: List[Optional[str]]) -> Set[str]:
+    """
+    Columns named by filter_dict keys, and, conservatively, any column whose name appears in a query string
+    """
+    out: Set[str] = set()
+    for d in filter_dicts:
+        if d is not None:
+            out.update(d.keys())
+    for q in queries:
+        if q is not None:
+            out.update(c for c in columns if isinstance(c, str) and c in q)
+    return out
+
+
+def pruned_columns(columns: Any, keep: Set[str]) -> Optional[List[str]]:
+    kept = [c for c in columns if c in keep]
+    return kept if len(kept) < len(columns) else None
+
+
+def plan_chain(g: Plottable, ops: List[ASTObject], engine: Engine) -> ChainPlan:
+    """
+    Rewrite a node-edge-...-node chain for execution over g
+
+    g must be the chain's working graph: materialized nodes, with a bound edge id.
+    """
+    assert g._node is not None and g._source is not None and g._destination is not None and g._edge is not None
+    notes: List[str] = []
+
+    # 1. Predicate pushdown
+    planned = push_predicates(ops, notes)
+
+    # 2. Start from the more selective end; the backward pass covers the other direction either way
+    #    Multi-hop edges keep their written direction: their intermediate hops are matched asymmetrically
+    #    Estimates filter the whole nodes table, so only pay for them when the direction can change
+    reversible = all(is_single_hop(op) for op in ops if isinstance(op, ASTEdge))
+    estimates: Optional[Tuple[int, int]] = None
+    reverse = False
+    if len(ops) > 1 and reversible:
+        first_estimate = estimate_matches(g, ops[0], engine)
+        last_estimate = estimate_matches(g, ops[-1], engine)
+        estimates = (first_estimate, last_estimate)
+        reverse = last_estimate < first_estimate
+        if reverse:
+            planned = reverse_ops(planned)
+            notes.append(f'run from the last written step: {last_estimate} vs {first_estimate} starting nodes')
+
+    # 3. Column pruning: traversal only needs ids and predicate columns, outputs get rehydrated
+    node_ops = [op for op in ops if isinstance(op, ASTNode)]
+    edge_ops = [op for op in ops if isinstance(op, ASTEdge)]
+    node_keep = {g._node} | referenced_columns(
+        g._nodes.columns,
+        [op.filter_dict for op in node_ops]
+        + [op.source_node_match for op in edge_ops]  # noqa: W503
+        + [op.destination_node_match for op in edge_ops],  # noqa: W503
+        [op.query for op in node_ops]
+        + [op.source_node_query for op in edge_ops]  # noqa: W503
+        + [op.destination_node_query for op in edge_ops]  # noqa: W503
+    )
+    edge_keep = {g._source, g._destination, g._edge} | referenced_columns(
+        g._edges.columns,
+        [op.edge_match for op in edge_ops],
+        [op.edge_query for op in edge_ops]
+    )
+    node_columns = pruned_columns(g._nodes.columns, node_keep)
+    edge_columns = pruned_columns(g._edges.columns, edge_keep)
+    if node_columns is not None:
+        notes.append(f'prune nodes to {node_columns}')
+    if edge_columns is not None:
+        notes.append(f'prune edges to {edge_columns}')
+
+    plan = ChainPlan(
+        planned, reverse, node_columns, edge_columns,
+        estimates,
+        engine == Engine.PANDAS and csr_index_of(g) is not None,
+        notes
+    )
+    logger.debug('chain plan:\n%s', plan)
+    return plan
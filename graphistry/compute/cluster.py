@@ -9,7 +9,7 @@ from collections import Counter
 from graphistry.Plottable import Plottable
 from graphistry.constants import CUML, UMAP_LEARN, DBSCAN  # noqa type: ignore
 from graphistry.features import ModelDict
-from graphistry.feature_utils import get_matrix_by_column_parts
+from graphistry.feature_utils import features_matrix, get_matrix_by_column_parts, is_sparse_df
 from graphistry.utils.lazy_import import lazy_cudf_import, lazy_dbscan_import
 
 logger = logging.getLogger("compute.cluster")
@@ -114,7 +114,7 @@ def dbscan_fit(g: Any, dbscan: Any, kind: str = "nodes", cols: Optional[Union[Li
     if X.empty:
         raise ValueError("No features found for clustering")
 
-    dbscan.fit(X)
+    dbscan.fit(features_matrix(X))
     # this is a future feature one cuml supports it
     if g.engine_dbscan == 'cuml':
         labels = dbscan.labels_.to_numpy()
@@ -157,10 +157,18 @@ def dbscan_predict(X: pd.DataFrame, model: Any):
 
     y_new = np.ones(shape=n_samples, dtype=int) * -1
 
+    sparse = is_sparse_df(X)
+    if sparse:
+        from sklearn.metrics.pairwise import euclidean_distances
+        X_ = features_matrix(X)
+
     for i in range(n_samples):
-        diff = model.components_ - X.iloc[i, :].values  # NumPy broadcasting
+        if sparse:
+            dist = euclidean_distances(model.components_, X_[i]).ravel()
+        else:
+            diff = model.components_ - X.iloc[i, :].values  # NumPy broadcasting
 
-        dist = np.linalg.norm(diff, axis=1)  # Euclidean distance
+            dist = np.linalg.norm(diff, axis=1)  # Euclidean distance
 
         shortest_dist_idx = np.argmin(dist)
 
@@ -500,6 +500,9 @@ def collapse_by(
     
     
     g = copy.deepcopy(self.bind())
+    # tables get mutated in place below, so drop cached indexes over them
+    g._csr_index = None
+    g._node_id_encoding = None
     g = check_default_columns_present_and_coerce_to_string(g)
 
     n_edges = len(g._edges)
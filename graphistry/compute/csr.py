@@ -0,0 +1,174 @@
+from typing import Any, Optional
+import numpy as np
+import pandas as pd
+
+from graphistry.Plottable import Plottable
+from graphistry.util import setup_logger
+from .node_ids import NodeIdEncoding
+
+
+logger = setup_logger(__name__)
+
+
+def gather_ranges(indptr: np.ndarray, perm: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """
+    Concatenate perm[indptr[c]:indptr[c + 1]] for each c in codes, without a Python loop
+    """
+    if len(codes) == 0:
+        return perm[:0]
+    starts = indptr[codes]
+    counts = indptr[codes + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return perm[:0]
+    # offset of each run in the output, repeated per element, shifted to the run's start in perm
+    run_offsets = np.cumsum(counts) - counts
+    positions = np.arange(total, dtype=np.int64) + np.repeat(starts - run_offsets, counts)
+    return perm[positions]
+
+
+def csr_arrays(codes: np.ndarray, n: int):
+    """
+    (indptr, perm) grouping positions of codes by code value, skipping negative (null) codes
+
+    perm[indptr[c]:indptr[c + 1]] are the positions i where codes[i] == c
+    """
+    valid = np.flatnonzero(codes >= 0)
+    valid_codes = codes[valid].astype(np.int64, copy=False)
+    perm = valid[np.argsort(valid_codes, kind='stable')].astype(np.int64)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(valid_codes, minlength=n), out=indptr[1:])
+    return indptr, perm
+
+
+class CSRIndex(object):
+    """
+    Compressed sparse row (forward) and column (reverse) adjacency over an edge table
+
+    Node ids are encoded into contiguous integer codes, and for each code, the
+    positions of its out-edges (forward) and in-edges (reverse) are stored as one
+    contiguous run. Frontier expansion then becomes an offset gather over only the
+    touched edges instead of a hash join over the whole edge table.
+
+    Positions refer to row order in the edge table the index was built from, so the
+    index is only valid for that exact table and source/destination bindings.
+
+    Internal: build via g.build_csr()
+    """
+
+    def __init__(
+        self,
+        edges: Any,
+        source: str,
+        destination: str,
+        node_ids: pd.Index,
+        fwd_indptr: np.ndarray,
+        fwd_perm: np.ndarray,
+        rev_indptr: np.ndarray,
+        rev_perm: np.ndarray
+    ) -> None:
+        self.edges = edges
+        self.source = source
+        self.destination = destination
+        self.node_ids = node_ids
+        self.fwd_indptr = fwd_indptr
+        self.fwd_perm = fwd_perm
+        self.rev_indptr = rev_indptr
+        self.rev_perm = rev_perm
+
+    def __repr__(self) -> str:
+        return f'CSRIndex(nodes={len(self.node_ids)}, edges={len(self.fwd_perm)}, source={self.source}, destination={self.destination})'
+
+    @classmethod
+    def build(
+        cls,
+        edges: pd.DataFrame,
+        source: str,
+        destination: str,
+        encoding: Optional[NodeIdEncoding] = None
+    ) -> 'CSRIndex':
+        """
+        Build over edges, reusing the codes of a node id encoding of the same edges when provided
+        """
+        if not isinstance(edges, pd.DataFrame):
+            raise ValueError(f'CSR index currently requires pandas edges, got: {type(edges)}')
+
+        if encoding is None:
+            encoding = NodeIdEncoding.build(edges, source, destination)
+        elif encoding.edges is not edges or encoding.source != source or encoding.destination != destination:
+            raise ValueError('CSR index requires a node id encoding of the same edges and bindings')
+        src_codes = encoding.src_codes
+        dst_codes = encoding.dst_codes
+        uniques = encoding.ids
+        n_nodes = len(uniques)
+
+        # null endpoints are coded -1: unreachable, so left out of adjacency
+        fwd_indptr, fwd_perm = csr_arrays(src_codes, n_nodes)
+        rev_indptr, rev_perm = csr_arrays(dst_codes, n_nodes)
+
+        out = cls(
+            edges, source, destination, uniques,
+            fwd_indptr, fwd_perm, rev_indptr, rev_perm
+        )
+        logger.debug('built %s', out)
+        return out
+
+    def matches(self, g: Plottable) -> bool:
+        """
+        Whether index positions are valid for g's current edge table and bindings
+        """
+        return (
+            g._edges is self.edges
+            and g._source == self.source  # noqa: W503
+            and g._destination == self.destination  # noqa: W503
+        )
+
+    def with_edges(self, edges: Any) -> 'CSRIndex':
+        """
+        Reuse the index for a derived table with the same rows in the same order, e.g., after reset_index()
+        """
+        if len(edges) != len(self.edges):
+            raise ValueError(f'CSR index rebinding requires same row count, got {len(edges)} vs {len(self.edges)}')
+        return CSRIndex(
+            edges, self.source, self.destination, self.node_ids,
+            self.fwd_indptr, self.fwd_perm, self.rev_indptr, self.rev_perm
+        )
+
+    def encode(self, ids: Any) -> np.ndarray:
+        """
+        Node ids -> unique codes, dropping unknown ids
+        """
+        codes = self.node_ids.get_indexer(pd.Series(ids).unique())
+        return codes[codes >= 0]
+
+    def edge_positions(self, ids: Any, direction: str, edge_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Positions of edges leaving (direction='forward') or entering (direction='reverse') the given node ids
+
+        :param ids: Node ids of the frontier
+        :param direction: 'forward' or 'reverse'
+        :param edge_mask: Optional boolean array over edge positions; only True edges are returned
+        """
+        codes = self.encode(ids)
+        if direction == 'forward':
+            positions = gather_ranges(self.fwd_indptr, self.fwd_perm, codes)
+        elif direction == 'reverse':
+            positions = gather_ranges(self.rev_indptr, self.rev_perm, codes)
+        else:
+            raise ValueError(f'Invalid CSR direction: "{direction}", must be one of: "forward", "reverse"')
+        if edge_mask is not None:
+            positions = positions[edge_mask[positions]]
+        return positions
+
+
+def csr_index_of(g: Plottable) -> Optional[CSRIndex]:
+    """
+    Return g's cached CSR index if it is still valid for g's edges and bindings, else None
+    """
+    csr = getattr(g, '_csr_index', None)
+    if csr is None:
+        return None
+    if not csr.matches(g):
+        logger.debug('Ignoring stale CSR index: edges or bindings changed since build_csr()')
+        return None
+    return csr
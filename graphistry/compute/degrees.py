@@ -0,0 +1,118 @@
+from typing import Optional
+import numpy as np
+
+from graphistry.Engine import Engine, df_concat, df_cons, resolve_engine
+from graphistry.Plottable import Plottable
+from graphistry.util import setup_logger
+from .node_ids import NodeIdEncoding, node_id_encoding_of
+from .typing import DataFrameT
+
+
+logger = setup_logger(__name__)
+
+
+def degrees_encoded(
+    g: Plottable,
+    enc: NodeIdEncoding,
+    weight: Optional[str] = None
+):
+    """
+    Per-node-row (in, out) degree arrays via bincount over node id codes
+    """
+    assert enc.node_codes is not None
+    # trailing 0 slot so null node ids (code -1) get degree 0
+    n = len(enc.ids) + 1
+    src_codes, dst_codes = enc.src_codes, enc.dst_codes
+    weights = None
+    if weight is not None:
+        weights = np.nan_to_num(g._edges[weight].to_numpy(dtype=np.float64, na_value=np.nan))
+    # Edges with a null endpoint are not counted on either side
+    valid = (src_codes >= 0) & (dst_codes >= 0)
+    if not valid.all():
+        src_codes, dst_codes = src_codes[valid], dst_codes[valid]
+        weights = weights[valid] if weights is not None else None
+    deg_in = np.bincount(dst_codes, weights=weights, minlength=n)
+    deg_out = np.bincount(src_codes, weights=weights, minlength=n)
+    if weight is None:
+        deg_in = deg_in.astype('int32')
+        deg_out = deg_out.astype('int32')
+    return deg_in[enc.node_codes], deg_out[enc.node_codes]
+
+
+def degrees_grouped(
+    g: Plottable,
+    engine: Engine,
+    weight: Optional[str] = None
+) -> DataFrameT:
+    """
+    Degree table (node, in, out) via one groupby over stacked endpoints, for engines without node id codes
+    """
+    assert g._source is not None and g._destination is not None and g._node is not None
+    concat = df_concat(engine)
+    DataFrame = df_cons(engine)
+    edges = g._edges
+    has_endpoints = edges[g._source].notna() & edges[g._destination].notna()
+    if not has_endpoints.all():
+        edges = edges[has_endpoints]
+    w = edges[weight].fillna(0) if weight is not None else 1
+    stacked = concat([
+        DataFrame({g._node: edges[g._source], '__degree_in__': 0, '__degree_out__': w}),
+        DataFrame({g._node: edges[g._destination], '__degree_in__': w, '__degree_out__': 0})
+    ], ignore_index=True, sort=False)
+    out = stacked.groupby(g._node).sum().reset_index()
+    return out
+
+
+def get_degrees(
+    g: Plottable,
+    col: Optional[str] = 'degree',
+    degree_in: Optional[str] = 'degree_in',
+    degree_out: Optional[str] = 'degree_out',
+    weight: Optional[str] = None
+) -> Plottable:
+    """
+    Decorate materialized nodes with any of total, in, and out degree in one pass over the edges
+
+    Columns whose name is None are skipped. Pandas uses bincount over node id codes (reusing
+    any cached encode_node_ids()) and assigns positionally; other engines use one groupby
+    and one merge.
+    """
+    if g._node is None or g._nodes is None:
+        raise ValueError('get_degrees requires materialized nodes')
+    out_cols = [c for c in [degree_in, degree_out, col] if c is not None]
+    if weight is not None and weight not in g._edges:
+        raise ValueError(f'Weight column "{weight}" not in edges')
+
+    engine = resolve_engine('auto', g)
+    base_nodes = g._nodes[[c for c in g._nodes.columns if c not in out_cols]]
+
+    if engine == Engine.PANDAS:
+        cached_enc = node_id_encoding_of(g)
+        enc = cached_enc
+        if enc is None:
+            assert g._source is not None and g._destination is not None
+            enc = NodeIdEncoding.build(g._edges, g._source, g._destination, g._nodes, g._node)
+        deg_in, deg_out = degrees_encoded(g, enc, weight)
+        nodes_df = base_nodes.assign(**{
+            **({degree_in: deg_in} if degree_in is not None else {}),
+            **({degree_out: deg_out} if degree_out is not None else {}),
+            **({col: deg_in + deg_out} if col is not None else {})
+        })
+        if cached_enc is not None:
+            # same node rows, so the output stays encoded
+            res = g.nodes(nodes_df, g._node)
+            res._node_id_encoding = cached_enc.with_tables(nodes=nodes_df)
+            return res
+    else:
+        deg_df = degrees_grouped(g, engine, weight)
+        nodes_df = base_nodes.merge(deg_df, how='left', on=g._node)
+        dtype = 'float64' if weight is not None else 'int32'
+        deg_in_s = nodes_df['__degree_in__'].fillna(0).astype(dtype)
+        deg_out_s = nodes_df['__degree_out__'].fillna(0).astype(dtype)
+        nodes_df = nodes_df.drop(columns=['__degree_in__', '__degree_out__']).assign(**{
+            **({degree_in: deg_in_s} if degree_in is not None else {}),
+            **({degree_out: deg_out_s} if degree_out is not None else {}),
+            **({col: deg_in_s + deg_out_s} if col is not None else {})
+        })
+
+    return g.nodes(nodes_df, g._node)
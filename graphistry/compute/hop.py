@@ -1,11 +1,14 @@
 import logging
 from typing import Any, List, Optional, TYPE_CHECKING, Union
+import numpy as np
 import pandas as pd
 
-from graphistry.Engine import Engine, EngineAbstract, df_concat, df_cons, df_to_engine, resolve_engine
+from graphistry.Engine import Engine, EngineAbstract, df_concat, df_cons, df_to_engine, df_to_pdf, resolve_engine
 from graphistry.Plottable import Plottable
 from graphistry.util import setup_logger
+from .csr import csr_index_of
 from .filter_by_dict import filter_by_dict
+from .shortest_paths import bidirectional_shortest_paths
 from .typing import DataFrameT
 
 
@@ -31,7 +34,9 @@ def hop(self: Plottable,
     edge_query: Optional[str] = None,
     return_as_wave_front = False,
     target_wave_front: Optional[DataFrameT] = None,  # chain: limit hits to these for reverse pass
-    engine: Union[EngineAbstract, str] = EngineAbstract.AUTO
+    engine: Union[EngineAbstract, str] = EngineAbstract.AUTO,
+    bidirectional: bool = False,
+    label_node_hops: Optional[str] = None
 ) -> Plottable:
     """
     Given a graph and some source nodes, return subgraph of all paths within k-hops from the sources
@@ -54,6 +59,15 @@ def hop(self: Plottable,
     return_as_wave_front: Exclude starting node(s) in return, returning only encountered nodes
     target_wave_front: Only consider these nodes + self._nodes for reachability
     engine: 'auto', 'pandas', 'cudf' (GPU)
+    bidirectional: Return only shortest paths from nodes to target_wave_front, searching from both ends at once
+    label_node_hops: Optional column name for the number of hops at which each returned node was first reached
+
+    When g.build_csr() was called on the current edges, pandas-mode hops expand via the cached CSR index
+
+    With bidirectional=True, both nodes and target_wave_front are required, and the search expands whichever
+    frontier is smaller, stopping as soon as the two meet or the hop budget (hops, or none when to_fixed_point)
+    is spent. The result is every node and edge on a shortest connecting path of length 1 or more, with
+    source/destination matches applied to each edge's tail/head. Reached depth is counted from nodes.
     """
 
     """
@@ -110,6 +124,9 @@ def hop(self: Plottable,
     if target_wave_front is not None and nodes is None:
         raise ValueError('target_wave_front requires nodes to target against (for intermediate hops)')
 
+    if bidirectional and target_wave_front is None:
+        raise ValueError('bidirectional requires target_wave_front to search back from')
+
     if destination_node_match == {}:
         destination_node_match = None
 
@@ -133,6 +150,26 @@ def hop(self: Plottable,
     if g2._source is None or g2._destination is None:
         raise ValueError('Source and destination binding cannot be None, please set g._source and g._destination via bind() or edges()')
 
+    if bidirectional:
+        assert target_wave_front is not None
+        return hop_bidirectional(
+            self, g2, starting_nodes, target_wave_front, edges_indexed, EDGE_ID,
+            None if to_fixed_point else hops, direction,
+            source_node_match, destination_node_match, source_node_query, destination_node_query,
+            return_as_wave_front, label_node_hops, engine_concrete
+        )
+
+    # When g.build_csr() was called on these edges, expand frontiers via CSR offset gathers instead of edge table joins
+    csr = csr_index_of(g2) if engine_concrete == Engine.PANDAS else None
+    if csr is not None:
+        if edge_match is None and edge_query is None:
+            csr_edges = edges_indexed[[g2._source, g2._destination, EDGE_ID]]
+            csr_edge_mask = None
+        else:
+            csr_edges = (g2._edges.reset_index() if g2._edge is None else g2._edges)[[g2._source, g2._destination, EDGE_ID]]
+            csr_edge_mask = csr_edges[EDGE_ID].isin(edges_indexed[EDGE_ID]).to_numpy()
+        logger.debug('hop using %s', csr)
+
     hops_remaining = hops
 
     wave_front = starting_nodes[[g2._node]][:0]
@@ -157,6 +194,8 @@ def hop(self: Plottable,
 
     first_iter = True
     combined_node_ids = None
+    current_hop = 0
+    node_hop_records: List[DataFrameT] = []  # (node, first hop reached), earliest first
     while True:
 
         if debugging_hop and logger.isEnabledFor(logging.DEBUG):
@@ -180,6 +219,7 @@ def hop(self: Plottable,
             if hops_remaining < 1:
                 break
             hops_remaining = hops_remaining - 1
+        current_hop += 1
         
         assert len(wave_front.columns) == 1, "just indexes"
         wave_front_iter : DataFrameT = query_if_not_none(
@@ -200,13 +240,18 @@ def hop(self: Plottable,
         hop_edges_forward = None
         new_node_ids_forward = None
         if direction in ['forward', 'undirected']:
-            hop_edges_forward = (
-                wave_front_iter.merge(
-                    edges_indexed[[g2._source, g2._destination, EDGE_ID]].assign(**{g2._node: edges_indexed[g2._source]}),
-                    how='inner',
-                    on=g2._node)
-                [[g2._source, g2._destination, EDGE_ID]]
-            )
+            if csr is not None:
+                hop_edges_forward = csr_edges.take(
+                    csr.edge_positions(wave_front_iter[g2._node], 'forward', csr_edge_mask)
+                )
+            else:
+                hop_edges_forward = (
+                    wave_front_iter.merge(
+                        edges_indexed[[g2._source, g2._destination, EDGE_ID]].assign(**{g2._node: edges_indexed[g2._source]}),
+                        how='inner',
+                        on=g2._node)
+                    [[g2._source, g2._destination, EDGE_ID]]
+                )
             if target_wave_front is not None:
                 # target prev internal transitions (g._nodes) + starting point (target)
                 # final hop can only be to target
@@ -246,13 +291,18 @@ def hop(self: Plottable,
         hop_edges_reverse = None
         new_node_ids_reverse = None
         if direction in ['reverse', 'undirected']:
-            hop_edges_reverse = (
-                wave_front_iter.merge(
-                    edges_indexed[[g2._destination, g2._source, EDGE_ID]].assign(**{g2._node: edges_indexed[g2._destination]}),
-                    how='inner',
-                    on=g2._node)
-                [[g2._destination, g2._source, EDGE_ID]]
-            )
+            if csr is not None:
+                hop_edges_reverse = csr_edges.take(
+                    csr.edge_positions(wave_front_iter[g2._node], 'reverse', csr_edge_mask)
+                )[[g2._destination, g2._source, EDGE_ID]]
+            else:
+                hop_edges_reverse = (
+                    wave_front_iter.merge(
+                        edges_indexed[[g2._destination, g2._source, EDGE_ID]].assign(**{g2._node: edges_indexed[g2._destination]}),
+                        how='inner',
+                        on=g2._node)
+                    [[g2._destination, g2._source, EDGE_ID]]
+                )
             if debugging_hop and logger.isEnabledFor(logging.DEBUG):
                 logger.debug('--- direction in [reverse, undirected] ---')
                 logger.debug('hop_edges_reverse basic:\n%s', hop_edges_reverse)
@@ -346,6 +396,12 @@ def hop(self: Plottable,
                 logger.debug('~~~~~~~~~~ LOOP STEP MERGES 2 ~~~~~~~~~~~')
                 logger.debug('matches_edges:\n%s', matches_edges)
 
+            if label_node_hops is not None:
+                node_hop_records.append(matches_nodes.assign(**{label_node_hops: 0}))
+
+        if label_node_hops is not None:
+            node_hop_records.append(new_node_ids.assign(**{label_node_hops: current_hop}))
+
         if len(matches_nodes) > 0:
             combined_node_ids = concat([matches_nodes, new_node_ids], ignore_index=True, sort=False).drop_duplicates()
         else:
@@ -375,7 +431,11 @@ def hop(self: Plottable,
         logger.debug('target_wave_front:\n%s', target_wave_front)
 
     #hydrate edges
-    final_edges = edges_indexed.merge(matches_edges, on=EDGE_ID, how='inner')
+    if csr is not None:
+        # matches are already deduplicated, so a semi-join avoids another full join
+        final_edges = edges_indexed[edges_indexed[EDGE_ID].isin(matches_edges[EDGE_ID])].reset_index(drop=True)
+    else:
+        final_edges = edges_indexed.merge(matches_edges, on=EDGE_ID, how='inner')
     if EDGE_ID not in self._edges:
         final_edges = final_edges.drop(columns=[EDGE_ID])
     g_out = g2.edges(final_edges)
@@ -400,6 +460,12 @@ def hop(self: Plottable,
             matches_nodes if matches_nodes is not None else wave_front[:0],
             on=self._node,
             how='inner')
+        if label_node_hops is not None:
+            if len(node_hop_records) > 0:
+                node_hops = concat(node_hop_records, ignore_index=True, sort=False).drop_duplicates(subset=[g2._node])
+                final_nodes = final_nodes.merge(node_hops, on=g2._node, how='left')
+            else:
+                final_nodes = final_nodes.assign(**{label_node_hops: 0})
         g_out = g_out.nodes(final_nodes)
 
     if debugging_hop and logger.isEnabledFor(logging.DEBUG):
@@ -410,3 +476,93 @@ def hop(self: Plottable,
         logger.debug('==========================')
 
     return g_out
+
+
+def hop_bidirectional(
+    self: Plottable,
+    g2: Plottable,
+    starting_nodes: DataFrameT,
+    target_wave_front: DataFrameT,
+    edges_indexed: DataFrameT,
+    EDGE_ID: str,
+    hops: Optional[int],
+    direction: str,
+    source_node_match: Optional[dict],
+    destination_node_match: Optional[dict],
+    source_node_query: Optional[str],
+    destination_node_query: Optional[str],
+    return_as_wave_front: bool,
+    label_node_hops: Optional[str],
+    engine: Engine
+) -> Plottable:
+    """
+    hop(bidirectional=True): shortest paths between starting_nodes and target_wave_front, over host-side node codes
+
+    Node matches become per-arc masks, as intermediate nodes are both a source and a destination of some hop:
+    an arc is usable when its tail passes the source match and its head passes the destination match.
+    """
+    assert g2._node is not None and g2._source is not None and g2._destination is not None
+    node, src, dst = g2._node, g2._source, g2._destination
+    concat = df_concat(engine)
+
+    base_nodes = concat([target_wave_front, g2._nodes], ignore_index=True, sort=False).drop_duplicates(subset=[node])
+    endpoints = df_to_pdf(edges_indexed[[src, dst]], engine)
+    ids = pd.Index(pd.concat(
+        [df_to_pdf(base_nodes[[node]], engine)[node], endpoints[src], endpoints[dst]],
+        ignore_index=True
+    ).dropna().unique())
+    n = len(ids)
+
+    def encode(df: DataFrameT) -> np.ndarray:
+        codes = ids.get_indexer(df_to_pdf(df[[node]], engine)[node])
+        return codes[codes >= 0]
+
+    def node_mask(match: Optional[dict], query: Optional[str]) -> np.ndarray:
+        # trailing False slot so null endpoints (code -1) never pass
+        mask = np.zeros(n + 1, dtype=bool)
+        if match is None and query is None:
+            mask[:n] = True
+        else:
+            mask[encode(query_if_not_none(query, filter_by_dict(base_nodes, match)))] = True
+        return mask
+
+    src_codes = ids.get_indexer(endpoints[src])
+    dst_codes = ids.get_indexer(endpoints[dst])
+    positions = np.arange(len(endpoints), dtype=np.int64)
+    tails: np.ndarray
+    heads: np.ndarray
+    arc_positions: np.ndarray
+    if direction == 'forward':
+        tails, heads, arc_positions = src_codes, dst_codes, positions
+    elif direction == 'reverse':
+        tails, heads, arc_positions = dst_codes, src_codes, positions
+    else:
+        tails = np.concatenate([src_codes, dst_codes])
+        heads = np.concatenate([dst_codes, src_codes])
+        arc_positions = np.concatenate([positions, positions])
+    usable = node_mask(source_node_match, source_node_query)[tails] & node_mask(destination_node_match, destination_node_query)[heads]
+    tails, heads, arc_positions = tails[usable], heads[usable], arc_positions[usable]
+
+    on_arc, depth, length = bidirectional_shortest_paths(
+        tails, heads, n, encode(starting_nodes), encode(target_wave_front), hops
+    )
+    logger.debug('hop bidirectional: shortest path length %s', length)
+
+    final_edges = edges_indexed.take(np.unique(arc_positions[on_arc])).reset_index(drop=True)
+    if EDGE_ID not in self._edges:
+        final_edges = final_edges.drop(columns=[EDGE_ID])
+    g_out = g2.edges(final_edges)
+
+    if self._nodes is not None:
+        on_path = np.flatnonzero(depth > (0 if return_as_wave_front else -1))
+        matches_nodes = df_to_engine(
+            pd.DataFrame({
+                node: ids.take(on_path),
+                **({label_node_hops: depth[on_path]} if label_node_hops is not None else {})
+            }),
+            engine
+        )
+        rich_nodes = concat([self._nodes, target_wave_front], ignore_index=True, sort=False).drop_duplicates(subset=[node])
+        g_out = g_out.nodes(rich_nodes.merge(matches_nodes, on=node, how='inner'))
+
+    return g_out
@@ -0,0 +1,174 @@
+from typing import Any, Optional
+import numpy as np
+import pandas as pd
+
+from graphistry.Plottable import Plottable
+from graphistry.util import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+def codes_dtype(n: int) -> Any:
+    return np.int32 if n < np.iinfo(np.int32).max else np.int64
+
+
+class NodeIdEncoding(object):
+    """
+    Dense integer codes for node ids, aligned with the rows of a nodes and edges table
+
+    The dictionary `ids` maps code i to node id ids[i]. It is built once from
+    g._nodes[g._node], g._edges[g._source], and g._edges[g._destination], in that order,
+    so compute ops can work over int32/int64 arrays and only decode at the output boundary.
+
+    Subgraphs derived via subset() keep the same dictionary, so codes stay comparable
+    across the results of drop_nodes(), keep_nodes(), and similar filters.
+
+    Null ids are coded as -1.
+
+    Internal: build via g.encode_node_ids()
+    """
+
+    def __init__(
+        self,
+        ids: pd.Index,
+        nodes: Any,
+        node: Optional[str],
+        node_codes: Optional[np.ndarray],
+        edges: Any,
+        source: str,
+        destination: str,
+        src_codes: np.ndarray,
+        dst_codes: np.ndarray
+    ) -> None:
+        self.ids = ids
+        self.nodes = nodes
+        self.node = node
+        self.node_codes = node_codes
+        self.edges = edges
+        self.source = source
+        self.destination = destination
+        self.src_codes = src_codes
+        self.dst_codes = dst_codes
+
+    def __repr__(self) -> str:
+        return f'NodeIdEncoding(ids={len(self.ids)}, nodes={None if self.nodes is None else len(self.nodes)}, edges={len(self.edges)})'
+
+    @classmethod
+    def build(
+        cls,
+        edges: pd.DataFrame,
+        source: str,
+        destination: str,
+        nodes: Optional[pd.DataFrame] = None,
+        node: Optional[str] = None
+    ) -> 'NodeIdEncoding':
+        if not isinstance(edges, pd.DataFrame) or (nodes is not None and not isinstance(nodes, pd.DataFrame)):
+            raise ValueError(f'Node id encoding currently requires pandas nodes and edges, got: {type(nodes)}, {type(edges)}')
+        if nodes is not None and node is None:
+            raise ValueError('Node id encoding of a nodes table requires a node id binding')
+
+        cols = ([nodes[node]] if nodes is not None else []) + [edges[source], edges[destination]]
+        codes, uniques = pd.factorize(pd.concat(cols, ignore_index=True))
+        codes = codes.astype(codes_dtype(len(uniques)), copy=False)
+
+        n_nodes = len(nodes) if nodes is not None else 0
+        n_edges = len(edges)
+        out = cls(
+            pd.Index(uniques),
+            nodes, node, codes[:n_nodes] if nodes is not None else None,
+            edges, source, destination,
+            codes[n_nodes:n_nodes + n_edges], codes[n_nodes + n_edges:]
+        )
+        logger.debug('built %s', out)
+        return out
+
+    def matches(self, g: Plottable) -> bool:
+        """
+        Whether codes are still aligned with g's current tables and bindings
+        """
+        return (
+            g._edges is self.edges
+            and g._source == self.source  # noqa: W503
+            and g._destination == self.destination  # noqa: W503
+            and g._nodes is self.nodes  # noqa: W503
+            and (self.nodes is None or g._node == self.node)  # noqa: W503
+        )
+
+    def encode(self, ids: Any) -> np.ndarray:
+        """
+        Node ids -> codes, with -1 for ids not in the dictionary
+        """
+        return self.ids.get_indexer(pd.Index(ids))
+
+    def decode(self, codes: np.ndarray) -> pd.Index:
+        """
+        Codes -> node ids; codes must be valid (non-negative)
+        """
+        return self.ids.take(codes)
+
+    def membership(self, ids: Any) -> np.ndarray:
+        """
+        Boolean lookup table over codes: table[c] is True iff node c is in ids
+
+        The table has one extra trailing False slot, so indexing it with -1 (null, unknown) yields False.
+        """
+        table = np.zeros(len(self.ids) + 1, dtype=bool)
+        codes = self.encode(ids)
+        table[codes[codes >= 0]] = True
+        return table
+
+    def subset(
+        self,
+        nodes: Any = None,
+        node_mask: Optional[np.ndarray] = None,
+        edges: Any = None,
+        edge_mask: Optional[np.ndarray] = None
+    ) -> 'NodeIdEncoding':
+        """
+        Encoding for a row-filtered subgraph, reusing the same dictionary
+
+        Pass the filtered table together with the boolean mask that produced it; omitted tables are unchanged.
+        """
+        if nodes is None:
+            nodes, node_codes = self.nodes, self.node_codes
+        else:
+            assert self.node_codes is not None and node_mask is not None
+            node_codes = self.node_codes[node_mask]
+        if edges is None:
+            edges, src_codes, dst_codes = self.edges, self.src_codes, self.dst_codes
+        else:
+            assert edge_mask is not None
+            src_codes, dst_codes = self.src_codes[edge_mask], self.dst_codes[edge_mask]
+        return NodeIdEncoding(
+            self.ids,
+            nodes, self.node, node_codes,
+            edges, self.source, self.destination, src_codes, dst_codes
+        )
+
+    def with_tables(self, nodes: Any = None, edges: Any = None) -> 'NodeIdEncoding':
+        """
+        Rebind to derived tables with the same rows in the same order, e.g., after reset_index()
+        """
+        if nodes is not None and len(nodes) != len(self.nodes):
+            raise ValueError(f'Node id encoding rebinding requires same node count, got {len(nodes)} vs {len(self.nodes)}')
+        if edges is not None and len(edges) != len(self.edges):
+            raise ValueError(f'Node id encoding rebinding requires same edge count, got {len(edges)} vs {len(self.edges)}')
+        return NodeIdEncoding(
+            self.ids,
+            nodes if nodes is not None else self.nodes, self.node, self.node_codes,
+            edges if edges is not None else self.edges, self.source, self.destination, self.src_codes, self.dst_codes
+        )
+
+
+def node_id_encoding_of(g: Plottable) -> Optional[NodeIdEncoding]:
+    """
+    Return g's cached node id encoding if it is still aligned with g's tables and bindings, else None
+    """
+    enc = getattr(g, '_node_id_encoding', None)
+    if enc is None:
+        return None
+    if not enc.matches(g):
+        logger.debug('Ignoring stale node id encoding: tables or bindings changed since encode_node_ids()')
+        return None
+    return enc
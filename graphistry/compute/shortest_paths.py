@@ -0,0 +1,104 @@
+from typing import Optional, Tuple
+import numpy as np
+
+from graphistry.util import setup_logger
+from .csr import csr_arrays, gather_ranges
+
+
+logger = setup_logger(__name__)
+
+
+def bidirectional_shortest_paths(
+    tails: np.ndarray,
+    heads: np.ndarray,
+    n: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    max_hops: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, Optional[int]]:
+    """
+    Arcs and nodes on any shortest path of length >= 1 from sources to targets, via bidirectional BFS
+
+    Arcs are directed (tails[i] -> heads[i]) over node codes 0..n-1. Each round expands whichever
+    frontier is smaller by one level, and records the shortest path found across the arcs leaving
+    (or entering) that frontier. After ks forward and kt backward rounds, every path of length
+    <= ks + kt has crossed such an arc, so search stops once the best length found is within that
+    bound, the hop budget is spent, or either side is exhausted. Shortest paths are then recovered
+    by walking BFS levels out from the arcs where the two searches met.
+
+    :returns: (bool mask over arcs, per-code depth from the source side or -1 when off-path, path length or None)
+    """
+    out_indptr, out_perm = csr_arrays(tails, n)
+    in_indptr, in_perm = csr_arrays(heads, n)
+
+    dist_s = np.full(n, -1, dtype=np.int64)
+    dist_t = np.full(n, -1, dtype=np.int64)
+    frontier_s = np.unique(sources)
+    frontier_t = np.unique(targets)
+    dist_s[frontier_s] = 0
+    dist_t[frontier_t] = 0
+    k_s = 0
+    k_t = 0
+    best: Optional[int] = None
+
+    while True:
+        if best is not None and best <= k_s + k_t:
+            break
+        if max_hops is not None and k_s + k_t >= max_hops:
+            break
+        if len(frontier_s) == 0 or len(frontier_t) == 0:
+            break
+        if len(frontier_s) <= len(frontier_t):
+            reached = heads[gather_ranges(out_indptr, out_perm, frontier_s)]
+            met = dist_t[reached]
+            met = met[met >= 0]
+            if len(met) > 0:
+                best = min(best if best is not None else np.iinfo(np.int64).max, k_s + 1 + int(met.min()))
+            frontier_s = np.unique(reached[dist_s[reached] < 0])
+            k_s += 1
+            dist_s[frontier_s] = k_s
+        else:
+            reached = tails[gather_ranges(in_indptr, in_perm, frontier_t)]
+            met = dist_s[reached]
+            met = met[met >= 0]
+            if len(met) > 0:
+                best = min(best if best is not None else np.iinfo(np.int64).max, k_t + 1 + int(met.min()))
+            frontier_t = np.unique(reached[dist_t[reached] < 0])
+            k_t += 1
+            dist_t[frontier_t] = k_t
+    logger.debug('bidirectional search: forward levels %s, backward levels %s, shortest %s', k_s, k_t, best)
+
+    on_arc = np.zeros(len(tails), dtype=bool)
+    depth = np.full(n, -1, dtype=np.int64)
+    if best is None or (max_hops is not None and best > max_hops):
+        return on_arc, depth, None
+
+    # Meeting arcs: both endpoints settled, and the path through them is shortest
+    settled_s = np.flatnonzero(dist_s >= 0)
+    arcs = gather_ranges(out_indptr, out_perm, settled_s)
+    arcs = arcs[(dist_t[heads[arcs]] >= 0) & (dist_s[tails[arcs]] + 1 + dist_t[heads[arcs]] == best)]
+    on_arc[arcs] = True
+    on_s = np.zeros(n, dtype=bool)
+    on_t = np.zeros(n, dtype=bool)
+    on_s[tails[arcs]] = True
+    on_t[heads[arcs]] = True
+
+    # Extend toward sources one BFS level at a time, then toward targets
+    for level in range(int(dist_s[on_s].max()), 0, -1):
+        layer = np.flatnonzero(on_s & (dist_s == level))
+        arcs = gather_ranges(in_indptr, in_perm, layer)
+        arcs = arcs[dist_s[tails[arcs]] == level - 1]
+        on_arc[arcs] = True
+        on_s[tails[arcs]] = True
+    for level in range(int(dist_t[on_t].max()), 0, -1):
+        layer = np.flatnonzero(on_t & (dist_t == level))
+        arcs = gather_ranges(out_indptr, out_perm, layer)
+        arcs = arcs[dist_t[heads[arcs]] == level - 1]
+        on_arc[arcs] = True
+        on_t[heads[arcs]] = True
+
+    # On a shortest path, the node at position i has dist_s == i and dist_t == best - i,
+    # except a node that is both a source and a target, which takes its source-side 0
+    depth[on_t] = best - dist_t[on_t]
+    depth[on_s] = dist_s[on_s]
+    return on_arc, depth, best
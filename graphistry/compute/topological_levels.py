@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+from graphistry.Engine import df_to_pdf, resolve_engine
+from graphistry.Plottable import Plottable
+from graphistry.util import setup_logger
+from .csr import csr_arrays, gather_ranges
+
+
+logger = setup_logger(__name__)
+
+
+def levels_from_codes(
+    node_codes: np.ndarray,
+    src_codes: np.ndarray,
+    dst_codes: np.ndarray,
+    n: int,
+    allow_cycles: bool = True,
+    warn_cycles: bool = True
+) -> np.ndarray:
+    """
+    Kahn-style level peeling over integer codes in O(V + E)
+
+    In-degrees are computed once and each level's removals decrement the
+    counts of only their neighbors, found through forward/reverse CSR arrays.
+    When no node has in-degree 0, the cycle is broken by picking the remaining
+    node with the highest remaining total degree, earliest code first.
+
+    Only codes in node_codes get levels; other codes (edge endpoints missing from
+    the nodes table) are never removed. Returns levels per code, -1 when unassigned.
+    """
+    indeg = np.bincount(dst_codes, minlength=n)
+    outdeg = np.bincount(src_codes, minlength=n)
+    fwd_indptr, fwd_perm = csr_arrays(src_codes, n)
+    rev_indptr, rev_perm = csr_arrays(dst_codes, n)
+
+    remaining = np.zeros(n, dtype=bool)
+    remaining[node_codes] = True
+    n_remaining = int(remaining.sum())
+
+    levels = np.full(n, -1, dtype=np.int64)
+    frontier = np.flatnonzero(remaining & (indeg == 0))
+    level = 0
+    while n_remaining > 0:
+        if len(frontier) == 0:
+            if not allow_cycles:
+                raise ValueError(
+                    "Cyclic graph in get_topological_levels(); remove cycles or set allow_cycles=True"
+                )
+            # tie break by picking biggest node
+            frontier = np.array([np.argmax(np.where(remaining, indeg + outdeg, -1))])
+            if warn_cycles:
+                logger.warning("Cycle on computing level %s", level)
+
+        levels[frontier] = level
+        remaining[frontier] = False
+        n_remaining -= len(frontier)
+
+        # Drop edges touching the frontier: only their other endpoints' counts change
+        out_dsts, out_counts = np.unique(dst_codes[gather_ranges(fwd_indptr, fwd_perm, frontier)], return_counts=True)
+        indeg[out_dsts] -= out_counts
+        in_srcs, in_counts = np.unique(src_codes[gather_ranges(rev_indptr, rev_perm, frontier)], return_counts=True)
+        outdeg[in_srcs] -= in_counts
+
+        frontier = out_dsts[(indeg[out_dsts] == 0) & remaining[out_dsts]]
+        level += 1
+
+    return levels
+
+
+def get_topological_levels(
+    self: Plottable,
+    level_col: str = "level",
+    allow_cycles: bool = True,
+    warn_cycles: bool = True,
+    remove_self_loops: bool = True,
+) -> Plottable:
+    """
+    See ComputeMixin.get_topological_levels
+    """
+
+    g2_base = self.materialize_nodes()
+
+    if (g2_base._nodes is None) or (len(g2_base._nodes) == 0):
+        return g2_base
+    assert g2_base._node is not None and g2_base._source is not None and g2_base._destination is not None
+
+    # Work over host-side integer codes of just the id columns, for both pandas and cudf
+    engine = resolve_engine('auto', g2_base)
+    node_ids = df_to_pdf(g2_base._nodes[[g2_base._node]], engine)[g2_base._node]
+    endpoints = df_to_pdf(g2_base._edges[[g2_base._source, g2_base._destination]], engine)
+    n_nodes = len(node_ids)
+    n_edges = len(endpoints)
+    codes, uniques = pd.factorize(pd.concat(
+        [node_ids, endpoints[g2_base._source], endpoints[g2_base._destination]],
+        ignore_index=True
+    ))
+    n = len(uniques)
+    node_codes = codes[:n_nodes]
+    src_codes = codes[n_nodes:n_nodes + n_edges]
+    dst_codes = codes[n_nodes + n_edges:]
+
+    # Edges with a null endpoint never count; duplicate and optionally self edges count once / not at all
+    keep = (src_codes >= 0) & (dst_codes >= 0)
+    if remove_self_loops:
+        keep &= src_codes != dst_codes
+    src_codes = src_codes[keep].astype(np.int64)
+    dst_codes = dst_codes[keep].astype(np.int64)
+    _, first = np.unique(src_codes * n + dst_codes, return_index=True)
+    src_codes, dst_codes = src_codes[first], dst_codes[first]
+
+    levels = levels_from_codes(
+        node_codes[node_codes >= 0], src_codes, dst_codes, n,
+        allow_cycles=allow_cycles, warn_cycles=warn_cycles
+    )
+    # null node ids have no counted edges, so are roots
+    node_levels = np.where(node_codes >= 0, levels[node_codes], 0)
+
+    nodes_df = g2_base._nodes.assign(**{level_col: node_levels})
+    if self._nodes is None:
+        # materialized nodes come back ordered by level
+        return self.nodes(nodes_df.take(np.argsort(node_levels, kind='stable')))
+    else:
+        return self.nodes(nodes_df)
@@ -16,6 +16,7 @@ IMPLICIT_NODE_ID = (
 )
 # for text search db column
 DISTANCE = '_distance'
+QUERY = '_query'
 # Scalers
 SCALERS = ['quantile', 'standard', 'kbins', 'robust', 'minmax']
 
@@ -55,6 +56,16 @@ SKLEARN = "sklearn"
 # #############################################################
 # Caching and other internals
 CACHE_COERCION_SIZE = 100
+# Byte budget of each memoization cache (not shared: there are 4 caches), see graphistry.utils.memo_cache
+MEMO_CACHE_MAX_BYTES = 512 * 1024 ** 2
+# hash_pdf(): default strategy, and minimum rows before hashing columns across threads
+HASH_PDF_STRATEGY = 'fast'
+HASH_PDF_PARALLEL_MIN_ROWS = 100000
+# infer_graph(): max batch x fitted distance pairs sampled to estimate eps='auto', and faiss query batch rows
+INFER_GRAPH_EPS_SAMPLE_PAIRS = 1000000
+INFER_GRAPH_QUERY_BATCH_SIZE = 10000
+# predict_links(), predict_links_all(): candidate triplets scored per block
+EMBED_SCORE_BLOCK_SIZE = 1000000
 
 # #############################################################
 # Annoy defaults
@@ -1,9 +1,10 @@
 # classes for converting a dataframe or Graphistry Plottable into a DGL
-from collections import Counter
-from typing import Dict, Optional, TYPE_CHECKING, Tuple
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, TYPE_CHECKING, Tuple
 
 import numpy as np
 import pandas as pd
+import weakref
 
 from graphistry.utils.lazy_import import (
     lazy_dgl_import,
@@ -95,6 +96,118 @@ def get_available_devices():
     return device, gpu_ids
 
 
+class EntityToIndex(Mapping):
+    """Read-only entity -> dense node index mapping, backed by the array of entities in index order
+
+    Behaves like a dict for lookups, and maps whole arrays of entities at once via get_indexer()
+    """
+
+    def __init__(self, entities: np.ndarray):
+        self.entities = entities
+        self.__index: Optional[pd.Index] = None
+
+    def _index(self) -> pd.Index:
+        # hash table built on first lookup, as DGL conversion only needs the entities array
+        if self.__index is None:
+            self.__index = pd.Index(self.entities)
+        return self.__index
+
+    def __getitem__(self, entity: Any) -> int:
+        loc = self._index().get_loc(entity)
+        # entities are unique, so a hit is one position, not a slice or mask
+        if not isinstance(loc, (int, np.integer)):
+            raise KeyError(entity)
+        return int(loc)
+
+    def __contains__(self, entity: Any) -> bool:
+        return entity in self._index()
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.entities)
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def __repr__(self) -> str:
+        return f"EntityToIndex({len(self)} entities)"
+
+    def get_indexer(self, entities: Any) -> np.ndarray:
+        """Index of each entity, -1 when not present"""
+        return self._index().get_indexer(entities)
+
+    def inverse(self) -> "IndexToEntity":
+        return IndexToEntity(self.entities)
+
+
+class IndexToEntity(Mapping):
+    """Read-only dense node index -> entity mapping, backed by the array of entities in index order"""
+
+    def __init__(self, entities: np.ndarray):
+        self.entities = entities
+
+    def __getitem__(self, i: int) -> Any:
+        if not 0 <= i < len(self.entities):
+            raise KeyError(i)
+        return self.entities[i]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self.entities)))
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def __repr__(self) -> str:
+        return f"IndexToEntity({len(self)} entities)"
+
+
+def reindex_edges(srclist: pd.Series, dstlist: pd.Series) -> Tuple[np.ndarray, np.ndarray, EntityToIndex]:
+    """Relabel src and dst entities as contiguous integers, most common entities first, ties by first appearance
+
+    :returns
+        src and dst index arrays, and the entity to index mapping
+    """
+    codes, uniques = pd.factorize(pd.concat([srclist, dstlist], axis=0, ignore_index=True), use_na_sentinel=False)
+    counts = np.bincount(codes, minlength=len(uniques))
+    # a stable sort keeps first appearance order among equal counts, as in Counter.most_common()
+    order = np.argsort(-counts, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    ranked = rank[codes]
+    return ranked[:len(srclist)], ranked[len(srclist):], EntityToIndex(np.asarray(uniques)[order])
+
+
+# build_gnn() relabelings by id of the edges frame they came from, dropped when that frame is collected
+_EDGE_REINDEX_CACHE: Dict[int, Tuple[Any, ...]] = {}
+
+
+def reindex_edges_cached(
+    edges_in: pd.DataFrame, nodes_in: Optional[pd.DataFrame], node: Optional[str],
+    edges: pd.DataFrame, src: str, dst: str
+) -> Tuple[np.ndarray, np.ndarray, EntityToIndex]:
+    """reindex_edges() of edges, reused while they derive from the same edges_in and nodes_in frames and bindings
+
+    edges are edges_in pruned to nodes_in, so repeat build_gnn() calls on one graph share a relabeling
+    even though each prunes to a new frame
+    """
+    key = id(edges_in)
+    cached = _EDGE_REINDEX_CACHE.get(key)
+    if (
+        cached is not None
+        and cached[0]() is edges_in  # noqa: W503
+        and (cached[1] is None if nodes_in is None else cached[1] is not None and cached[1]() is nodes_in)  # noqa: W503
+        and cached[2:5] == (node, src, dst)  # noqa: W503
+    ):
+        logger.debug("--Reusing node relabeling of edges")
+        return cached[5]
+    reindexed = reindex_edges(edges[src], edges[dst])
+    if cached is None:
+        weakref.finalize(edges_in, _EDGE_REINDEX_CACHE.pop, key, None)
+    _EDGE_REINDEX_CACHE[key] = (
+        weakref.ref(edges_in), None if nodes_in is None else weakref.ref(nodes_in), node, src, dst, reindexed
+    )
+    return reindexed
+
+
 def reindex_edgelist(df, src, dst):
     """Since DGL needs integer contiguous node labels, this relabels as pre-processing step
 
@@ -107,20 +220,15 @@ def reindex_edgelist(df, src, dst):
 
     :returns
         df, pandas DataFrame with new edges.
-        ordered_nodes_dict, dict ordered from most common src and dst nodes.
+        ordered_nodes_dict, mapping ordered from most common src and dst nodes, see EntityToIndex.
     """
-    srclist = df[src]
-    dstlist = df[dst]
-    cnt = Counter(
-        pd.concat([srclist, dstlist], axis=0)
-    )  # can also use pd.Factorize but doesn't order by count, which is satisfying
-    ordered_nodes_dict = {k: i for i, (k, c) in enumerate(cnt.most_common())}
-    df[config.SRC] = df[src].apply(lambda x: ordered_nodes_dict[x])
-    df[config.DST] = df[dst].apply(lambda x: ordered_nodes_dict[x])
+    src_index, dst_index, ordered_nodes_dict = reindex_edges(df[src], df[dst])
+    df[config.SRC] = src_index
+    df[config.DST] = dst_index
     return df, ordered_nodes_dict
 
 
-def pandas_to_sparse_adjacency(df, src, dst, weight_col):
+def pandas_to_sparse_adjacency(df, src, dst, weight_col, reindexed=None):
     """
         Takes a Pandas Dataframe and named src and dst columns into a sparse adjacency matrix in COO format
         Needed for DGL utils
@@ -128,21 +236,24 @@ def pandas_to_sparse_adjacency(df, src, dst, weight_col):
     :param src: source column
     :param dst: destination column
     :param weight_col: optional weight column
-    :return: COO sparse matrix, dictionary of src, dst nodes to index
+    :param reindexed: optional result of reindex_edges(df[src], df[dst]) to reuse
+    :return: COO sparse matrix, mapping of src, dst nodes to index
     """
     # use scipy sparse to encode matrix
     from scipy.sparse import coo_matrix
     
-    # have to reindex to align edge list with range(n_nodes) with new SRC and DST columns
-    df, ordered_nodes_dict = reindex_edgelist(df, src, dst)
+    # have to reindex to align edge list with range(n_nodes)
+    if reindexed is None:
+        reindexed = reindex_edges(df[src], df[dst])
+    src_index, dst_index, ordered_nodes_dict = reindexed
     
-    eweight = np.array([1] * len(df))
+    eweight = np.ones(len(df), dtype=np.int64)
     if weight_col is not None:
         eweight = df[weight_col].values
     
     shape = len(ordered_nodes_dict)
     sp_mat = coo_matrix(
-        (eweight, (df[config.SRC], df[config.DST])), shape=(shape, shape)
+        (eweight, (src_index, dst_index)), shape=(shape, shape)
     )
     return sp_mat, ordered_nodes_dict
 
@@ -150,8 +261,9 @@ def pandas_to_sparse_adjacency(df, src, dst, weight_col):
 # ##############################################################################
 
 def pandas_to_dgl_graph(
-    df: pd.DataFrame, src: str, dst: str, weight_col: Optional[str] = None, device: str = "cpu"
-) -> Tuple["dgl.DGLGraph", "scipy.sparse.coo_matrix", Dict]:
+    df: pd.DataFrame, src: str, dst: str, weight_col: Optional[str] = None, device: str = "cpu",
+    reindexed: Optional[Tuple[np.ndarray, np.ndarray, EntityToIndex]] = None
+) -> Tuple["dgl.DGLGraph", "scipy.sparse.coo_matrix", EntityToIndex]:
     """Turns an edge DataFrame with named src and dst nodes, to DGL graph
     :eg
         g, sp_mat, ordered_nodes_dict = pandas_to_sparse_adjacency(df, 'to_node', 'from_node')
@@ -160,13 +272,14 @@ def pandas_to_dgl_graph(
     :param dst: destination column of DataFrame for coo matrix
     :param weight_col: optional weight column when constructing coo matrix
     :param device: whether to put dgl graph on cpu or gpu
+    :param reindexed: optional result of reindex_edges(df[src], df[dst]) to reuse
     :return
         g: dgl graph
         sp_mat: sparse scipy matrix
-        ordered_nodes_dict: dict ordered from most common src and dst nodes
+        ordered_nodes_dict: mapping ordered from most common src and dst nodes
     """
     _, _, dgl = lazy_dgl_import()  # noqa: F811
-    sp_mat, ordered_nodes_dict = pandas_to_sparse_adjacency(df, src, dst, weight_col)
+    sp_mat, ordered_nodes_dict = pandas_to_sparse_adjacency(df, src, dst, weight_col, reindexed)
     g = dgl.from_scipy(sp_mat, device=device)  # there are other ways too
     logger.info(f"Graph Type: {type(g)}") 
 
@@ -243,8 +356,8 @@ class DGLGraphMixin(MIXIN_BASE):
         # print(f'OG: length: {len(edf)}')
 
         assert (
-            sum(mask) > 2
-        ), f"mask slice is (practically) empty, will lead to bad graph, found {sum(mask)}"
+            mask.sum() > 2
+        ), f"mask slice is (practically) empty, will lead to bad graph, found {mask.sum()}"
         self._MASK = mask   # type: ignore
         self._edges = edf[mask]   # type: ignore
 
@@ -281,7 +394,7 @@ class DGLGraphMixin(MIXIN_BASE):
             )
         # now check that self._entity_to_index is in 1-1 to with self.ndf[node_column]
         # nodes = self._nodes[node_column]
-        res = nodes.isin(self._entity_to_index)
+        res = nodes.isin(self._entity_to_index.entities)
         if res.sum() != len(nodes):
             logger.warning(
                 "Some Edges connect to Nodes not explicitly mentioned in nodes DataFrame (ndf)"
@@ -304,6 +417,7 @@ class DGLGraphMixin(MIXIN_BASE):
         if res._node is None:
             res._node = config.IMPLICIT_NODE_ID
 
+        edges_in, nodes_in = res._edges, res._nodes
         if not res._removed_edges_previously:
             logger.info(
                 f"--Node in convert dataframe to dgl: {res._node}"
@@ -320,16 +434,20 @@ class DGLGraphMixin(MIXIN_BASE):
                 'destination column not set, try running g.bind(destination="my_col") or g.edges(df, destination="my_col")'
             )
 
+        # reuse the relabeling of earlier build_gnn() calls on the same edges and nodes
+        reindexed = reindex_edges_cached(edges_in, nodes_in, res._node, res._edges, res._source, res._destination)
+
         res._dgl_graph, res._adjacency, res._entity_to_index = pandas_to_dgl_graph(
             res._edges,
             res._source,
             res._destination,
             weight_col=weight_column,
             device=res.device,
+            reindexed=reindexed,
         )
         if res._entity_to_index is None:
             raise ValueError("entity_to_index is None, something went wrong")
-        res._index_to_entity = {k: v for v, k in res._entity_to_index.items()}
+        res._index_to_entity = res._entity_to_index.inverse()
         # this is a sanity check after _remove_edges_not_in_nodes
         res._check_nodes_lineup_with_edges()
         return res
@@ -1,11 +1,13 @@
 import logging
 import numpy as np
 import pandas as pd
-from typing import Optional, Union, Callable, List, TYPE_CHECKING, Any, Tuple
+from typing import Optional, Union, Callable, Dict, Iterator, List, TYPE_CHECKING, Any, Tuple
 
 from graphistry.utils.lazy_import import lazy_embed_import
+from . import constants as config
 from .PlotterBase import Plottable
 from .compute.ComputeMixin import ComputeMixin
+from .dgl_utils import EntityToIndex, IndexToEntity
 
 
 def check_cudf():
@@ -53,6 +55,61 @@ class EmbedDistScore:
         return -(h * r - t).norm(p=1, dim=1)  # type: ignore
 
 
+def iter_triplet_blocks(
+    src: np.ndarray, rel: np.ndarray, dst: np.ndarray, block_size: int = config.EMBED_SCORE_BLOCK_SIZE
+) -> Iterator[np.ndarray]:
+    """Candidate (src, rel, dst) id triplets of src x rel x dst, without self loops, in blocks of at most block_size rows"""
+    n_rel_dst = len(rel) * len(dst)
+    for start in range(0, len(src) * n_rel_dst, block_size):
+        i = np.arange(start, min(start + block_size, len(src) * n_rel_dst), dtype=np.int64)
+        block = np.stack([src[i // n_rel_dst], rel[(i // len(dst)) % len(rel)], dst[i % len(dst)]], axis=1)
+        yield block[block[:, 0] != block[:, 2]]
+
+
+def _in_sorted(values: np.ndarray, sorted_values: np.ndarray) -> np.ndarray:
+    if len(sorted_values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    i = np.minimum(np.searchsorted(sorted_values, values), len(sorted_values) - 1)
+    return sorted_values[i] == values
+
+
+def iter_unlinked_triplet_blocks(
+    triplets: np.ndarray, num_nodes: int, block_size: int = config.EMBED_SCORE_BLOCK_SIZE
+) -> Iterator[np.ndarray]:
+    """Candidate (a, r, x) id triplets with a < x, for each relation r that a has as head (tail) and
+    (a, r, x) (resp. (x, r, a)) not among the existing triplets, in blocks of about block_size rows
+    """
+    h, r, t = (triplets[:, i].astype(np.int64) for i in range(3))
+    num_rels = int(r.max()) + 1 if len(r) else 0
+
+    def key(a, rel, b):
+        return (a * num_rels + rel) * num_nodes + b
+
+    existing = np.unique(key(h, r, t))
+    head_pairs = np.unique(h * num_rels + r)
+    tail_pairs = np.unique(t * num_rels + r)
+    pairs = np.union1d(head_pairs, tail_pairs)
+    a_all = pairs // num_rels
+    counts = num_nodes - 1 - a_all
+    ends = np.cumsum(counts)
+    start = 0
+    while start < len(pairs):
+        # at least one (a, r) pair per block, and as many more as fit
+        stop = max(start + 1, int(np.searchsorted(ends, (ends[start - 1] if start else 0) + block_size, side='right')))
+        chunk = pairs[start:stop]
+        a_chunk, r_chunk = chunk // num_rels, chunk % num_rels
+        n = counts[start:stop]
+        a = np.repeat(a_chunk, n)
+        rel = np.repeat(r_chunk, n)
+        offsets = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+        x = a + 1 + offsets
+        is_head = np.repeat(_in_sorted(chunk, head_pairs), n)
+        is_tail = np.repeat(_in_sorted(chunk, tail_pairs), n)
+        keep = (is_head & ~_in_sorted(key(a, rel, x), existing)) | (is_tail & ~_in_sorted(key(x, rel, a), existing))
+        yield np.stack([a[keep], rel[keep], x[keep]], axis=1)
+        start = stop
+
+
 class HeterographEmbedModuleMixin(MIXIN_BASE):
     def __init__(self):
         super().__init__()
@@ -63,10 +120,10 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             "RotatE": EmbedDistScore.RotatE,
         }
 
-        self._node2id = {}
-        self._relation2id = {}
-        self._id2node = {}
-        self._id2relation = {}
+        self._node2id = EntityToIndex(np.array([]))
+        self._relation2id = EntityToIndex(np.array([]))
+        self._id2node = IndexToEntity(np.array([]))
+        self._id2relation = IndexToEntity(np.array([]))
         self._relation = None
         self._use_feat = False
         self._kg_embed_dim = None
@@ -100,23 +157,18 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             res = res.materialize_nodes()
             nodes = res._nodes[res._node]
         
-        edges = res._edges
-        edges = edges[edges[src].isin(nodes) & edges[dst].isin(nodes)]
-        relations = edges[relation].unique()
+        # type2id, as arrays of entities in id order
+        res._node2id = EntityToIndex(pd.unique(np.asarray(nodes)))
+        res._id2node = res._node2id.inverse()
 
-        # type2id
-        res._node2id = {n: idx for idx, n in enumerate(nodes)}
-        res._relation2id = {r: idx for idx, r in enumerate(relations)}
-
-        res._id2node = {idx: n for idx, n in enumerate(nodes)}
-        res._id2relation = {idx: r for idx, r in enumerate(relations)}
+        edges = res._edges
+        s, t = res._node2id.get_indexer(edges[src]), res._node2id.get_indexer(edges[dst])
+        in_nodes = (s >= 0) & (t >= 0)
+        r, relations = pd.factorize(edges[relation][in_nodes])
+        res._relation2id = EntityToIndex(np.asarray(relations))
+        res._id2relation = res._relation2id.inverse()
 
-        s, r, t = (
-            edges[src].map(res._node2id),
-            edges[relation].map(res._relation2id),
-            edges[dst].map(res._node2id),
-        )
-        triplets = torch.from_numpy(pd.concat([s, r, t], axis=1).to_numpy())
+        triplets = torch.from_numpy(np.stack([s[in_nodes], r, t[in_nodes]], axis=1).astype(np.int64))
 
         # split idx
         if res._train_idx is None or res._train_split != train_split:
@@ -155,12 +207,19 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
         return res
 
 
-    def _init_model(self, res, batch_size:int, sample_size:int, num_steps:int, device):
-        _, _, _, _, GraphDataLoader, HeteroEmbed, _, _ = lazy_embed_import()
-        g_iter = SubgraphIterator(res._kg_dgl, sample_size, num_steps)
+    def _init_model(self, res, batch_size:int, sample_size:int, num_steps:int, device, num_workers: int = 0, seed: Optional[int] = None):
+        _, torch, _, _, GraphDataLoader, HeteroEmbed, _, _ = lazy_embed_import()
+        # batches of batch_size subgraphs only ever train on their first, so only sample one per batch
+        g_iter = SubgraphIterator(res._kg_dgl, sample_size, -(-num_steps // batch_size), seed=seed)
         g_dataloader = GraphDataLoader(
-            g_iter, batch_size=batch_size, collate_fn=lambda x: x[0]
+            g_iter,
+            batch_size=1,
+            collate_fn=_first,
+            num_workers=num_workers,
+            **({'prefetch_factor': 4, 'persistent_workers': True} if num_workers > 0 else {})
         )
+        if seed is not None:
+            torch.manual_seed(seed)
 
         # init model
         model = HeteroEmbed(
@@ -174,10 +233,10 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
 
         return model, g_dataloader
 
-    def _train_embedding(self, res, epochs:int, batch_size:int, lr:float, sample_size:int, num_steps:int, device) -> Plottable:
+    def _train_embedding(self, res, epochs:int, batch_size:int, lr:float, sample_size:int, num_steps:int, device, num_workers: int = 0, seed: Optional[int] = None) -> Plottable:
         _, torch, nn, _, _, _, _, trange = lazy_embed_import()
         log('Training embedding')
-        model, g_dataloader = res._init_model(res, batch_size, sample_size, num_steps, device)
+        model, g_dataloader = res._init_model(res, batch_size, sample_size, num_steps, device, num_workers, seed)
         if hasattr(res, "_embed_model") and not res._build_new_embedding_model:
             model = res._embed_model
             log("--Reusing previous model")
@@ -241,6 +300,8 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
         inplace: Optional[bool] = False,
         device: Optional['str'] = "cpu",
         evaluate: bool = True,
+        num_workers: int = 0,
+        seed: Optional[int] = None,
         *args,
         **kwargs,
     ) -> Plottable:
@@ -281,6 +342,10 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             accelarator. Defaults to "cpu"
         evaluate : bool
             Whether to evaluate. Defaults to False.
+        num_workers : int
+            DataLoader worker processes sampling training subgraphs ahead of the model. Defaults to 0, in process
+        seed : Optional[int]
+            seed for subgraph sampling and model initialization, for reproducible runs. Defaults to None
 
         Returns
         -------
@@ -329,34 +394,43 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             res = res._preprocess_embedding_data(res, train_split=train_split)  # type: ignore
             res = res._build_graph(res)  # type: ignore
 
-        return res._train_embedding(res, epochs, batch_size, lr=lr, sample_size=sample_size, num_steps=num_steps, device=device)  # type: ignore
+        return res._train_embedding(res, epochs, batch_size, lr=lr, sample_size=sample_size, num_steps=num_steps, device=device, num_workers=num_workers, seed=seed)  # type: ignore
 
 
     def _score_triplets(self, triplets, threshold, anomalous, retain_old_edges, return_dataframe):
-        """Score triplets using the trained model."""
-        
-        log(f"{triplets.shape[0]} triplets for inference")
-        ############################################################
-        # the bees knees 
-        scores = self._score(triplets)
-        ############################################################
-        if len(triplets) > 1:
-            if anomalous:
-                predicted_links = triplets[scores < threshold]  # type: ignore
-                this_score = scores[scores < threshold]  # type: ignore
-            else:
-                predicted_links = triplets[scores > threshold]  # type: ignore
-                this_score = scores[scores > threshold]  # type: ignore
-        else:
-            predicted_links = triplets
-            this_score = scores
-            
-        predicted_links = pd.DataFrame(predicted_links, columns=[self._source, self._relation, self._destination])
-        predicted_links[self._source] = predicted_links[self._source].map(self._id2node)
-        predicted_links[self._relation] = predicted_links[self._relation].map(self._id2relation)
-        predicted_links[self._destination] = predicted_links[self._destination].map(self._id2node)
-
-        predicted_links['score'] = this_score.detach().numpy()
+        """Score triplets using the trained model.
+
+        triplets may be one array of id triplets, or an iterable of blocks of them scored one at a time,
+        keeping only those past the threshold. A lone triplet is kept whatever its score."""
+        if isinstance(triplets, np.ndarray):
+            triplets = [triplets]
+
+        n = 0
+        kept, kept_scores = [], []
+        for block in triplets:
+            if len(block) == 0:
+                continue
+            n += len(block)
+            ############################################################
+            # the bees knees 
+            scores = self._score(block).numpy()
+            ############################################################
+            mask = scores < threshold if anomalous else scores > threshold
+            kept.append(block[mask])
+            kept_scores.append(scores[mask])
+            if n == len(block) == 1:
+                lone_triplet, lone_score = block, scores
+        log(f"{n} triplets for inference")
+        if n == 1:
+            kept, kept_scores = [lone_triplet], [lone_score]
+
+        predicted = np.concatenate(kept) if kept else np.zeros((0, 3), dtype=np.int64)
+        predicted_links = pd.DataFrame({
+            self._source: self._id2node.entities[predicted[:, 0]],
+            self._relation: self._id2relation.entities[predicted[:, 1]],
+            self._destination: self._id2node.entities[predicted[:, 2]],
+        })
+        predicted_links['score'] = np.concatenate(kept_scores) if kept_scores else np.zeros(0, dtype=np.float32)
         predicted_links.sort_values(by='score', ascending=False, inplace=True)
         
         log(f"-- {predicted_links.shape[0]} triplets scored at threshold {threshold:.2f}")
@@ -385,7 +459,8 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
         threshold: Optional[float] = 0.5,
         anomalous: Optional[bool] = False,
         retain_old_edges: Optional[bool] = False,
-        return_dataframe: Optional[bool] = False
+        return_dataframe: Optional[bool] = False,
+        block_size: int = config.EMBED_SCORE_BLOCK_SIZE
     ) -> Plottable:  # type: ignore
         """predict_links over all the combinations of given source, relation, destinations.
 
@@ -405,6 +480,8 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             will return a dataframe instead of a graphistry instance. Defaults to False.
         anomalous : Optional[False]
             will return the edges < threshold or low confidence edges(anomaly).
+        block_size: int
+            candidate triplets generated and scored at a time. Defaults to 1M
 
         Returns
         -------
@@ -415,59 +492,25 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
         """
         logging.warning("currently `predict_links` is cpu only, gpu compatibility will be added in \
                 future releases") 
-        all_nodes = self._node2id.values()
-        all_relations = self._relation2id.values()
-
-        if source is None:
-            src = pd.Series(all_nodes)
-        else:
-            # this is temporary, will be removed after gpu feature utils
-            try:
-                if isinstance(source, cudf.DataFrame):
-                    source = source.to_pandas()  # type: ignore
-            except:
-                pass
-            src = pd.Series(source)
-            src = src.map(self._node2id)
-
-        if relation is None:
-            rel = pd.Series(all_relations)
-        else:
-            # this is temporary, will be removed after gpu feature utils
-            try:
-                if isinstance(relation, cudf.DataFrame):
-                    relation = relation.to_pandas()  # type: ignore
-            except:
-                pass
-            rel = pd.Series(relation)
-            rel = rel.map(self._relation2id)
-
-        if destination is None:
-            dst = pd.Series(all_nodes)
-        else:
+        def to_ids(values, id_map, name):
+            if values is None:
+                return np.arange(len(id_map))
             # this is temporary, will be removed after gpu feature utils
             try:
-                if isinstance(destination, cudf.DataFrame):
-                    destination = destination.to_pandas()  # type: ignore
+                if isinstance(values, cudf.DataFrame):
+                    values = values.to_pandas()  # type: ignore
             except:
                 pass
-            dst = pd.Series(destination)
-            dst = dst.map(self._node2id)
+            ids = id_map.get_indexer(pd.Series(values).unique())
+            if (ids < 0).any():
+                logger.warning(f"Dropping {(ids < 0).sum()} {name} not seen in training")
+            return ids[ids >= 0]
 
-        def fetch_triplets_for_inference(source, relation, destination):
-            source = pd.DataFrame(source.unique(), columns=['source'])
-            source['relation'] = [relation.unique()] * source.shape[0]
+        src = to_ids(source, self._node2id, 'sources')
+        rel = to_ids(relation, self._relation2id, 'relations')
+        dst = to_ids(destination, self._node2id, 'destinations')
 
-            source_with_relation = source.explode('relation')
-            source_with_relation['destination'] = [destination.unique()] * source_with_relation.shape[0]
-
-            triplets = source_with_relation.explode('destination')
-            triplets = triplets[triplets['source'] != triplets['destination']]
-
-            return triplets.drop_duplicates().reset_index(drop=True)
-
-        triplets = fetch_triplets_for_inference(src, rel, dst)
-        triplets = triplets.to_numpy().astype(np.int64)
+        triplets = iter_triplet_blocks(src, rel, dst, block_size)
         
         return self._score_triplets(triplets, threshold, anomalous, retain_old_edges, return_dataframe)
  
@@ -477,7 +520,8 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
         threshold: Optional[float] = 0.5,
         anomalous: Optional[bool] = False,
         retain_old_edges: Optional[bool] = False,
-        return_dataframe: Optional[bool] = False
+        return_dataframe: Optional[bool] = False,
+        block_size: int = config.EMBED_SCORE_BLOCK_SIZE
     ) -> Plottable:  # type: ignore
         """predict_links over entire graph given a threshold
 
@@ -491,6 +535,8 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             will include old edges in predicted graph. Defaults to False.
         return_dataframe: Optional[bool]
             will return a dataframe instead of a graphistry instance. Defaults to False.
+        block_size: int
+            candidate triplets generated and scored at a time. Defaults to 1M
 
         Returns
         -------
@@ -498,30 +544,7 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             graphistry graph instance containing all predicted/anomalous links or dataframe
 
         """
-        h_r = pd.DataFrame(self._triplets.numpy())  # type: ignore
-        t_r = h_r.copy()
-        t_r[[0,1,2]] = t_r[[2,1,0]]
-
-        all_nodes = set(self._node2id.values())
-
-        def fetch_triplets_for_inference(x_r):
-            existing_collapsed = pd.DataFrame(
-                x_r.groupby(by=[0, 1])[2].apply(set)
-            ).reset_index()
-
-            non_existing_collapsed = existing_collapsed[2].map(lambda x: set(all_nodes).difference(x))
-            triplets_for_inference = pd.concat(
-                [
-                    existing_collapsed[[0, 1]], 
-                    non_existing_collapsed
-                ], axis=1
-            ).explode(2)
-
-            return triplets_for_inference
-
-        triplets = pd.concat([fetch_triplets_for_inference(h_r), fetch_triplets_for_inference(t_r)], axis=0)
-        triplets = triplets[triplets[0] < triplets[2]]
-        triplets = triplets.drop_duplicates().to_numpy().astype(np.int64)
+        triplets = iter_unlinked_triplet_blocks(self._triplets.numpy(), len(self._node2id), block_size)  # type: ignore
 
         return self._score_triplets(triplets, threshold, anomalous, retain_old_edges, return_dataframe)
         
@@ -546,53 +569,93 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             log("WARNING: train_split must be < 1 for _eval()")
 
 
+def _first(batch):
+    return batch[0]
+
+
 class SubgraphIterator:
-    def __init__(self, g, sample_size:int = 3000, num_steps:int = 1000):
+    """Training subgraphs of sample_size edges each, plus as many corrupted negative edges
+
+    Steps draw edges without replacement from a stream of seeded per-epoch permutations of all edges, and
+    each DataLoader worker samples steps_per_block of the steps it is assigned at once. Step i of the n-th
+    pass over the iterator only depends on (seed, n * num_steps + i), so runs are reproducible whatever the
+    number of workers. With workers, use persistent workers so passes keep advancing.
+    """
+
+    def __init__(self, g, sample_size:int = 3000, num_steps:int = 1000, seed: Optional[int] = None, steps_per_block: int = 16):
+        _, _, _, dgl, _, _, _, _ = lazy_embed_import()
         self.num_steps = num_steps
         self.sample_size = sample_size
-        self.eids = np.arange(g.num_edges())
-        self.g = g
+        self.steps_per_block = steps_per_block
+        self.seed = int(np.random.randint(2 ** 31)) if seed is None else seed
+        src, dst = g.edges()
+        self.triplets = np.stack([src.numpy(), g.edata[dgl.ETYPE].numpy(), dst.numpy()], axis=1).astype(np.int64)
         self.num_nodes = g.num_nodes()
+        self._pass = 0
+        self._last_step = -1
+        self._sampled: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._permutations: Dict[int, np.ndarray] = {}
 
     def __len__(self) -> int:
         return self.num_steps
 
-    def __getitem__(self, i:int):
-        _, torch, nn, dgl, GraphDataLoader, _, F, _ = lazy_embed_import()
-        eids = torch.from_numpy(np.random.choice(self.eids, self.sample_size))
-
-        src, dst = self.g.find_edges(eids)
-        rel = self.g.edata[dgl.ETYPE][eids].numpy()
-
-        triplets = np.stack((src, rel, dst)).T
-        samples, labels = SubgraphIterator._sample_neg(
-            triplets,
-            self.num_nodes,
-        )
-
-        src, rel, dst = samples.T  # type: ignore
+    def _permutation(self, epoch: int) -> np.ndarray:
+        if epoch not in self._permutations:
+            # keep only the permutations still ahead
+            self._permutations = {e: p for e, p in self._permutations.items() if e > epoch - 2}
+            self._permutations[epoch] = np.random.default_rng([self.seed, epoch]).permutation(len(self.triplets))
+        return self._permutations[epoch]
+
+    def _edge_ids(self, step: int) -> np.ndarray:
+        num_edges = len(self.triplets)
+        start, stop = step * self.sample_size, (step + 1) * self.sample_size
+        first_epoch, last_epoch = start // num_edges, (stop - 1) // num_edges
+        perm = np.concatenate([self._permutation(e) for e in range(first_epoch, last_epoch + 1)])
+        return perm[start - first_epoch * num_edges:stop - first_epoch * num_edges]
+
+    def _sample_block(self, steps: np.ndarray) -> None:
+        # draw each step's randomness from its own seed, then corrupt the whole block at once
+        triplets = np.concatenate([self.triplets[self._edge_ids(step)] for step in steps])
+        rngs = [np.random.default_rng([self.seed, 2 ** 31 + step]) for step in steps]
+        h_o_t = np.concatenate([rng.integers(2, size=self.sample_size) for rng in rngs])
+        random_nodes = np.concatenate([rng.integers(self.num_nodes, size=self.sample_size) for rng in rngs])
+        neg_triplets = SubgraphIterator._corrupt(triplets, h_o_t, random_nodes)
+        for k, step in enumerate(steps):
+            rows = slice(k * self.sample_size, (k + 1) * self.sample_size)
+            samples = np.concatenate([triplets[rows], neg_triplets[rows]])
+            labels = np.zeros(len(samples), dtype=np.float32)
+            labels[:self.sample_size] = 1
+            self._sampled[step] = (samples, labels)
 
-        sub_g = dgl.graph((src, dst), num_nodes=self.num_nodes)
-        sub_g.edata[dgl.ETYPE] = rel
-        sub_g.edata["norm"] = dgl.norm_by_dst(sub_g).unsqueeze(-1)
-
-        return sub_g, samples, labels
+    def __getitem__(self, i:int):
+        _, torch, _, dgl, _, _, _, _ = lazy_embed_import()
+        if i < 0 or i >= self.num_steps:
+            raise IndexError(i)
+        if i <= self._last_step:
+            self._pass += 1
+            self._sampled.clear()
+        self._last_step = i
+        step = self._pass * self.num_steps + i
+        if step not in self._sampled:
+            # this worker's next steps, as DataLoader workers take turns
+            worker_info = torch.utils.data.get_worker_info()
+            stride = 1 if worker_info is None else worker_info.num_workers
+            stop = min((self._pass + 1) * self.num_steps, step + stride * self.steps_per_block)
+            self._sample_block(np.arange(step, stop, stride))
+        samples, labels = self._sampled.pop(step)
+
+        src, rel, dst = (np.ascontiguousarray(col) for col in samples.T)
+        sub_g = dgl.graph((torch.from_numpy(src), torch.from_numpy(dst)), num_nodes=self.num_nodes)
+        sub_g.edata[dgl.ETYPE] = torch.from_numpy(rel)
+        # as dgl.norm_by_dst(): 1 / in-degree of each edge's destination
+        norm = 1.0 / np.bincount(dst, minlength=self.num_nodes)[dst].astype(np.float32)
+        sub_g.edata["norm"] = torch.from_numpy(norm).unsqueeze(-1)
+
+        return sub_g, torch.from_numpy(samples), torch.from_numpy(labels)
 
     @staticmethod
-    def _sample_neg(triplets:np.ndarray, num_nodes:int) -> Tuple[TT, TT]:  # type: ignore
-        _, torch, _, _, _, _, _, _ = lazy_embed_import()
-        triplets = torch.tensor(triplets)
+    def _corrupt(triplets: np.ndarray, h_o_t: np.ndarray, random_nodes: np.ndarray) -> np.ndarray:
         h, r, t = triplets.T
-        h_o_t = torch.randint(high=2, size=h.size())
-
-        random_h = torch.randint(high=num_nodes, size=h.size())
-        random_t = torch.randint(high=num_nodes, size=h.size())
-
-        neg_h = torch.where(h_o_t == 0, random_h, h)
-        neg_t = torch.where(h_o_t == 1, random_t, t)
-        neg_triplets = torch.stack((neg_h, r, neg_t), dim=1)
-
-        all_triplets = torch.cat((triplets, neg_triplets), dim=0)
-        labels = torch.zeros((all_triplets.size()[0]))
-        labels[: triplets.shape[0]] = 1
-        return all_triplets, labels
+        neg_h = np.where(h_o_t == 0, random_nodes, h)
+        neg_t = np.where(h_o_t == 1, random_nodes, t)
+        return np.stack((neg_h, r, neg_t), axis=1)
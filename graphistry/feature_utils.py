@@ -8,6 +8,7 @@ import warnings
 from functools import partial
 
 from typing import (
+    Iterable,
     List,
     Union,
     Dict,
@@ -15,12 +16,15 @@ from typing import (
     Optional,
     Tuple,
     TYPE_CHECKING, 
+    cast,
 )  # noqa
 from typing_extensions import Literal  # Literal native to py3.8+
 
 from graphistry.compute.ComputeMixin import ComputeMixin
 from graphistry.config import config as graphistry_config
 from graphistry.features import ScalerType
+from graphistry.utils.embedding_cache import encode_sentences, get_sentence_transformer, sentence_transformer_name
+from graphistry.utils.feature_store import ChunkSource, FeatureStore, iter_chunks, sample_rows
 from graphistry.utils.lazy_import import (
     lazy_sentence_transformers_import,
     lazy_import_has_min_dependancy,
@@ -554,6 +558,7 @@ def get_preprocessing_pipeline(
     n_bins: int = 10,
     encode: str = "ordinal",
     strategy: str = "quantile",
+    sparse: bool = False,
 ) -> Pipeline:  # noqa
     """Helper function for imputing and scaling np.ndarray data using different scaling transformers.
 
@@ -571,6 +576,7 @@ def get_preprocessing_pipeline(
             `onehot`, `onehot-dense`, `ordinal`, default 'ordinal'
     :param strategy: strategy for KBinsDiscretizer, can be one of
             `uniform`, `quantile`, `kmeans`, default 'quantile'
+    :param sparse: whether inputs are scipy.sparse, so scalers skip centering, which would densify them
     :return: scaled array, imputer instances or None, scaler instance or None
     """
     from sklearn.preprocessing import (
@@ -615,9 +621,9 @@ def get_preprocessing_pipeline(
             n_quantiles=n_quantiles, output_distribution=output_distribution
         )
     elif use_scaler == "standard":
-        scaler = StandardScaler()
+        scaler = StandardScaler(with_mean=not sparse)
     elif use_scaler == "robust":
-        scaler = RobustScaler(quantile_range=quantile_range)
+        scaler = RobustScaler(quantile_range=quantile_range, with_centering=not sparse)
     elif use_scaler == "kbins":
         scaler = KBinsDiscretizer(
             n_bins=n_bins, encode=encode, strategy=strategy
@@ -644,12 +650,20 @@ def fit_pipeline(
     """
     columns = X.columns
     index = X.index
+    sparse = is_sparse_df(X)
 
-    X = transformer.fit_transform(X)
+    X_t: Any = transformer.fit_transform(features_matrix(X))
     if keep_n_decimals:
-        X = np.round(X, decimals=keep_n_decimals)  #  type: ignore  # noqa
+        if sparse and hasattr(X_t, "tocsr"):
+            X_t.data = np.round(X_t.data, decimals=keep_n_decimals)
+        else:
+            X_t = np.round(X_t, decimals=keep_n_decimals)
+
+    return make_dataframe(X_t, columns, index, sparse)
 
-    return pd.DataFrame(X, columns=columns, index=index)
+
+# scalers whose outputs do not keep zeros zero, or that do not accept scipy.sparse inputs
+DENSE_ONLY_SCALERS = ["minmax", "quantile", "kbins"]
 
 
 def impute_and_scale_df(
@@ -665,9 +679,16 @@ def impute_and_scale_df(
     keep_n_decimals: int = 5,
 ) -> Tuple[pd.DataFrame, Pipeline]:
 
+    sparse = is_sparse_df(df)
+    if sparse and use_scaler in DENSE_ONLY_SCALERS:
+        logger.warning(f"-Scaler `{use_scaler}` requires dense input, densifying features of shape {df.shape}")
+        df = to_dense_df(df)
+        sparse = False
+
     transformer = get_preprocessing_pipeline(
         impute=impute,
         use_scaler=use_scaler,
+        sparse=sparse,
         n_quantiles=n_quantiles,
         quantile_range=quantile_range,
         output_distribution=output_distribution,
@@ -713,6 +734,19 @@ def _get_sentence_transformer_headers(emb, text_cols):
     return [f"{'_'.join(text_cols)}_{k}" for k in range(emb.shape[1])]
 
 
+def encode_sentences_with_config(model, texts, model_name: Optional[str]) -> Any:
+    """Sentence transformer encoding, with batch size and the on-disk embedding cache directory set via
+    graphistry.config keys 'encode_textual.batch_size' and 'encode_textual.embedding_cache'"""
+    batch_size = graphistry_config.get('encode_textual.batch_size')
+    return encode_sentences(
+        model,
+        texts,
+        model_name,
+        graphistry_config.get('encode_textual.embedding_cache'),
+        **({'batch_size': batch_size} if batch_size is not None else {})
+    )
+
+
 def encode_textual(
     df: pd.DataFrame,
     min_words: float = 2.5,
@@ -721,9 +755,8 @@ def encode_textual(
     ngram_range: tuple = (1, 3),
     max_df: float = 0.2,
     min_df: int = 3,
+    sparse: bool = False,
 ) -> Tuple[pd.DataFrame, List, Any]:
-    _, _, SentenceTransformer = lazy_sentence_transformers_import()
-
     t = time()
     text_cols = get_textual_columns(
         df, min_words=min_words
@@ -741,13 +774,12 @@ def encode_textual(
                 f"-Calculating Tfidf Vectorizer with"
                 f" {ngram_range}-ngrams for column(s) `{text_cols}`"
             )
-            embeddings = make_array(model.fit_transform(res))
+            embeddings = model.fit_transform(res)
             transformed_columns = list(model[0].vocabulary_.keys())
         else:
             model_name = os.path.split(model_name)[-1]
-            model = SentenceTransformer(f"{model_name}")
-            batch_size = graphistry_config.get('encode_textual.batch_size')
-            embeddings = model.encode(res.values, **({'batch_size': batch_size} if batch_size is not None else {}))
+            model = get_sentence_transformer(f"{model_name}")
+            embeddings = encode_sentences_with_config(model, res.values, model_name)
             transformed_columns = _get_sentence_transformer_headers(
                 embeddings, text_cols
             )
@@ -755,9 +787,7 @@ def encode_textual(
             f"Encoded Textual Data using {model} at "
             f"{len(df) / ((time() - t) / 60):.2f} rows per minute"
         )
-    res = pd.DataFrame(embeddings,
-                       columns=transformed_columns,
-                       index=df.index)
+    res = make_dataframe(embeddings, transformed_columns, df.index, sparse)
 
     return res, text_cols, model
 
@@ -824,6 +854,60 @@ def make_array(X):
     return X
 
 
+def is_sparse_df(df: Any) -> bool:
+    """Whether df is a pandas DataFrame with columns, all of them sparse, as produced by featurize(sparse=True)"""
+    return (
+        isinstance(df, pd.DataFrame)
+        and len(df.columns) > 0  # noqa: W503
+        and all(isinstance(dtype, pd.SparseDtype) for dtype in df.dtypes)  # noqa: W503
+    )
+
+
+def make_dataframe(X, columns, index, sparse: bool = False) -> pd.DataFrame:
+    """Wrap an encoder output with its column names, keeping scipy.sparse outputs sparse when sparse=True"""
+    if sparse:
+        import scipy.sparse
+        if scipy.sparse.issparse(X):
+            return cast(Any, pd.DataFrame).sparse.from_spmatrix(X, index=index, columns=columns)
+    return pd.DataFrame(make_array(X), columns=columns, index=index)
+
+
+def to_sparse_df(df: pd.DataFrame) -> pd.DataFrame:
+    if is_sparse_df(df):
+        return df
+    return df.astype(pd.SparseDtype("float64", 0.0))
+
+
+def to_dense_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Densify a sparse DataFrame, as for encoders and scalers that need dense input"""
+    return cast(Any, df).sparse.to_dense()
+
+
+def concat_features(dfs: List[pd.DataFrame]) -> pd.DataFrame:
+    """Column-wise concat of feature blocks; if any block is sparse, all are, so the result stays one sparse matrix"""
+    if any(is_sparse_df(df) for df in dfs):
+        dfs = [to_sparse_df(df) for df in dfs]
+    return pd.concat(dfs, axis=1)
+
+
+def features_matrix(X: Any) -> Any:
+    """Estimator input for a feature matrix: a scipy.sparse CSR matrix for sparse DataFrames, else X as is"""
+    if is_sparse_df(X):
+        return X.sparse.to_coo().tocsr()
+    return X
+
+
+def pipeline_transform(transformer, X: pd.DataFrame) -> pd.DataFrame:
+    """transformer.transform(X) as a DataFrame, staying sparse unless the fitted transformer needs dense input"""
+    if is_sparse_df(X):
+        try:
+            return make_dataframe(transformer.transform(features_matrix(X)), X.columns, X.index, sparse=True)
+        except (TypeError, ValueError):
+            logger.debug("Transformer requires dense input, densifying features", exc_info=True)
+            X = to_dense_df(X)
+    return pd.DataFrame(transformer.transform(X), columns=X.columns, index=X.index)
+
+
 def passthrough_df_cols(
     df, columns
 ):  # if lambdas, won't pickle in FunctionTransformer
@@ -865,6 +949,158 @@ def get_numeric_transformers(ndf, y=None):
     return ndf_, y_, data_encoder, label_encoder
 
 
+COLUMN_GROUPS = ["numeric", "datetime", "low_card_cat", "high_card_cat"]
+
+
+def _fit_transform_column(encoder, X: pd.DataFrame) -> Tuple[Any, Any, float]:
+    t = time()
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=DeprecationWarning)
+        warnings.filterwarnings("ignore", category=FutureWarning)
+        X_enc = encoder.fit_transform(X)
+    return encoder, X_enc, time() - t
+
+
+def _transform_column(encoder, X: pd.DataFrame) -> Any:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=DeprecationWarning)
+        warnings.filterwarnings("ignore", category=FutureWarning)
+        return encoder.transform(X)
+
+
+class ColumnwiseVectorizer:
+    """SuperVectorizer-style encoder that fits an independent encoder per categorical column, concurrently
+    in a process pool, and assembles their outputs in column order
+
+    Columns are grouped as numeric and datetime (passed through as numbers), low cardinality
+    categoricals (one-hot), and high cardinality categoricals (GapEncoder by default). Costly columns,
+    by cardinality, are scheduled first. Per column encoders, output widths, and fit times are in
+    `transformers_` and `timing_report()`.
+
+    Enable in featurize() via graphistry.config key 'encode_dirty.n_jobs', e.g., -1 for all cores
+    """
+
+    # below this many rows, transform() encodes columns inline, as pool startup would dominate
+    MIN_PARALLEL_TRANSFORM_ROWS = 10000
+
+    def __init__(
+        self,
+        cardinality_threshold: int = 40,
+        high_card_cat_transformer: Any = None,
+        low_card_cat_transformer: Any = None,
+        n_jobs: Optional[int] = -1,
+    ):
+        self.cardinality_threshold = cardinality_threshold
+        self.high_card_cat_transformer = high_card_cat_transformer
+        self.low_card_cat_transformer = low_card_cat_transformer
+        self.n_jobs = n_jobs
+
+    def _column_group(self, s: pd.Series) -> str:
+        if pd.api.types.is_bool_dtype(s) or pd.api.types.is_numeric_dtype(s):
+            return "numeric"
+        if pd.api.types.is_datetime64_any_dtype(s):
+            return "datetime"
+        if s.dtype == object and s.notna().any() and pd.to_numeric(s, errors="coerce").notna().sum() == s.notna().sum():
+            return "numeric"
+        return "low_card_cat" if s.nunique() < self.cardinality_threshold else "high_card_cat"
+
+    def _categories(self, df: pd.DataFrame, col) -> pd.DataFrame:
+        return df[[col]].astype(object).where(df[[col]].notna(), "").astype(str)
+
+    def _numbers(self, df: pd.DataFrame, col) -> np.ndarray:
+        s = df[col]
+        if self.groups_[col] == "datetime":
+            s = pd.to_datetime(s, errors="coerce")
+            return np.where(s.notna(), s.astype("int64") / 1e9, np.nan).reshape(-1, 1)
+        return pd.to_numeric(s, errors="coerce").astype(float).to_numpy().reshape(-1, 1)
+
+    def _encoder(self, group: str):
+        from sklearn.base import clone
+        if group == "low_card_cat":
+            if self.low_card_cat_transformer is None:
+                from sklearn.preprocessing import OneHotEncoder
+                return OneHotEncoder(handle_unknown="ignore")
+            return clone(self.low_card_cat_transformer)
+        if self.high_card_cat_transformer is None:
+            from dirty_cat import GapEncoder
+            return GapEncoder(config.N_TOPICS_DEFAULT)
+        return clone(self.high_card_cat_transformer)
+
+    def _schedule(self) -> List[Any]:
+        cat_cols = [c for c in self.columns_ if self.groups_[c] in ["low_card_cat", "high_card_cat"]]
+        # longest first, so one slow GapEncoder column does not start last and hold up the pool
+        return sorted(
+            cat_cols, key=lambda c: (self.groups_[c] != "high_card_cat", -self.cardinalities_[c])
+        )
+
+    def _parallel(self, tasks: List[Any], parallel: bool = True) -> List[Any]:
+        if not parallel or len(tasks) <= 1 or self.n_jobs in [None, 0, 1]:
+            return [f(*args) for f, args in tasks]
+        from joblib import Parallel, delayed
+        return Parallel(n_jobs=self.n_jobs, backend="loky")(delayed(f)(*args) for f, args in tasks)
+
+    def fit(self, X: pd.DataFrame, y=None) -> "ColumnwiseVectorizer":
+        self.fit_transform(X, y)
+        return self
+
+    def fit_transform(self, X: pd.DataFrame, y=None) -> Any:
+        t = time()
+        self.columns_ = list(X.columns)
+        self.groups_ = {col: self._column_group(X[col]) for col in self.columns_}
+        self.cardinalities_ = {col: X[col].nunique() for col in self.columns_}
+        order = self._schedule()
+        fitted = self._parallel([
+            (_fit_transform_column, (self._encoder(self.groups_[col]), self._categories(X, col))) for col in order
+        ])
+        blocks = {col: X_enc for col, (_, X_enc, _) in zip(order, fitted)}
+        self.encoders_ = {col: encoder for col, (encoder, _, _) in zip(order, fitted)}
+        self.fit_seconds_ = {col: seconds for col, (_, _, seconds) in zip(order, fitted)}
+        self.feature_names_ = {col: self._feature_names(col) for col in self.columns_}
+        self.transformers_ = [
+            (col, self.encoders_.get(col, "passthrough"), [col]) for col in self.columns_
+        ]
+        self.transformers = self.transformers_
+        self.wall_seconds_ = time() - t
+        return self._assemble(X, blocks)
+
+    def transform(self, X: pd.DataFrame) -> Any:
+        order = self._schedule()
+        transformed = self._parallel([
+            (_transform_column, (self.encoders_[col], self._categories(X, col))) for col in order
+        ], parallel=len(X) >= self.MIN_PARALLEL_TRANSFORM_ROWS)
+        return self._assemble(X, dict(zip(order, transformed)))
+
+    def _feature_names(self, col) -> List[str]:
+        if col not in self.encoders_:
+            return [str(col)]
+        try:
+            return [str(name) for name in self.encoders_[col].get_feature_names_out([str(col)])]
+        except (AttributeError, TypeError, ValueError):
+            n = len(self.encoders_[col].transform(pd.DataFrame({col: [""]})).T)
+            return [f"{col}_{i}" for i in range(n)]
+
+    def _assemble(self, X: pd.DataFrame, blocks: Dict[Any, Any]) -> Any:
+        import scipy.sparse
+        out = [blocks[col] if col in blocks else self._numbers(X, col) for col in self.columns_]
+        if any(scipy.sparse.issparse(block) for block in out):
+            return scipy.sparse.hstack([scipy.sparse.csr_matrix(block) for block in out]).tocsr()
+        return np.hstack([np.asarray(block, dtype=float) for block in out]) if out else np.zeros((len(X), 0))
+
+    def get_feature_names_out(self) -> List[str]:
+        return [name for col in self.columns_ for name in self.feature_names_[col]]
+
+    def timing_report(self) -> pd.DataFrame:
+        """Per column group, encoder, output width, and fit seconds, slowest first"""
+        return pd.DataFrame({
+            "column": self.columns_,
+            "group": [self.groups_[col] for col in self.columns_],
+            "cardinality": [self.cardinalities_[col] for col in self.columns_],
+            "encoder": [type(self.encoders_[col]).__name__ if col in self.encoders_ else "passthrough" for col in self.columns_],
+            "n_features": [len(self.feature_names_[col]) for col in self.columns_],
+            "fit_seconds": [self.fit_seconds_.get(col, 0.0) for col in self.columns_],
+        }).sort_values("fit_seconds", ascending=False, ignore_index=True)
+
+
 def process_dirty_dataframes(
     ndf: pd.DataFrame,
     y: Optional[pd.DataFrame],
@@ -876,6 +1112,7 @@ def process_dirty_dataframes(
     categories: Optional[str] = "auto",
     multilabel: bool = False,
     feature_engine: FeatureEngineConcrete = "pandas",
+    sparse: bool = False,
 ) -> Tuple[
     pd.DataFrame,
     Optional[pd.DataFrame],
@@ -896,6 +1133,7 @@ def process_dirty_dataframes(
     :param similarity: one of 'ngram', 'levenshtein-ratio', 'jaro',
             or'jaro-winkler'}) – The type of pairwise string similarity
             to use. If None or False, uses a SuperVectorizer
+    :param sparse: keep sparse encoder outputs, such as one-hot blocks, as sparse DataFrame columns
     :return: Encoded data matrix and target (if not None),
             the data encoder, and the label encoder.
     """
@@ -904,18 +1142,27 @@ def process_dirty_dataframes(
         from dirty_cat import SuperVectorizer, GapEncoder, SimilarityEncoder
     from sklearn.preprocessing import FunctionTransformer
     t = time()
+    # when set, fit per column encoders concurrently instead of one SuperVectorizer, see ColumnwiseVectorizer
+    n_jobs = graphistry_config.get('encode_dirty.n_jobs')
 
     all_numeric = is_dataframe_all_numeric(ndf)
     if not all_numeric and has_dirty_cat and (feature_engine in ["dirty_cat", "torch"]):
-        data_encoder = SuperVectorizer(
-            auto_cast=True,
-            cardinality_threshold=cardinality_threshold,
-            high_card_cat_transformer=GapEncoder(n_topics),
-            #  numerical_transformer=StandardScaler(), This breaks
-            #  since -- AttributeError: Transformer numeric
-            #  (type StandardScaler)
-            #  does not provide get_feature_names.
-        )
+        if n_jobs is not None:
+            data_encoder = ColumnwiseVectorizer(
+                cardinality_threshold=cardinality_threshold,
+                high_card_cat_transformer=GapEncoder(n_topics),
+                n_jobs=n_jobs,
+            )
+        else:
+            data_encoder = SuperVectorizer(
+                auto_cast=True,
+                cardinality_threshold=cardinality_threshold,
+                high_card_cat_transformer=GapEncoder(n_topics),
+                #  numerical_transformer=StandardScaler(), This breaks
+                #  since -- AttributeError: Transformer numeric
+                #  (type StandardScaler)
+                #  does not provide get_feature_names.
+            )
 
         logger.info(":: Encoding DataFrame might take a few minutes ------")
         
@@ -927,7 +1174,6 @@ def process_dirty_dataframes(
             nndf[object_columns] = nndf[object_columns].astype(str)
             X_enc = data_encoder.fit_transform(nndf, y)
             logger.info("obj columns: %s are being converted to str", object_columns)
-        X_enc = make_array(X_enc)
 
         import warnings
 
@@ -945,13 +1191,13 @@ def process_dirty_dataframes(
         logger.debug(
             f"--Fitting on Data took {(time() - t) / 60:.2f} minutes\n"
         )
+        if isinstance(data_encoder, ColumnwiseVectorizer):
+            logger.info(f"-Per column encoding times:\n{data_encoder.timing_report()}")
         #  now just set the feature names, since dirty cat changes them in
         #  a weird way...
-        data_encoder.get_feature_names_out = callThrough(features_transformed)
+        data_encoder.get_feature_names_out = callThrough(features_transformed)  # type: ignore
         
-        X_enc = pd.DataFrame(
-            X_enc, columns=features_transformed, index=ndf.index
-        )
+        X_enc = make_dataframe(X_enc, features_transformed, ndf.index, sparse)
         X_enc = X_enc.fillna(0.0)
     elif not all_numeric and (not has_dirty_cat or feature_engine in ["pandas", "none"]):
         numeric_ndf = ndf.select_dtypes(include=[np.number])  # type: ignore
@@ -973,15 +1219,25 @@ def process_dirty_dataframes(
         t2 = time()
         logger.debug("-Fitting Targets --\n%s", y.columns)
 
-        label_encoder = SuperVectorizer(
-            auto_cast=True,
-            cardinality_threshold=cardinality_threshold_target,
-            high_card_cat_transformer=GapEncoder(n_topics_target)
+        high_card_cat_transformer = (
+            GapEncoder(n_topics_target)
             if not similarity
             else SimilarityEncoder(
                 similarity=similarity, categories=categories, n_prototypes=2
-            ),  # Similarity
+            )  # Similarity
         )
+        if n_jobs is not None:
+            label_encoder = ColumnwiseVectorizer(
+                cardinality_threshold=cardinality_threshold_target,
+                high_card_cat_transformer=high_card_cat_transformer,
+                n_jobs=n_jobs,
+            )
+        else:
+            label_encoder = SuperVectorizer(
+                auto_cast=True,
+                cardinality_threshold=cardinality_threshold_target,
+                high_card_cat_transformer=high_card_cat_transformer,
+            )
 
         y_enc = label_encoder.fit_transform(y)
         y_enc = make_array(y_enc)
@@ -991,9 +1247,7 @@ def process_dirty_dataframes(
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore", category=DeprecationWarning)
             warnings.filterwarnings("ignore", category=FutureWarning)
-            if isinstance(label_encoder, SuperVectorizer) or isinstance(
-                label_encoder, FunctionTransformer
-            ):
+            if isinstance(label_encoder, (SuperVectorizer, FunctionTransformer, ColumnwiseVectorizer)):
                 labels_transformed = label_encoder.get_feature_names_out()
             else:  # Similarity Encoding uses categories_
                 labels_transformed = label_encoder.categories_
@@ -1054,7 +1308,8 @@ def process_nodes_dataframes(
     encode: str = "ordinal",
     strategy: str = "uniform",
     keep_n_decimals: int = 5,
-    feature_engine: FeatureEngineConcrete = "pandas"
+    feature_engine: FeatureEngineConcrete = "pandas",
+    sparse: bool = False,
     # test_size: Optional[bool] = None,
 ) -> Tuple[
     pd.DataFrame,
@@ -1149,6 +1404,7 @@ def process_nodes_dataframes(
             ngram_range=ngram_range,
             max_df=max_df,
             min_df=min_df,
+            sparse=sparse,
         )
     else:
         logger.debug(
@@ -1168,7 +1424,8 @@ def process_nodes_dataframes(
         similarity=similarity,
         categories=categories,
         multilabel=multilabel,
-        feature_engine=feature_engine
+        feature_engine=feature_engine,
+        sparse=sparse,
     )
 
     if embedding:
@@ -1178,9 +1435,7 @@ def process_nodes_dataframes(
     if not text_enc.empty and not X_enc.empty:
         logger.info("-" * 60)
         logger.info("<= Found both a textual embedding + dirty_cat =>")
-        X_enc = pd.concat(
-            [text_enc, X_enc], axis=1
-        )  # np.c_[embeddings, X_enc.values]
+        X_enc = concat_features([text_enc, X_enc])  # np.c_[embeddings, X_enc.values]
     elif not text_enc.empty and X_enc.empty:
         logger.info("-" * 60)
         logger.info("<= Found only textual embedding =>")
@@ -1272,7 +1527,7 @@ def encode_multi_target(ydf, mlb = None):
  
     return T, label_encoder
 
-def encode_edges(edf, src, dst, mlb, fit=False):
+def encode_edges(edf, src, dst, mlb, fit=False, sparse=False):
     """edge encoder -- creates multilabelBinarizer on edge pairs.
 
     Args:
@@ -1281,6 +1536,7 @@ def encode_edges(edf, src, dst, mlb, fit=False):
         dst (string): destination column
         mlb (sklearn): multilabelBinarizer
         fit (bool, optional): If true, fits multilabelBinarizer. Defaults to False.
+        sparse (bool, optional): If true, keeps the E x N pair encoding as sparse DataFrame columns. Defaults to False.
 
     :Returns: tuple: pd.DataFrame, multilabelBinarizer
     """
@@ -1289,6 +1545,7 @@ def encode_edges(edf, src, dst, mlb, fit=False):
     source = edf[src]
     destination = edf[dst]
     logger.debug("Encoding Edges using MultiLabelBinarizer")
+    mlb.sparse_output = sparse
     if fit:
         T = mlb.fit_transform(zip(source, destination))
     else:
@@ -1299,7 +1556,7 @@ def encode_edges(edf, src, dst, mlb, fit=False):
     ]  # stringify the column names or scikits.base throws error
     mlb.get_feature_names_out = callThrough(columns)
     mlb.columns_ = [src, dst]
-    T = pd.DataFrame(T, columns=columns, index=edf.index)
+    T = make_dataframe(T, columns, edf.index, sparse)
     logger.info(f"Shape of Edge Encoding: {T.shape}")
     return T, mlb
 
@@ -1333,6 +1590,7 @@ def process_edge_dataframes(
     strategy: str = "uniform",
     keep_n_decimals: int = 5,
     feature_engine: FeatureEngineConcrete = "pandas",
+    sparse: bool = False,
 ) -> Tuple[
     pd.DataFrame,
     pd.DataFrame,
@@ -1373,7 +1631,7 @@ def process_edge_dataframes(
     )  # create new one so we can use encode_edges later in
     # transform with fit=False
     T, mlb_pairwise_edge_encoder = encode_edges(
-        edf, src, dst, mlb_pairwise_edge_encoder, fit=True
+        edf, src, dst, mlb_pairwise_edge_encoder, fit=True, sparse=sparse
     )
     other_df = edf.drop(columns=[src, dst])
     logger.debug(
@@ -1393,7 +1651,7 @@ def process_edge_dataframes(
             other_df, y
         )
         # add the two datasets together
-        X_enc = pd.concat([T, X_enc], axis=1)
+        X_enc = concat_features([T, X_enc])
         # then scale them
         X_encs, y_encs, scaling_pipeline, scaling_pipeline_target = smart_scaler(
             X_enc,
@@ -1455,12 +1713,13 @@ def process_edge_dataframes(
         similarity=similarity,
         categories=categories,
         feature_engine=feature_engine,
+        sparse=sparse,
     )
 
     if not X_enc.empty and not T.empty:
         logger.debug("-" * 60)
         logger.debug("<= Found Edges and Dirty_cat encoding =>")
-        X_enc = pd.concat([T, X_enc], axis=1)
+        X_enc = concat_features([T, X_enc])
     elif not T.empty and X_enc.empty:
         logger.debug("-" * 60)
         logger.debug("<= Found only Edges =>")
@@ -1512,6 +1771,7 @@ def transform_text(
     df: pd.DataFrame,
     text_model: Union[SentenceTransformer, Pipeline],  # type: ignore
     text_cols: Union[List, str],
+    sparse: bool = False,
 ) -> pd.DataFrame:
     from sklearn.pipeline import Pipeline
     _, _, SentenceTransformer = lazy_sentence_transformers_import()
@@ -1520,15 +1780,10 @@ def transform_text(
     if isinstance(text_model, Pipeline):
         logger.debug(f"--Ngram tfidf {text_model}")
         tX = text_model.transform(df)
-        tX = make_array(tX)
-        tX = pd.DataFrame(
-            tX,
-            columns=list(text_model[0].vocabulary_.keys()),
-            index=df.index
-            )
+        tX = make_dataframe(tX, list(text_model[0].vocabulary_.keys()), df.index, sparse)
     elif isinstance(text_model, SentenceTransformer):
         logger.debug(f"--HuggingFace Transformer {text_model}")
-        tX = text_model.encode(df.values)
+        tX = encode_sentences_with_config(text_model, df.values, sentence_transformer_name(text_model))
         tX = pd.DataFrame(
             tX,
             columns=_get_sentence_transformer_headers(tX, text_cols),
@@ -1547,6 +1802,7 @@ def transform_dirty(
     df: pd.DataFrame,
     data_encoder: Union[SuperVectorizer, FunctionTransformer],  # type: ignore
     name: str = "",
+    sparse: bool = False,
 ) -> pd.DataFrame:
     # from sklearn.preprocessing import MultiLabelBinarizer
     logger.debug(f"-{name} Encoder:")
@@ -1572,21 +1828,18 @@ def transform_dirty(
     # X = data_encoder.transform(df)
 
     logger.debug(f"TRANSFORM DIRTY as Matrix -- \t{X.shape}")
-    X = make_array(X)
     with warnings.catch_warnings():
         warnings.filterwarnings("ignore", category=DeprecationWarning)
         warnings.filterwarnings("ignore", category=FutureWarning)
         warnings.filterwarnings("ignore", category=UserWarning)
-        X = pd.DataFrame(
-            X, columns=data_encoder.get_feature_names_out(), index=df.index
-        )
+        X = make_dataframe(X, data_encoder.get_feature_names_out(), df.index, sparse)
         logger.debug(f"TRANSFORM DIRTY dataframe -- \t{X.shape}")
 
     return X
 
 
 def transform(
-    df: pd.DataFrame, ydf: pd.DataFrame, res: List, kind: str, src, dst
+    df: pd.DataFrame, ydf: pd.DataFrame, res: List, kind: str, src, dst, sparse: bool = False
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     # here res is the featurization result,
     # this function aligns with what is computed during
@@ -1613,16 +1866,17 @@ def transform(
     if kind == "nodes":
         logger.info("-Transforming Nodes--")
         X = transform_dirty(
-            df, data_encoder, name="Numeric or Dirty Node-Features"
+            df, data_encoder, name="Numeric or Dirty Node-Features", sparse=sparse
         )
     # encode edges
     elif kind == "edges":
         logger.info("-Transforming Edges--")
         mlb, data_encoder = data_encoder
-        T, mlb = encode_edges(df, src, dst, mlb, fit=False)
+        T, mlb = encode_edges(df, src, dst, mlb, fit=False, sparse=sparse)
         X = transform_dirty(df,
                             data_encoder,
-                            "Numeric or Dirty Edge-Features")
+                            "Numeric or Dirty Edge-Features",
+                            sparse=sparse)
 
     if ydf is not None:
         logger.info("-Transforming Target--")
@@ -1635,12 +1889,12 @@ def transform(
         logger.info(f"-textual columns found: {text_cols}")
         res_df = concat_text(df, text_cols)
         if text_model:
-            tX = transform_text(res_df, text_model, text_cols)
+            tX = transform_text(res_df, text_model, text_cols, sparse=sparse)
         logger.info("** text features are empty") if tX.empty else None
 
     # concat text to dirty_cat, with text in front.
     if not tX.empty and not X.empty:
-        X = pd.concat([tX, X], axis=1)
+        X = concat_features([tX, X])
         logger.info("--Combining both Textual and Numeric/Dirty_Cat")
     elif not tX.empty and X.empty:
         X = tX  # textual
@@ -1655,7 +1909,7 @@ def transform(
 
     # now if edges, add T at front
     if kind == "edges":
-        X = pd.concat([T, X], axis=1)  # edges, text, dirty_cat
+        X = concat_features([T, X])  # edges, text, dirty_cat
         logger.info("-Combining MultiLabelBinarizer with previous features")
 
     logger.info("-" * 40)
@@ -1674,6 +1928,27 @@ def transform(
     return X, y
 
 
+def partial_fit_scaling_pipeline(encoder: "FastEncoder", chunks: Iterable[Tuple[pd.DataFrame, Optional[pd.DataFrame]]]) -> bool:
+    """Refit the encoder's feature scaler with partial_fit over raw (unscaled) chunk features, keeping its imputer fit.
+    Returns False, leaving the pipeline as is, when the scaler has no partial_fit"""
+    from sklearn.base import clone
+
+    pipeline = encoder.scaling_pipeline
+    if pipeline is None:
+        return False
+    imputer, scaler = pipeline.named_steps["imputer"], pipeline.named_steps["scaler"]
+    if not hasattr(scaler, "partial_fit"):
+        logger.info(f"-Scaler {scaler} has no partial_fit, keeping its fit on the sample")
+        return False
+    scaler = clone(scaler)
+    for X_chunk, y_chunk in chunks:
+        X, _ = encoder.transform(X_chunk, y_chunk)
+        X = features_matrix(X)
+        scaler.partial_fit(X if imputer is identity else imputer.transform(X))
+    pipeline.steps[-1] = ("scaler", scaler)
+    return True
+
+
 class FastEncoder:
     def __init__(self, df, y=None, kind="nodes"):
         self._df = df
@@ -1752,6 +2027,7 @@ class FastEncoder:
     def fit(self, src=None, dst=None, *args, **kwargs):
         self.src = src
         self.dst = dst
+        self.sparse = kwargs.get("sparse", False)
         res = self._encode(
             self._df, self._y, self.kind, src, dst, *args, **kwargs
         )
@@ -1759,16 +2035,16 @@ class FastEncoder:
 
     def transform(self, df, ydf=None):
         "Raw transform, no scaling."
-        X, y = transform(df, ydf, self.res, self.kind, self.src, self.dst)
+        X, y = transform(df, ydf, self.res, self.kind, self.src, self.dst, self.sparse)
         return X, y
     
     def _transform_scaled(self, df, ydf, scaling_pipeline, scaling_pipeline_target):
         """Transform with scaling fit durning fit."""
-        X, y = transform(df, ydf, self.res, self.kind, self.src, self.dst)
+        X, y = transform(df, ydf, self.res, self.kind, self.src, self.dst, self.sparse)
         if scaling_pipeline is not None and not X.empty:
-            X = pd.DataFrame(scaling_pipeline.transform(X), columns=X.columns, index=X.index)
+            X = pipeline_transform(scaling_pipeline, X)
         if scaling_pipeline_target is not None and y is not None and not y.empty:
-            y = pd.DataFrame(scaling_pipeline_target.transform(y), columns=y.columns, index=y.index)
+            y = pipeline_transform(scaling_pipeline_target, y)
         return X, y
     
     def transform_scaled(self, df, ydf=None, scaling_pipeline=None, scaling_pipeline_target=None):
@@ -1926,6 +2202,7 @@ class FeatureMixin(MIXIN_BASE):
         keep_n_decimals: int = 5,
         remove_node_column: bool = True,
         feature_engine: FeatureEngineConcrete = "pandas",
+        sparse: bool = False,
         memoize: bool = True,
         verbose: bool = False,
     ):
@@ -1987,6 +2264,7 @@ class FeatureMixin(MIXIN_BASE):
             keep_n_decimals=keep_n_decimals,
             remove_node_column=remove_node_column,
             feature_engine=feature_engine,
+            sparse=sparse,
         )
 
         res._feature_params = {
@@ -2057,6 +2335,7 @@ class FeatureMixin(MIXIN_BASE):
         strategy: str = "uniform",
         keep_n_decimals: int = 5,
         feature_engine: FeatureEngineConcrete = "pandas",
+        sparse: bool = False,
         memoize: bool = True,
         verbose: bool = False,
     ):
@@ -2105,6 +2384,7 @@ class FeatureMixin(MIXIN_BASE):
             strategy=strategy,
             keep_n_decimals=keep_n_decimals,
             feature_engine=feature_engine,
+            sparse=sparse,
         )
 
         res._feature_params = {
@@ -2381,6 +2661,7 @@ class FeatureMixin(MIXIN_BASE):
         remove_node_column: bool = True,
         inplace: bool = False,
         feature_engine: FeatureEngine = "auto",
+        sparse: bool = False,
         dbscan: bool = False,
         min_dist: float = 0.5,  # DBSCAN eps
         min_samples: int = 1,  # DBSCAN min_samples
@@ -2485,6 +2766,9 @@ class FeatureMixin(MIXIN_BASE):
                 not, default False.
         :param memoize: whether to store and reuse results across runs,
                 default True.
+        :param sparse: whether to keep sparse encodings, such as edge pairs, ngrams, and one-hot
+                categories, as sparse DataFrame columns instead of densifying them, default False.
+                Scalers skip centering to stay sparse, and `minmax`, `quantile`, and `kbins` densify.
         :return: graphistry instance with new attributes set by the featurization process.
         """
         assert_imported()
@@ -2530,6 +2814,7 @@ class FeatureMixin(MIXIN_BASE):
                 keep_n_decimals=keep_n_decimals,
                 remove_node_column=remove_node_column,
                 feature_engine=feature_engine,
+                sparse=sparse,
                 memoize=memoize,
                 verbose=verbose
             )
@@ -2561,6 +2846,7 @@ class FeatureMixin(MIXIN_BASE):
                 strategy=strategy,
                 keep_n_decimals=keep_n_decimals,
                 feature_engine=feature_engine,
+                sparse=sparse,
                 memoize=memoize,
                 verbose=verbose
             )
@@ -2576,6 +2862,129 @@ class FeatureMixin(MIXIN_BASE):
         if not inplace:
             return res
 
+    def featurize_chunked(
+        self,
+        kind: str = "nodes",
+        source: Optional[ChunkSource] = None,
+        chunk_size: int = 100000,
+        fit_sample: int = 100000,
+        partial_fit: bool = False,
+        store: Optional[str] = None,
+        load: bool = True,
+        **featurize_kwargs,
+    ):
+        r"""Featurize nodes or edges too large to encode at once: fit encoders on a sample, then transform chunk by chunk.
+
+            **Example**
+            ::
+
+                # 200GB of nodes as Parquet, features written to a Parquet feature store
+                g = graphistry.bind(node='id')
+                g2 = g.featurize_chunked(source='nodes/', store='node_features/', X=['title', 'body'])
+
+                # consume the stored features without refeaturizing
+                g3 = g2.umap(reuse_if_existing=True)
+
+                # or stream them
+                from graphistry.utils.feature_store import FeatureStore
+                for X in FeatureStore('node_features/').iter_features():
+                    ...
+
+        :param kind: `nodes` or `edges`
+        :param source: rows to featurize: a DataFrame, a Parquet file or directory path, or a function returning
+                an iterable of DataFrames. Defaults to the current nodes or edges.
+        :param chunk_size: rows per transform chunk, default 100000
+        :param fit_sample: rows sampled to fit encoders and scalers, default 100000.
+                Sampled uniformly from DataFrames and Parquet, and the first rows of function sources.
+        :param partial_fit: if True and the fitted feature scaler supports `partial_fit`,
+                such as `standard` and `minmax`, refit it over all chunks in an extra pass.
+                Other scalers, imputers, and encoders keep their fit on the sample.
+        :param store: optional directory to write features to as Parquet parts, one per chunk,
+                instead of concatenating them in memory
+        :param load: whether to set the full features on the result, read memory mapped when stored, default True.
+                If False, the result keeps the features of the fit sample, and the full features are in `store`.
+        :param featurize_kwargs: encoding options, see help(g.featurize)
+        :return: graphistry instance with a fitted encoder and features of all rows.
+                For Parquet and function sources, its nodes (edges) become the node id (source and
+                destination) columns of the source, in the same order as the features. Without a node
+                binding, nodes are the source frame, or for Parquet and function sources, a new
+                `_n_implicit` id column numbering the rows.
+        """
+        assert_imported()
+        if kind not in ["nodes", "edges"]:
+            raise ValueError(f"kind must be one of `nodes` or `edges`, got {kind}")
+        in_memory = source is None
+        if source is None:
+            source = self._nodes if kind == "nodes" else self._edges
+            if source is None:
+                raise ValueError(f"No {kind} to featurize, set them or pass a `source`")
+
+        t = time()
+        sample = sample_rows(source, fit_sample, chunk_size)
+        g_sample = self.nodes(sample) if kind == "nodes" else self.edges(sample)
+        res = g_sample.featurize(kind=kind, **featurize_kwargs)  # type: ignore
+        encoder = res._node_encoder if kind == "nodes" else res._edge_encoder
+        logger.info(f"-Fit {kind} encoders on {len(sample)} sampled rows in {time() - t:.2f}s")
+
+        x_cols = list(encoder.feature_names_in)
+        y_cols = list(encoder.target_names_in)
+
+        def chunks():
+            for chunk in iter_chunks(source, chunk_size):
+                yield chunk[x_cols], (chunk[y_cols] if len(y_cols) else None)
+
+        if partial_fit:
+            partial_fit_scaling_pipeline(encoder, chunks())
+
+        feature_store = None
+        if store is not None:
+            feature_store = FeatureStore(store)
+            feature_store.clear()
+        Xs, ys = [], []
+        n = 0
+        for X_chunk, y_chunk in chunks():
+            X, y = encoder.transform_scaled(X_chunk, y_chunk)
+            if feature_store is not None:
+                feature_store.append(X, y)
+            elif load:
+                Xs.append(X)
+                ys.append(y)
+            n += len(X)
+            logger.debug(f"-Transformed {n} {kind}")
+        logger.info(f"-Featurized {n} {kind} in {time() - t:.2f}s, {n / (time() - t):.2f} rows per second")
+
+        if not load:
+            return res
+
+        if feature_store is not None:
+            X_all, y_all = feature_store.features(), feature_store.target()
+        else:
+            X_all = pd.concat(Xs, axis=0) if len(Xs) else pd.DataFrame([])
+            y_all = pd.concat(ys, axis=0) if len(y_cols) and len(ys) else None
+
+        if in_memory:
+            res = self.bind()
+        elif kind == "nodes" and res._node is None:
+            # nodes must line up with the features: reuse in-memory rows, else number the streamed ones
+            if isinstance(source, pd.DataFrame):
+                res = res.nodes(source)
+            else:
+                res = res.nodes(pd.DataFrame({config.NODE: np.arange(n)}), config.NODE)
+        else:
+            ids = [res._node] if kind == "nodes" else [res._source, res._destination]
+            ids = [c for c in ids if c is not None]
+            id_df = pd.concat(list(iter_chunks(source, chunk_size, columns=ids)), axis=0)
+            res = res.nodes(id_df) if kind == "nodes" else res.edges(id_df)
+        if kind == "nodes":
+            res._node_features = X_all
+            res._node_target = y_all
+            res._node_encoder = encoder
+        else:
+            res._edge_features = X_all
+            res._edge_target = y_all
+            res._edge_encoder = encoder
+        return res
+
     def featurize_or_get_nodes_dataframe_if_X_is_None(
         self,
         X: XSymbolic = None,
@@ -2608,6 +3017,7 @@ class FeatureMixin(MIXIN_BASE):
         keep_n_decimals: int = 5,
         remove_node_column: bool = True,
         feature_engine: FeatureEngineConcrete = "pandas",
+        sparse: bool = False,
         reuse_if_existing=False,
         memoize: bool = True,
         verbose: bool = False,
@@ -2657,6 +3067,7 @@ class FeatureMixin(MIXIN_BASE):
             keep_n_decimals=keep_n_decimals,
             remove_node_column=remove_node_column,
             feature_engine=feature_engine,
+            sparse=sparse,
             memoize=memoize,
             verbose=verbose,
         )
@@ -2692,6 +3103,7 @@ class FeatureMixin(MIXIN_BASE):
             keep_n_decimals=keep_n_decimals,
             remove_node_column=remove_node_column,
             feature_engine=feature_engine,
+            sparse=sparse,
             reuse_if_existing=True,
             memoize=memoize,
         )  # now we are guaranteed to have node feature and target matrices.
@@ -2726,6 +3138,7 @@ class FeatureMixin(MIXIN_BASE):
         strategy: str = "uniform",
         keep_n_decimals: int = 5,
         feature_engine: FeatureEngineConcrete = "pandas",
+        sparse: bool = False,
         reuse_if_existing=False,
         memoize: bool = True,
         verbose: bool = False,
@@ -2777,6 +3190,7 @@ class FeatureMixin(MIXIN_BASE):
             strategy=strategy,
             keep_n_decimals=keep_n_decimals,
             feature_engine=feature_engine,
+            sparse=sparse,
             memoize=memoize,
             verbose=verbose,
         )
@@ -3,6 +3,7 @@
 from .circle import circle_layout
 from .fa2 import fa2_layout
 from .gib import group_in_a_box_layout
+from .incremental import incremental_layout
 from .modularity_weighted import modularity_weighted_layout
 from .ring import time_ring, ring_categorical, ring_continuous
 from .sugiyama import SugiyamaLayout
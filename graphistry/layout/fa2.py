@@ -1,8 +1,12 @@
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import inspect, warnings
+import numpy as np
+import pandas as pd
 
 from graphistry.Engine import Engine, EngineAbstract, df_concat, df_cons, resolve_engine
 from graphistry.Plottable import Plottable
 from graphistry.layout.circle import circle_layout
+from graphistry.layout.force_atlas2 import force_atlas2
 from graphistry.util import setup_logger
 
 
@@ -16,12 +20,29 @@ GRAPHISTRY_FA2_PARAMS: Dict[str, Any] = {
     'scaling_ratio': 1
 }
 
-GRAPHISTRY_FR_PARAMS: Dict[str, Any] = {
-    #'max_iter': 1000,
-    #'outbound_attraction_distribution': False,
-    #'scaling_ratio': 1
+# CPU engine, with Gephi's coarser Barnes-Hut theta for speed
+GRAPHISTRY_FA2_CPU_PARAMS: Dict[str, Any] = {
+    **GRAPHISTRY_FA2_PARAMS,
+    'barnes_hut_theta': 1.2
 }
 
+# Keys of force_atlas2() that fa2_params may set on CPU
+FA2_CPU_PARAM_KEYS = [
+    k for k in inspect.signature(force_atlas2).parameters
+    if k not in ['src', 'dst', 'n', 'weights', 'pos']
+]
+
+
+def fa2_cpu_params(fa2_params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    fa2_params that :meth:`graphistry.layout.force_atlas2.force_atlas2` accepts, warning about and dropping others,
+    such as igraph `fr` keys (`niter`) from before the CPU engine ran ForceAtlas2
+    """
+    unknown = [k for k in fa2_params if k not in FA2_CPU_PARAM_KEYS]
+    if len(unknown) > 0:
+        warnings.warn(f'fa2_layout: ignoring fa2_params not supported on CPU: {unknown}, expected some of: {FA2_CPU_PARAM_KEYS}')
+    return {k: v for k, v in fa2_params.items() if k not in unknown}
+
 
 def compute_bounding_boxes(self: Plottable, partition_key: str, engine: Engine) -> Any:
     """
@@ -65,6 +86,35 @@ def compute_bounding_boxes(self: Plottable, partition_key: str, engine: Engine)
     return bounding_boxes
 
 
+def fa2_cpu_layout(g: Plottable, fa2_params: Dict[str, Any], pos: Optional[Any] = None) -> Plottable:
+    """
+    ForceAtlas2 on pandas via :meth:`graphistry.layout.force_atlas2.force_atlas2`, writing x, y to the nodes
+
+    :param pos: Optional starting positions, one (x, y) row per node row, with nulls placed at random
+    """
+    n_nodes, n_edges = len(g._nodes), len(g._edges)
+    codes, uniques = pd.factorize(pd.concat(
+        [g._nodes[g._node], g._edges[g._source], g._edges[g._destination]],
+        ignore_index=True
+    ))
+    node_codes = codes[:n_nodes]
+
+    start = None
+    if pos is not None:
+        start = np.full((len(uniques), 2), np.nan)
+        start[node_codes] = pd.DataFrame(pos).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+    weights = None
+    if g._edge_weight is not None and g._edge_weight in g._edges:
+        weights = pd.to_numeric(g._edges[g._edge_weight], errors='coerce').fillna(1.).to_numpy()
+
+    out = force_atlas2(
+        codes[n_nodes:n_nodes + n_edges], codes[n_nodes + n_edges:], len(uniques),
+        weights=weights, pos=start, **fa2_cpu_params(fa2_params)
+    )
+    return g.nodes(g._nodes.assign(x=out[node_codes, 0], y=out[node_codes, 1]))
+
+
 def fa2_layout(
     g: Plottable, 
     fa2_params: Optional[Dict[str, Any]] = None,
@@ -78,9 +128,11 @@ def fa2_layout(
 
     Allows optional parameterization of the circle layout, e.g., sort keys
 
+    On CPU, runs :meth:`graphistry.layout.force_atlas2.force_atlas2` and warm starts from existing x/y node columns
+
     :param g: The graph object with nodes and edges, in a format compatible with Graphistry's Plottable object.
     :type g: graphistry.Plottable.Plottable
-    :param fa2_params: Optional parameters for customizing the Force-Atlas 2 (FA2) layout, passed through to `fa2_layout`.
+    :param fa2_params: Optional parameters for customizing the Force-Atlas 2 (FA2) layout, passed through to cugraph's `force_atlas2` on GPU and :meth:`graphistry.layout.force_atlas2.force_atlas2` on CPU, which also takes `seed`, `n_threads`, and `use_numba`. Keys the CPU engine does not take, such as igraph `fr` keys, are ignored with a warning.
     :type fa2_params: Optional[Dict[str, Any]]
     :param circle_layout_params: Optional parameters for customizing the circle layout, passed through to `general_circle_layout`. Can include:
         - `by`: Column name(s) for sorting nodes (default: 'degree').
@@ -108,6 +160,10 @@ def fa2_layout(
 
     g = g.materialize_nodes()
 
+    warm_start = None
+    if engine_concrete == Engine.PANDAS and 'x' in g._nodes and 'y' in g._nodes:
+        warm_start = g._nodes[['x', 'y']]
+
     drop: List[str] = []
     if 'x' in g._nodes:
         drop.append('x')
@@ -121,10 +177,11 @@ def fa2_layout(
 
     # 2. Identify remaining edgeless nodes (0-degree nodes after removing self-loops)
     nodes_with_edges = concat([edges_without_self_loops[g._source], edges_without_self_loops[g._destination]]).unique()
-    edgeless_nodes = g._nodes[~g._nodes[g._node].isin(nodes_with_edges)]
+    connected_mask = g._nodes[g._node].isin(nodes_with_edges)
+    edgeless_nodes = g._nodes[~connected_mask]
 
     # 3. Nodes with edges (after removing self-loops)
-    connected_nodes = g._nodes[g._nodes[g._node].isin(nodes_with_edges)]
+    connected_nodes = g._nodes[connected_mask]
 
     # 4. Create subgraphs for edgeless and connected nodes
     empty_edges_df = g._edges[:0]
@@ -136,11 +193,10 @@ def fa2_layout(
         #g_connected = g_connected.edges(g_connected._edges.reset_index(drop=True))
 
         if engine_concrete == Engine.PANDAS:
-            logger.warning("Pandas engine detected. FA2 falling back to igraph fr")
-            g_connected_layout = g_connected.layout_igraph(
-                'fr',
-                directed=False,
-                params=fa2_params if fa2_params is not None else GRAPHISTRY_FR_PARAMS
+            g_connected_layout = fa2_cpu_layout(
+                g_connected,
+                fa2_params if fa2_params is not None else GRAPHISTRY_FA2_CPU_PARAMS,
+                pos=None if warm_start is None else warm_start[connected_mask.to_numpy()]
             )
         elif engine_concrete == Engine.CUDF:
             g_connected_layout = g_connected.layout_cugraph(
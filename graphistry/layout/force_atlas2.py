@@ -0,0 +1,494 @@
+from typing import Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from graphistry.util import setup_logger
+logger = setup_logger(__name__)
+
+
+# Nodes per batch of Barnes-Hut traversal, bounding the (node, cell) frontier held in memory
+CHUNK_SIZE = 4096
+
+# Below this many nodes, exact all-pairs repulsion is cheaper than building a quadtree
+EXACT_MAX_NODES = 256
+
+
+class _QuadTree(object):
+    """
+    Quadtree over point positions as one array per level, from Morton codes
+
+    Level l has cells codes[l] (sorted), with total mass[l] and center of mass cx[l], cy[l];
+    point i is in cell node_cell[l][i], and cells at level l have side size / 2 ** l.
+    Cell c at level l has children child_start[l][c]:child_start[l][c + 1] at level l + 1,
+    and leaf c holds points leaf_nodes[leaf_start[c]:leaf_start[c + 1]].
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, mass: np.ndarray) -> None:
+        self.x, self.y, self.point_mass = x, y, mass
+        self.x0, self.y0 = x.min(), y.min()
+        self.size = max(x.max() - self.x0, y.max() - self.y0) * (1 + 1e-9) or 1.0
+        self.depth = depth = int(min(16, np.ceil(np.log2(len(x)) / 2) + 3))
+        morton = self.morton(x, y)
+
+        self.codes: List[np.ndarray] = []
+        self.node_cell: List[np.ndarray] = []
+        self.mass: List[np.ndarray] = []
+        self.cx: List[np.ndarray] = []
+        self.cy: List[np.ndarray] = []
+        for level in range(depth + 1):
+            codes, node_cell = np.unique(morton >> (2 * (depth - level)), return_inverse=True)
+            cell_mass = np.bincount(node_cell, weights=mass, minlength=len(codes))
+            self.codes.append(codes)
+            self.node_cell.append(node_cell)
+            self.mass.append(cell_mass)
+            self.cx.append(np.bincount(node_cell, weights=mass * x, minlength=len(codes)) / cell_mass)
+            self.cy.append(np.bincount(node_cell, weights=mass * y, minlength=len(codes)) / cell_mass)
+
+        # children of a cell are contiguous in the sorted codes of the next level
+        self.child_start = [
+            np.searchsorted(self.codes[level + 1] >> 2, np.append(self.codes[level], self.codes[level][-1] + 1))
+            for level in range(depth)
+        ]
+        self.leaf_nodes = np.argsort(self.node_cell[depth], kind='stable')
+        self.leaf_start = np.searchsorted(self.node_cell[depth][self.leaf_nodes], np.arange(len(self.codes[depth]) + 1))
+
+    def morton(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Leaf-level Morton code of points, clipped to the tree's bounds
+        """
+        cells = 1 << self.depth
+        gx = np.clip(((x - self.x0) / self.size * cells).astype(np.int64), 0, cells - 1)
+        gy = np.clip(((y - self.y0) / self.size * cells).astype(np.int64), 0, cells - 1)
+        morton = np.zeros(len(x), dtype=np.int64)
+        for bit in range(self.depth):
+            morton |= ((gx >> bit) & 1) << (2 * bit) | ((gy >> bit) & 1) << (2 * bit + 1)
+        return morton
+
+    def children(self, level: int, cells: np.ndarray, owners: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Children at level + 1 of cells at level, with the owner of each repeated per child
+        """
+        first = self.child_start[level][cells]
+        counts = self.child_start[level][cells + 1] - first
+        return np.repeat(owners, counts), _ranges(first, counts)
+
+
+def _leaf_forces_py(
+    owner: np.ndarray, cell: np.ndarray, leaf_start: np.ndarray, leaf_nodes: np.ndarray,
+    x: np.ndarray, y: np.ndarray, mass: np.ndarray, tx: np.ndarray, ty: np.ndarray, tmass: np.ndarray,
+    kr: float, fx: np.ndarray, fy: np.ndarray
+) -> None:
+    """
+    Add repulsion on points owner[k] from the points of leaf cell[k], skipping coincident points; numba kernel source
+    """
+    for k in range(len(owner)):
+        i = owner[k]
+        c = cell[k]
+        for p in range(leaf_start[c], leaf_start[c + 1]):
+            j = leaf_nodes[p]
+            dx = x[i] - tx[j]
+            dy = y[i] - ty[j]
+            dist2 = dx * dx + dy * dy
+            if dist2 > 0:
+                factor = kr * mass[i] * tmass[j] / dist2
+                fx[i] += factor * dx
+                fy[i] += factor * dy
+
+
+def _exact_forces_py(
+    src_x: np.ndarray, src_y: np.ndarray, src_mass: np.ndarray, x: np.ndarray, y: np.ndarray, mass: np.ndarray, kr: float
+) -> np.ndarray:
+    """
+    All-pairs repulsion on points x, y from src points without (n, m) temporaries; numba kernel source
+    """
+    out = np.zeros((len(x), 2))
+    for i in range(len(x)):
+        fx = 0.
+        fy = 0.
+        for j in range(len(src_x)):
+            dx = x[i] - src_x[j]
+            dy = y[i] - src_y[j]
+            dist2 = dx * dx + dy * dy
+            if dist2 > 0:
+                factor = kr * mass[i] * src_mass[j] / dist2
+                fx += factor * dx
+                fy += factor * dy
+        out[i, 0] = fx
+        out[i, 1] = fy
+    return out
+
+
+class _Kernels(object):
+    """
+    numba-compiled pair loops for leaf and exact repulsion, releasing the GIL so n_threads chunks run in parallel
+    """
+
+    def __init__(self, numba: Any) -> None:
+        jit = numba.njit(nogil=True, cache=False)
+        self.leaf_forces = jit(_leaf_forces_py)
+        self.exact_forces = jit(_exact_forces_py)
+
+
+_kernels: Optional[_Kernels] = None
+_kernels_tried = False
+
+
+def _numba_kernels(use_numba: Optional[bool]) -> Optional[_Kernels]:
+    """
+    Compiled kernels when use_numba is True, or None (default) and numba is installed, else None for pure NumPy
+
+    Compiled once per process, on first use
+    """
+    global _kernels, _kernels_tried
+    if use_numba is False:
+        return None
+    if not _kernels_tried:
+        _kernels_tried = True
+        try:
+            import numba  # type: ignore
+            _kernels = _Kernels(numba)
+        except ModuleNotFoundError:
+            logger.debug('force_atlas2: numba not installed, using NumPy kernels')
+        except Exception as e:
+            logger.warning('force_atlas2: numba unavailable, using NumPy kernels', exc_info=e)
+    if use_numba and _kernels is None:
+        raise ImportError('force_atlas2(use_numba=True) requires numba, try pip install numba')
+    return _kernels
+
+
+def _ranges(first: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Concatenation of arange(first[k], first[k] + counts[k]) over k
+    """
+    ends = np.cumsum(counts)
+    return np.arange(ends[-1] if len(ends) else 0) + np.repeat(first - (ends - counts), counts)
+
+
+def _bh_repulsion(
+    tree: _QuadTree, x: np.ndarray, y: np.ndarray, mass: np.ndarray, theta: float, kr: float,
+    kernels: Optional[_Kernels] = None
+) -> np.ndarray:
+    """
+    Barnes-Hut repulsion on points x, y from the tree's points, walking it one level at a time over (point, cell) pairs
+
+    A cell is taken as a point mass when it does not contain the point and size / distance < theta,
+    else opened; opened leaves are summed point by point, skipping coincident points such as the point itself
+    """
+    fx = np.zeros(len(x))
+    fy = np.zeros(len(x))
+
+    def add(owner: np.ndarray, factor: np.ndarray, dx: np.ndarray, dy: np.ndarray) -> None:
+        fx[:] += np.bincount(owner, weights=factor * dx, minlength=len(x))
+        fy[:] += np.bincount(owner, weights=factor * dy, minlength=len(x))
+
+    morton = tree.morton(x, y)
+    owner = np.arange(len(x))
+    cell = np.zeros(len(x), dtype=np.int64)
+    theta2 = theta * theta
+    for level in range(tree.depth + 1):
+        dx = x[owner] - tree.cx[level][cell]
+        dy = y[owner] - tree.cy[level][cell]
+        dist2 = dx * dx + dy * dy
+        side = tree.size / (1 << level)
+        own = (morton[owner] >> (2 * (tree.depth - level))) == tree.codes[level][cell]
+        take = (side * side < theta2 * dist2) & ~own
+        factor = kr * mass[owner[take]] * tree.mass[level][cell[take]] / dist2[take]
+        add(owner[take], factor, dx[take], dy[take])
+        if level < tree.depth:
+            owner, cell = tree.children(level, cell[~take], owner[~take])
+        else:
+            owner, cell = owner[~take], cell[~take]
+
+    # opened leaves, point by point
+    if kernels is not None:
+        kernels.leaf_forces(
+            owner, cell, tree.leaf_start, tree.leaf_nodes, x, y, mass, tree.x, tree.y, tree.point_mass, kr, fx, fy
+        )
+        return np.stack([fx, fy], axis=1)
+    counts = tree.leaf_start[cell + 1] - tree.leaf_start[cell]
+    owner = np.repeat(owner, counts)
+    j = tree.leaf_nodes[_ranges(tree.leaf_start[cell], counts)]
+    dx = x[owner] - tree.x[j]
+    dy = y[owner] - tree.y[j]
+    dist2 = dx * dx + dy * dy
+    factor = np.where(dist2 > 0, kr * mass[owner] * tree.point_mass[j] / np.where(dist2 > 0, dist2, 1.), 0.)
+    add(owner, factor, dx, dy)
+    return np.stack([fx, fy], axis=1)
+
+
+def _exact_repulsion(
+    src_x: np.ndarray, src_y: np.ndarray, src_mass: np.ndarray, x: np.ndarray, y: np.ndarray, mass: np.ndarray, kr: float
+) -> np.ndarray:
+    dx = x[:, None] - src_x[None, :]
+    dy = y[:, None] - src_y[None, :]
+    dist2 = dx * dx + dy * dy
+    factor = np.where(dist2 > 0, kr * mass[:, None] * src_mass[None, :] / np.where(dist2 > 0, dist2, 1.), 0.)
+    return np.stack([(factor * dx).sum(axis=1), (factor * dy).sum(axis=1)], axis=1)
+
+
+def _repulsion(
+    src_pos: np.ndarray,
+    src_mass: np.ndarray,
+    pos: np.ndarray,
+    mass: np.ndarray,
+    barnes_hut: bool,
+    theta: float,
+    kr: float,
+    pool: Optional[ThreadPoolExecutor],
+    tree: Optional[_QuadTree] = None,
+    kernels: Optional[_Kernels] = None
+) -> np.ndarray:
+    """
+    Repulsion on points pos from points src_pos, which may be the same, skipping coincident pairs
+
+    Uses Barnes-Hut over src_pos, or the given tree of them, when barnes_hut and there are enough sources,
+    and compiled pair loops when kernels are given
+    """
+    n = len(pos)
+    x = np.ascontiguousarray(pos[:, 0])
+    y = np.ascontiguousarray(pos[:, 1])
+    if len(src_pos) == 0:
+        return np.zeros((n, 2))
+    bh = barnes_hut and len(src_pos) > EXACT_MAX_NODES
+    if bh:
+        bh_tree = tree if tree is not None else _QuadTree(
+            np.ascontiguousarray(src_pos[:, 0]), np.ascontiguousarray(src_pos[:, 1]), src_mass
+        )
+
+        def f(nodes: np.ndarray) -> np.ndarray:
+            return _bh_repulsion(bh_tree, x[nodes], y[nodes], mass[nodes], theta, kr, kernels)
+    else:
+        src_x = np.ascontiguousarray(src_pos[:, 0])
+        src_y = np.ascontiguousarray(src_pos[:, 1])
+
+        exact = _exact_repulsion if kernels is None else kernels.exact_forces
+
+        def f(nodes: np.ndarray) -> np.ndarray:
+            return exact(src_x, src_y, src_mass, x[nodes], y[nodes], mass[nodes], kr)
+    chunk = CHUNK_SIZE if bh or kernels is not None else max(1, (1 << 22) // len(src_pos))
+    chunks = [np.arange(start, min(n, start + chunk)) for start in range(0, n, chunk)]
+    if pool is not None and len(chunks) > 1:
+        return np.concatenate(list(pool.map(f, chunks)))
+    return np.concatenate([f(nodes) for nodes in chunks]) if chunks else np.zeros((0, 2))
+
+
+def _attraction(
+    pos: np.ndarray, src: np.ndarray, dst: np.ndarray, edge_weight: np.ndarray, lin_log_mode: bool, n: int
+) -> np.ndarray:
+    delta = pos[src] - pos[dst]
+    if lin_log_mode:
+        dist = np.sqrt((delta ** 2).sum(axis=1))
+        delta = delta * (np.log1p(dist) / np.where(dist > 0, dist, 1.))[:, None]
+    pull = delta * edge_weight[:, None]
+    return np.stack([
+        np.bincount(dst, weights=pull[:, axis], minlength=n) - np.bincount(src, weights=pull[:, axis], minlength=n)
+        for axis in range(2)
+    ], axis=1)
+
+
+def _gravity(pos: np.ndarray, mass: np.ndarray, gravity: float, strong_gravity_mode: bool) -> np.ndarray:
+    if strong_gravity_mode:
+        return -(gravity * mass)[:, None] * pos
+    dist = np.sqrt((pos ** 2).sum(axis=1))
+    return -(gravity * mass / np.where(dist > 0, dist, 1.))[:, None] * pos
+
+
+def _edge_weights(
+    src: np.ndarray, mass: np.ndarray, weights: Optional[np.ndarray], edge_weight_influence: float, outbound_attraction_distribution: bool
+) -> np.ndarray:
+    edge_weight = np.ones(len(src)) if weights is None else np.asarray(weights, dtype=np.float64) ** edge_weight_influence
+    if outbound_attraction_distribution:
+        edge_weight = edge_weight * mass.mean() / mass[src]
+    return edge_weight
+
+
+def equilibrium_scale(
+    src: np.ndarray,
+    dst: np.ndarray,
+    pos: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+    sample: int = 2000,
+    seed: Optional[int] = None,
+    outbound_attraction_distribution: bool = True,
+    lin_log_mode: bool = False,
+    edge_weight_influence: float = 1.0,
+    barnes_hut_optimize: bool = True,
+    barnes_hut_theta: float = 0.5,
+    scaling_ratio: float = 2.0,
+    strong_gravity_mode: bool = False,
+    gravity: float = 1.0,
+    **kwargs: Any
+) -> float:
+    """
+    Factor s for which positions pos / s are closest to a ForceAtlas2 equilibrium under the given parameters
+
+    Layouts from other algorithms, or from ForceAtlas2 with other parameters, live at other scales,
+    so forces on them are out of balance and would move every node. Rows of pos with NaN are ignored.
+    Fits over a sample of nodes, as repulsion scales with 1 / s and attraction and gravity are evaluated per s.
+    """
+    n = len(pos)
+    known = ~np.isnan(pos).any(axis=1)
+    keep = known[src] & known[dst] & (src != dst)
+    src, dst = src[keep], dst[keep]
+    weights = None if weights is None else np.asarray(weights)[keep]
+    if not len(src):
+        return 1.
+    mass = 1. + np.bincount(src, minlength=n) + np.bincount(dst, minlength=n)
+    edge_weight = _edge_weights(src, mass, weights, edge_weight_influence, outbound_attraction_distribution)
+
+    rng = np.random.default_rng(seed)
+    candidates = np.flatnonzero(known & (mass > 1))
+    picked = np.zeros(n, dtype=bool)
+    picked[candidates if len(candidates) <= sample else rng.choice(candidates, sample, replace=False)] = True
+    nodes = np.flatnonzero(picked)
+    incident = picked[src] | picked[dst]
+    src, dst, edge_weight = src[incident], dst[incident], edge_weight[incident]
+
+    sources = np.flatnonzero(known)
+    repulsion = _repulsion(
+        pos[sources], mass[sources], pos[nodes], mass[nodes], barnes_hut_optimize, barnes_hut_theta, scaling_ratio, None
+    )
+
+    def imbalance(scale: float) -> float:
+        scaled = np.where(known[:, None], pos, 0.) / scale
+        forces = repulsion * scale + _attraction(scaled, src, dst, edge_weight, lin_log_mode, n)[nodes]
+        forces += _gravity(scaled[nodes], mass[nodes], gravity, strong_gravity_mode)
+        return float((np.sqrt((forces ** 2).sum(axis=1)) / mass[nodes]).sum())
+
+    # coarse to fine search over log scale
+    best = 0.
+    for step in [1., .25, .05]:
+        grid = best + step * np.arange(-6, 7)
+        best = grid[int(np.argmin([imbalance(10. ** e) for e in grid]))]
+    return float(10. ** best)
+
+
+def force_atlas2(
+    src: np.ndarray,
+    dst: np.ndarray,
+    n: int,
+    weights: Optional[np.ndarray] = None,
+    pos: Optional[np.ndarray] = None,
+    max_iter: int = 500,
+    outbound_attraction_distribution: bool = True,
+    lin_log_mode: bool = False,
+    prevent_overlapping: bool = False,
+    edge_weight_influence: float = 1.0,
+    jitter_tolerance: float = 1.0,
+    barnes_hut_optimize: bool = True,
+    barnes_hut_theta: float = 0.5,
+    scaling_ratio: float = 2.0,
+    strong_gravity_mode: bool = False,
+    gravity: float = 1.0,
+    verbose: bool = False,
+    seed: Optional[int] = None,
+    n_threads: Optional[int] = None,
+    fixed: Optional[np.ndarray] = None,
+    anchor: Optional[np.ndarray] = None,
+    use_numba: Optional[bool] = None
+) -> np.ndarray:
+    """
+    ForceAtlas2 over integer edge arrays, returning an (n, 2) array of positions
+
+    Parameters follow cugraph's force_atlas2, so the same fa2_params work on CPU and GPU.
+    Repulsion uses a Barnes-Hut quadtree built from arrays, attraction sums over the edge arrays,
+    and speed adapts per node and globally from swinging and traction as in Gephi.
+
+    :param src: Source vertex of each edge, in [0, n)
+    :param dst: Destination vertex of each edge, in [0, n)
+    :param n: Number of vertices
+    :param weights: Optional edge weights
+    :param pos: Optional (n, 2) starting positions, with NaN rows placed at random
+    :param prevent_overlapping: Accepted for cugraph compatibility and ignored, as nodes have no size
+    :param seed: Seed for random starting positions
+    :param n_threads: Threads for repulsion over node chunks, default in-process
+    :param fixed: Optional boolean mask of vertices that keep their position, while still pulling and pushing the others
+    :param anchor: Optional per-vertex strength of a spring to its starting position, relative to its degree, where 0 is free
+    :param use_numba: Run repulsion pair loops as numba kernels: None (default) when numba is installed, True to require it
+    """
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    kernels = _numba_kernels(use_numba)
+    if prevent_overlapping:
+        logger.debug('force_atlas2: prevent_overlapping not supported, ignoring')
+
+    rng = np.random.default_rng(seed)
+    spread = max(1.0, np.sqrt(n))
+    start = rng.uniform(-spread, spread, size=(n, 2))
+    if pos is None:
+        out = start
+    else:
+        out = np.array(pos, dtype=np.float64).reshape(n, 2)
+        missing = np.isnan(out).any(axis=1)
+        out[missing] = start[missing]
+    if n == 0 or max_iter <= 0:
+        return out
+
+    mass = 1. + np.bincount(src, minlength=n) + np.bincount(dst, minlength=n)
+    edge_weight = _edge_weights(src, mass, weights, edge_weight_influence, outbound_attraction_distribution)
+
+    # only movable vertices are simulated: fixed ones repel from one tree, and attract via their edges
+    movable = np.ones(n, dtype=bool) if fixed is None else ~np.asarray(fixed, dtype=bool)
+    moving = np.flatnonzero(movable)
+    pinned = np.flatnonzero(~movable)
+    active = movable[src] | movable[dst]
+    src, dst, edge_weight = src[active], dst[active], edge_weight[active]
+    moving_mass = mass[moving]
+    k = len(moving)
+    if k == 0:
+        return out
+    if anchor is not None:
+        anchor_strength = (np.asarray(anchor, dtype=np.float64) * mass)[moving]
+        anchor_pos = out[moving].copy()
+    pinned_tree = None
+    if barnes_hut_optimize and len(pinned) > EXACT_MAX_NODES:
+        pinned_tree = _QuadTree(out[pinned, 0].copy(), out[pinned, 1].copy(), mass[pinned])
+
+    speed, speed_efficiency = 1., 1.
+    prev = np.zeros((k, 2))
+    pool = ThreadPoolExecutor(n_threads) if n_threads is not None and n_threads > 1 else None
+    try:
+        for it in range(max_iter):
+            pos = out[moving]
+            forces = _repulsion(
+                pos, moving_mass, pos, moving_mass, barnes_hut_optimize, barnes_hut_theta, scaling_ratio, pool,
+                kernels=kernels
+            )
+            if len(pinned):
+                forces += _repulsion(
+                    out[pinned], mass[pinned], pos, moving_mass,
+                    barnes_hut_optimize, barnes_hut_theta, scaling_ratio, pool, pinned_tree, kernels
+                )
+
+            forces += _attraction(out, src, dst, edge_weight, lin_log_mode, n)[moving]
+            forces += _gravity(pos, moving_mass, gravity, strong_gravity_mode)
+            if anchor is not None:
+                forces -= anchor_strength[:, None] * (pos - anchor_pos)
+
+            swinging = moving_mass * np.sqrt(((forces - prev) ** 2).sum(axis=1))
+            traction = moving_mass * np.sqrt(((forces + prev) ** 2).sum(axis=1)) / 2
+            total_swinging = swinging.sum()
+            total_traction = traction.sum()
+
+            estimated_jt = .05 * np.sqrt(k)
+            jt = jitter_tolerance * max(np.sqrt(estimated_jt), min(10., estimated_jt * total_traction / (k * k)))
+            if total_traction > 0 and total_swinging / total_traction > 2.:
+                if speed_efficiency > .05:
+                    speed_efficiency *= .5
+                jt = max(jt, jitter_tolerance)
+            target_speed = np.inf if total_swinging == 0 else jt * speed_efficiency * total_traction / total_swinging
+            if total_swinging > jt * total_traction:
+                if speed_efficiency > .05:
+                    speed_efficiency *= .7
+            elif speed < 1000:
+                speed_efficiency *= 1.3
+            speed = speed + min(target_speed - speed, .5 * speed)
+
+            out[moving] = pos + forces * (speed / (1. + np.sqrt(speed * swinging)))[:, None]
+            prev = forces
+            if verbose and it % 100 == 0:
+                logger.info('force_atlas2 iteration %s: speed %s, swinging %s', it, speed, total_swinging)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return out
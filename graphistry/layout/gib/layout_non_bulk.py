@@ -1,4 +1,5 @@
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import os
 import pandas as pd
 from timeit import default_timer as timer
 
@@ -8,6 +9,124 @@ from graphistry.util import setup_logger
 logger = setup_logger(__name__)
 
 
+# Below this many nodes + edges across all partitions, process startup costs more than it saves
+MIN_PARALLEL_WORK = 20000
+
+# Partitions are bundled into tasks of at least this many nodes + edges, so small ones share a dispatch
+MIN_TASK_WORK = 2000
+
+
+def split_partitions(
+    self: Plottable,
+    self_selfless: Plottable,
+    partitions: Any,
+    partition_key: str
+) -> Dict[Any, Tuple[Any, Any]]:
+    """
+    Split nodes and within-partition edges by partition in one groupby pass each
+
+    :param partitions: Partitions to keep
+    :return: {<partition> -> (nodes, edges)}, for the kept partitions in order
+    """
+    nodes = self._nodes[self._nodes[partition_key].isin(partitions)]
+    edges = self_selfless._edges
+
+    # edges are kept when both endpoints land in the same partition, as keep_nodes() would per partition
+    node_partition = nodes[[self._node, partition_key]].drop_duplicates(subset=[self._node]).set_index(self._node)[partition_key]
+    src_partition = edges[self_selfless._source].map(node_partition)
+    dst_partition = edges[self_selfless._destination].map(node_partition)
+    internal = src_partition.notna() & (src_partition == dst_partition)
+    edges_by_partition = dict(iter(edges[internal].groupby(src_partition[internal], sort=False)))
+    no_edges = edges.iloc[:0]
+
+    return {
+        partition: (partition_nodes, edges_by_partition.get(partition, no_edges))
+        for partition, partition_nodes in nodes.groupby(partition_key, sort=False)
+    }
+
+
+def layout_partition(
+    subgraph_g: Plottable,
+    layout_alg: Optional[Union[str, Callable[[Plottable], Plottable]]],
+    layout_params: Optional[Dict[str, Any]],
+    engine: Engine
+) -> Any:
+    """
+    Position one partition's subgraph, returning its nodes with x, y, and a layout type
+    """
+    niter = min(len(subgraph_g._nodes), 300)
+    if callable(layout_alg):
+        positioned_subgraph_g = layout_alg(subgraph_g)
+        layout_name = 'custom'
+    elif engine == Engine.PANDAS:
+        layout_name = layout_alg or 'fr'
+        positioned_subgraph_g = subgraph_g.layout_igraph(
+            layout=layout_name,
+            params={**({'niter': niter} if layout_name == 'fr' else {}), **(layout_params or {})}
+        )
+    elif engine == Engine.CUDF:
+        layout_name = layout_alg or 'force_atlas2'
+        positioned_subgraph_g = subgraph_g.layout_cugraph(
+            layout=layout_name,
+            params={**({'max_iter': niter} if layout_name == 'force_atlas2' else {}), **(layout_params or {})}
+        )
+    else:
+        raise ValueError(f"Unsupported engine: {engine}")
+
+    return positioned_subgraph_g._nodes.assign(type=layout_name)
+
+
+def layout_partitions(
+    g: Plottable,
+    parts: List[Tuple[Any, Any, Any]],
+    layout_alg: Optional[Union[str, Callable[[Plottable], Plottable]]],
+    layout_params: Optional[Dict[str, Any]],
+    engine: Engine
+) -> List[Tuple[Any, Any, float]]:
+    """
+    Position a bundle of (partition, nodes, edges) subgraphs, returning (partition, positioned nodes, seconds) each
+
+    Runs in pool workers, so g is an edgeless and nodeless template carrying the bindings
+    """
+    out = []
+    for partition, nodes, edges in parts:
+        start = timer()
+        positioned = layout_partition(g.nodes(nodes).edges(edges), layout_alg, layout_params, engine)
+        out.append((partition, positioned, timer() - start))
+    return out
+
+
+def bundle_partitions(parts: List[Tuple[Any, Any, Any]], n_workers: int) -> List[List[Tuple[Any, Any, Any]]]:
+    """
+    Group (partition, nodes, edges) subgraphs into tasks sized by nodes + edges, largest first
+
+    Big partitions get their own task and start first, while small ones are bundled up to a
+    share of the total work, so workers finish close together without one dispatch per tiny partition
+    """
+    def work(part: Tuple[Any, Any, Any]) -> int:
+        return len(part[1]) + len(part[2])
+
+    ordered = sorted(parts, key=work, reverse=True)
+    target = max(MIN_TASK_WORK, sum(work(p) for p in ordered) // (4 * max(n_workers, 1)))
+    tasks: List[List[Tuple[Any, Any, Any]]] = []
+    task_work = target
+    for part in ordered:
+        if task_work >= target:
+            tasks.append([])
+            task_work = 0
+        tasks[-1].append(part)
+        task_work += work(part)
+    return tasks
+
+
+def resolve_n_jobs(n_jobs: Optional[int]) -> int:
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
 def layout_non_bulk_mode(
     self: Plottable,
     node_partitions: List[pd.DataFrame],  # or cudf.DataFrame
@@ -16,11 +135,15 @@ def layout_non_bulk_mode(
     layout_alg: Optional[Union[str, Callable[[Plottable], Plottable]]],
     layout_params: Optional[Dict[str, Any]],
     engine: Engine,
-    self_selfless: Plottable
+    self_selfless: Plottable,
+    n_jobs: Optional[int] = -1
 ) -> Tuple[List[pd.DataFrame], float, float, Dict[int, Tuple[int, float]]]:
     """
     Handles the layout in non-bulk mode by applying the layout separately for each partition.
 
+    Nodes and edges are split by partition once, and for the pandas engine, partitions are laid out
+    in a process pool, largest first.
+
     :param node_partitions: List of DataFrames for node partitions.
     :type node_partitions: List[pd.DataFrame]
     :param remaining: DataFrame of remaining nodes after filtering.
@@ -29,58 +152,56 @@ def layout_non_bulk_mode(
     :type partition_key: str
     :param layout_alg: Layout algorithm to be applied.
     :type layout_alg: Optional[Union[str, Callable[[Plottable], Plottable]]]
-    :param layout_alg: Layout algorithm to be applied.
-    :type layout_alg: Optional[Union[str, Callable[[Plottable], Plottable]]]
     :param layout_params: Parameters for the layout algorithm.
     :type layout_params: Optional[Dict[str, Any]]
     :param engine: The engine being used (Pandas or CUDF).
     :type engine: Engine
     :param self_selfless: Graph excluding self-edges.
     :type self_selfless: Plottable
-    :return: Tuple containing node partitions, layout time, keep time, and layout by size.
+    :param n_jobs: Worker processes for pandas layouts, with -1 for all cores and None or 1 for in-process; requires joblib
+    :type n_jobs: Optional[int]
+    :return: Tuple containing node partitions, layout time, keep time, and layout by size as {<partition size> -> (count, seconds)}.
     """
 
-    s_keep = 0.0
-    s_layout = 0.0
-    s_layout_by_size = {}
-
-    for partition in remaining[partition_key].to_numpy():
-        start_i = timer()
-
-        node_ids = self._nodes[self._nodes[partition_key] == partition][self._node]
-        subgraph_g = self_selfless.nodes(self._nodes).keep_nodes({self._node: node_ids})
-        start_i_mid = timer()
-        s_keep += start_i_mid - start_i
-
-        niter = min(len(subgraph_g._nodes), 300)
-        if callable(layout_alg):
-            positioned_subgraph_g = layout_alg(subgraph_g)
-            layout_name = 'custom'
-        elif engine == Engine.PANDAS:
-            layout_name = layout_alg or 'fr'
-            positioned_subgraph_g = subgraph_g.layout_igraph(
-                layout=layout_name,
-                params={**({'niter': niter} if layout_name == 'fr' else {}), **(layout_params or {})}
-            )
-        elif engine == Engine.CUDF:
-            layout_name = layout_alg or 'force_atlas2'
-            positioned_subgraph_g = subgraph_g.layout_cugraph(
-                layout=layout_name,
-                params={**({'max_iter': niter} if layout_name == 'force_atlas2' else {}), **(layout_params or {})}
-            )
+    start = timer()
+    order = list(remaining[partition_key].to_numpy())
+    splits = split_partitions(self, self_selfless, remaining[partition_key], partition_key)
+    parts = [(partition, *splits[partition]) for partition in order if partition in splits]
+    start_layout = timer()
+    s_keep = start_layout - start
+
+    # bindings only, so workers do not receive the full tables
+    template = self_selfless.nodes(self._nodes.iloc[:0]).edges(self_selfless._edges.iloc[:0])
+    template._node_id_encoding = None
+
+    n_workers = resolve_n_jobs(n_jobs) if engine == Engine.PANDAS else 1
+    total_work = sum(len(nodes) + len(edges) for _, nodes, edges in parts)
+    parallel = n_workers > 1 and len(parts) > 1 and total_work >= MIN_PARALLEL_WORK
+    results: List[Tuple[Any, Any, float]] = []
+    if parallel:
+        try:
+            from joblib import Parallel, delayed
+        except ImportError:
+            logger.debug('joblib not installed, laying out partitions in-process')
+            parallel = False
         else:
-            raise ValueError(f"Unsupported engine: {engine}")
+            tasks = bundle_partitions(parts, n_workers)
+            logger.debug('laying out %s partitions as %s tasks over %s workers', len(parts), len(tasks), n_workers)
+            for task_results in Parallel(n_jobs=n_workers, backend='loky')(
+                delayed(layout_partitions)(template, task, layout_alg, layout_params, engine) for task in tasks
+            ):
+                results.extend(task_results)
+    if not parallel:
+        results = layout_partitions(template, parts, layout_alg, layout_params, engine)
 
-        positioned_subgraph_g = positioned_subgraph_g.nodes(
-            positioned_subgraph_g._nodes.assign(type=layout_name)
-        )
-        node_partitions.append(positioned_subgraph_g._nodes)
-        end_i = timer()
-        s_layout += end_i - start_i_mid
-
-        if len(positioned_subgraph_g._nodes) not in s_layout_by_size:
-            s_layout_by_size[len(positioned_subgraph_g._nodes)] = (0, 0.0)
-        n, t = s_layout_by_size[len(positioned_subgraph_g._nodes)]
-        s_layout_by_size[len(positioned_subgraph_g._nodes)] = (n + 1, t + (end_i - start_i_mid))
+    s_layout_by_size: Dict[int, Tuple[int, float]] = {}
+    positioned_by_partition = {}
+    for partition, positioned, seconds in results:
+        positioned_by_partition[partition] = positioned
+        n, t = s_layout_by_size.get(len(positioned), (0, 0.0))
+        s_layout_by_size[len(positioned)] = (n + 1, t + seconds)
+    for partition, _, _ in parts:
+        node_partitions.append(positioned_by_partition[partition])
+    s_layout = timer() - start_layout
 
     return node_partitions, s_layout, s_keep, s_layout_by_size
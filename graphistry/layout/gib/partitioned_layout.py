@@ -22,6 +22,7 @@ def partitioned_layout(
     partition_key='partition',
     bulk_mode: bool = True,
     engine: Engine = Engine.PANDAS,
+    n_jobs: Optional[int] = -1
 ) -> Plottable:
     """    
     :param partition_offsets: {'dx', 'dy', 'x', 'y'} => <partition> => float
@@ -36,6 +37,8 @@ def partitioned_layout(
     :type bulk_mode: bool
     :param engine: The engine being used (Pandas or CUDF)
     :type engine: Engine
+    :param n_jobs: When not bulk_mode, worker processes for per-partition pandas layouts, with -1 for all cores and None or 1 for in-process
+    :type n_jobs: Optional[int]
 
     :return: The resulting Plottable object with positioned nodes
     """
@@ -105,8 +108,11 @@ def partitioned_layout(
         node_partitions.append(combined_nodes)
     else:
         node_partitions, s_layout, s_keep, s_layout_by_size = layout_non_bulk_mode(
-            self, node_partitions, remaining, partition_key, layout_alg, layout_params, engine, self_selfless
+            self, node_partitions, remaining, partition_key, layout_alg, layout_params, engine, self_selfless, n_jobs
         )
+        logger.debug('non-bulk split: %s s, layout: %s s', s_keep, s_layout)
+        for size, (count, seconds) in sorted(s_layout_by_size.items(), key=lambda kv: -kv[1][1]):
+            logger.debug('layout of %s partitions of size %s: %s s', count, size, seconds)
 
     end_communities = timer()  # Define end_communities here to track layout time
     logger.debug('part_layout time: %s s', end_communities - start)
@@ -0,0 +1,223 @@
+from typing import Any, Dict, Optional, Union
+from timeit import default_timer as timer
+import numpy as np
+import pandas as pd
+
+from graphistry.Engine import EngineAbstract, df_to_engine, df_to_pdf, resolve_engine
+from graphistry.Plottable import Plottable
+from graphistry.layout.fa2 import GRAPHISTRY_FA2_CPU_PARAMS, fa2_cpu_params, fa2_layout
+from graphistry.layout.force_atlas2 import equilibrium_scale, force_atlas2
+from graphistry.util import setup_logger
+
+
+logger = setup_logger(__name__)
+
+
+def place_new_nodes(
+    pos: np.ndarray, src: np.ndarray, dst: np.ndarray, jitter: float, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Fill NaN rows of pos with the mean position of their positioned neighbors, plus jitter
+
+    Repeats outward from positioned nodes, so chains of new nodes are placed hop by hop;
+    nodes with no path to a positioned node land at random within the positioned extent.
+    """
+    pos = pos.copy()
+    n = len(pos)
+    known = ~np.isnan(pos).any(axis=1)
+    if not known.any():
+        return pos
+    while not known.all():
+        ends = np.concatenate([src, dst])
+        others = np.concatenate([dst, src])
+        hit = known[others] & ~known[ends]
+        if not hit.any():
+            break
+        counts = np.bincount(ends[hit], minlength=n)
+        placed = counts > 0
+        for axis in range(2):
+            sums = np.bincount(ends[hit], weights=pos[others[hit], axis], minlength=n)
+            pos[placed, axis] = sums[placed] / counts[placed] + rng.normal(0, jitter, placed.sum())
+        known |= placed
+    if not known.all():
+        lo = pos[known].min(axis=0)
+        hi = pos[known].max(axis=0)
+        pos[~known] = rng.uniform(lo, hi, size=((~known).sum(), 2))
+    return pos
+
+
+def neighborhood(seeds: np.ndarray, src: np.ndarray, dst: np.ndarray, hops: int) -> np.ndarray:
+    """
+    Boolean mask of nodes within hops of a seed node, ignoring edge direction
+    """
+    mask = seeds.copy()
+    for _ in range(hops):
+        grow = mask[src] | mask[dst]
+        if not grow.any():
+            break
+        before = mask.sum()
+        mask[src[grow]] = True
+        mask[dst[grow]] = True
+        if mask.sum() == before:
+            break
+    return mask
+
+
+def incremental_layout(
+    self: Plottable,
+    previous: Optional[Any] = None,
+    hops: int = 1,
+    max_iter: int = 50,
+    refine: bool = True,
+    stiffness: float = 1.0,
+    fa2_params: Optional[Dict[str, Any]] = None,
+    seed: Optional[int] = None,
+    engine: Union[EngineAbstract, str] = EngineAbstract.AUTO
+) -> Plottable:
+    """
+    Update an existing layout for changed nodes and edges instead of laying out from scratch
+
+    Nodes with a previous position keep it, new nodes are placed at the mean of their positioned neighbors,
+    and when refine, a bounded number of ForceAtlas2 iterations move only the new nodes, the endpoints of
+    added or removed edges, and their neighbors within hops, with everything else pinned in place.
+    When no node has a previous position, runs :meth:`graphistry.layout.fa2.fa2_layout`.
+
+    Works after any layout that writes x/y node columns. For ring, circle, and tree layouts, use refine=False,
+    as refinement uses force-directed forces that do not keep their geometry.
+
+    Displacement stats are on the result's `_layout_stats`: counts of nodes, new, removed, and affected nodes,
+    iterations, and the mean, 95th percentile, and max displacement of previously positioned nodes.
+
+    :param previous: Earlier graph or nodes DataFrame with x/y positions, by node id; defaults to the x/y node columns of this graph
+    :type previous: Optional[Union[Plottable, pd.DataFrame]]
+    :param hops: Neighborhood radius around new nodes and changed edges that refinement may move
+    :type hops: int
+    :param max_iter: Refinement iterations
+    :type max_iter: int
+    :param refine: Whether to run refinement after placing new nodes
+    :type refine: bool
+    :param stiffness: During refinement, how strongly previously positioned nodes are held to their position, relative to their edges; 0 lets them move freely
+    :type stiffness: float
+    :param fa2_params: Optional ForceAtlas2 parameters for refinement, see :meth:`graphistry.layout.force_atlas2.force_atlas2`
+    :type fa2_params: Optional[Dict[str, Any]]
+    :param seed: Seed for jitter and random placement
+    :type seed: Optional[int]
+    :param engine: Output engine; the layout itself runs on CPU
+    :type engine: Union[graphistry.Engine.EngineAbstract, str]
+
+    :returns: Graph with x/y node positions
+    :rtype: graphistry.Plottable.Plottable
+
+    **Example: Replot a growing graph without moving settled nodes**
+        ::
+
+            g1 = graphistry.edges(df1, 's', 'd').fa2_layout()
+            g2 = graphistry.edges(df2, 's', 'd').incremental_layout(previous=g1)
+            print(g2._layout_stats)
+    """
+    start = timer()
+    if isinstance(engine, str):
+        engine = EngineAbstract(engine)
+    engine_concrete = resolve_engine(engine, self)
+
+    g = self.materialize_nodes()
+    nodes = df_to_pdf(g._nodes, engine_concrete)
+    edges = df_to_pdf(g._edges, engine_concrete)
+    g = g.nodes(nodes).edges(edges)
+
+    prev_nodes: Optional[pd.DataFrame] = None
+    prev_edges: Optional[pd.DataFrame] = None
+    if previous is None:
+        if 'x' in nodes and 'y' in nodes:
+            prev_nodes = nodes
+    elif hasattr(previous, '_nodes'):
+        if previous._nodes is not None and previous._node is not None and 'x' in previous._nodes and 'y' in previous._nodes:
+            prev_nodes = df_to_pdf(previous._nodes, engine_concrete).rename(columns={previous._node: g._node})
+        if previous._edges is not None and previous._source is not None and previous._destination is not None:
+            prev_edges = df_to_pdf(previous._edges, engine_concrete).rename(
+                columns={previous._source: g._source, previous._destination: g._destination}
+            )
+    else:
+        prev_nodes = df_to_pdf(previous, engine_concrete)
+    if prev_nodes is not None and not ({g._node, 'x', 'y'} <= set(prev_nodes.columns)):
+        raise ValueError(f'Expected previous positions with columns {g._node}, x, y, got: {list(prev_nodes.columns)}')
+
+    n_nodes, n_edges = len(nodes), len(edges)
+    codes, uniques = pd.factorize(pd.concat([nodes[g._node], edges[g._source], edges[g._destination]], ignore_index=True))
+    n = len(uniques)
+    node_codes = codes[:n_nodes]
+    src = codes[n_nodes:n_nodes + n_edges]
+    dst = codes[n_nodes + n_edges:]
+
+    old = np.full((n, 2), np.nan)
+    removed = 0
+    if prev_nodes is not None:
+        prev_positions = prev_nodes.drop_duplicates(subset=[g._node], keep='last')
+        at = pd.Index(uniques).get_indexer(prev_positions[g._node])
+        found = at >= 0
+        removed = int((~found).sum()) if previous is not None else 0
+        old[at[found]] = prev_positions[['x', 'y']].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)[found]
+
+    new = np.isnan(old).any(axis=1)
+    if new.all():
+        logger.debug('incremental_layout: no previous positions, running fa2_layout')
+        out = fa2_layout(g.nodes(nodes.drop(columns=[c for c in ['x', 'y'] if c in nodes])), fa2_params=fa2_params)
+        out = out.nodes(df_to_engine(out._nodes, engine_concrete)).edges(df_to_engine(out._edges, engine_concrete))
+        out._layout_stats = {
+            'nodes': n_nodes, 'new': n_nodes, 'removed': removed, 'affected': n_nodes, 'iterations': None,
+            'displacement_mean': 0.0, 'displacement_p95': 0.0, 'displacement_max': 0.0, 'seconds': timer() - start
+        }
+        return out
+
+    # seeds: new nodes, and endpoints of added edges between positioned nodes and of removed edges
+    seeds = new.copy()
+    if prev_edges is not None:
+        pairs = pd.MultiIndex.from_arrays([edges[g._source], edges[g._destination]])
+        prev_pairs = pd.MultiIndex.from_arrays([prev_edges[g._source], prev_edges[g._destination]])
+        added = ~pairs.isin(prev_pairs) & ~new[src] & ~new[dst]
+        seeds[src[added]] = True
+        seeds[dst[added]] = True
+        gone = prev_edges[~prev_pairs.isin(pairs)]
+        for col in [g._source, g._destination]:
+            at = pd.Index(uniques).get_indexer(gone[col])
+            seeds[at[at >= 0]] = True
+
+    rng = np.random.default_rng(seed)
+    known = ~new
+    lengths = np.sqrt(((old[src] - old[dst]) ** 2).sum(axis=1))[known[src] & known[dst] & (src != dst)]
+    extent = np.nanmax(old, axis=0) - np.nanmin(old, axis=0)
+    jitter = 0.1 * (np.median(lengths) if len(lengths) else max(extent.max(), 1.) / np.sqrt(n))
+    pos = place_new_nodes(old, src, dst, jitter, rng)
+
+    affected = neighborhood(seeds, src, dst, hops)
+    iterations = 0
+    if refine and max_iter > 0 and affected.any():
+        params = fa2_cpu_params({**GRAPHISTRY_FA2_CPU_PARAMS, 'seed': seed, **(fa2_params or {}), 'max_iter': max_iter})
+        weights = None
+        if g._edge_weight is not None and g._edge_weight in edges:
+            weights = pd.to_numeric(edges[g._edge_weight], errors='coerce').fillna(1.).to_numpy()
+        # refine at the scale where the settled layout is closest to balanced, so pinned nodes do not push or pull
+        scale = equilibrium_scale(src, dst, old, weights=weights, **params)
+        refined = force_atlas2(
+            src, dst, n, weights=weights, pos=pos / scale, fixed=~affected, anchor=np.where(new, 0., stiffness), **params
+        ) * scale
+        # pinned nodes keep their exact previous coordinates, without rescaling round-off
+        pos[affected] = refined[affected]
+        iterations = max_iter
+
+    displacement = np.sqrt(((pos - old) ** 2).sum(axis=1))[known]
+    out_nodes = nodes.assign(x=pos[node_codes, 0], y=pos[node_codes, 1])
+    out = g.nodes(df_to_engine(out_nodes, engine_concrete)).edges(df_to_engine(edges, engine_concrete)).layout_settings(play=0)
+    out._layout_stats = {
+        'nodes': n_nodes,
+        'new': int(new[node_codes].sum()),
+        'removed': removed,
+        'affected': int(affected[node_codes].sum()),
+        'iterations': iterations,
+        'displacement_mean': float(displacement.mean()) if len(displacement) else 0.0,
+        'displacement_p95': float(np.quantile(displacement, 0.95)) if len(displacement) else 0.0,
+        'displacement_max': float(displacement.max()) if len(displacement) else 0.0,
+        'seconds': timer() - start
+    }
+    logger.debug('incremental_layout: %s', out._layout_stats)
+    return out
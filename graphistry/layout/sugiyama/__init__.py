@@ -1 +1,2 @@
 from .sugiyamaLayout import SugiyamaLayout
+from .layeredLayout import has_cycles, layered_layout, layered_layout_df
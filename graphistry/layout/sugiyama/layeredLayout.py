@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+Array-based Sugiyama (layered) layout over integer edge arrays, as used by tree_layout()
+
+Cycles are broken and layers assigned by peeling frontiers of the edge arrays, long edges get dummy vertices
+as array ops, and layers are ordered by median or barycenter sweeps, each layer one NumPy sort followed by
+an adjacent exchange pass, then placed by sweeps pulling vertices toward their neighbors
+"""
+from typing import Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _csr(src: np.ndarray, dst: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(src, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order]
+
+
+def _expand(indptr: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """
+    Positions in the CSR targets of the out-edges of nodes
+    """
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    offsets = np.cumsum(counts) - counts
+    return np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+
+
+def peeling_rank(src: np.ndarray, dst: np.ndarray, n: int) -> np.ndarray:
+    """
+    Round in which each node is peeled: nodes without remaining in-edges first, and when only cycles remain,
+    the remaining nodes with the fewest remaining in-edges
+    """
+    indptr, targets = _csr(src, dst, n)
+    indeg = np.bincount(dst, minlength=n)
+    rank = np.full(n, -1, dtype=np.int64)
+    remaining = np.ones(n, dtype=bool)
+    frontier = np.flatnonzero(indeg == 0)
+    r = 0
+    while True:
+        if len(frontier) == 0:
+            candidates = np.flatnonzero(remaining)
+            if len(candidates) == 0:
+                break
+            frontier = candidates[indeg[candidates] == indeg[candidates].min()]
+        rank[frontier] = r
+        remaining[frontier] = False
+        r += 1
+        reached = targets[_expand(indptr, frontier)]
+        indeg -= np.bincount(reached, minlength=n)
+        reached = np.unique(reached)
+        frontier = reached[(indeg[reached] <= 0) & remaining[reached]]
+    return rank
+
+
+def has_cycles(src: np.ndarray, dst: np.ndarray, n: int) -> bool:
+    """
+    Whether the directed graph of integer edge arrays over n nodes has a cycle, including self loops
+    """
+    if (src == dst).any():
+        return True
+    indptr, targets = _csr(src, dst, n)
+    indeg = np.bincount(dst, minlength=n)
+    frontier = np.flatnonzero(indeg == 0)
+    peeled = 0
+    while len(frontier):
+        peeled += len(frontier)
+        reached = targets[_expand(indptr, frontier)]
+        indeg -= np.bincount(reached, minlength=n)
+        reached = np.unique(reached)
+        frontier = reached[indeg[reached] == 0]
+    return peeled < n
+
+
+def _root_distance(src: np.ndarray, dst: np.ndarray, n: int, roots: np.ndarray) -> np.ndarray:
+    """
+    Undirected hop distance from the nearest root, n for nodes not connected to one
+    """
+    indptr, targets = _csr(np.concatenate([src, dst]), np.concatenate([dst, src]), n)
+    dist = np.full(n, n, dtype=np.int64)
+    frontier = np.unique(roots)
+    d = 0
+    while len(frontier):
+        dist[frontier] = d
+        d += 1
+        reached = np.unique(targets[_expand(indptr, frontier)])
+        frontier = reached[dist[reached] == n]
+    return dist
+
+
+def _longest_path_layers(src: np.ndarray, dst: np.ndarray, n: int) -> np.ndarray:
+    """
+    Layer of each node of a DAG, one past its deepest parent
+    """
+    indptr, targets = _csr(src, dst, n)
+    order = np.argsort(src, kind='stable')
+    sources = src[order]
+    indeg = np.bincount(dst, minlength=n)
+    level = np.zeros(n, dtype=np.int64)
+    frontier = np.flatnonzero(indeg == 0)
+    while len(frontier):
+        edges = _expand(indptr, frontier)
+        reached = targets[edges]
+        np.maximum.at(level, reached, level[sources[edges]] + 1)
+        indeg -= np.bincount(reached, minlength=n)
+        reached = np.unique(reached)
+        frontier = reached[indeg[reached] == 0]
+    return level
+
+
+def _insert_dummies(
+    src: np.ndarray, dst: np.ndarray, level: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split edges spanning several layers into chains through one dummy vertex per inner layer
+
+    Returns the layer of every vertex, real then dummy, and edges between adjacent layers
+    """
+    n = len(level)
+    span = level[dst] - level[src]
+    inner = span - 1
+    first_dummy = n + np.cumsum(inner) - inner
+    edge = np.repeat(np.arange(len(src)), span)
+    step = np.arange(len(edge)) - np.repeat(np.cumsum(span) - span, span)
+    u = np.where(step == 0, src[edge], first_dummy[edge] + step - 1)
+    v = np.where(step == span[edge] - 1, dst[edge], first_dummy[edge] + step)
+    dummy_edge = np.repeat(np.arange(len(src)), inner)
+    dummy_step = np.arange(len(dummy_edge)) - np.repeat(np.cumsum(inner) - inner, inner) + 1
+    layers = np.concatenate([level, level[src[dummy_edge]] + dummy_step])
+    return layers, u, v
+
+
+def _place(desired: np.ndarray) -> np.ndarray:
+    """
+    Positions closest to desired, in the same order, at least 1 apart: the mean of left and right compaction
+    """
+    rank = np.arange(len(desired))
+    slack = desired - rank
+    left = rank + np.maximum.accumulate(slack)
+    right = rank + np.minimum.accumulate(slack[::-1])[::-1]
+    return (left + right) / 2
+
+
+class _Layers(object):
+    """
+    Vertices by layer, with the edges between adjacent layers grouped by their lower and upper layer
+    """
+
+    def __init__(self, layers: np.ndarray, u: np.ndarray, v: np.ndarray) -> None:
+        self.count = int(layers.max()) + 1
+        self.nodes = np.argsort(layers, kind='stable')
+        self.indptr = np.zeros(self.count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(layers, minlength=self.count), out=self.indptr[1:])
+        by_lower = np.argsort(layers[v], kind='stable')
+        self.lower_indptr = np.zeros(self.count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(layers[v], minlength=self.count), out=self.lower_indptr[1:])
+        self.u_by_lower, self.v_by_lower = u[by_lower], v[by_lower]
+        by_upper = np.argsort(layers[u], kind='stable')
+        self.upper_indptr = np.zeros(self.count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(layers[u], minlength=self.count), out=self.upper_indptr[1:])
+        self.u_by_upper, self.v_by_upper = u[by_upper], v[by_upper]
+
+    def layer(self, i: int) -> np.ndarray:
+        return self.nodes[self.indptr[i]:self.indptr[i + 1]]
+
+    def neighbors(self, i: int, down: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (vertex in layer i, neighbor) pairs, with neighbors in layer i - 1 when down, else in layer i + 1
+        """
+        if down:
+            s = slice(self.lower_indptr[i], self.lower_indptr[i + 1])
+            return self.v_by_lower[s], self.u_by_lower[s]
+        s = slice(self.upper_indptr[i], self.upper_indptr[i + 1])
+        return self.u_by_upper[s], self.v_by_upper[s]
+
+    def sweep(self, down: bool) -> range:
+        return range(1, self.count) if down else range(self.count - 2, -1, -1)
+
+
+def crossings(upper: np.ndarray, lower: np.ndarray) -> int:
+    """
+    Number of crossings between edges of two adjacent layers, given their endpoint positions in each layer,
+    as the inversions among lower positions in upper position order, counted one bit of the positions at a time
+    """
+    if len(upper) < 2:
+        return 0
+    seq = lower[np.lexsort((lower, upper))]
+    total = 0
+    for bit in range(int(seq.max()).bit_length()):
+        # pairs first differing at this bit: an earlier 1 before a later 0 within the same higher bits
+        prefix = seq >> (bit + 1)
+        ordering = np.argsort(prefix, kind='stable')
+        prefix, ones = prefix[ordering], (seq[ordering] >> bit) & 1
+        before = np.cumsum(ones) - ones
+        starts = np.flatnonzero(np.r_[True, prefix[1:] != prefix[:-1]])
+        before -= np.repeat(before[starts], np.diff(np.r_[starts, len(prefix)]))
+        total += int(before[ones == 0].sum())
+    return total
+
+
+def _exchange(at: np.ndarray, nbrs: np.ndarray, k: int) -> np.ndarray:
+    """
+    Odd-even transposition pass over a layer of k vertices: adjacent vertices swap when that crosses fewer
+    of their edges, given the layer position of each edge's vertex and of its neighbor in the previous layer
+
+    Returns the vertex position for each slot
+    """
+    order = np.arange(k)
+    if len(at) == 0 or k < 2:
+        return order
+    m = int(nbrs.max()) + 1
+    for parity in [0, 1]:
+        slot = np.empty(k, dtype=np.int64)
+        slot[order] = np.arange(k)
+        s = slot[at]
+        keys = np.sort(s * m + nbrs)
+        start = np.searchsorted(keys, np.arange(k + 1) * m)
+        # edges of the right vertex of each candidate pair, against the edges of its left vertex
+        right = (s >= 1) & ((s - 1) % 2 == parity)
+        left, q = s[right] - 1, nbrs[right]
+        above = start[left + 1] - np.searchsorted(keys, left * m + q, 'right')
+        below = np.searchsorted(keys, left * m + q, 'left') - start[left]
+        swap = np.flatnonzero(
+            np.bincount(left, weights=below, minlength=k) < np.bincount(left, weights=above, minlength=k)
+        )
+        order[swap], order[swap + 1] = order[swap + 1], order[swap].copy()
+    return order
+
+
+def _total_crossings(lay: _Layers, pos: np.ndarray) -> int:
+    return sum(
+        crossings(pos[nbrs], pos[nodes]) for i in range(1, lay.count) for nodes, nbrs in [lay.neighbors(i, True)]
+    )
+
+
+def _order(lay: _Layers, pos: np.ndarray, iterations: int, method: str = 'median') -> np.ndarray:
+    """
+    Reorder each layer by the median or barycenter of its neighbors' relative positions in the previous layer,
+    with adjacent exchanges after each sort, sweeping down then up iterations times, and return the positions
+    with the fewest crossings after any sweep
+    """
+    size = np.diff(lay.indptr)
+    best, best_crossings = pos.copy(), _total_crossings(lay, pos)
+    for _ in range(iterations):
+        for down in [True, False]:
+            for i in lay.sweep(down):
+                nodes, nbrs = lay.neighbors(i, down)
+                if len(nodes) == 0:
+                    continue
+                k = size[i]
+                prev = i - 1 if down else i + 1
+                # vertices in current order
+                current = np.empty(k, dtype=np.int64)
+                layer = lay.layer(i)
+                current[pos[layer]] = layer
+                at, rel = pos[nodes], pos[nbrs] / max(size[prev] - 1, 1)
+                count = np.bincount(at, minlength=k)
+                if method == 'median':
+                    ordering = np.lexsort((rel, at))
+                    rel = rel[ordering]
+                    starts = np.cumsum(count) - count
+                    lo = rel[np.minimum(starts + (count - 1) // 2, len(rel) - 1)]
+                    hi = rel[np.minimum(starts + count // 2, len(rel) - 1)]
+                    value = (lo + hi) / 2
+                elif method == 'barycenter':
+                    value = np.bincount(at, weights=rel, minlength=k) / np.maximum(count, 1)
+                else:
+                    raise ValueError(f'Unknown ordering method "{method}", expected "median" or "barycenter"')
+                # vertices without neighbors there keep their relative position
+                value = np.where(count > 0, value, np.arange(k) / max(k - 1, 1))
+                pos[current[np.argsort(value, kind='stable')]] = np.arange(k)
+                current[pos[layer]] = layer
+                pos[current[_exchange(pos[nodes], pos[nbrs], k)]] = np.arange(k)
+            c = _total_crossings(lay, pos)
+            if c < best_crossings:
+                best, best_crossings = pos.copy(), c
+    return best
+
+
+def _coordinates(lay: _Layers, pos: np.ndarray, iterations: int) -> np.ndarray:
+    """
+    x of every vertex, keeping layer orders at unit spacing, with parents pulled over their children and
+    then children under their parents
+    """
+    x = pos.astype(np.float64)
+    for _ in range(iterations):
+        for down in [False, True]:
+            for i in lay.sweep(down):
+                nodes, nbrs = lay.neighbors(i, down)
+                if len(nodes) == 0:
+                    continue
+                layer = lay.layer(i)
+                current = np.empty(len(layer), dtype=np.int64)
+                current[pos[layer]] = layer
+                total = np.bincount(pos[nodes], weights=x[nbrs], minlength=len(layer))
+                count = np.bincount(pos[nodes], minlength=len(layer))
+                desired = np.where(count > 0, total / np.maximum(count, 1), x[current])
+                x[current] = _place(desired)
+    return x
+
+
+def layered_layout(
+    src: np.ndarray,
+    dst: np.ndarray,
+    n: int,
+    roots: Optional[np.ndarray] = None,
+    iterations: int = 4,
+    method: str = 'median'
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Topological Sugiyama layout of n nodes given integer edge arrays, as
+    SugiyamaLayout.arrange(topological_coordinates=True, include_levels=True)
+
+    :param src: edge source node numbers, in [0, n)
+    :param dst: edge destination node numbers, in [0, n)
+    :param n: number of nodes, including any without edges
+    :param roots: optional node numbers to put on the first layer, with their components layered by
+        distance from them; otherwise nodes without in-edges start layers
+    :param iterations: number of down and up ordering and placement sweeps
+    :param method: order layers by the 'median' or 'barycenter' of neighbor positions
+
+    **Returns**
+        (x, y, level) arrays: x in [0, 1], y the layer counted up from the bottom, and level the layer
+        counted down from the roots
+    """
+    if n == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    loops = src == dst
+    src, dst = src[~loops], dst[~loops]
+
+    # break cycles by reversing edges against a peeling order
+    key = peeling_rank(src, dst, n)
+    if roots is not None and len(roots):
+        dist = _root_distance(src, dst, n, np.asarray(roots, dtype=np.int64))
+        key = dist * (key.max() + 1) + key
+    ordering = np.lexsort((np.arange(n), key))
+    at = np.empty(n, dtype=np.int64)
+    at[ordering] = np.arange(n)
+    backwards = at[src] > at[dst]
+    src, dst = np.where(backwards, dst, src), np.where(backwards, src, dst)
+
+    level = _longest_path_layers(src, dst, n)
+    layers, u, v = _insert_dummies(src, dst, level)
+
+    lay = _Layers(layers, u, v)
+    # initial order within layers: node number, then dummies
+    pos = np.empty(len(layers), dtype=np.int64)
+    pos[lay.nodes] = np.arange(len(layers)) - np.repeat(lay.indptr[:-1], np.diff(lay.indptr))
+    pos = _order(lay, pos, iterations, method)
+    x = _coordinates(lay, pos, iterations)
+
+    x = x - x.min()
+    if x.max() > 0:
+        x = x / x.max()
+    y = level.max() - level
+    return x[:n], y, level
+
+
+def layered_layout_df(
+    edges: pd.DataFrame,
+    source_column: str = 'source',
+    target_column: str = 'target',
+    nodes: Optional[Any] = None,
+    root: Optional[Any] = None,
+    iterations: int = 4,
+    method: str = 'median'
+) -> pd.DataFrame:
+    """
+    layered_layout() of an edge frame, as a frame of x, y, and level indexed by node id
+
+    :param nodes: optional node ids to include, such as those without edges
+    :param root: optional node id or list of node ids to use as roots; ids not in the graph are ignored
+    """
+    ids = [edges[source_column], edges[target_column]] + ([pd.Series(nodes)] if nodes is not None else [])
+    codes, uniques = pd.factorize(pd.concat(ids, ignore_index=True))
+    m = len(edges)
+    roots: Optional[np.ndarray] = None
+    if root is not None:
+        root_codes = pd.Index(uniques).get_indexer(pd.Index(np.atleast_1d(np.asarray(root, dtype=object))))
+        roots = root_codes[root_codes >= 0]
+    x, y, level = layered_layout(codes[:m], codes[m:2 * m], len(uniques), roots, iterations, method)
+    return pd.DataFrame({'x': x, 'y': y, 'level': level}, index=pd.Index(uniques))
@@ -6,12 +6,14 @@ from .layout import (
     circle_layout as circle_layout_base,
     fa2_layout as fa2_layout_base,
     group_in_a_box_layout as group_in_a_box_layout_base,
+    incremental_layout as incremental_layout_base,
     modularity_weighted_layout as modularity_weighted_layout_base,
     ring_categorical as ring_categorical_base,
     ring_continuous as ring_continuous_base,
     time_ring as time_ring_base
 )
 from .layout.graph import Graph
+from .layout.sugiyama import has_cycles, layered_layout_df
 from .util import deprecated, setup_logger
 logger = setup_logger(__name__)
 
@@ -38,6 +40,10 @@ class LayoutsMixin(MIXIN_BASE):
         return group_in_a_box_layout_base(self, *args, **kwargs)
     group_in_a_box_layout.__doc__ = group_in_a_box_layout_base.__doc__
 
+    def incremental_layout(self, *args, **kwargs):
+        return incremental_layout_base(self, *args, **kwargs)
+    incremental_layout.__doc__ = incremental_layout_base.__doc__
+
     def modularity_weighted_layout(self, *args, **kwargs):
         return modularity_weighted_layout_base(self, *args, **kwargs)
     modularity_weighted_layout.__doc__ = modularity_weighted_layout_base.__doc__
@@ -63,12 +69,17 @@ class LayoutsMixin(MIXIN_BASE):
                     rotate: Optional[float] = None,
                     allow_cycles = True,
                     root=None,
+                    sugiyama_engine: str = 'vectorized',
                     *args,
                     **kwargs):
         """
             Improved tree layout based on the Sugiyama algorithm.
             * rotate: rotates the layout by the given angle (in degrees)
+            * sugiyama_engine: 'vectorized' (default) lays out integer edge arrays with NumPy, and also places
+              nodes outside the first component; 'legacy' uses the object-based SugiyamaLayout
         """
+        if sugiyama_engine not in ['vectorized', 'legacy']:
+            raise ValueError(f'sugiyama_engine must be "vectorized" or "legacy", got: {sugiyama_engine}')
         g: Plottable = self
 
         if (g._edges is None) or (len(g._edges) == 0):
@@ -98,14 +109,28 @@ class LayoutsMixin(MIXIN_BASE):
         if level_col is None:
             level_col = 'level'
         g2 = g.materialize_nodes()
-        # check cycles
-        if not allow_cycles:
-            if SugiyamaLayout.has_cycles(g._edges, source_column = g2._source, target_column = g2._destination):
-                raise ValueError
-
-        triples = SugiyamaLayout.arrange(g2._edges, topological_coordinates = True, source_column = g2._source, target_column = g2._destination, include_levels = True, root = root)
-        g2._nodes[level_col] = [triples[id][2] for id in g2._nodes[g2._node]]
-        g2._nodes[y_col] = [triples[id][1] * height for id in g2._nodes[g2._node]]
+        if sugiyama_engine == 'vectorized':
+            if g2._source is None or g2._destination is None:
+                raise ValueError('tree_layout requires bound source and destination columns')
+            positions = layered_layout_df(g2._edges, g2._source, g2._destination, nodes = g2._nodes[g2._node], root = root)
+            # check cycles
+            if not allow_cycles:
+                codes = positions.index.get_indexer(pd.concat([g2._edges[g2._source], g2._edges[g2._destination]]))
+                if has_cycles(codes[:len(g2._edges)], codes[len(g2._edges):], len(positions)):
+                    raise ValueError
+        else:
+            # check cycles
+            if not allow_cycles:
+                if SugiyamaLayout.has_cycles(g._edges, source_column = g2._source, target_column = g2._destination):
+                    raise ValueError
+
+            triples = SugiyamaLayout.arrange(g2._edges, topological_coordinates = True, source_column = g2._source, target_column = g2._destination, include_levels = True, root = root)
+            positions = pd.DataFrame.from_dict(triples, orient = 'index', columns = ['x', 'y', 'level'])
+        at = positions.index.get_indexer(g2._nodes[g2._node])
+        if (at < 0).any():
+            raise KeyError(f'No tree layout position for nodes: {list(g2._nodes[g2._node][at < 0][:5])}')
+        g2._nodes[level_col] = positions['level'].values[at]
+        g2._nodes[y_col] = positions['y'].values[at] * height
         
         if (g2._nodes is None) or (len(g2._nodes) == 0):
             return g2
@@ -117,7 +142,7 @@ class LayoutsMixin(MIXIN_BASE):
                 by = level_sort_values_by,
                 ascending = level_sort_values_by_ascending))
 
-        g2._nodes[x_col] = [triples[id][0] * width for id in g2._nodes[g2._node]]
+        g2._nodes[x_col] = positions['x'].values[positions.index.get_indexer(g2._nodes[g2._node])] * width
 
         if rotate is not None:
             g2 = cast(LayoutsMixin, g2).rotate(rotate)
@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
-from typing import List, Optional
+from typing import Any, List, Optional
+from graphistry.compute.node_ids import NodeIdEncoding, node_id_encoding_of
 from graphistry.constants import NODE
 from graphistry.Plottable import Plottable
 from graphistry.util import setup_logger
@@ -264,6 +266,62 @@ def to_igraph(
     )
 
 
+def to_igraph_topology(
+    self: Plottable,
+    directed: bool = True,
+    attributes: Optional[List[str]] = None
+) -> Optional[Any]:
+    """Convert current item to an igraph Graph of only its edges, where igraph vertex i is row i of the nodes table
+
+    Unlike to_igraph(), node and edge columns are not copied into igraph attributes, so algorithm results can be assigned back to the nodes table positionally
+
+    Node ids are mapped to vertex ids via the cached node id encoding when present (see encode_node_ids())
+
+    :param directed: Whether to create a directed graph (default True)
+    :type directed: bool
+
+    :param attributes: Node and edge columns to still copy into igraph attributes, such as a weights column; names of neither are ignored (default None)
+    :type attributes: Optional[List[str]]
+
+    :returns: igraph.Graph, or None when the nodes table cannot index the edges: no pandas nodes table, duplicate or null node IDs, or edges with node IDs missing from the nodes table
+    """
+    import igraph
+
+    g = self
+    if (
+        not isinstance(g._nodes, pd.DataFrame) or not isinstance(g._edges, pd.DataFrame)
+        or g._node is None or g._source is None or g._destination is None  # noqa: W503
+    ):
+        return None
+
+    enc = node_id_encoding_of(g)
+    if enc is None:
+        enc = NodeIdEncoding.build(g._edges, g._source, g._destination, g._nodes, g._node)
+    assert enc.node_codes is not None
+
+    n = len(g._nodes)
+    if (enc.node_codes < 0).any() or (n > 0 and np.bincount(enc.node_codes).max() > 1):
+        return None
+
+    # code -> nodes table row, with a trailing -1 slot for null codes
+    row_of = np.full(len(enc.ids) + 1, -1, dtype=np.int64)
+    row_of[enc.node_codes] = np.arange(n)
+    src = row_of[enc.src_codes]
+    dst = row_of[enc.dst_codes]
+    if (src < 0).any() or (dst < 0).any():
+        return None
+
+    ig = igraph.Graph(n=n, directed=directed)
+    # igraph reads numpy edge arrays element by element, so python int pairs are faster
+    ig.add_edges(zip(src.tolist(), dst.tolist()))
+    for col in attributes or []:
+        if col in g._nodes and col != g._node:
+            ig.vs[col] = g._nodes[col].tolist()
+        if col in g._edges and col not in [g._source, g._destination]:
+            ig.es[col] = g._edges[col].tolist()
+    return ig
+
+
 compute_algs: List[str] = [
     'articulation_points',
     'authority_score',
@@ -300,6 +358,12 @@ compute_algs: List[str] = [
     'spanning_tree'
 ]
 
+# Algorithms returning graphs, which need node and edge attributes to convert back
+compute_algs_graph_output: List[str] = ['gomory_hu_tree', 'k_core', 'spanning_tree']
+
+# Parameters that may name vertices, which need the node id attribute
+compute_vertex_params: List[str] = ['vertices', 'reset_vertices', 'source', 'target', 'root', 'roots']
+
 def compute_igraph(
     self: Plottable,
     alg: str,
@@ -311,6 +375,8 @@ def compute_igraph(
 ) -> Plottable:
     """Enrich or replace graph using igraph methods
 
+    When the result is a node column, the algorithm runs on an igraph Graph of just the edges (see to_igraph_topology()), plus any columns named by string params like weights, and the column is assigned to the nodes table by row. Graph results, vertex-naming params, use_vids, and nodes tables that do not cover the edges go through to_igraph() and from_igraph().
+
     :param alg: Name of an igraph.Graph method like `pagerank`
     :type alg: str
 
@@ -387,12 +453,26 @@ def compute_igraph(
     if out_col is None:
         out_col = alg
 
+    # fast path: when the result is a node column, run on topology alone and assign it back by row, skipping attribute round trips
+    ig: Any = None
+    if not use_vids and alg not in compute_algs_graph_output and not any(k in params for k in compute_vertex_params):
+        ig = to_igraph_topology(
+            self,
+            directed=True if directed is None else directed,
+            attributes=[v for v in params.values() if isinstance(v, str)]
+        )
+    topology_only = ig is not None
+
     try:
-        ig = self.to_igraph(directed=True if directed is None else directed, use_vids=use_vids)
+        if ig is None:
+            ig = self.to_igraph(directed=True if directed is None else directed, use_vids=use_vids)
         out = getattr(ig, alg)(**params)
     except NotImplementedError as e:
         if directed is None:
-            ig = self.to_igraph(directed=False, use_vids=use_vids)
+            if topology_only:
+                ig.to_undirected(mode='each')
+            else:
+                ig = self.to_igraph(directed=False, use_vids=use_vids)
             out = getattr(ig, alg)(**params)
         else:
             raise e
@@ -425,6 +505,15 @@ def compute_igraph(
 
         raise RuntimeError(f'Unexpected output type "{type(out)}"{xtra}; should be VertexClustering, VertexDendrogram, Graph, or list_<|V|>')
 
+    if topology_only:
+        nodes_df = self._nodes.assign(**{out_col: pd.Series(clustering, index=self._nodes.index)})
+        res = self.nodes(nodes_df)
+        cached_enc = node_id_encoding_of(self)
+        if cached_enc is not None:
+            # same node rows, so the output stays encoded
+            res._node_id_encoding = cached_enc.with_tables(nodes=nodes_df)
+        return res
+
     ig.vs[out_col] = clustering
 
     return self.from_igraph(ig)
@@ -6,6 +6,7 @@ import pytest
 
 from graphistry.compute.ast import ASTNode, ASTEdge, n, e, e_undirected, e_forward
 from graphistry.compute.chain import Chain
+from graphistry.compute.chain_planner import ChainPlan
 from graphistry.tests.test_compute import CGFull
 
 
@@ -416,3 +417,42 @@ def test_preds_more_pd_2():
     )
     assert len(g2._nodes) == 2
     assert set(g2._nodes[g._node].tolist()) == set(['b2', 'c2'])
+
+
+class TestChainPlanner():
+
+    def test_explain_pushdown_and_direction(self, g_long_forwards_chain: CGFull):
+        plan = g_long_forwards_chain.chain([n(), e_forward(name='h'), n({'v': 'b'}, name='hit')], explain=True)
+        assert isinstance(plan, ChainPlan)
+        assert plan.reverse
+        assert plan.estimates == (5, 1)
+        assert [op._name for op in plan.ops] == ['hit', 'h', None]
+        assert plan.ops[1].direction == 'reverse'
+        assert plan.ops[1].source_node_match == {'v': 'b'}
+        assert plan.node_columns == ['v']
+        assert plan.edge_columns == ['index', 's', 'd']
+        assert 'run from the last written step' in str(plan)
+
+    def test_planned_matches_written_order(self, g_long_forwards_chain: CGFull):
+        g2 = g_long_forwards_chain.chain([n(), e_forward(name='h'), n({'v': 'b'}, name='hit')])
+        assert g2._nodes.sort_values('v').to_dict(orient='records') == [
+            {'v': 'a', 'w': '1', 'hit': False},
+            {'v': 'b', 'w': '2', 'hit': True}
+        ]
+        assert g2._edges.to_dict(orient='records') == [
+            {'s': 'a', 'd': 'b', 't': '1', 'e': '2', 'h': True}
+        ]
+
+    def test_multihop_not_pushed_or_reversed(self, g_long_forwards_chain: CGFull):
+        plan = g_long_forwards_chain.chain([n(), e_forward(hops=2), n({'v': 'c'})], explain=True)
+        assert not plan.reverse
+        assert plan.estimates is None
+        assert plan.ops[1].destination_node_match is None
+
+    def test_query_prunes_conservatively(self, g_long_forwards_chain: CGFull):
+        plan = g_long_forwards_chain.chain([n(query='w == "1"'), e_forward(edge_query='t > "0"'), n()], explain=True)
+        assert plan.node_columns is None
+        assert plan.edge_columns == ['index', 's', 'd', 't']
+        assert plan.ops[1].source_node_query == 'w == "1"'
+        g2 = g_long_forwards_chain.chain([n(query='w == "1"'), e_forward(edge_query='t > "0"'), n()])
+        assert g2._edges.to_dict(orient='records') == [{'s': 'a', 'd': 'b', 't': '1', 'e': '2'}]
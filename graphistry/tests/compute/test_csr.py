@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from graphistry.compute.ast import n, e_forward, e_reverse, e_undirected
+from graphistry.compute.csr import CSRIndex, csr_index_of, gather_ranges
+from graphistry.tests.test_compute import CGFull
+
+
+def hops_graph():
+    edges_df = pd.DataFrame({
+        's': ['e', 'l', 'k', 'e', 'g', 'd', 'd', 'd', 'd', 'd', 'j', 'i', 'h', 'j', 'o', 'm', 'n', 'p'],
+        'd': ['l', 'b', 'a', 'g', 'a', 'f', 'c', 'j', 'i', 'h', 'p', 'n', 'm', 'o', 'b', 'a', 'a', 'b']
+    }).assign(type='e')
+    nodes_df = pd.DataFrame({'node': list('abcdefghijklmnop')}).assign(type='n')
+    return CGFull().nodes(nodes_df, 'node').edges(edges_df, 's', 'd')
+
+
+def sorted_records(df: pd.DataFrame, cols):
+    return df[cols].sort_values(cols).to_dict(orient='records')
+
+
+def assert_same_graph(g_a, g_b):
+    assert sorted_records(g_a._nodes, [g_a._node]) == sorted_records(g_b._nodes, [g_b._node])
+    assert sorted_records(g_a._edges, [g_a._source, g_a._destination]) == sorted_records(g_b._edges, [g_b._source, g_b._destination])
+
+
+def test_gather_ranges():
+    indptr = np.array([0, 2, 2, 5])
+    perm = np.array([10, 11, 12, 13, 14])
+    assert gather_ranges(indptr, perm, np.array([2, 0])).tolist() == [12, 13, 14, 10, 11]
+    assert gather_ranges(indptr, perm, np.array([1])).tolist() == []
+    assert gather_ranges(indptr, perm, np.array([], dtype=np.int64)).tolist() == []
+
+
+def test_build_positions():
+    edges = pd.DataFrame({'s': ['a', 'a', 'b', None], 'd': ['b', 'c', 'c', 'a']})
+    csr = CSRIndex.build(edges, 's', 'd')
+    assert sorted(csr.edge_positions(['a'], 'forward').tolist()) == [0, 1]
+    assert sorted(csr.edge_positions(['c'], 'reverse').tolist()) == [1, 2]
+    assert csr.edge_positions(['a'], 'reverse').tolist() == [3]  # null source still lands on a
+    assert csr.edge_positions(['zz'], 'forward').tolist() == []
+    mask = np.array([True, False, True, True])
+    assert csr.edge_positions(['a', 'b'], 'forward', mask).tolist() == [0, 2]
+
+
+def test_build_csr_stale():
+    g = hops_graph()
+    g2 = g.build_csr()
+    assert csr_index_of(g2) is not None
+    assert csr_index_of(g) is None
+    assert csr_index_of(g2.edges(g2._edges.copy())) is None
+    assert csr_index_of(g2.nodes(g2._nodes.copy())) is not None
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'hops': 1},
+    {'hops': 2, 'direction': 'reverse'},
+    {'hops': 2, 'direction': 'undirected'},
+    {'to_fixed_point': True},
+    {'hops': 2, 'edge_match': {'type': 'e'}},
+    {'hops': 2, 'edge_query': 's != "j"'},
+    {'hops': 3, 'destination_node_match': {'type': 'n'}},
+    {'hops': 2, 'return_as_wave_front': True},
+])
+def test_hop_csr_parity(kwargs):
+    g = hops_graph()
+    seeds = pd.DataFrame({g._node: ['d', 'e']})
+    assert_same_graph(g.hop(seeds, **kwargs), g.build_csr().hop(seeds, **kwargs))
+
+
+@pytest.mark.parametrize('ops', [
+    [n({'node': 'd'}), e_forward(hops=2), n()],
+    [n({'node': 'a'}), e_reverse(to_fixed_point=True, name='up'), n()],
+    [n({'node': 'j'}), e_undirected(), n(name='hit')],
+])
+def test_chain_csr_parity(ops):
+    g = hops_graph()
+    assert_same_graph(g.chain(ops), g.build_csr().chain(ops))
+
+
+def test_chain_csr_edge_id():
+    edges = pd.DataFrame({'s': ['a', 'b', 'c'], 'd': ['b', 'c', 'a'], 'eid': [10, 20, 30]})
+    g = CGFull().edges(edges, 's', 'd', 'eid')
+    ops = [n({g.materialize_nodes()._node: 'a'}), e_forward(hops=2)]
+    g_out = g.build_csr().chain(ops)
+    assert sorted(g_out._edges['eid'].tolist()) == [10, 20]
+    assert_same_graph(g.chain(ops), g_out)
@@ -415,6 +415,71 @@ class TestMultiHopForward():
         assert g2._edges[['s', 'd']].sort_values(['s', 'd']).to_dict(orient='records') == []
 
 
+class TestHopBidirectional():
+
+    @pytest.fixture(scope='class')
+    def g_detour(self) -> CGFull:
+        """
+        a->b->c->d
+        a->x->y->z->d
+        q->a
+        """
+        return (CGFull()
+            .edges(pd.DataFrame({
+                's': ['a', 'b', 'c', 'a', 'x', 'y', 'z', 'q'],
+                'd': ['b', 'c', 'd', 'x', 'y', 'z', 'd', 'a']}),
+                's', 'd')
+            .materialize_nodes())
+
+    def test_shortest_only(self, g_detour: CGFull):
+        g2 = g_detour.hop(
+            pd.DataFrame({'id': ['a']}), hops=6, bidirectional=True,
+            target_wave_front=pd.DataFrame({'id': ['d']}), label_node_hops='hop')
+        assert g2._nodes.to_dict(orient='records') == [
+            {'id': 'a', 'hop': 0}, {'id': 'b', 'hop': 1}, {'id': 'c', 'hop': 2}, {'id': 'd', 'hop': 3}
+        ]
+        assert g2._edges.to_dict(orient='records') == [
+            {'s': 'a', 'd': 'b'}, {'s': 'b', 'd': 'c'}, {'s': 'c', 'd': 'd'}
+        ]
+
+    def test_budget(self, g_detour: CGFull):
+        g2 = g_detour.hop(
+            pd.DataFrame({'id': ['a']}), hops=2, bidirectional=True,
+            target_wave_front=pd.DataFrame({'id': ['d']}))
+        assert len(g2._nodes) == 0
+        assert len(g2._edges) == 0
+
+    def test_undirected_wave_front(self, g_detour: CGFull):
+        g2 = g_detour.hop(
+            pd.DataFrame({'id': ['d']}), direction='undirected', to_fixed_point=True, bidirectional=True,
+            target_wave_front=pd.DataFrame({'id': ['q']}), return_as_wave_front=True, label_node_hops='hop')
+        assert g2._nodes.sort_values('hop').to_dict(orient='records') == [
+            {'id': 'c', 'hop': 1}, {'id': 'b', 'hop': 2}, {'id': 'a', 'hop': 3}, {'id': 'q', 'hop': 4}
+        ]
+        assert len(g2._edges) == 4
+
+    def test_destination_match_avoids(self, g_detour: CGFull):
+        g2 = g_detour.hop(
+            pd.DataFrame({'id': ['a']}), to_fixed_point=True, bidirectional=True,
+            destination_node_match={'id': is_in(['x', 'y', 'z', 'd'])},
+            target_wave_front=pd.DataFrame({'id': ['d']}))
+        assert sorted(g2._nodes['id'].tolist()) == ['a', 'd', 'x', 'y', 'z']
+
+    def test_requires_target(self, g_detour: CGFull):
+        with pytest.raises(ValueError):
+            g_detour.hop(pd.DataFrame({'id': ['a']}), bidirectional=True)
+
+    def test_label_node_hops(self, g_detour: CGFull):
+        g2 = g_detour.hop(pd.DataFrame({'id': ['a']}), hops=3, label_node_hops='hop')
+        assert g2._nodes.sort_values('id').to_dict(orient='records') == [
+            {'id': 'a', 'hop': 0}, {'id': 'b', 'hop': 1}, {'id': 'c', 'hop': 2}, {'id': 'd', 'hop': 3},
+            {'id': 'x', 'hop': 1}, {'id': 'y', 'hop': 2}, {'id': 'z', 'hop': 3}
+        ]
+        g3 = g_detour.hop(pd.DataFrame({'id': ['a']}), to_fixed_point=True, label_node_hops='hop', return_as_wave_front=True)
+        assert 'a' not in g3._nodes['id'].tolist()
+        assert g3._nodes.set_index('id')['hop'].to_dict()['d'] == 3
+
+
 def test_hop_simple_cudf_pd():
     nodes_df = pd.DataFrame({'id': [0, 1, 2], 'label': ['a', 'b', 'c']})
     edges_df = pd.DataFrame({'src': [0, 1, 2], 'dst': [1, 2, 0]})
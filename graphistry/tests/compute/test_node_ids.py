@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from graphistry.compute.node_ids import NodeIdEncoding, node_id_encoding_of
+from graphistry.compute.csr import csr_index_of
+from graphistry.tests.test_compute import CGFull
+
+
+def g_small():
+    edges = pd.DataFrame({'s': ['a', 'b', 'c', 'd', None], 'd': ['b', 'c', 'd', 'a', 'a'], 'w': [1, 2, 3, 4, 5]})
+    nodes = pd.DataFrame({'n': ['a', 'b', 'c', 'd', 'z'], 't': ['x', 'y', 'x', 'y', 'x']})
+    return CGFull().edges(edges, 's', 'd').nodes(nodes, 'n')
+
+
+def test_build_codes():
+    g = g_small()
+    enc = NodeIdEncoding.build(g._edges, 's', 'd', g._nodes, 'n')
+    assert enc.ids.tolist() == ['a', 'b', 'c', 'd', 'z']
+    assert enc.node_codes.tolist() == [0, 1, 2, 3, 4]
+    assert enc.src_codes.tolist() == [0, 1, 2, 3, -1]
+    assert enc.dst_codes.tolist() == [1, 2, 3, 0, 0]
+    assert enc.src_codes.dtype == np.int32
+    assert enc.decode(np.array([3, 0])).tolist() == ['d', 'a']
+    assert enc.encode(['c', 'nope']).tolist() == [2, -1]
+
+
+def test_membership_null_slot():
+    enc = node_id_encoding_of(g_small().encode_node_ids())
+    table = enc.membership(['a', 'nope'])
+    assert table[enc.encode(['a'])].tolist() == [True]
+    assert not table[-1]
+
+
+def test_encode_node_ids_stale():
+    g = g_small().encode_node_ids()
+    assert node_id_encoding_of(g) is not None
+    assert node_id_encoding_of(g.edges(g._edges.copy())) is None
+    assert node_id_encoding_of(g.nodes(g._nodes.copy())) is None
+    assert node_id_encoding_of(g.bind(source='d', destination='s')) is None
+
+
+def test_encode_node_ids_materializes():
+    g = CGFull().edges(pd.DataFrame({'s': [1, 2], 'd': [2, 3]}), 's', 'd').encode_node_ids()
+    assert g._node == 'id'
+    assert node_id_encoding_of(g).ids.tolist() == [1, 2, 3]
+
+
+def test_drop_nodes_parity():
+    g = g_small()
+    g_enc = g.encode_node_ids()
+    for drop in [['a'], ['z'], ['nope'], ['b', 'd']]:
+        expected = g.drop_nodes(drop)
+        out = g_enc.drop_nodes(drop)
+        assert out._nodes.to_dict(orient='records') == expected._nodes.to_dict(orient='records')
+        assert out._edges.to_dict(orient='records') == expected._edges.to_dict(orient='records')
+        assert node_id_encoding_of(out) is not None
+
+
+def test_keep_nodes_parity():
+    g = g_small()
+    g_enc = g.encode_node_ids()
+    for keep in [['a', 'b', 'c'], ['z'], [], pd.Series(['d', 'a']), np.array(['b', 'c'])]:
+        expected = g.keep_nodes(keep)
+        out = g_enc.keep_nodes(keep)
+        assert out._nodes.to_dict(orient='records') == expected._nodes.to_dict(orient='records')
+        assert out._edges.to_dict(orient='records') == expected._edges.to_dict(orient='records')
+        assert node_id_encoding_of(out) is not None
+
+
+def test_encoding_carried_across_filters():
+    g = g_small().encode_node_ids().drop_nodes(['a']).keep_nodes(['b', 'c', 'd'])
+    enc = node_id_encoding_of(g)
+    assert enc is not None
+    assert enc.decode(enc.src_codes).tolist() == g._edges['s'].tolist()
+    assert enc.decode(enc.dst_codes).tolist() == g._edges['d'].tolist()
+    g2 = g.build_csr()
+    assert csr_index_of(g2).node_ids is enc.ids
@@ -0,0 +1,121 @@
+import numpy as np, pandas as pd, pytest
+from unittest import mock
+from graphistry.compute import ComputeMixin
+from graphistry.layout.force_atlas2 import _exact_repulsion, _numba_kernels, _repulsion, force_atlas2
+from graphistry.layouts import LayoutsMixin
+from graphistry.plotter import PlotterBase
+from graphistry.tests.common import NoAuthTestCase
+
+
+class LGFull(LayoutsMixin, ComputeMixin, PlotterBase):
+    def __init__(self, *args, **kwargs):
+        super(LGFull, self).__init__(*args, **kwargs)
+        PlotterBase.__init__(self, *args, **kwargs)
+        ComputeMixin.__init__(self, *args, **kwargs)
+        LayoutsMixin.__init__(self, *args, **kwargs)
+
+
+def clusters(k=4, size=40, seed=0):
+    rng = np.random.default_rng(seed)
+    n = k * size
+    part = np.repeat(np.arange(k), size)
+    src = rng.integers(0, n, 6 * n)
+    dst = part[src] * size + rng.integers(0, size, len(src))
+    bridges = np.arange(k - 1) * size
+    return np.concatenate([src, bridges]), np.concatenate([dst, bridges + size]), n, part
+
+
+class Test_force_atlas2(NoAuthTestCase):
+
+    def test_barnes_hut_close_to_exact(self):
+        rng = np.random.default_rng(0)
+        n = 3000
+        pos = rng.normal(size=(n, 2)) * 30
+        pos[:300] = rng.normal(size=(300, 2)) + 40
+        mass = rng.integers(1, 5, n).astype(float)
+        exact = _exact_repulsion(pos[:, 0], pos[:, 1], mass, pos[:, 0], pos[:, 1], mass, 2.)
+        approx = _repulsion(pos, mass, pos, mass, True, 0.5, 2., None)
+        err = np.linalg.norm(approx - exact, axis=1) / np.linalg.norm(exact, axis=1)
+        assert np.median(err) < 0.01
+        assert np.quantile(err, 0.99) < 0.05
+
+    def test_separates_clusters(self):
+        src, dst, n, part = clusters()
+        extents = []
+        for params in [{}, {'lin_log_mode': True, 'outbound_attraction_distribution': False}]:
+            with mock.patch('graphistry.layout.force_atlas2.EXACT_MAX_NODES', 10):
+                pos = force_atlas2(src, dst, n, max_iter=300, seed=0, **params)
+            assert np.isfinite(pos).all()
+            centers = np.array([pos[part == c].mean(axis=0) for c in range(4)])
+            spread = np.mean([np.linalg.norm(pos[part == c] - centers[c], axis=1).mean() for c in range(4)])
+            gaps = [np.linalg.norm(centers[a] - centers[b]) for a in range(4) for b in range(a)]
+            assert min(gaps) > 2 * spread
+            extents.append(np.abs(pos).max())
+        with mock.patch('graphistry.layout.force_atlas2.EXACT_MAX_NODES', 10):
+            pos = force_atlas2(src, dst, n, max_iter=300, seed=0, strong_gravity_mode=True)
+        assert np.isfinite(pos).all()
+        assert np.abs(pos).max() < extents[0]
+
+    def test_threads_and_seed(self):
+        src, dst, n, _ = clusters()
+        with mock.patch('graphistry.layout.force_atlas2.CHUNK_SIZE', 16):
+            with mock.patch('graphistry.layout.force_atlas2.EXACT_MAX_NODES', 10):
+                a = force_atlas2(src, dst, n, max_iter=20, seed=1)
+                b = force_atlas2(src, dst, n, max_iter=20, seed=1, n_threads=3)
+        assert np.allclose(a, b)
+
+    def test_warm_start(self):
+        src, dst, n, _ = clusters()
+        pos = force_atlas2(src, dst, n, max_iter=200, seed=0)
+        assert (force_atlas2(src, dst, n, pos=pos, max_iter=0) == pos).all()
+        refined = force_atlas2(src, dst, n, pos=pos, max_iter=5, seed=1)
+        restarted = force_atlas2(src, dst, n, max_iter=5, seed=1)
+        scale = np.abs(pos).max()
+        assert np.abs(refined - pos).max() < np.abs(restarted - pos).max()
+        assert np.abs(refined - pos).mean() < 0.1 * scale
+        partial = pos.copy()
+        partial[:5] = np.nan
+        assert np.isfinite(force_atlas2(src, dst, n, pos=partial, max_iter=0)).all()
+
+
+    def test_numba_kernels_match_numpy(self):
+        kernels = _numba_kernels(None)
+        if kernels is None:
+            pytest.skip('requires numba')
+        rng = np.random.default_rng(0)
+        for n in [100, 3000]:
+            pos = rng.normal(size=(n, 2)) * 30
+            mass = rng.integers(1, 5, n).astype(float)
+            expected = _repulsion(pos, mass, pos, mass, True, 0.5, 2., None)
+            assert np.allclose(_repulsion(pos, mass, pos, mass, True, 0.5, 2., None, kernels=kernels), expected)
+        src, dst, n, _ = clusters(k=2, size=10)
+        assert np.allclose(
+            force_atlas2(src, dst, n, max_iter=5, seed=0, use_numba=True),
+            force_atlas2(src, dst, n, max_iter=5, seed=0, use_numba=False),
+            rtol=1e-4
+        )
+
+
+class Test_fa2_layout(NoAuthTestCase):
+
+    def test_fa2_layout_pd(self):
+        src, dst, n, _ = clusters(k=2, size=10)
+        edges = pd.DataFrame({'s': src, 'd': dst})
+        nodes = pd.DataFrame({'n': np.arange(n + 2), 't': 'a'})
+        g = LGFull().edges(edges, 's', 'd').nodes(nodes, 'n').fa2_layout(fa2_params={'max_iter': 50, 'seed': 0})
+        assert len(g._nodes) == n + 2
+        assert not g._nodes.x.isna().any() and not g._nodes.y.isna().any()
+        assert set(g._nodes.n) == set(range(n + 2))
+
+        # rerunning warm starts from the current positions
+        g2 = g.fa2_layout(fa2_params={'max_iter': 0})
+        before = g._nodes.set_index('n').loc[range(n)]
+        after = g2._nodes.set_index('n').loc[range(n)]
+        assert np.allclose(before[['x', 'y']], after[['x', 'y']])
+
+    def test_fa2_layout_pd_ignores_unknown_params(self):
+        src, dst, n, _ = clusters(k=2, size=10)
+        g = LGFull().edges(pd.DataFrame({'s': src, 'd': dst}), 's', 'd')
+        with self.assertWarns(UserWarning):
+            g2 = g.fa2_layout(fa2_params={'niter': 3, 'max_iter': 10, 'seed': 0})
+        assert not g2._nodes.x.isna().any()
@@ -1,5 +1,8 @@
 import logging, os, pandas as pd, pytest, warnings
+from unittest import mock
 from graphistry.compute import ComputeMixin
+from graphistry.Engine import Engine
+from graphistry.layout.gib.layout_non_bulk import bundle_partitions, layout_non_bulk_mode, split_partitions
 from graphistry.layouts import LayoutsMixin
 from graphistry.plotter import PlotterBase
 from graphistry.tests.common import NoAuthTestCase
@@ -24,6 +27,64 @@ class LGFull(LayoutsMixin, ComputeMixin, PlotterBase):
         LayoutsMixin.__init__(self, *args, **kwargs)
 
 
+def degree_layout(g):
+    return g.nodes(g._nodes.assign(
+        x=g._nodes[g._node].map(g._edges[g._source].value_counts()).fillna(0),
+        y=float(len(g._edges))
+    ))
+
+
+class Test_gib_non_bulk(NoAuthTestCase):
+
+    def graph(self):
+        edges = pd.DataFrame({
+            's': ['a', 'b', 'c', 'a', 'x', 'y', 'z', 'c', 'q'],
+            'd': ['b', 'c', 'a', 'a', 'y', 'z', 'x', 'x', 'r']
+        })
+        nodes = pd.DataFrame({
+            'n': ['a', 'b', 'c', 'x', 'y', 'z', 'w', 'q', 'r'],
+            'p': [0, 0, 0, 1, 1, 1, 1, 2, 2]
+        })
+        g = LGFull().edges(edges, 's', 'd').nodes(nodes, 'n')
+        return g, g.edges(edges[edges.s != edges.d])
+
+    def test_split_partitions(self):
+        g, g_selfless = self.graph()
+        splits = split_partitions(g, g_selfless, pd.Series([1, 0]), 'p')
+        assert sorted(splits.keys()) == [0, 1]
+        for p, (nodes, edges) in splits.items():
+            expected = g_selfless.nodes(g._nodes).keep_nodes({'n': g._nodes[g._nodes.p == p].n})
+            assert nodes.n.tolist() == expected._nodes.n.tolist()
+            assert edges.to_dict('records') == expected._edges.to_dict('records')
+        # cross-partition and self edges are dropped
+        assert len(splits[1][1]) == 3 and len(splits[0][1]) == 3
+
+    def test_bundle_partitions(self):
+        parts = [(i, [0] * n, []) for i, n in enumerate([1, 5000, 10, 3000, 2])]
+        with mock.patch('graphistry.layout.gib.layout_non_bulk.MIN_TASK_WORK', 100):
+            tasks = bundle_partitions(parts, 2)
+        assert [[p for p, _, _ in task] for task in tasks] == [[1], [3], [2, 4, 0]]
+
+    def test_non_bulk_parallel(self):
+        g, g_selfless = self.graph()
+        remaining = pd.DataFrame({'p': [0, 1]})
+        serial, _, _, serial_by_size = layout_non_bulk_mode(
+            g, [], remaining, 'p', degree_layout, None, Engine.PANDAS, g_selfless, n_jobs=1
+        )
+        with mock.patch('graphistry.layout.gib.layout_non_bulk.MIN_PARALLEL_WORK', 0):
+            with mock.patch('graphistry.layout.gib.layout_non_bulk.MIN_TASK_WORK', 1):
+                parallel, _, _, parallel_by_size = layout_non_bulk_mode(
+                    g, [], remaining, 'p', degree_layout, None, Engine.PANDAS, g_selfless, n_jobs=2
+                )
+        assert len(serial) == len(parallel) == 2
+        for a, b in zip(serial, parallel):
+            pd.testing.assert_frame_equal(a, b)
+        assert (serial[1].x == [1., 1., 1., 0.]).all() and (serial[1].y == 3.).all()
+        assert (serial[0].type == 'custom').all()
+        assert sorted(serial_by_size.keys()) == sorted(parallel_by_size.keys()) == [3, 4]
+        assert all(n == 1 for n, _ in parallel_by_size.values())
+
+
 class Test_gib(NoAuthTestCase):
 
     def test_gib_pd(self):
@@ -0,0 +1,116 @@
+import numpy as np, pandas as pd, pytest
+from graphistry.compute import ComputeMixin
+from graphistry.layout.incremental import neighborhood, place_new_nodes
+from graphistry.layouts import LayoutsMixin
+from graphistry.plotter import PlotterBase
+from graphistry.tests.common import NoAuthTestCase
+
+
+class LGFull(LayoutsMixin, ComputeMixin, PlotterBase):
+    def __init__(self, *args, **kwargs):
+        super(LGFull, self).__init__(*args, **kwargs)
+        PlotterBase.__init__(self, *args, **kwargs)
+        ComputeMixin.__init__(self, *args, **kwargs)
+        LayoutsMixin.__init__(self, *args, **kwargs)
+
+
+def clustered_edges(k=3, size=30, seed=0):
+    rng = np.random.default_rng(seed)
+    n = k * size
+    part = np.repeat(np.arange(k), size)
+    src = rng.integers(0, n, 5 * n)
+    dst = part[src] * size + rng.integers(0, size, len(src))
+    return pd.DataFrame({'s': src, 'd': dst})
+
+
+class Test_incremental_helpers(NoAuthTestCase):
+
+    def test_place_new_nodes(self):
+        pos = np.array([[0., 0.], [2., 0.], [np.nan, np.nan], [np.nan, np.nan], [np.nan, np.nan]])
+        # 2 hangs off 0 and 1, 3 hangs off 2, and 4 is unreachable
+        src = np.array([2, 2, 3])
+        dst = np.array([0, 1, 2])
+        out = place_new_nodes(pos, src, dst, 0., np.random.default_rng(0))
+        assert (out[:2] == pos[:2]).all()
+        assert (out[2] == [1., 0.]).all()
+        assert (out[3] == [1., 0.]).all()
+        assert np.isfinite(out[4]).all()
+        assert 0 <= out[4, 0] <= 2 and out[4, 1] == 0
+
+    def test_neighborhood(self):
+        src = np.array([0, 1, 2, 4])
+        dst = np.array([1, 2, 3, 5])
+        seeds = np.array([True, False, False, False, False, False])
+        assert neighborhood(seeds, src, dst, 0).tolist() == seeds.tolist()
+        assert np.flatnonzero(neighborhood(seeds, src, dst, 2)).tolist() == [0, 1, 2]
+
+
+class Test_incremental_layout(NoAuthTestCase):
+
+    def setUp(self):
+        self.e1 = clustered_edges()
+        self.g1 = LGFull().edges(self.e1, 's', 'd').fa2_layout(fa2_params={'max_iter': 100, 'seed': 0})
+        self.e2 = pd.concat([self.e1, pd.DataFrame({'s': [1000, 1000, 1001], 'd': [3, 5, 1000]})], ignore_index=True)
+
+    def positions(self, g):
+        return g._nodes.set_index(g._node)[['x', 'y']]
+
+    def test_keeps_unaffected(self):
+        g2 = LGFull().edges(self.e2, 's', 'd').incremental_layout(previous=self.g1, seed=0)
+        before, after = self.positions(self.g1), self.positions(g2)
+        assert len(after) == len(before) + 2
+        assert not after.isna().any().any()
+        stats = g2._layout_stats
+        assert stats['new'] == 2 and stats['removed'] == 0 and stats['iterations'] == 50
+        # new nodes, and neighbors within 1 hop of them, may move
+        movable = {1000, 1001, 3, 5}
+        assert stats['affected'] == len(movable)
+        fixed = [i for i in before.index if i not in movable]
+        assert (after.loc[fixed] == before.loc[fixed]).all().all()
+        assert stats['displacement_p95'] == 0
+        assert stats['displacement_max'] > 0
+        # the new node lands among its neighbors rather than anywhere
+        extent = (before.max() - before.min()).max()
+        assert np.linalg.norm(after.loc[1000] - before.loc[[3, 5]].mean()) < 0.25 * extent
+
+    def test_no_refine(self):
+        g2 = LGFull().edges(self.e2, 's', 'd').incremental_layout(previous=self.g1, refine=False, seed=0)
+        before, after = self.positions(self.g1), self.positions(g2)
+        assert (after.loc[before.index] == before).all().all()
+        assert g2._layout_stats['iterations'] == 0 and g2._layout_stats['displacement_max'] == 0
+        # placed at the neighbor mean, plus jitter
+        extent = (before.max() - before.min()).max()
+        assert np.linalg.norm(after.loc[1000] - before.loc[[3, 5]].mean()) < 0.1 * extent
+
+    def test_previous_sources(self):
+        nodes = self.g1._nodes[[self.g1._node, 'x', 'y']]
+        ids = list(range(90)) + [1000, 1001]
+        from_df = LGFull().edges(self.e2, 's', 'd').incremental_layout(previous=nodes, refine=False, seed=0)
+        own = (
+            LGFull().edges(self.e2, 's', 'd')
+            .nodes(pd.DataFrame({'n': ids}).merge(nodes.rename(columns={self.g1._node: 'n'}), how='left'), 'n')
+            .incremental_layout(refine=False, seed=0)
+        )
+        assert (self.positions(from_df).loc[ids].values == self.positions(own).loc[ids].values).all()
+        with pytest.raises(ValueError):
+            LGFull().edges(self.e2, 's', 'd').incremental_layout(previous=pd.DataFrame({'x': [1.]}))
+
+    def test_changed_edges(self):
+        e2 = self.e1.iloc[1:]
+        g2 = LGFull().edges(e2, 's', 'd').incremental_layout(previous=self.g1, hops=0, seed=0)
+        stats = g2._layout_stats
+        assert stats['new'] == 0
+        assert stats['affected'] == len({self.e1.s.iloc[0], self.e1.d.iloc[0]})
+
+    def test_from_scratch(self):
+        g = LGFull().edges(self.e1, 's', 'd').incremental_layout(fa2_params={'max_iter': 10, 'seed': 0})
+        assert not g._nodes.x.isna().any()
+        assert g._layout_stats['new'] == g._layout_stats['nodes'] == len(g._nodes)
+
+    def test_unknown_fa2_params(self):
+        g = LGFull().edges(self.e2, 's', 'd')
+        with self.assertWarns(UserWarning):
+            g2 = g.incremental_layout(previous=self.g1, fa2_params={'niter': 5}, seed=0)
+        assert g2._layout_stats['iterations'] == 50
+        with self.assertWarns(UserWarning):
+            LGFull().edges(self.e1, 's', 'd').incremental_layout(fa2_params={'niter': 5, 'max_iter': 10})
@@ -1,9 +1,10 @@
 import pyarrow as pa
 
 import graphistry, logging, pandas as pd, pytest, warnings
+from unittest import mock
 from graphistry.tests.common import NoAuthTestCase
 from graphistry.constants import SRC, DST, NODE
-from graphistry.plugins.igraph import SRC_IGRAPH, DST_IGRAPH, compute_algs, compute_igraph, layout_algs, layout_igraph
+from graphistry.plugins.igraph import SRC_IGRAPH, DST_IGRAPH, compute_algs, compute_igraph, layout_algs, layout_igraph, to_igraph_topology
 
 try:
     import igraph
@@ -681,6 +682,48 @@ class Test_igraph_compute(NoAuthTestCase):
         g3 = g2.compute_igraph('community_optimal_modularity')
         assert g3._nodes.community_optimal_modularity.equals(g2b._nodes.community_optimal_modularity)
 
+    def test_topology_matches_attributed(self):
+        g = graphistry.edges(edges4_df, 's', 'd').materialize_nodes()
+        g = g.nodes(g._nodes.assign(t='x').sample(frac=1, random_state=0))
+        cases = [
+            ('pagerank', {}),
+            ('pagerank', {'params': {'weights': 'w'}}),
+            ('articulation_points', {}),
+            ('betweenness', {}),
+            ('coreness', {}),
+            ('community_multilevel', {'directed': False, 'params': {'weights': 'w'}}),
+            ('community_optimal_modularity', {}),
+        ]
+        for alg, opts in cases:
+            g2 = compute_igraph(g, alg, **opts)
+            with mock.patch('graphistry.plugins.igraph.to_igraph_topology', return_value=None):
+                expected = compute_igraph(g, alg, **opts)
+            # rows and index kept, edges untouched
+            assert g2._nodes.index.equals(g._nodes.index)
+            assert g2._nodes[g._node].equals(g._nodes[g._node])
+            assert list(g2._nodes.columns) == list(g._nodes.columns) + [alg]
+            assert g2._edges is g._edges
+            assert (
+                g2._nodes.set_index(g._node)[alg].sort_index().values.tolist()
+                == expected._nodes.set_index(g._node)[alg].sort_index().values.tolist()
+            ), alg
+
+    def test_topology_fallback(self):
+        g = graphistry.edges(edges3_df, 'a', 'b').nodes(nodes3_df, 'n')
+        ig = to_igraph_topology(g)
+        assert ig.vcount() == 4 and ig.ecount() == 3 and ig.vs.attributes() == [] and ig.es.attributes() == []
+        assert [e.tuple for e in ig.es] == [(2, 3), (3, 0), (0, 1)]
+        assert to_igraph_topology(g, attributes=['i', 't', 'nope']).es['i'] == [2, 4, 6]
+        assert to_igraph_topology(g.nodes(nodes3_df.iloc[:3])) is None
+        assert to_igraph_topology(g.nodes(pd.concat([nodes3_df, nodes3_df]))) is None
+        assert to_igraph_topology(graphistry.edges(edges3_df, 'a', 'b')) is None
+
+        # encoded graphs stay encoded, including subgraphs sharing the parent's codes
+        g2 = g.encode_node_ids().keep_nodes(['a', 'b', 'd'])
+        assert [e.tuple for e in to_igraph_topology(g2).es] == [(2, 0), (0, 1)]
+        g3 = g2.compute_igraph('pagerank')
+        assert g3._node_id_encoding is not None and g3._node_id_encoding.matches(g3)
+
     def test_all_calls(self):
         overrides = {
             'bipartite_projection': {
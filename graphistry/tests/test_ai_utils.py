@@ -0,0 +1,118 @@
+import numpy as np, pandas as pd, pytest, unittest
+
+import graphistry
+from graphistry.ai_utils import (
+    FaissVectorSearch, estimate_eps, infer_graph, infer_neighbors, infer_self_graph, sample_local_edges
+)
+from graphistry.constants import DISTANCE, QUERY
+from graphistry.utils.lazy_import import lazy_import_has_min_dependancy
+
+has_min_dependancy, _ = lazy_import_has_min_dependancy()
+try:
+    import faiss  # noqa: F401
+    has_faiss = True
+except ImportError:
+    has_faiss = False
+
+
+class TestInferGraph(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 200
+        self.features = pd.DataFrame(rng.normal(size=(n, 4)), columns=['a', 'b', 'c', 'd'])
+        self.batch = pd.DataFrame(rng.normal(size=(20, 4)), columns=['a', 'b', 'c', 'd'])
+        self.edges = pd.DataFrame({'s': rng.integers(0, n, 3 * n), 'd': rng.integers(0, n, 3 * n)})
+        self.g = graphistry.nodes(pd.DataFrame({'n': np.arange(n)}), 'n').edges(self.edges, 's', 'd')
+        self.g._node_features = self.features
+        self.g._node_embedding = self.features[['a', 'b']].rename(columns={'a': 'x', 'b': 'y'})
+
+    @pytest.mark.skipif(not has_min_dependancy, reason="requires ai feature dependencies")
+    def test_neighbors_match_brute_force(self):
+        rows, cols, dists, eps, nn = infer_neighbors(self.features, self.batch, n_neighbors=5)
+        D = np.linalg.norm(self.batch.values[:, None, :] - self.features.values[None, :, :], axis=2)
+        assert np.isclose(eps, min(abs(D.mean() - D.std()), D.mean()), atol=1e-4)
+        for i in range(len(self.batch)):
+            expected = np.argsort(D[i])[:5]
+            expected = expected[D[i][expected] < eps]
+            assert set(cols[rows == i]) == set(expected)
+            assert nn[i] == len(expected)
+        assert np.allclose(dists, D[rows, cols], atol=1e-4)
+
+    @pytest.mark.skipif(not has_min_dependancy, reason="requires ai feature dependencies")
+    def test_estimate_eps_sampled(self):
+        M = self.features.values.astype(np.float32)
+        m, std = estimate_eps(M, M)
+        m2, std2 = estimate_eps(M, M, max_pairs=5000)
+        assert abs(m - m2) < 0.2 and abs(std - std2) < 0.2
+
+    def test_sample_local_edges(self):
+        edges = pd.DataFrame({'s': [0, 1, 2, 2], 'd': [1, 2, 0, 3]})
+        g = graphistry.edges(edges, 's', 'd')
+        # 3 has only an in edge, 4 and 99 are not in the graph
+        sampled = sample_local_edges(g, edges, np.array([3, 0, 0, 4, 99]), 5)
+        assert len(sampled) == 15
+        assert (sampled.iloc[:5]['d'] == 3).all()
+        assert sampled.iloc[5:].apply(lambda r: 0 in (r.s, r.d), axis=1).all()
+
+    @pytest.mark.skipif(not has_min_dependancy, reason="requires ai feature dependencies")
+    def test_infer_graph(self):
+        emb = self.batch[['a', 'b']].rename(columns={'a': 'x', 'b': 'y'})
+        df = pd.DataFrame({'v': np.arange(len(self.batch))})
+        g2 = infer_graph(self.g, emb, self.batch, None, df, sample=2, n_neighbors=3)
+        new_edges = g2._edges[g2._edges['_batch'] == 1]
+        assert new_edges['d'].isin(np.arange(200, 220)).all()
+        assert new_edges['s'].isin(np.arange(200)).all()
+        assert (g2._edges['_batch'] == 0).any()
+        assert set(g2._nodes['n']) >= set(new_edges['s'])
+
+    @pytest.mark.skipif(not has_min_dependancy, reason="requires ai feature dependencies")
+    def test_infer_self_graph(self):
+        df = pd.DataFrame({'v': np.arange(len(self.batch))})
+        g2 = infer_self_graph(self.g, None, self.batch, None, df, eps=10.0, n_neighbors=3)
+        assert len(g2._edges) == 2 * len(self.batch)
+        assert (g2._edges['s'] != g2._edges['d']).all()
+
+
+class TestFaissVectorSearch(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.M = rng.normal(size=(2000, 16)).astype(np.float32)
+
+    @pytest.mark.skipif(not has_faiss, reason="requires faiss")
+    def test_index_types_batched(self):
+        for index_type in ['flat', 'ivf', 'hnsw', 'pq', 'ivfpq']:
+            search = FaissVectorSearch(self.M, index_type=index_type, nprobe=16)
+            indices, distances = search.search(self.M[:10], k=3)
+            assert indices.shape == (10, 3) and distances.shape == (10, 3)
+            assert (indices[:, 0] == np.arange(10)).mean() >= 0.8, index_type
+            index, _ = search.search(self.M[3], k=3)
+            assert index.shape == (3,)
+        with pytest.raises(ValueError):
+            FaissVectorSearch(self.M, index_type='annoy')
+
+    @pytest.mark.skipif(not has_faiss, reason="requires faiss")
+    def test_search_df(self):
+        search = FaissVectorSearch(self.M)
+        df = pd.DataFrame({'v': np.arange(len(self.M))})
+        q = pd.DataFrame(self.M[[5, 7]])
+        results = search.search_df(q, df, 2)
+        assert len(results) == 4
+        assert set(results[results[QUERY] == 1]['v']) >= {7}
+        assert results[DISTANCE].is_monotonic_increasing
+        assert QUERY not in search.search_df(q.iloc[:1], df, 2).columns
+
+    @pytest.mark.skipif(not has_faiss or not has_min_dependancy, reason="requires faiss and ai feature dependencies")
+    def test_save_load_search_instance(self):
+        import os, tempfile
+        g = graphistry.nodes(pd.DataFrame(self.M[:200], columns=[f'c{i}' for i in range(16)]))
+        g = g.featurize(feature_engine='pandas', use_scaler='none')
+        g.build_index(index_type='hnsw')
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'search')
+            g.save_search_instance(path)
+            assert os.path.exists(f'{path}.faiss')
+            g2 = g.load_search_instance(path)
+        assert g2.search_index.index_type == 'hnsw'
+        assert g2.search_index.index.ntotal == 200
@@ -356,3 +356,73 @@ class TestArrowUploader_Comms(unittest.TestCase):
 
         au.sso_get_token(state='ignored-valid')
         assert au.token == '123'
+
+    def test_arrow_to_chunks_roundtrip(self):
+        import pyarrow as pa
+        au = ArrowUploader(token='xx')
+        arr = pa.Table.from_pandas(pd.DataFrame({'x': range(1000), 'y': ['a'] * 1000}), preserve_index=False)
+        chunks = list(au.arrow_to_chunks(arr, 300))
+        assert len(chunks) == 5
+        assert all(len(c) > 0 for c in chunks)
+        assert pa.ipc.open_file(pa.BufferReader(b''.join(chunks))).read_all().equals(arr)
+
+    def test_arrow_to_buffer_compressed_dictionary(self):
+        import pyarrow as pa
+        au = ArrowUploader(token='xx')
+        arr = pa.Table.from_pandas(
+            pd.DataFrame({'x': range(1000), 'y': ['a', 'b'] * 500, 'z': [str(i) for i in range(1000)]}),
+            preserve_index=False)
+        plain = au.arrow_to_buffer(arr)
+        for compression in ['lz4', 'zstd']:
+            buf = au.arrow_to_buffer(arr, compression=compression, compression_level=None if compression == 'lz4' else 3, dictionary_encode=True)
+            assert len(buf) < len(plain)
+            out = pa.ipc.open_file(pa.BufferReader(buf)).read_all()
+            assert pa.types.is_dictionary(out.schema.field('y').type)
+            assert not pa.types.is_dictionary(out.schema.field('z').type)
+            assert out.to_pandas().astype({'y': str}).equals(arr.to_pandas())
+        chunks = b''.join(au.arrow_to_chunks(arr, 300, compression='zstd', dictionary_encode=True))
+        assert pa.ipc.open_file(pa.BufferReader(chunks)).read_all().to_pandas().astype({'y': str}).equals(arr.to_pandas())
+        with pytest.raises(ValueError):
+            au.arrow_to_buffer(arr, compression='gzip2')
+
+    @mock.patch('graphistry.arrow_uploader.pooled_session')
+    def test_post_as_files_concurrent_pooled(self, mock_session):
+        import pyarrow as pa
+
+        def post(url, **kwargs):
+            if url.endswith('/api/v2/files/'):
+                return self._mock_response(json_data={'file_id': kwargs['json']['name']})
+            if url.endswith('/api/v2/upload/datasets/'):
+                return self._mock_response(json_data={'success': True, 'data': {'dataset_id': 'ds'}})
+            if 'data' in kwargs and not isinstance(kwargs['data'], bytes):
+                kwargs['data'] = b''.join(kwargs['data'])
+            pa.ipc.open_file(pa.BufferReader(kwargs['data'])).read_all()
+            return self._mock_response(json_data={'is_valid': True, 'is_uploaded': True})
+
+        mock_session.return_value.post.side_effect = post
+
+        au = ArrowUploader(
+            token='xx', name='g',
+            edges=pa.Table.from_pandas(pd.DataFrame({'s': [1], 'd': [2]})),
+            nodes=pa.Table.from_pandas(pd.DataFrame({'n': [1, 2]})),
+            edge_encodings={'bindings': {'source': 's', 'destination': 'd'}},
+            node_encodings={'bindings': {'node': 'n'}})
+        au.post(as_files=True, memoize=False, chunk_size=1)
+        assert au.dataset_id == 'ds'
+        urls = [c.args[0] for c in mock_session.return_value.post.call_args_list]
+        assert sum(u.endswith('/api/v2/files/') for u in urls) == 2
+        assert sum('/api/v2/upload/files/' in u for u in urls) == 2
+        assert urls[-1].endswith('/api/v2/upload/datasets/')
+        mock_session.assert_called_once()
+
+    def test_session_per_uploader_without_cookies(self):
+        import requests, urllib.request
+
+        a = ArrowUploader(token='xx')
+        b = ArrowUploader(token='yy')
+        assert a.session is a.session
+        assert a.session is not b.session
+        assert a.session.get_adapter('https://x') is b.session.get_adapter('https://y')
+        cookie = requests.cookies.create_cookie('k', 'v', domain='x.com')
+        a.session.cookies.set_cookie_if_ok(cookie, urllib.request.Request('https://x.com'))
+        assert len(a.session.cookies) == 0
@@ -116,6 +116,46 @@ class TestComputeMixin(NoAuthTestCase):
         ]
         assert g2._node == "id"
 
+    def test_degrees_weighted(self):
+        cg = CGFull()
+        g = cg.edges(
+            pd.DataFrame({"s": ["a", "b", "c", "a"], "d": ["b", "a", "d", "b"], "w": [1.0, 2.0, None, 0.5]}), "s", "d"
+        )
+        g2 = g.get_degrees(weight="w")
+        assert g2._nodes.to_dict(orient="records") == [
+            {"id": "a", "degree_in": 2.0, "degree_out": 1.5, "degree": 3.5},
+            {"id": "b", "degree_in": 1.5, "degree_out": 2.0, "degree": 3.5},
+            {"id": "c", "degree_in": 0.0, "degree_out": 0.0, "degree": 0.0},
+            {"id": "d", "degree_in": 0.0, "degree_out": 0.0, "degree": 0.0},
+        ]
+
+    def test_degrees_overwrite_and_nulls(self):
+        cg = CGFull()
+        g = (
+            cg.edges(pd.DataFrame({"s": ["a", "b", None], "d": ["b", "a", "a"]}), "s", "d")
+            .nodes(pd.DataFrame({"n": ["a", "b", "z"], "degree": ["x", "y", "z"]}), "n")
+        )
+        g2 = g.get_degrees()
+        assert g2._nodes.to_dict(orient="records") == [
+            {"n": "a", "degree_in": 1, "degree_out": 1, "degree": 2},
+            {"n": "b", "degree_in": 1, "degree_out": 1, "degree": 2},
+            {"n": "z", "degree_in": 0, "degree_out": 0, "degree": 0},
+        ]
+
+    def test_degrees_encoded(self):
+        cg = CGFull()
+        g = cg.edges(
+            pd.DataFrame({"s": ["a", "b", "c"], "d": ["b", "a", "d"]}), "s", "d"
+        ).encode_node_ids()
+        g2 = g.get_degrees()
+        assert g2._nodes.to_dict(orient="records") == [
+            {"id": "a", "degree_in": 1, "degree_out": 1, "degree": 2},
+            {"id": "b", "degree_in": 1, "degree_out": 1, "degree": 2},
+            {"id": "c", "degree_in": 0, "degree_out": 1, "degree": 1},
+            {"id": "d", "degree_in": 1, "degree_out": 0, "degree": 1},
+        ]
+        assert g2._node_id_encoding is not None and g2._node_id_encoding.matches(g2)
+
     def test_get_topological_levels_mt(self):
         cg = CGFull()
         g = cg.edges(
@@ -162,6 +202,27 @@ class TestComputeMixin(NoAuthTestCase):
             {"id": "b", "level": 1},
         ]
 
+    def test_get_topological_levels_dag(self):
+        cg = CGFull()
+        g = cg.edges(
+            pd.DataFrame({"s": ["a", "a", "b", "c", "d", "a", "d"], "d": ["b", "c", "d", "d", "e", "e", "d"]}), "s", "d"
+        ).get_topological_levels()
+        assert g._nodes.to_dict(orient="records") == [
+            {"id": "a", "level": 0},
+            {"id": "b", "level": 1},
+            {"id": "c", "level": 1},
+            {"id": "d", "level": 2},
+            {"id": "e", "level": 3},
+        ]
+
+    def test_get_topological_levels_cycle_highest_degree(self):
+        cg = CGFull()
+        g = cg.edges(
+            pd.DataFrame({"s": ["a", "b", "c", "c", "c"], "d": ["b", "c", "a", "x", "y"]}), "s", "d"
+        ).get_topological_levels(warn_cycles=False)
+        levels = {r["id"]: r["level"] for r in g._nodes.to_dict(orient="records")}
+        assert levels == {"c": 0, "a": 1, "x": 1, "y": 1, "b": 2}
+
     def test_drop_nodes(self):
         cg = CGFull()
         g = cg.edges(
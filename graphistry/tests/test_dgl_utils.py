@@ -1,7 +1,10 @@
 import unittest
 import pytest
 import graphistry
+import numpy as np
 import pandas as pd
+from collections import Counter
+from graphistry.dgl_utils import pandas_to_sparse_adjacency, reindex_edgelist
 from graphistry.util import setup_logger
 from graphistry.utils.lazy_import import lazy_dgl_import
 
@@ -177,3 +180,40 @@ class TestDGL(unittest.TestCase):
             use_edge_scaler="robust",
         )
         self._test_cases_dgl(g2)
+
+
+    @pytest.mark.skipif(not has_dgl, reason="requires DGL dependencies")
+    def test_build_gnn_reuses_relabeling(self):
+        from unittest import mock
+        from graphistry import dgl_utils
+        g = graphistry.edges(edf, src, dst).nodes(ndf, "ip")
+        kwargs = dict(X_edges=good_cols_without_label, X_nodes=use_cols, featurize_edges=False)
+        with mock.patch.object(dgl_utils, "reindex_edges", wraps=dgl_utils.reindex_edges) as reindex:
+            g2 = g.build_gnn(**kwargs)
+            g3 = g.build_gnn(**kwargs)
+            assert reindex.call_count == 1
+            assert (g2._entity_to_index.entities == g3._entity_to_index.entities).all()
+            g.nodes(ndf.copy(), "ip").build_gnn(**kwargs)
+            assert reindex.call_count == 2
+
+
+class TestReindexEdgelist(unittest.TestCase):
+
+    def test_matches_counter_order(self):
+        df = edf[[src, dst]].copy()
+        cnt = Counter(pd.concat([df[src], df[dst]], axis=0))
+        expected = {k: i for i, (k, c) in enumerate(cnt.most_common())}
+        df2, ordered_nodes_dict = reindex_edgelist(df, src, dst)
+        assert list(ordered_nodes_dict.items()) == list(expected.items())
+        assert (df2["_src_implicit"] == df[src].map(expected)).all()
+        assert (df2["_dst_implicit"] == df[dst].map(expected)).all()
+        index_to_entity = ordered_nodes_dict.inverse()
+        assert [index_to_entity[i] for i in range(3)] == list(expected.keys())[:3]
+        assert "not a node" not in ordered_nodes_dict
+
+    def test_sparse_adjacency(self):
+        df = pd.DataFrame({"s": ["a", "b", "a"], "d": ["b", "c", "c"], "w": [1.0, 2.0, 3.0]})
+        sp_mat, ordered_nodes_dict = pandas_to_sparse_adjacency(df, "s", "d", "w")
+        assert list(ordered_nodes_dict.keys()) == ["a", "b", "c"]
+        assert np.allclose(sp_mat.toarray(), [[0, 1, 3], [0, 0, 2], [0, 0, 0]])
+        assert list(df.columns) == ["s", "d", "w"]
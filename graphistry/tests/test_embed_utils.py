@@ -5,7 +5,7 @@ import unittest
 import graphistry
 import numpy as np
 
-from graphistry.embed_utils import check_cudf
+from graphistry.embed_utils import check_cudf, iter_triplet_blocks, iter_unlinked_triplet_blocks, SubgraphIterator
 from graphistry.utils.lazy_import import lazy_embed_import
 
 import logging
@@ -204,6 +204,51 @@ class TestEmbedCUDF(unittest.TestCase):
             self.assertNotEqual(np.linalg.norm(g._kg_embeddings - g2._kg_embeddings), 0)
 
 
+class TestTripletBlocks(unittest.TestCase):
+
+    def test_iter_triplet_blocks(self):
+        src, rel, dst = np.array([2, 0]), np.array([0, 1]), np.array([0, 1, 2])
+        blocks = list(iter_triplet_blocks(src, rel, dst, block_size=4))
+        assert len(blocks) == 3
+        triplets = np.concatenate(blocks)
+        expected = [(s, r, d) for s in src for r in rel for d in dst if s != d]
+        assert [tuple(t) for t in triplets] == expected
+
+    def test_iter_unlinked_triplet_blocks(self):
+        num_nodes = 4
+        triplets = np.array([[0, 0, 1], [2, 0, 1], [1, 1, 3]])
+        blocks = list(iter_unlinked_triplet_blocks(triplets, num_nodes, block_size=2))
+        candidates = [tuple(t) for b in blocks for t in b]
+        existing = {tuple(t) for t in triplets}
+        heads = {(h, r) for h, r, _ in existing}
+        tails = {(t, r) for _, r, t in existing}
+        expected = {
+            (a, r, x) for a in range(num_nodes) for r in range(2) for x in range(a + 1, num_nodes)
+            if ((a, r) in heads and (a, r, x) not in existing) or ((a, r) in tails and (x, r, a) not in existing)
+        }
+        assert len(candidates) == len(expected) and set(candidates) == expected
+
+
+class TestSubgraphIterator(unittest.TestCase):
+
+    @pytest.mark.skipif(not dep_flag, reason="requires ai feature dependencies")
+    def test_seeded(self):
+        _, torch, _, dgl, _, _, _, _ = lazy_embed_import()
+        g = dgl.graph((torch.tensor([0, 1, 2, 3, 4]), torch.tensor([1, 2, 3, 4, 0])), num_nodes=5)
+        g.edata[dgl.ETYPE] = torch.tensor([0, 1, 0, 1, 0])
+        a = SubgraphIterator(g, sample_size=3, num_steps=4, seed=1)
+        b = SubgraphIterator(g, sample_size=3, num_steps=4, seed=1, steps_per_block=1)
+        first_pass = [a[i] for i in range(4)]
+        for i, (sub_g, samples, labels) in enumerate(first_pass):
+            assert torch.equal(samples, b[i][1])
+            assert samples.shape == (6, 3) and labels.tolist() == [1] * 3 + [0] * 3
+            assert sub_g.num_edges() == 6
+        # positives cover every edge once per epoch of edges
+        positives = torch.cat([samples[:3] for _, samples, _ in first_pass])[:5]
+        assert sorted(positives[:, 0].tolist()) == [0, 1, 2, 3, 4]
+        # later passes draw new steps
+        assert any(not torch.equal(a[i][1], first_pass[i][1]) for i in range(4))
+
 
 if __name__ == "__main__":
     unittest.main()
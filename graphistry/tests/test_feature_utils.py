@@ -11,6 +11,9 @@ import unittest
 import warnings
 
 from graphistry.feature_utils import (
+    ColumnwiseVectorizer,
+    impute_and_scale_df,
+    is_sparse_df,
     process_dirty_dataframes,
     process_nodes_dataframes,
     resolve_feature_engine,
@@ -442,5 +445,129 @@ class TestFeatureMethods(unittest.TestCase):
 
 
 
+class TestSparseFeaturize(unittest.TestCase):
+
+    def setUp(self):
+        self.edf = pd.DataFrame({'src': [0, 1, 2, 3, 0], 'dst': [1, 2, 3, 0, 2], 'w': [1., 2., 3., 4., 5.]})
+
+    @pytest.mark.skipif(not has_min_dependancy, reason="requires ai feature dependencies")
+    def test_edge_featurize_stays_sparse(self):
+        g = graphistry.edges(self.edf, 'src', 'dst')
+        dense = g.featurize(kind='edges', feature_engine='pandas', memoize=False)
+        sparse = g.featurize(kind='edges', feature_engine='pandas', sparse=True, memoize=False)
+        assert is_sparse_df(sparse._edge_features)
+        assert is_sparse_df(sparse._edge_features_raw)
+        assert np.allclose(sparse._edge_features_raw.sparse.to_dense().values, dense._edge_features_raw.values)
+        X, _ = sparse.transform(self.edf, None, kind='edges', return_graph=False)
+        assert is_sparse_df(X)
+        assert np.allclose(X.sparse.to_dense().values, sparse._edge_features.sparse.to_dense().values)
+
+    @pytest.mark.skipif(not has_min_dependancy, reason="requires ai feature dependencies")
+    def test_scalers(self):
+        X = self.edf.astype(pd.SparseDtype('float64', 0.0))
+        for scaler in ['standard', 'robust']:
+            X2, _ = impute_and_scale_df(X, use_scaler=scaler)
+            assert is_sparse_df(X2), scaler
+            assert (X2.sparse.to_dense().values[X.sparse.to_dense().values == 0] == 0).all(), scaler
+        X2, _ = impute_and_scale_df(X, use_scaler='minmax')
+        assert not is_sparse_df(X2)
+
+
+class TestColumnwiseVectorizer(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 500
+        self.df = pd.DataFrame({
+            'num': rng.normal(size=n),
+            'lo': rng.choice(['a', 'b', None], n),
+            'hi': [f'u{i}' for i in rng.integers(0, 200, n)],
+            'when': pd.date_range('2020-01-01', periods=n, freq='h'),
+        })
+
+    def vectorizer(self, n_jobs):
+        from sklearn.preprocessing import OrdinalEncoder
+        return ColumnwiseVectorizer(
+            cardinality_threshold=40,
+            high_card_cat_transformer=OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1),
+            n_jobs=n_jobs
+        )
+
+    @pytest.mark.skipif(not has_min_dependancy, reason="requires ai feature dependencies")
+    def test_fit_transform(self):
+        v = self.vectorizer(1)
+        X = v.fit_transform(self.df).toarray()
+        assert v.get_feature_names_out() == ['num', 'lo_', 'lo_a', 'lo_b', 'hi', 'when']
+        assert X.shape == (len(self.df), 6)
+        assert np.allclose(X[:, 0], self.df['num'])
+        assert (X[:, 1:4].sum(axis=1) == 1).all()
+        assert np.allclose(v.transform(self.df.iloc[:7]).toarray(), X[:7])
+        report = v.timing_report()
+        assert set(report['group']) == {'numeric', 'low_card_cat', 'high_card_cat', 'datetime'}
+        assert report.set_index('column').loc['hi', 'encoder'] == 'OrdinalEncoder'
+
+    @pytest.mark.skipif(not has_min_dependancy, reason="requires ai feature dependencies")
+    def test_process_pool_matches_serial(self):
+        X = self.vectorizer(1).fit_transform(self.df).toarray()
+        v = self.vectorizer(2)
+        assert np.allclose(v.fit_transform(self.df).toarray(), X)
+        assert len(v.transformers_) == len(self.df.columns)
+
+
+class TestFeaturizeChunked(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 1000
+        self.ndf = pd.DataFrame({
+            'id': np.arange(n), 'a': rng.normal(size=n), 'b': rng.normal(size=n) * 3 + 1, 'lbl': rng.integers(0, 2, n) * 1.
+        })
+        self.g = graphistry.nodes(self.ndf, 'id')
+        self.kwargs = dict(feature_engine='pandas', use_scaler='standard', y=['lbl'], memoize=False)
+
+    @pytest.mark.skipif(not has_min_dependancy, reason="requires ai feature dependencies")
+    def test_matches_featurize(self):
+        full = self.g.featurize(**self.kwargs)
+        g2 = self.g.featurize_chunked(chunk_size=300, fit_sample=len(self.ndf), **self.kwargs)
+        assert g2._nodes is self.ndf
+        assert np.allclose(g2._node_features.values, full._node_features.values, atol=1e-4)
+        assert g2._node_target.shape == (len(self.ndf), 1)
+        # scaler refit over all chunks recovers the full fit from a small sample
+        g3 = self.g.featurize_chunked(chunk_size=300, fit_sample=100, partial_fit=True, **self.kwargs)
+        assert np.allclose(g3._node_features.values, full._node_features.values, atol=1e-4)
+
+    @pytest.mark.skipif(not has_min_dependancy, reason="requires ai feature dependencies")
+    def test_parquet_source_and_store(self):
+        import os, tempfile
+        from graphistry.utils.feature_store import FeatureStore
+        full = self.g.featurize(**self.kwargs)
+        with tempfile.TemporaryDirectory() as d:
+            self.ndf.to_parquet(os.path.join(d, 'nodes.parquet'))
+            g2 = graphistry.bind(node='id').featurize_chunked(
+                source=os.path.join(d, 'nodes.parquet'), store=os.path.join(d, 'features'),
+                chunk_size=300, fit_sample=len(self.ndf), **self.kwargs
+            )
+            assert len(FeatureStore(os.path.join(d, 'features'))) == len(self.ndf)
+        assert list(g2._nodes.columns) == ['id']
+        assert (g2._nodes['id'].values == self.ndf['id'].values).all()
+        assert np.allclose(g2._node_features.values, full._node_features.values, atol=1e-4)
+
+    @pytest.mark.skipif(not has_min_dependancy, reason="requires ai feature dependencies")
+    def test_parquet_source_without_node_binding(self):
+        import os, tempfile
+        ndf = self.ndf.drop(columns=['id'])
+        with tempfile.TemporaryDirectory() as d:
+            ndf.to_parquet(os.path.join(d, 'nodes.parquet'))
+            g2 = graphistry.bind().featurize_chunked(
+                source=os.path.join(d, 'nodes.parquet'), chunk_size=300, fit_sample=200, **self.kwargs
+            )
+        assert len(g2._nodes) == len(g2._node_features) == len(ndf)
+        assert (g2._nodes[g2._node].values == np.arange(len(ndf))).all()
+        assert (g2._nodes.index == g2._node_features.index).all()
+        g3 = graphistry.bind().featurize_chunked(source=ndf, chunk_size=300, fit_sample=200, **self.kwargs)
+        assert g3._nodes is ndf
+        assert len(g3._node_features) == len(ndf)
+
+
 if __name__ == "__main__":
     unittest.main()
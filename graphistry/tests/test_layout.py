@@ -4,7 +4,8 @@ import numpy as np, pandas as pd, pytest, unittest
 from graphistry.compute import ComputeMixin
 from graphistry.layouts import LayoutsMixin
 from graphistry.layout.graph import Edge, Graph, Vertex, GraphBase
-from graphistry.layout.sugiyama import SugiyamaLayout
+from graphistry.layout.sugiyama import SugiyamaLayout, has_cycles, layered_layout_df
+from graphistry.layout.sugiyama.layeredLayout import crossings
 from graphistry.layout.utils import EdgeViewer, Layer, Rectangle, DummyVertex, route_with_rounded_corners, Poset 
 from graphistry.plotter import PlotterBase
 
@@ -729,3 +730,53 @@ class TestLayout(unittest.TestCase):
         SugiyamaLayout(component)
         #pos = 
         SugiyamaLayout.arrange(g, root = None)
+
+
+class TestLayeredLayout(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        n = 300
+        parent = np.array([rng.integers(max(0, i - 20), i) for i in range(1, n)])
+        self.tree = pd.DataFrame({'s': parent, 'd': np.arange(1, n)})
+        extra = pd.DataFrame({'s': rng.integers(0, n // 2, 30), 'd': rng.integers(n // 2, n, 30)})
+        self.dag = pd.concat([self.tree, extra], ignore_index = True)
+
+    def test_crossings(self):
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            a, b = rng.integers(0, 7, 15), rng.integers(0, 9, 15)
+            expected = sum(1 for i in range(15) for j in range(15) if a[i] < a[j] and b[i] > b[j])
+            assert crossings(a, b) == expected
+
+    def test_levels_match_legacy(self):
+        pos = layered_layout_df(self.dag, 's', 'd')
+        legacy = SugiyamaLayout.arrange(self.dag, topological_coordinates = True, source_column = 's', target_column = 'd', include_levels = True)
+        assert all(pos.loc[k, 'level'] == v[2] for k, v in legacy.items())
+        assert (pos['y'] == pos['level'].max() - pos['level']).all()
+        assert pos['x'].between(0, 1).all()
+
+    def test_tree_without_crossings(self):
+        pos = layered_layout_df(self.tree, 's', 'd')
+        s, d = self.tree['s'], self.tree['d']
+        for level in range(pos['level'].max()):
+            m = (pos.loc[s, 'level'] == level).values
+            assert crossings(pos.loc[s[m], 'x'].rank(method = 'dense').values.astype(int), pos.loc[d[m], 'x'].rank(method = 'dense').values.astype(int)) == 0
+
+    def test_cycles_and_components(self):
+        edges = pd.DataFrame({'s': ['a', 'b', 'c', 'x', 'y'], 'd': ['b', 'c', 'a', 'y', 'y']})
+        pos = layered_layout_df(edges, 's', 'd', nodes = ['z'])
+        assert set(pos.index) == {'a', 'b', 'c', 'x', 'y', 'z'}
+        assert sorted(pos.loc[['a', 'b', 'c'], 'level']) == [0, 1, 2]
+        assert pos.loc['y', 'level'] == 1 and pos.loc['z', 'level'] == 0
+        assert has_cycles(np.array([0, 1]), np.array([1, 0]), 2)
+        assert not has_cycles(np.array([0, 1]), np.array([1, 2]), 3)
+
+    def test_tree_layout_engines(self):
+        g = LGFull().edges(self.dag, 's', 'd')
+        g1 = g.tree_layout()
+        g2 = g.tree_layout(sugiyama_engine = 'legacy')
+        assert (g1._nodes['level'].values == g2._nodes['level'].values).all()
+        assert (g1._nodes['y'].values == g2._nodes['y'].values).all()
+        with pytest.raises(ValueError):
+            g.tree_layout(sugiyama_engine = 'other')
@@ -11,6 +11,7 @@ import logging
 import numpy as np
 import pandas as pd
 from graphistry.config import config
+from graphistry.constants import SRC
 from graphistry.feature_utils import remove_internal_namespace_if_present
 from graphistry.tests.test_feature_utils import (
     ndf_reddit,
@@ -31,7 +32,7 @@ from graphistry.utils.lazy_import import (
     lazy_cuml_import,
     lazy_umap_import,
 )
-from graphistry.util import cache_coercion_helper
+from graphistry.utils.memo_cache import clear_memo_caches
 
 has_dependancy, _ = lazy_import_has_min_dependancy()
 has_cuml, _, _ = lazy_cuml_import()
@@ -736,7 +737,7 @@ class TestCUMLMethodsMore():
 class TestCUMLMethods(TestUMAPMethods):
 
     def setup_method(self, method: Any) -> None:
-        cache_coercion_helper.cache_clear()
+        clear_memo_caches()
         gc.collect()
 
     @classmethod
@@ -930,6 +931,62 @@ class TestCUMLMethods(TestUMAPMethods):
                 self.assertGreaterEqual(shape[0], last_shape)
                 last_shape = shape[0]
 
+class TestUMAPUpdate(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame(rng.normal(size=(400, 4)), columns=["a", "b", "c", "d"])
+        self.df["n"] = [f"v{i}" for i in range(len(self.df))]
+
+    def test_smooth_knn_weights(self):
+        from graphistry.umap_utils import smooth_knn_weights
+        dists = np.sort(np.random.default_rng(0).random((50, 8)), axis=1)
+        weights = smooth_knn_weights(dists)
+        # nearest neighbor at full strength, the rest summing to log2(k)
+        assert np.allclose(weights[:, 0], 1)
+        assert np.allclose(weights[:, 1:].sum(axis=1), 3, atol=1e-3)
+        assert (np.diff(weights, axis=1) <= 0).all()
+
+    def test_merge_knn(self):
+        from graphistry.umap_utils import merge_knn
+        indices, dists = merge_knn(
+            np.array([[1, 2], [-1, -1]]), np.array([[0.1, 0.5], [np.inf, np.inf]]),
+            np.array([0, 0, 1]), np.array([5, 6, 7]), np.array([0.2, 0.01, 3.0])
+        )
+        assert indices.tolist() == [[6, 1], [7, -1]]
+        assert dists[0].tolist() == [0.01, 0.1]
+
+    @pytest.mark.skipif(not has_umap, reason="requires umap feature dependencies")
+    def test_update(self):
+        cols = ["a", "b", "c", "d"]
+        g = graphistry.nodes(self.df.iloc[:300], "n").umap(X=cols, n_neighbors=8, feature_engine="pandas")
+        g2 = g.nodes(pd.concat([g._nodes.iloc[20:], self.df.iloc[300:]])).umap(
+            X=cols, n_neighbors=8, feature_engine="pandas", update=True
+        )
+        assert g2._umap is g._umap
+        assert g2._node_embedding.shape == (380, 2)
+        assert len(g2._node_features) == 380
+        assert (g2._umap_ids == g2._nodes["n"].values).all()
+        # kept rows keep their coordinates
+        kept = g._nodes.set_index("n").loc[g2._nodes["n"].iloc[:280]]
+        assert np.allclose(g2._nodes[["x", "y"]].values[:280], kept[["x", "y"]].values)
+        # new rows are linked into the graph, and removed rows are gone
+        edges = g2._weighted_edges_df
+        assert edges[SRC].max() < 380
+        assert set(np.arange(280, 380)) <= set(edges[SRC])
+        assert g2._umap_knn[0].shape[0] == 380
+        # refitting the same nodes starts from the updated kNN graph
+        g3 = g2.umap(X=cols, n_neighbors=8, feature_engine="pandas")
+        assert g3._node_embedding.shape == (380, 2)
+
+    @pytest.mark.skipif(not has_umap, reason="requires umap feature dependencies")
+    def test_update_without_fit(self):
+        g = graphistry.nodes(self.df, "n").umap(X=["a", "b"], n_neighbors=8, feature_engine="pandas", update=True)
+        assert g._node_embedding.shape == (400, 2)
+        with pytest.raises(ValueError):
+            g.umap(kind="edges", update=True)
+
+
 class TestCudfUmap(unittest.TestCase):
     # temporary tests for cudf pass thru umap
     @pytest.mark.skipif(not is_test_cudf, reason="requires cudf")
@@ -0,0 +1,73 @@
+import numpy as np, pandas as pd, pytest, unittest
+
+from graphistry.util import hash_pdf, hash_pdf_fast, set_hash_pdf_strategy
+
+
+class TestHashPdf(unittest.TestCase):
+
+    def tearDown(self):
+        set_hash_pdf_strategy()
+
+    def df(self, n=1000):
+        return pd.DataFrame({
+            'i': np.arange(n),
+            'f': np.linspace(0, 1, n),
+            's': [str(x % 7) for x in range(n)],
+            't': pd.date_range('2020-01-01', periods=n, freq='h')
+        })
+
+    def test_fast_stable_and_sensitive(self):
+        df = self.df()
+        assert hash_pdf_fast(df) == hash_pdf_fast(df.copy())
+        for col, v in [('i', -1), ('f', 2.0), ('s', 'x')]:
+            df2 = df.copy()
+            df2.loc[500, col] = v
+            assert hash_pdf_fast(df2) != hash_pdf_fast(df)
+        assert hash_pdf_fast(df.rename(columns={'i': 'j'})) != hash_pdf_fast(df)
+        assert hash_pdf_fast(df.astype({'i': 'float64'})) != hash_pdf_fast(df)
+        assert hash_pdf_fast(df.set_index(df.index + 1)) != hash_pdf_fast(df)
+
+    def test_fast_parallel_matches_serial(self):
+        import graphistry.util as util
+        df = self.df(5000)
+        serial = hash_pdf_fast(df)
+        orig = util.HASH_PDF_PARALLEL_MIN_ROWS
+        util.HASH_PDF_PARALLEL_MIN_ROWS = 10
+        try:
+            assert hash_pdf_fast(df, max_workers=3) == serial
+        finally:
+            util.HASH_PDF_PARALLEL_MIN_ROWS = orig
+
+    def test_unhashable_raises_type_error(self):
+        with pytest.raises(TypeError):
+            hash_pdf(pd.DataFrame({'x': [[1], [2]]}))
+
+    def test_sampled(self):
+        df = self.df()
+        df2 = df.copy()
+        df2.loc[1, 'i'] = -1
+        assert hash_pdf_fast(df, sample_rows=10) == hash_pdf_fast(df2, sample_rows=10)
+        assert hash_pdf_fast(df, sample_rows=10) != hash_pdf_fast(df.iloc[:-1], sample_rows=10)
+
+    def test_strategies(self):
+        df = self.df()
+        set_hash_pdf_strategy('sha256')
+        assert hash_pdf(df) != hash_pdf_fast(df)
+        set_hash_pdf_strategy(lambda d: 'custom')
+        assert hash_pdf(df) == 'custom'
+        with pytest.raises(ValueError):
+            set_hash_pdf_strategy('nope')
+
+    def test_cache_by_identity(self):
+        calls = []
+
+        def strategy(d):
+            calls.append(1)
+            return str(len(calls))
+
+        set_hash_pdf_strategy(strategy, cache_by_identity=True)
+        df = self.df()
+        assert hash_pdf(df) == hash_pdf(df) == '1'
+        assert hash_pdf(df.copy()) == '2'
+        df['extra'] = 1
+        assert hash_pdf(df) == '3'
@@ -0,0 +1,56 @@
+import numpy as np, pytest
+
+from graphistry.utils.embedding_cache import EmbeddingCache, embedding_cache, encode_sentences
+
+
+class CountingModel():
+
+    def __init__(self, dim=3):
+        self.dim = dim
+        self.encoded = []
+
+    def encode(self, texts, batch_size=32):
+        self.encoded.extend(texts)
+        return np.array([[len(t), i % 7, self.dim] for i, t in enumerate(texts)], dtype=np.float32)[:, :self.dim]
+
+
+class TestEmbeddingCache():
+
+    def test_encodes_only_unseen(self, tmp_path):
+        model = CountingModel()
+        cache = EmbeddingCache(str(tmp_path), 'm')
+        a = cache.encode(model, ['x', 'yy', 'x', 'zzz'])
+        assert sorted(model.encoded) == ['x', 'yy', 'zzz']
+        assert (a[0] == a[2]).all()
+        assert a.shape == (4, 3)
+        b = cache.encode(model, ['zzz', 'x', 'wwww'], batch_size=2)
+        assert sorted(model.encoded) == ['wwww', 'x', 'yy', 'zzz']
+        assert (b[0] == a[3]).all() and (b[1] == a[0]).all()
+        assert len(cache) == 4
+
+    def test_shared_on_disk(self, tmp_path):
+        model = CountingModel()
+        expected = EmbeddingCache(str(tmp_path), 'org/m').encode(model, ['a', 'bb'])
+        # a second handle, as in another process, reads what the first wrote
+        other = EmbeddingCache(str(tmp_path), 'org/m')
+        assert other.dim() == 3
+        assert np.allclose(other.encode(model, ['bb', 'a']), expected[::-1])
+        assert model.encoded == ['a', 'bb']
+        # other models do not share entries
+        assert len(EmbeddingCache(str(tmp_path), 'org/m2')) == 0
+
+    def test_dim_mismatch(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), 'm')
+        cache.encode(CountingModel(3), ['a'])
+        with pytest.raises(ValueError):
+            cache.encode(CountingModel(2), ['b'])
+        assert len(cache) == 1
+
+    def test_encode_sentences(self, tmp_path):
+        model = CountingModel()
+        encode_sentences(model, ['a', 'a'], None, str(tmp_path))
+        assert model.encoded == ['a', 'a']
+        encode_sentences(model, ['a', 'a'], 'm', str(tmp_path))
+        encode_sentences(model, ['a', 'a'], 'm', str(tmp_path))
+        assert model.encoded == ['a', 'a', 'a']
+        assert embedding_cache(str(tmp_path), 'm') is embedding_cache(str(tmp_path), 'm')
@@ -0,0 +1,48 @@
+import numpy as np, pandas as pd
+
+from graphistry.utils.feature_store import FeatureStore, iter_chunks, sample_rows
+
+
+class TestChunks():
+
+    def setup_method(self):
+        self.df = pd.DataFrame({'a': np.arange(10), 'b': np.arange(10) * 2.})
+
+    def test_iter_chunks(self, tmp_path):
+        assert [len(c) for c in iter_chunks(self.df, 4)] == [4, 4, 2]
+        path = str(tmp_path / 'df.parquet')
+        self.df.to_parquet(path)
+        chunks = list(iter_chunks(path, 4, columns=['b']))
+        assert pd.concat(chunks).equals(self.df[['b']])
+        # function sources are rechunked and indexed by position
+        chunks = list(iter_chunks(lambda: [self.df.iloc[:3], self.df.iloc[3:]], 4))
+        assert [len(c) for c in chunks] == [3, 4, 3]
+        assert list(pd.concat(chunks).index) == list(range(10))
+
+    def test_sample_rows(self, tmp_path):
+        s = sample_rows(self.df, 5, 4, seed=0)
+        assert len(s) == 5 and s.index.is_monotonic_increasing
+        assert s.equals(self.df.loc[s.index])
+        path = str(tmp_path / 'df.parquet')
+        self.df.to_parquet(path)
+        s = sample_rows(path, 5, 4, seed=0)
+        assert s.equals(self.df.loc[s.index])
+        assert len(sample_rows(lambda: [self.df], 5, 4)) == 5
+
+
+class TestFeatureStore():
+
+    def test_roundtrip(self, tmp_path):
+        store = FeatureStore(str(tmp_path))
+        X = pd.DataFrame({0: [1., 2.], 'x': [3., 4.]})
+        store.append(X, pd.DataFrame({'y': [0, 1]}))
+        store.append(X.astype(pd.SparseDtype('float64', 0.)).set_axis([2, 3], axis=0), pd.DataFrame({'y': [1, 0]}))
+        assert len(store) == 4
+        features = store.features()
+        assert list(features.columns) == [0, 'x']
+        assert list(features.index) == [0, 1, 2, 3]
+        assert np.allclose(features.values, np.vstack([X.values, X.values]))
+        assert list(store.target()['y']) == [0, 1, 1, 0]
+        assert [len(X) for X in store.iter_features()] == [2, 2]
+        store.clear()
+        assert len(store) == 0 and store.target() is None
@@ -0,0 +1,109 @@
+import numpy as np, pandas as pd, pytest
+
+import graphistry
+from graphistry.util import check_set_memoize
+from graphistry.utils.memo_cache import MemoCache, memo_cache_stats, sizeof
+
+
+class TestSizeof():
+
+    def test_buffers(self):
+        assert sizeof(np.zeros(10, dtype='int64')) == 80
+        assert sizeof(pd.DataFrame({'x': np.zeros(10, dtype='int64')})) >= 80
+
+    def test_object_columns_deep(self):
+        df = pd.DataFrame({'x': ['a' * 1000] * 1000, 'y': np.zeros(1000, dtype='int64')})
+        assert sizeof(df) >= 1000 * 1000
+        assert sizeof(df) == pytest.approx(int(df.memory_usage(index=True, deep=True).sum()), rel=0.1)
+
+    def test_plottable(self):
+        df = pd.DataFrame({'s': np.zeros(100, dtype='int64'), 'd': np.zeros(100, dtype='int64')})
+        g = graphistry.edges(df, 's', 'd')
+        assert sizeof(g) >= 1600
+        # shared tables count once
+        assert sizeof(g.nodes(df, 's')) == sizeof(g)
+
+
+class TestMemoCache():
+
+    def test_lru_entries(self):
+        cache = MemoCache('t', max_entries=2, max_bytes=None)
+        cache['a'] = 1
+        cache['b'] = 2
+        assert cache.get('a') == 1
+        cache['c'] = 3
+        assert cache.keys() == ['a', 'c']
+        assert cache.get('b') is None
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+        assert cache.stats()['evictions'] == 1
+
+    def test_lfu(self):
+        cache = MemoCache('t', max_entries=2, max_bytes=None, policy='lfu')
+        cache['a'] = 1
+        cache['b'] = 2
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        cache['c'] = 3
+        assert sorted(cache.keys()) == ['a', 'c']
+
+    def test_bytes_budget(self):
+        cache = MemoCache('t', max_entries=None, max_bytes=250)
+        for k in ['a', 'b', 'c']:
+            cache[k] = np.zeros(10, dtype='int64')
+        assert cache.nbytes() == 240
+        cache['d'] = np.zeros(20, dtype='int64')
+        assert cache.keys() == ['c', 'd']
+        cache['e'] = np.zeros(100, dtype='int64')
+        assert cache.keys() == []
+        assert cache.stats()['evictions'] == 5
+
+    def test_bytes_remeasured(self):
+        cache = MemoCache('t', max_entries=None, max_bytes=100)
+        grows = {}
+        cache['b'] = np.zeros(5, dtype='int64')
+        cache['a'] = grows
+        grows['arr'] = np.zeros(10, dtype='int64')
+        # under budget as recorded, so growth goes unmeasured
+        cache['c'] = np.zeros(1, dtype='int64')
+        assert cache.nbytes() == 48
+        # recorded sizes go over budget, so growth gets measured before evicting
+        cache['d'] = np.zeros(7, dtype='int64')
+        assert cache.keys() == ['c', 'd']
+
+    def test_pinning(self):
+        cache = MemoCache('t', max_entries=1, max_bytes=None)
+        v = object()
+        cache['a'] = v
+        cache.pin('a')
+        cache['b'] = 2
+        assert cache.keys() == ['a']
+        assert cache.pin_value(v) == 1
+        cache.unpin('a')
+        cache['c'] = 3
+        assert cache.keys() == ['c']
+        with pytest.raises(KeyError):
+            cache.pin('a')
+
+    def test_configure(self):
+        cache = MemoCache('t', max_entries=3, max_bytes=None)
+        for k in ['a', 'b', 'c']:
+            cache[k] = 1
+        cache.configure(max_entries=1, max_bytes=None)
+        assert cache.keys() == ['c']
+        with pytest.raises(ValueError):
+            cache.configure(policy='fifo')
+
+
+class TestCheckSetMemoize():
+
+    def test_hit_miss(self):
+        g = graphistry.bind()
+        g.reset_caches()
+        metadata = {'k': 'test_hit_miss'}
+        assert check_set_memoize(g, metadata, '_feat_param_to_g', memoize=True) is False
+        assert check_set_memoize(graphistry.bind(), metadata, '_feat_param_to_g', memoize=True) is g
+        assert memo_cache_stats()['feat_param_to_g']['entries'] == 1
+        g.reset_caches()
+        assert memo_cache_stats()['feat_param_to_g']['entries'] == 0
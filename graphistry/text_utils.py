@@ -1,3 +1,5 @@
+import os
+import numpy as np
 import pandas as pd
 
 from .feature_utils import FeatureMixin
@@ -7,6 +9,9 @@ from logging import getLogger
 
 from typing import (
     TYPE_CHECKING,
+    List,
+    Optional,
+    Union,
 )  # noqa
 
 
@@ -38,13 +43,47 @@ class SearchToGraphMixin(MIXIN_BASE):
             f"found nodes: {a}, feats: {b}. Did you mutate nodes between fit?"
         )
 
-    def build_index(self, angular=False, n_trees=None):
-        # builds local index
+    def build_index(
+        self,
+        angular=False,
+        n_trees=None,
+        index_type: str = "flat",
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        hnsw_m: int = 32,
+        ef_search: int = 64,
+        pq_m: int = 8,
+        pq_bits: int = 8,
+    ):
+        """Build the vector search index over node features, run on the fly by search() when missing.
+
+            For interactive search over many nodes, use an approximate index and tune its recall:
+            ::
+
+                g2.build_index(index_type='hnsw', ef_search=128)
+                g2.search_index.set_search_params(ef_search=256)  # higher recall, slower
+
+        Args:
+            :index_type (str, optional): 'flat' (exact, default), 'ivf', 'hnsw', 'pq', or 'ivfpq'.
+            :nlist (int, optional): 'ivf'/'ivfpq' number of cells, defaults to about 4 * sqrt(nodes).
+            :nprobe (int, optional): 'ivf'/'ivfpq' cells probed per query, higher is slower with better recall.
+            :hnsw_m (int, optional): 'hnsw' links per node.
+            :ef_search (int, optional): 'hnsw' candidates explored per query, higher is slower with better recall.
+            :pq_m (int, optional): 'pq'/'ivfpq' number of sub-vectors, must divide the number of features.
+            :pq_bits (int, optional): 'pq'/'ivfpq' bits per sub-vector code.
+        """
         self.assert_fitted()
         self.assert_features_line_up_with_nodes()
         X = self._get_feature("nodes")
         self.search_index = FaissVectorSearch(
-            X.values
+            X,
+            index_type=index_type,
+            nlist=nlist,
+            nprobe=nprobe,
+            hnsw_m=hnsw_m,
+            ef_search=ef_search,
+            pq_m=pq_m,
+            pq_bits=pq_bits,
         )  # self._build_search_index(X, angular, n_trees, faiss=False)
 
     def _query_from_dataframe(self, qdf: pd.DataFrame, top_n: int, thresh: float):
@@ -56,11 +95,12 @@ class SearchToGraphMixin(MIXIN_BASE):
 
         return results, vect
 
-    def _query(self, query: str, top_n: int, thresh: float):
-        # build the query dataframe
+    def _query(self, query: Union[str, List[str]], top_n: int, thresh: float):
+        # build the query dataframe, one row per query
         if not hasattr(self, "search_index"):
             self.build_index()
 
+        queries = [query] if isinstance(query, str) else list(query)
         qdf = pd.DataFrame([])
 
         cols_text = self._node_encoder.text_cols  # type: ignore
@@ -71,10 +111,10 @@ class SearchToGraphMixin(MIXIN_BASE):
             )
             return pd.DataFrame([]), None
 
-        qdf[cols_text[0]] = [query]
+        qdf[cols_text[0]] = queries
         if len(cols_text) > 1:
             for col in cols_text[1:]:
-                qdf[col] = [""]
+                qdf[col] = [""] * len(queries)
 
         # this is hookey and needs to be fixed on dirty_cat side (with errors='ignore')
         # if however min_words = 0, all columns will be textual,
@@ -92,7 +132,7 @@ class SearchToGraphMixin(MIXIN_BASE):
                 dt = df[other_cols].dtypes
                 for col, v in zip(other_cols, dt.values):
                     if str(v) in ["string", "object", "category"]:
-                        qdf[col] = df.sample(1)[col].values  # so hookey
+                        qdf[col] = np.repeat(df.sample(1)[col].values, len(queries))  # so hookey
                     elif str(v) in [
                         "int",
                         "float",
@@ -112,7 +152,7 @@ class SearchToGraphMixin(MIXIN_BASE):
 
     def search(
         self,
-        query: str,
+        query: Union[str, List[str]],
         cols=None,
         thresh: float = 5000,
         fuzzy: bool = True,
@@ -136,10 +176,16 @@ class SearchToGraphMixin(MIXIN_BASE):
                 )
             
             If an index is not yet built, it is generated `g2.build_index()` on the fly at search time.
-            Otherwise, can set `g2.build_index()` to build it ahead of time.
+            Otherwise, can set `g2.build_index()` to build it ahead of time,
+            including with an approximate index, see help(g.build_index).
+
+            Multiple queries are encoded and looked up as one batch:
+            ::
+
+                results, vects = g2.search(['query 1', 'query 2'])  # results[QUERY] is the query position
 
         Args:
-            :query (str): natural language query.
+            :query (str or list of str): natural language query, or queries.
             :cols (list or str, optional): if fuzzy=False, select which column to query.
                                             Defaults to None since fuzzy=True by defaul.
             :thresh (float, optional): distance threshold from query vector to returned results.
@@ -148,11 +194,12 @@ class SearchToGraphMixin(MIXIN_BASE):
             :fuzzy (bool, optional): if True, uses embedding + annoy index for recall,
                                         otherwise does string matching over given `cols`
                                         Defaults to True.
-            :top_n (int, optional): how many results to return. Defaults to 100.
+            :top_n (int, optional): how many results to return, per query. Defaults to 100.
 
         Returns:
             **pd.DataFrame, vector_encoding_of_query:**
-            rank ordered dataframe of results matching query
+            rank ordered dataframe of results matching query, and for multiple queries,
+            which query each matches in column `_query`
 
             vector encoding of query via given transformer/ngrams model if fuzzy=True else None
         """
@@ -164,10 +211,12 @@ class SearchToGraphMixin(MIXIN_BASE):
                 )
 
             logger.info(f"-- Word Match: [[ {query} ]]")
+            queries = [query] if isinstance(query, str) else query
             return (
                 pd.concat(
                     [
-                        search_to_df(query, col, self._nodes, as_string=True)
+                        search_to_df(q, col, self._nodes, as_string=True)
+                        for q in queries
                         for col in cols
                     ]
                 ),
@@ -179,7 +228,7 @@ class SearchToGraphMixin(MIXIN_BASE):
 
     def search_graph(
         self,
-        query: str,
+        query: Union[str, List[str]],
         scale: float = 0.5,
         top_n: int = 100,
         thresh: float = 5000,
@@ -190,9 +239,10 @@ class SearchToGraphMixin(MIXIN_BASE):
             See help(g.search) for more information
 
         Args:
-            :query (str): query input eg "coding best practices"
+            :query (str or list of str): query input eg "coding best practices", or several queries,
+                                         searched as one batch, whose results are combined into one graph
             :scale (float, optional): edge weigh threshold,  Defaults to 0.5.
-            :top_n (int, optional): how many results to return. Defaults to 100.
+            :top_n (int, optional): how many results to return, per query. Defaults to 100.
             :thresh (float, optional): distance threshold from query vector to returned results.
                                         Defaults to 5000, set large just in case,
                                         but could be as low as 10.
@@ -221,6 +271,7 @@ class SearchToGraphMixin(MIXIN_BASE):
             # run a real query, else return entire graph
             rdf, _ = res.search(query, thresh=thresh, fuzzy=True, top_n=top_n)
             if not rdf.empty:
+                rdf = rdf[~rdf.index.duplicated()]  # nodes matching several queries
                 indices = rdf[node]
                 # now get edges from indices
                 if broader:  # this will make a broader graph, finding NN in src OR dst
@@ -263,6 +314,8 @@ class SearchToGraphMixin(MIXIN_BASE):
         g._node_features = feats
         g._node_embedding = emb
 
+        if not isinstance(query, str):
+            query = " | ".join(query)
         if g._name is not None:
             name = f"{g._name}-query:{query}"
         else:
@@ -271,19 +324,34 @@ class SearchToGraphMixin(MIXIN_BASE):
         return g
 
     def save_search_instance(self, savepath):
+        """Save the instance to `savepath` with joblib, and its search index to `savepath + '.faiss'` in faiss's native format"""
         from joblib import dump  # type: ignore   # need to make this onnx or similar
 
-        self.build_index()
+        if not hasattr(self, "search_index"):
+            self.build_index()
         search = self.search_index
-        del self.search_index  # can't pickle Annoy
-        dump(self, savepath)
-        self.search_index = search  # add it back
+        del self.search_index  # can't pickle faiss indexes
+        self._search_index_type = search.index_type
+        try:
+            dump(self, savepath)
+        finally:
+            self.search_index = search  # add it back
+        search.save(f"{savepath}.faiss")
         logger.info(f"Saved: {savepath}")
 
     @classmethod
-    def load_search_instance(self, savepath):
+    def load_search_instance(self, savepath, mmap: bool = False):
+        """Load an instance saved by save_search_instance, reading its faiss index instead of rebuilding it.
+            
+            Set mmap=True to memory map a large index instead of reading it into memory.
+        """
         from joblib import load  # type: ignore   # need to make this onnx or similar
 
         cls = load(savepath)
-        cls.build_index()
+        if os.path.exists(f"{savepath}.faiss"):
+            cls.search_index = FaissVectorSearch.load(
+                f"{savepath}.faiss", index_type=getattr(cls, "_search_index_type", "flat"), mmap=mmap
+            )
+        else:  # saved before indexes were persisted
+            cls.build_index()
         return cls
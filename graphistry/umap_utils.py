@@ -12,9 +12,11 @@ from graphistry.utils.lazy_import import (
     lazy_cuml_import,
 )
 from . import constants as config
+from .ai_utils import as_search_matrix, knn_search
 from .constants import CUML, UMAP_LEARN
 from .feature_utils import (FeatureMixin, Literal, XSymbolic, YSymbolic,
-                            resolve_feature_engine)
+                            features_matrix, is_sparse_df, resolve_feature_engine,
+                            to_dense_df)
 from .PlotterBase import Plottable, WeakValueDictionary
 from .util import check_set_memoize, setup_logger
 
@@ -99,6 +101,8 @@ def make_safe_gpu_dataframes(X, y, engine):
             if isinstance(value, cudf.DataFrame) and engine in ["pandas", "umap_learn", "dirty_cat"]:
                 new_kwargs[key] = value.to_pandas()
             elif isinstance(value, pd.DataFrame) and engine in ["cuml", "cu_cat"]:
+                if is_sparse_df(value):
+                    value = to_dense_df(value)
                 new_kwargs[key] = cudf.from_pandas(value)
             else:
                 new_kwargs[key] = value
@@ -184,6 +188,134 @@ def prune_weighted_edges_df_and_relabel_nodes(
     return wdf2
 
 
+##############################################################################
+#
+#      Incremental UMAP
+#
+##############################################################################
+
+
+def knn_graph(M_fit, M_new, k: int, metric: str = "euclidean") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Indices and distances of the k nearest fit rows for each new row, sorted by distance
+    """
+    if metric == "euclidean":
+        return knn_search(M_fit, M_new, k)
+    from sklearn.neighbors import NearestNeighbors
+    k = min(k, M_fit.shape[0])
+    if k == 0 or M_new.shape[0] == 0:
+        return np.zeros((M_new.shape[0], 0), dtype=np.int64), np.zeros((M_new.shape[0], 0), dtype=np.float32)
+    dists, indices = NearestNeighbors(n_neighbors=k, metric=metric).fit(M_fit).kneighbors(M_new)
+    return indices.astype(np.int64), dists
+
+
+def smooth_knn_weights(
+    knn_dists: np.ndarray, local_connectivity: float = 1.0, bandwidth: float = 1.0, n_iter: int = 64
+) -> np.ndarray:
+    """
+    UMAP fuzzy membership strength of each kNN distance, as umap-learn's smooth_knn_dist and
+    compute_membership_strengths, vectorized over rows
+
+    Per row, rho is the distance to the local_connectivity-th nearest nonzero neighbor, and sigma is bisected
+    so that exp(-(d - rho) / sigma) over the row, past its first entry, sums to log2(k) * bandwidth
+    """
+    n, k = knn_dists.shape
+    if n == 0 or k == 0:
+        return np.zeros((n, k), dtype=np.float32)
+    dists = knn_dists.astype(np.float64)
+    target = np.log2(k) * bandwidth
+
+    # rho: interpolate between the nonzero distances around local_connectivity
+    nonzero = np.sort(np.where(dists > 0, dists, np.inf), axis=1)
+    n_nonzero = (dists > 0).sum(axis=1)
+    index = int(np.floor(local_connectivity))
+    interpolation = local_connectivity - index
+    rho = np.zeros(n)
+    enough = n_nonzero >= local_connectivity
+    if index > 0:
+        lo = nonzero[:, index - 1]
+        rho = np.where(enough, lo, rho)
+        if interpolation > 1e-5 and index < k:
+            rho = np.where(enough, lo + interpolation * (nonzero[:, index] - lo), rho)
+    else:
+        rho = np.where(enough, interpolation * nonzero[:, 0], rho)
+    row_max = np.where(dists > 0, dists, -np.inf).max(axis=1)
+    rho = np.where(~enough & (n_nonzero > 0), row_max, rho)
+    rho = np.where(np.isfinite(rho), rho, 0)
+
+    # sigma: bisect all rows together
+    lo_s, hi_s, mid = np.zeros(n), np.full(n, np.inf), np.ones(n)
+    gap = np.maximum(dists[:, 1:] - rho[:, None], 0)
+    for _ in range(n_iter):
+        psum = np.exp(-gap / mid[:, None]).sum(axis=1)
+        done = np.abs(psum - target) < 1e-5
+        over = (psum > target) & ~done
+        under = ~over & ~done
+        hi_s = np.where(over, mid, hi_s)
+        lo_s = np.where(under, mid, lo_s)
+        mid = np.where(
+            done, mid, np.where(np.isinf(hi_s), mid * 2, (lo_s + hi_s) / 2)
+        )
+        if done.all():
+            break
+    mean_row = dists.mean(axis=1)
+    floor = 1e-3 * np.where(rho > 0, mean_row, dists.mean())
+    sigma = np.maximum(mid, floor)
+
+    excess = dists - rho[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = np.where(
+            (excess <= 0) | (sigma[:, None] == 0), 1.0, np.exp(-excess / sigma[:, None])
+        )
+    return weights.astype(np.float32)
+
+
+def merge_knn(
+    indices: np.ndarray,
+    dists: np.ndarray,
+    rows: np.ndarray,
+    candidates: np.ndarray,
+    candidate_dists: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge candidate neighbors, rows[i] -> candidates[i] at candidate_dists[i], into each row's k nearest
+
+    Rows stay sorted by distance, with empty slots as index -1 at infinite distance; candidates are assumed
+    not already listed
+    """
+    indices, dists = indices.copy(), dists.copy()
+    k = indices.shape[1]
+    if len(rows) == 0 or k == 0:
+        return indices, dists
+    order = np.lexsort((candidate_dists, rows))
+    rows, candidates, candidate_dists = rows[order], candidates[order], candidate_dists[order]
+    affected, starts, counts = np.unique(rows, return_index=True, return_counts=True)
+    rank = np.arange(len(rows)) - np.repeat(starts, counts)
+    keep = rank < k
+    pool_indices = np.full((len(affected), 2 * k), -1, dtype=np.int64)
+    pool_dists = np.full((len(affected), 2 * k), np.inf)
+    pool_indices[:, :k] = indices[affected]
+    pool_dists[:, :k] = dists[affected]
+    slots = np.searchsorted(affected, rows[keep])
+    pool_indices[slots, k + rank[keep]] = candidates[keep]
+    pool_dists[slots, k + rank[keep]] = candidate_dists[keep]
+    best = np.argsort(pool_dists, axis=1, kind="stable")[:, :k]
+    indices[affected] = np.take_along_axis(pool_indices, best, axis=1)
+    dists[affected] = np.take_along_axis(pool_dists, best, axis=1)
+    return indices, dists
+
+
+def umap_knn_graph(umap_model: Any, n: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    kNN graph umap-learn computed while fitting n rows, if it kept one
+    """
+    indices = getattr(umap_model, "_knn_indices", None)
+    dists = getattr(umap_model, "_knn_dists", None)
+    if not isinstance(indices, np.ndarray) or not isinstance(dists, np.ndarray) or len(indices) != n:
+        return None
+    return indices.astype(np.int64), dists.astype(np.float64)
+
+
 
 class UMAPMixin(MIXIN_BASE):
     """
@@ -297,7 +429,8 @@ class UMAPMixin(MIXIN_BASE):
         self,
         X: pd.DataFrame,
         y: Union[pd.DataFrame, None] = None,
-        umap_fit_kwargs: Dict[str, Any] = {}
+        umap_fit_kwargs: Dict[str, Any] = {},
+        knn_init: Optional[np.ndarray] = None
     ):
         if self._umap is None:
             raise ValueError("UMAP is not initialized")
@@ -310,11 +443,13 @@ class UMAPMixin(MIXIN_BASE):
             from cuml.neighbors import NearestNeighbors
 
             knn = NearestNeighbors(n_neighbors=self._n_neighbors)  # type: ignore
-            cc = self._umap.fit(X, y, knn_graph=knn, **umap_fit_kwargs)
+            cc = self._umap.fit(features_matrix(X), y, knn_graph=knn, **umap_fit_kwargs)
             knn.fit(cc.embedding_)
             self._umap.graph_ = knn.kneighbors_graph(cc.embedding_)
         else:
-            self._umap.fit(X, y, **umap_fit_kwargs)
+            if self.engine == UMAP_LEARN:  # type: ignore
+                self._umap.precomputed_knn = self._precomputed_knn(X, knn_init)
+            self._umap.fit(features_matrix(X), y, **umap_fit_kwargs)
             
         self._weighted_adjacency = self._umap.graph_
         # if changing, also update fresh_res
@@ -327,24 +462,53 @@ class UMAPMixin(MIXIN_BASE):
         logger.info(f" - or {X.shape[0] / mins:.2f} rows per minute")
         return self
 
+    def _precomputed_knn(self, X: pd.DataFrame, knn_init: Optional[np.ndarray]) -> Tuple[Any, Any, Any]:
+        """
+        umap-learn precomputed_knn of X, refined by NN-descent from the neighbor lists of a previous fit,
+        or all None for umap-learn to search from scratch
+        """
+        if knn_init is None:
+            return None, None, None
+        # slots emptied by dropped rows start from random rows, as NN-descent does
+        missing = knn_init < 0
+        if missing.any():
+            knn_init = np.where(missing, np.random.randint(0, len(knn_init), knn_init.shape), knn_init)
+        try:
+            from pynndescent import NNDescent
+            t = time()
+            index = NNDescent(
+                features_matrix(X),
+                n_neighbors=knn_init.shape[1],
+                metric=self._metric,  # type: ignore
+                init_graph=knn_init,
+                low_memory=True,
+            )
+            indices, dists = index.neighbor_graph
+            logger.info(f" - Refined previous kNN graph in {time() - t:.2f}s")
+            return indices, dists, index
+        except Exception:
+            logger.warning("Could not reuse previous kNN graph, recomputing it", exc_info=True)
+            return None, None, None
+
 
     def _umap_fit_transform(
         self,
         X: pd.DataFrame,
         y: Union[pd.DataFrame, None] = None,
         umap_fit_kwargs: Dict[str, Any] = {},
-        umap_transform_kwargs: Dict[str, Any] = {}
+        umap_transform_kwargs: Dict[str, Any] = {},
+        knn_init: Optional[np.ndarray] = None
     ):
         if self._umap is None:
             raise ValueError("UMAP is not initialized")
-        self.umap_fit(X, y, umap_fit_kwargs)
+        self.umap_fit(X, y, umap_fit_kwargs, knn_init)
         logger.debug('_umap_fit_transform:\nX::%s\n%s\n%s\nkwargs:\n%s\ny:\n%s', type(X), X.dtypes, X, umap_transform_kwargs, y)
         #logger.debug('per col types: %s', {k: (type(X[k]), X[k].dtype) for k in X.columns})
         try:
             logger.debug('X as pandas', X.to_pandas())  # type: ignore
         except:
             pass
-        emb = self._umap.transform(X, **umap_transform_kwargs)
+        emb = self._umap.transform(features_matrix(X), **umap_transform_kwargs)
         emb = self._bundle_embedding(emb, index=X.index)
         return emb
 
@@ -378,7 +542,7 @@ class UMAPMixin(MIXIN_BASE):
         df, y = make_safe_gpu_dataframes(df, y, 'pandas')
         X, y_ = self.transform(df, y, kind=kind, return_graph=False)
         X, y_ = make_safe_gpu_dataframes(X, y_, self.engine)  # type: ignore
-        emb = self._umap.transform(X, **umap_transform_kwargs)  # type: ignore
+        emb = self._umap.transform(features_matrix(X), **umap_transform_kwargs)  # type: ignore
         emb = self._bundle_embedding(emb, index=df.index)
         if return_graph and kind not in ["edges"]:
             emb, _ = make_safe_gpu_dataframes(emb, None, 'pandas')  # for now so we don't have to touch infer_edges, force to pandas
@@ -391,11 +555,13 @@ class UMAPMixin(MIXIN_BASE):
 
     def _bundle_embedding(self, emb, index):
         # Converts Embedding into dataframe and takes care if emb.dim > 2
-        if emb.shape[1] == 2 and 'cudf.core.dataframe' not in str(getmodule(emb)) and not hasattr(emb, 'device'):
+        # numpy 2 arrays also have a device attribute
+        on_device = hasattr(emb, 'device') and not isinstance(emb, np.ndarray)
+        if emb.shape[1] == 2 and 'cudf.core.dataframe' not in str(getmodule(emb)) and not on_device:
             emb = pd.DataFrame(emb, columns=[config.X, config.Y], index=index)
         elif emb.shape[1] == 2 and 'cudf.core.dataframe' in str(getmodule(emb)):
             emb.rename(columns={0: config.X, 1: config.Y}, inplace=True)
-        elif emb.shape[1] == 2 and hasattr(emb, 'device'):
+        elif emb.shape[1] == 2 and on_device:
             import cudf
             emb = cudf.DataFrame(emb, columns=[config.X, config.Y], index=index)
         else:
@@ -416,10 +582,14 @@ class UMAPMixin(MIXIN_BASE):
         kind,
         memoize: bool,
         featurize_kwargs,
+        knn_init: Optional[np.ndarray] = None,
         **rest: Any
     ):
         """
         Returns res mutated with new _xy
+
+        knn_init: neighbor lists of the rows of X_ from a previous fit, for umap-learn to refine instead of
+        searching from scratch
         """
 
         umap_kwargs = rest.pop('umap_kwargs', {})
@@ -460,10 +630,130 @@ class UMAPMixin(MIXIN_BASE):
             umap_fit_kwargs=umap_fit_kwargs,
             umap_transform_kwargs=umap_transform_kwargs)
         
-        emb = res._umap_fit_transform(X_, y_, umap_fit_kwargs, umap_transform_kwargs)
+        emb = res._umap_fit_transform(X_, y_, umap_fit_kwargs, umap_transform_kwargs, knn_init)
         res._xy = emb
         return res
 
+    def _umap_update(
+        self,
+        res,
+        nodes: np.ndarray,
+        umap_transform_kwargs: Dict[str, Any] = {}
+    ):
+        """
+        Embed nodes missing from the last fit with the fitted UMAP, without refitting, and merge them into
+        the features, embedding, weighted edges, and kNN graph of the last fit; nodes no longer present are dropped
+
+        New rows are linked to their nearest previously embedded rows in feature space, weighted by UMAP
+        membership strength as in umap-learn's transform, and are merged into the neighbor lists of those rows
+
+        Returns res mutated with new _xy
+        """
+        t = time()
+        old_ids = res._umap_ids
+        old_X = res._node_features
+        old_y = res._node_target
+        n, k_fit = len(nodes), res._n_neighbors
+        old_pos = pd.Index(old_ids).get_indexer(nodes)
+        kept = np.flatnonzero(old_pos >= 0)
+        fresh = np.flatnonzero(old_pos < 0)
+        logger.info(f"Updating UMAP of {len(old_ids):,} rows with {len(fresh):,} new and {len(old_ids) - len(kept):,} removed rows")
+
+        # new position of each old row, or -1 when removed
+        pos_map = np.full(len(old_ids), -1, dtype=np.int64)
+        pos_map[old_pos[kept]] = kept
+        order = np.argsort(np.concatenate([kept, fresh]), kind="stable")
+
+        X_kept = old_X.iloc[old_pos[kept]]
+        if len(fresh):
+            X_new, y_new = res.transform(res._nodes.iloc[fresh], None, kind="nodes", return_graph=False)
+            X_new = X_new[old_X.columns]
+            emb_new = np.asarray(res._umap.transform(features_matrix(X_new), **umap_transform_kwargs))
+        else:
+            X_new, y_new = old_X.iloc[:0], None
+            emb_new = np.zeros((0, res._xy.shape[1]))
+        res._node_features = pd.concat([X_kept, X_new]).iloc[order].set_axis(res._nodes.index, axis=0)
+        if old_y is not None and len(old_y.columns):
+            y_fresh = y_new.reindex(columns=old_y.columns) if y_new is not None else pd.DataFrame(
+                np.nan, index=X_new.index, columns=old_y.columns
+            )
+            res._node_target = pd.concat([old_y.iloc[old_pos[kept]], y_fresh]).iloc[order].set_axis(
+                res._nodes.index, axis=0
+            )
+
+        xy = np.empty((n, res._xy.shape[1]))
+        xy[kept] = np.asarray(res._xy.values)[old_pos[kept]]
+        xy[fresh] = emb_new
+        res._xy = res._bundle_embedding(xy, index=res._nodes.index)
+
+        # kNN graph of the last fit, when umap-learn did not keep one
+        if res._umap_knn is None:
+            M_old = as_search_matrix(old_X)
+            res._umap_knn = knn_graph(M_old, M_old, k_fit, res._metric)
+        old_indices, old_dists = res._umap_knn
+        k = old_indices.shape[1]
+        indices = np.full((n, k), -1, dtype=np.int64)
+        dists = np.full((n, k), np.inf)
+        remapped = np.where(old_indices >= 0, pos_map[np.maximum(old_indices, 0)], -1)[old_pos[kept]]
+        remapped_dists = np.where(remapped >= 0, old_dists[old_pos[kept]], np.inf)
+        by_dist = np.argsort(remapped_dists, axis=1, kind="stable")
+        indices[kept] = np.take_along_axis(remapped, by_dist, axis=1)
+        dists[kept] = np.take_along_axis(remapped_dists, by_dist, axis=1)
+
+        # weighted edges of the last fit, between the rows still present
+        wdf = res._weighted_edges_df
+        src = pos_map[wdf[config.SRC].values]
+        dst = pos_map[wdf[config.DST].values]
+        alive = (src >= 0) & (dst >= 0)
+        srcs, dsts, weights = [src[alive]], [dst[alive]], [wdf[config.WEIGHT].values[alive]]
+
+        if len(fresh) and len(kept):
+            M_kept = as_search_matrix(X_kept)
+            M_new = as_search_matrix(X_new)
+            idx, d = knn_graph(M_kept, M_new, k_fit, res._metric)
+            w = smooth_knn_weights(d, local_connectivity=max(0, res._local_connectivity - 1)).ravel()
+            new_src, new_dst = np.repeat(fresh, idx.shape[1]), kept[idx.ravel()]
+            srcs += [new_src, new_dst]
+            dsts += [new_dst, new_src]
+            weights += [w, w]
+
+            # new rows list their nearest rows among all rows, and are offered to the lists of their neighbors
+            idx_self, d_self = knn_graph(M_new, M_new, k, res._metric)
+            indices, dists = merge_knn(
+                indices, dists,
+                np.concatenate([np.repeat(fresh, idx_self.shape[1]), new_src, new_dst]),
+                np.concatenate([fresh[idx_self.ravel()], new_dst, new_src]),
+                np.concatenate([d_self.ravel(), d.ravel(), d.ravel()]),
+            )
+
+        src, dst, weight = np.concatenate(srcs), np.concatenate(dsts), np.concatenate(weights)
+        from scipy.sparse import csr_matrix
+        res._weighted_adjacency = csr_matrix((weight, (src, dst)), shape=(n, n))
+        res._weighted_edges_df = pd.DataFrame({config.SRC: src, config.DST: dst, config.WEIGHT: weight})
+        res._umap_ids = nodes
+        res._umap_knn = indices, dists
+        logger.info(f"-UMAP update took {time() - t:.2f}s")
+        return res
+
+    def _umap_updatable(self, res, fitted_umap: Any, nodes: np.ndarray) -> bool:
+        """
+        Whether res holds a node UMAP fit with the current parameters that umap(update=True) can extend
+        """
+        reason = None
+        if fitted_umap is None or res._umap is not fitted_umap:
+            reason = "no previous node UMAP fit with the same parameters"
+        elif res._umap_ids is None or res._xy is None or res._xy is not res._node_embedding:
+            reason = "the last UMAP fit was not of nodes"
+        elif not isinstance(res._node_features, pd.DataFrame) or not isinstance(res._weighted_edges_df, pd.DataFrame):
+            reason = "only pandas features are supported"
+        elif len(res._node_features) != len(res._umap_ids):
+            reason = "node features changed since the last fit"
+        elif not pd.Index(nodes).is_unique:
+            reason = "node ids are not unique"
+        if reason is not None:
+            logger.info(f"UMAP update not possible, refitting: {reason}")
+        return reason is None
+
     def _set_features(  # noqa: E303
         self, res, X, y, kind, feature_engine, featurize_kwargs
     ):
@@ -524,6 +814,7 @@ class UMAPMixin(MIXIN_BASE):
         feature_engine: str = "auto",
         inplace: bool = False,
         memoize: bool = True,
+        update: bool = False,
         umap_kwargs: Dict[str, Any] = {},
         umap_fit_kwargs: Dict[str, Any] = {},
         umap_transform_kwargs: Dict[str, Any] = {},
@@ -580,6 +871,10 @@ class UMAPMixin(MIXIN_BASE):
                     when False, returns a new object, useful for chaining in a functional paradigm.
             :memoize: whether to memoize the results of this method,
                     default True.
+            :update: for `nodes`, embed nodes missing from the last fit with the fitted UMAP instead of refitting,
+                    merging them into the embedding, weighted edges, and kNN graph, and dropping nodes no longer present;
+                    falls back to a fit when there is no previous fit with the same parameters. Default False.
+                    Refits reuse the kNN graph of the last fit or update as a starting point (umap_learn).
             :umap_kwargs: Optional kwargs to pass to underlying UMAP library constructor
             :umap_fit_kwargs: Optional kwargs to pass to underlying UMAP fit method, including fit part of fit_transform
             :umap_transform_kwargs: Optional kwargs to pass to underlying UMAP transform method, including transform part of fit_transform
@@ -612,10 +907,14 @@ class UMAPMixin(MIXIN_BASE):
         # temporary until we have full cudf support in feature_utils.py
         has_cudf, _, cudf = lazy_cudf_import()
 
+        if update and kind != "nodes":
+            raise ValueError(f"update=True is only supported for kind='nodes', got {kind}")
+
         if inplace:
             res = self
         else:
             res = self.bind()
+        fitted_umap = res._umap
 
         if has_cudf:
             flag_nodes_cudf = isinstance(self._nodes, cudf.DataFrame)
@@ -668,35 +967,58 @@ class UMAPMixin(MIXIN_BASE):
                     config.IMPLICIT_NODE_ID,
                 )
                 res._nodes.index = index
+            elif update and res._node == config.IMPLICIT_NODE_ID and res._nodes[res._node].isna().any():
+                # appended rows lack the implicit ids written by the last fit
+                ids = res._nodes[res._node]
+                start = int(ids.max()) + 1 if ids.notna().any() else 0
+                ids = ids.fillna(pd.Series(np.arange(start, start + ids.isna().sum()), index=ids.index[ids.isna()]))
+                res = res.nodes(res._nodes.assign(**{res._node: ids.astype("int64")}))  # type: ignore
 
             nodes = res._nodes[res._node].values
 
-            logger.debug("propagating with featurize_kwargs: %s", featurize_kwargs)
-            (
-                X_,
-                y_,
-                res,
-            ) = res.featurize_or_get_nodes_dataframe_if_X_is_None(  # type: ignore
-                **featurize_kwargs
-            )
-
-            logger.debug("umap X_ (%s): %s", type(X_), X_)
-            logger.debug("umap y_ (%s): %s", type(y_), y_)
-            logger.debug("data is type :: %s", (type(X_)))
-            if isinstance(X_, pd.DataFrame):
+            if update and res._umap_updatable(res, fitted_umap, nodes):
+                res = res._umap_update(res, nodes, umap_transform_kwargs)
                 index_to_nodes_dict = dict(zip(range(len(nodes)), nodes))
-            elif 'cudf.core.dataframe' in str(getmodule(X_)):
-                assert isinstance(X_, cudf.DataFrame)
-                logger.debug('nodes type: %s', type(nodes))
-                import cupy as cp
-                index_to_nodes_dict = dict(zip(range(len(nodes)), cp.asnumpy(nodes)))
-
-            # add the safe coercion here 
-            X_, y_ = make_safe_gpu_dataframes(X_, y_, res.engine)  # type: ignore
+            else:
+                logger.debug("propagating with featurize_kwargs: %s", featurize_kwargs)
+                (
+                    X_,
+                    y_,
+                    res,
+                ) = res.featurize_or_get_nodes_dataframe_if_X_is_None(  # type: ignore
+                    **featurize_kwargs
+                )
 
-            res = res._process_umap(
-                res, X_, y_, kind, memoize, featurize_kwargs, **umap_kwargs_combined
-            )
+                logger.debug("umap X_ (%s): %s", type(X_), X_)
+                logger.debug("umap y_ (%s): %s", type(y_), y_)
+                logger.debug("data is type :: %s", (type(X_)))
+                if isinstance(X_, pd.DataFrame):
+                    index_to_nodes_dict = dict(zip(range(len(nodes)), nodes))
+                elif 'cudf.core.dataframe' in str(getmodule(X_)):
+                    assert isinstance(X_, cudf.DataFrame)
+                    logger.debug('nodes type: %s', type(nodes))
+                    import cupy as cp
+                    index_to_nodes_dict = dict(zip(range(len(nodes)), cp.asnumpy(nodes)))
+
+                # add the safe coercion here 
+                X_, y_ = make_safe_gpu_dataframes(X_, y_, res.engine)  # type: ignore
+
+                # start from the kNN graph of the last fit or update when it covers the same nodes
+                knn_init = None
+                if (
+                    res._umap_knn is not None
+                    and res._umap_ids is not None
+                    and len(res._umap_ids) == len(nodes)
+                    and np.array_equal(res._umap_ids, nodes)
+                    and res._umap_knn[0].shape[1] >= n_neighbors
+                ):
+                    knn_init = res._umap_knn[0][:, :n_neighbors]
+
+                res = res._process_umap(
+                    res, X_, y_, kind, memoize, featurize_kwargs, knn_init=knn_init, **umap_kwargs_combined
+                )
+                res._umap_ids = nodes
+                res._umap_knn = umap_knn_graph(res._umap, len(nodes))
 
             res._weighted_adjacency_nodes = res._weighted_adjacency
             if res._xy is None:
@@ -7,13 +7,17 @@ import pandas.util as putil
 import platform as p
 import random
 import string
+import threading
 import uuid
 import warnings
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import Any
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 from collections import UserDict
+import numpy as np
 
-from .constants import VERBOSE, CACHE_COERCION_SIZE, TRACE
+from .constants import VERBOSE, HASH_PDF_PARALLEL_MIN_ROWS, HASH_PDF_STRATEGY, TRACE
 
 
 # #####################################
@@ -51,40 +55,145 @@ def setup_logger(name='', verbose=VERBOSE, fullpath=TRACE):
 # #####################################
 # Caching utils
 
-_cache_coercion_val = None
 
+def hash_pdf_sha256(df: pd.DataFrame) -> str:
+    """
+    Original fingerprint: SHA-256 over pandas row hashes of every cell, plus the column names
+    """
+    # can be 20% faster via to_parquet (see lmeyerov issue in pandas gh), but unclear if always available
+    return (
+        hashlib.sha256(
+            putil.hash_pandas_object(df, index=True).to_numpy().tobytes()
+        ).hexdigest()
+        + hashlib.sha256(str(df.columns).encode("utf-8")).hexdigest()  # noqa: W503
+    )
 
-@lru_cache(maxsize=CACHE_COERCION_SIZE)
-def cache_coercion_helper(k):
-    return _cache_coercion_val
+
+@lru_cache(maxsize=1)
+def fast_hasher() -> Callable[[], Any]:
+    """
+    Non-cryptographic xxh3_128 when xxhash is installed, else blake2b; both release the GIL on large buffers
+    """
+    try:
+        import xxhash  # type: ignore
+        return xxhash.xxh3_128
+    except ImportError:
+        return lambda: hashlib.blake2b(digest_size=16)
 
 
-def cache_coercion(k, v):
+def hash_values(values: Any) -> bytes:
     """
-    Holds references to last 100 used coercions
-    Use with weak key/value dictionaries for actual lookups
+    Digest of a Series or Index: fixed-width numpy values are hashed as raw buffers, others via pandas object hashing
+
+    Raises TypeError when pandas cannot hash the values, e.g., cells holding lists
     """
-    global _cache_coercion_val
-    _cache_coercion_val = v
+    h = fast_hasher()()
+    h.update(str(values.dtype).encode('utf-8'))
+    if isinstance(values, pd.RangeIndex):
+        h.update(f'{values.start}:{values.stop}:{values.step}'.encode('utf-8'))
+        return h.digest()
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biufcmM':
+        arr = np.ascontiguousarray(values.to_numpy())
+    else:
+        arr = putil.hash_pandas_object(values, index=False).to_numpy()
+    h.update(arr.view(np.uint8))
+    return h.digest()
 
-    out = cache_coercion_helper(k)
-    _cache_coercion_val = None
-    return out
 
+def hash_pdf_fast(df: pd.DataFrame, sample_rows: Optional[int] = None, max_workers: Optional[int] = None) -> str:
+    """
+    Fingerprint of columns, dtypes, index, and values, hashing each column separately
+
+    - Fixed-width columns skip pandas row hashing and are digested directly from their buffers
+    - Frames of at least HASH_PDF_PARALLEL_MIN_ROWS rows hash columns across a thread pool
+    - sample_rows: when set and smaller than the frame, only that many evenly spaced rows (plus the shape) are hashed,
+      so edits to other rows go unnoticed
+    """
+    h = fast_hasher()()
+    h.update(str(df.shape).encode('utf-8'))
+    h.update(str(list(df.columns)).encode('utf-8'))
+    if sample_rows is not None and len(df) > sample_rows:
+        df = df.iloc[np.linspace(0, len(df) - 1, sample_rows).astype(np.int64)]
+    parts = [df.index] + [df.iloc[:, i] for i in range(df.shape[1])]
+    if len(df) >= HASH_PDF_PARALLEL_MIN_ROWS and len(parts) > 2:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            digests = list(executor.map(hash_values, parts))
+    else:
+        digests = [hash_values(part) for part in parts]
+    for digest in digests:
+        h.update(digest)
+    return h.hexdigest()
+
+
+HASH_PDF_STRATEGIES: Dict[str, Callable[..., str]] = {
+    'fast': hash_pdf_fast,
+    'sha256': hash_pdf_sha256
+}
+
+_hash_pdf_settings: Dict[str, Any] = {
+    'strategy': HASH_PDF_STRATEGY,
+    'sample_rows': None,
+    'max_workers': None,
+    'cache_by_identity': False
+}
+
+# id(df) -> (weakref to df, shape/columns/dtypes/settings key, hash)
+_hash_pdf_identity_cache: Dict[int, Tuple[Any, Any, str]] = {}
+_hash_pdf_identity_cache_lock = threading.Lock()
+
+
+def set_hash_pdf_strategy(
+    strategy: Union[str, Callable[[pd.DataFrame], str]] = HASH_PDF_STRATEGY,
+    sample_rows: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    cache_by_identity: bool = False
+) -> None:
+    """
+    Configure how hash_pdf() fingerprints DataFrames for plot(), featurize(), and umap() memoization
 
-class WeakValueWrapper:
-    def __init__(self, v):
-        self.v = v
+    :param strategy: 'fast' (default, column-wise xxhash/blake2b), 'sha256' (original full row hashing), or a function df -> str
+    :param sample_rows: For 'fast', hash only this many evenly spaced rows of larger frames; misses edits to other rows
+    :param max_workers: For 'fast', thread pool size for column-wise hashing of large frames
+    :param cache_by_identity: Reuse the hash of the same DataFrame object while its shape, columns, and dtypes are unchanged; misses in-place value edits
+    """
+    if isinstance(strategy, str) and strategy not in HASH_PDF_STRATEGIES:
+        raise ValueError(f'Unknown hash_pdf strategy "{strategy}", expected a function or one of: {list(HASH_PDF_STRATEGIES.keys())}')
+    _hash_pdf_settings.update(
+        strategy=strategy, sample_rows=sample_rows, max_workers=max_workers, cache_by_identity=cache_by_identity
+    )
+    with _hash_pdf_identity_cache_lock:
+        _hash_pdf_identity_cache.clear()
 
 
 def hash_pdf(df: pd.DataFrame) -> str:
-    # can be 20% faster via to_parquet (see lmeyerov issue in pandas gh), but unclear if always available
-    return (
-        hashlib.sha256(
-            putil.hash_pandas_object(df, index=True).to_numpy().tobytes()
-        ).hexdigest()
-        + hashlib.sha256(str(df.columns).encode("utf-8")).hexdigest()  # noqa: W503
-    )
+    """
+    Fingerprint df for memoization, using the strategy configured by set_hash_pdf_strategy()
+
+    Raises TypeError when df holds values that cannot be hashed
+    """
+    strategy = _hash_pdf_settings['strategy']
+    cache_by_identity = _hash_pdf_settings['cache_by_identity']
+
+    key = None
+    if cache_by_identity:
+        key = (df.shape, tuple(df.columns), tuple(str(t) for t in df.dtypes))
+        with _hash_pdf_identity_cache_lock:
+            hit = _hash_pdf_identity_cache.get(id(df))
+        if hit is not None and hit[0]() is df and hit[1] == key:
+            return hit[2]
+
+    if callable(strategy):
+        out = strategy(df)
+    elif strategy == 'fast':
+        out = hash_pdf_fast(df, _hash_pdf_settings['sample_rows'], _hash_pdf_settings['max_workers'])
+    else:
+        out = HASH_PDF_STRATEGIES[strategy](df)
+
+    if cache_by_identity:
+        df_id = id(df)
+        with _hash_pdf_identity_cache_lock:
+            _hash_pdf_identity_cache[df_id] = (weakref.ref(df, lambda _: _hash_pdf_identity_cache.pop(df_id, None)), key, out)
+    return out
 
 
 def hash_memoize_helper(v: Any) -> str:
@@ -147,29 +256,25 @@ def check_set_memoize(
         return False
 
     hashed = None
-    weakref = getattr(g, attribute)
+    cache = getattr(g, attribute)  # graphistry.utils.memo_cache.MemoCache
     try:
         hashed = hash_memoize(dict(data=metadata))
     except TypeError:
         logger.warning(
             f"! Failed {name} speedup attempt. Continuing without memoization speedups."
         )
-    try:
-        if hashed in weakref:
-            logger.debug(f"{name} memoization hit: %s", hashed)
-            return weakref[hashed].v
-        else:
-            logger.debug(
-                f"{name} memoization miss for id (of %s): %s", len(weakref), hashed
-            )
-    except:
-        logger.debug(f"Failed to hash {name} kwargs", exc_info=True)
-        pass
+    if hashed is None:
+        return False
+
+    hit = cache.get(hashed)
+    if hit is not None:
+        logger.debug(f"{name} memoization hit: %s", hashed)
+        return hit
+    logger.debug(
+        f"{name} memoization miss for id (of %s): %s", len(cache), hashed
+    )
 
-    if memoize and (hashed is not None):
-        w = WeakValueWrapper(g)
-        cache_coercion(hashed, w)
-        weakref[hashed] = w
+    cache[hashed] = g
     return False
 
 
@@ -0,0 +1,202 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from graphistry.utils.lazy_import import lazy_sentence_transformers_import
+from graphistry.util import setup_logger
+logger = setup_logger(__name__)
+
+
+# #############################################################################
+#
+#      Process-wide model registry
+#
+# #############################################################################
+
+
+SENTENCE_TRANSFORMERS: Dict[str, Any] = {}
+_registry_lock = threading.Lock()
+
+
+def get_sentence_transformer(model_name: str) -> Any:
+    """
+    Process-wide SentenceTransformer for model_name, loaded on first use and shared by later featurizations
+    """
+    with _registry_lock:
+        if model_name not in SENTENCE_TRANSFORMERS:
+            _, _, SentenceTransformer = lazy_sentence_transformers_import()
+            logger.debug('Loading SentenceTransformer %s', model_name)
+            SENTENCE_TRANSFORMERS[model_name] = SentenceTransformer(model_name)
+        return SENTENCE_TRANSFORMERS[model_name]
+
+
+def sentence_transformer_name(model: Any) -> Optional[str]:
+    """
+    Registry name of a model loaded by get_sentence_transformer(), else None
+    """
+    for name, registered in SENTENCE_TRANSFORMERS.items():
+        if registered is model:
+            return name
+    return None
+
+
+# #############################################################################
+#
+#      On-disk embedding cache
+#
+# #############################################################################
+
+
+def text_key(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8', errors='surrogatepass'), digest_size=16).hexdigest()
+
+
+class EmbeddingCache(object):
+    """
+    Content-addressed on-disk cache of one model's text embeddings, shared across processes
+
+    Under path/<model>/, embeddings are float32 rows appended to a raw file that is read memory-mapped,
+    and a SQLite index maps the hash of each text to its row. Writers serialize on the SQLite write lock,
+    and rows are on disk before their index entries commit, so concurrent readers only see complete rows.
+    """
+
+    SQLITE_MAX_PARAMS = 900
+
+    def __init__(self, path: str, model_name: str) -> None:
+        self.model_name = model_name
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+        self.path = os.path.join(path, f'{safe_name}-{text_key(model_name)[:8]}')
+        os.makedirs(self.path, exist_ok=True)
+        self.data_path = os.path.join(self.path, 'embeddings.f32')
+        self.__lock = threading.RLock()
+        self.__db = sqlite3.connect(
+            os.path.join(self.path, 'index.sqlite'), timeout=600, isolation_level=None, check_same_thread=False
+        )
+        self.__db.execute('PRAGMA journal_mode=WAL')
+        self.__db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self.__db.execute('CREATE TABLE IF NOT EXISTS rows (key TEXT PRIMARY KEY, row INTEGER)')
+        self.__db.execute('INSERT OR IGNORE INTO meta VALUES (?, ?)', ('model_name', model_name))
+
+    def __repr__(self) -> str:
+        return f'EmbeddingCache(path={self.path}, entries={len(self)}, dim={self.dim()})'
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return self.__db.execute('SELECT COUNT(*) FROM rows').fetchone()[0]
+
+    def dim(self) -> Optional[int]:
+        with self.__lock:
+            row = self.__db.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        return None if row is None else int(row[0])
+
+    def lookup(self, keys: Sequence[str]) -> np.ndarray:
+        """
+        Row of each text key, or -1 when not cached
+        """
+        found: Dict[str, int] = {}
+        with self.__lock:
+            for start in range(0, len(keys), self.SQLITE_MAX_PARAMS):
+                chunk = list(keys[start:start + self.SQLITE_MAX_PARAMS])
+                found.update(self.__db.execute(
+                    f"SELECT key, row FROM rows WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall())
+        return np.array([found.get(k, -1) for k in keys], dtype=np.int64)
+
+    def read(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Embeddings of cached rows, read through a memory map of the rows file
+        """
+        dim = self.dim()
+        if dim is None or len(rows) == 0:
+            return np.zeros((len(rows), dim or 0), dtype=np.float32)
+        n = os.path.getsize(self.data_path) // (4 * dim)
+        return np.array(np.memmap(self.data_path, dtype=np.float32, mode='r', shape=(n, dim))[rows])
+
+    def put(self, keys: Sequence[str], embeddings: np.ndarray) -> None:
+        """
+        Append embeddings of text keys not yet cached, by this or another process
+        """
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        with self.__lock:
+            self.__db.execute('BEGIN IMMEDIATE')
+            try:
+                dim = self.dim()
+                if dim is None:
+                    dim = embeddings.shape[1]
+                    self.__db.execute("INSERT INTO meta VALUES ('dim', ?)", (str(dim),))
+                elif dim != embeddings.shape[1]:
+                    raise ValueError(f'Embedding cache {self.path} holds dimension {dim}, got {embeddings.shape[1]}')
+                new = np.flatnonzero(self.lookup(keys) < 0)
+                # drop repeats within this batch, keeping the first
+                _, first = np.unique(np.asarray(keys, dtype=object)[new], return_index=True)
+                new = new[np.sort(first)]
+                n = self.__db.execute('SELECT COUNT(*) FROM rows').fetchone()[0]
+                # rows past n are leftovers of a writer that failed before committing, so overwrite them
+                with open(self.data_path, 'r+b' if os.path.exists(self.data_path) else 'wb') as f:
+                    f.seek(n * 4 * dim)
+                    f.write(embeddings[new].tobytes())
+                    f.flush()
+                self.__db.executemany(
+                    'INSERT INTO rows VALUES (?, ?)', [(keys[int(i)], n + j) for j, i in enumerate(new)]
+                )
+                self.__db.execute('COMMIT')
+            except BaseException:
+                self.__db.execute('ROLLBACK')
+                raise
+
+    def encode(self, model: Any, texts: Sequence[Any], **encode_kwargs: Any) -> np.ndarray:
+        """
+        model.encode(texts, **encode_kwargs), encoding only distinct texts not already cached
+        """
+        texts = [str(t) for t in texts]
+        unique_keys, first, inverse = np.unique([text_key(t) for t in texts], return_index=True, return_inverse=True)
+        keys: List[str] = list(unique_keys)
+        rows = self.lookup(keys)
+        missing = np.flatnonzero(rows < 0)
+        logger.info(
+            'Embedding cache %s: %s of %s distinct texts cached', self.model_name, len(keys) - len(missing), len(keys)
+        )
+        if len(missing):
+            encoded = np.asarray(model.encode([texts[first[i]] for i in missing], **encode_kwargs))
+            missing_keys = [keys[i] for i in missing]
+            self.put(missing_keys, encoded)
+            rows[missing] = self.lookup(missing_keys)
+        return self.read(rows)[inverse.ravel()]
+
+
+EMBEDDING_CACHES: Dict[Tuple[str, str], EmbeddingCache] = {}
+
+
+def embedding_cache(path: str, model_name: str) -> EmbeddingCache:
+    """
+    Get or create the process-wide handle on the embedding cache of model_name under path
+    """
+    with _registry_lock:
+        key = (os.path.abspath(path), model_name)
+        if key not in EMBEDDING_CACHES:
+            EMBEDDING_CACHES[key] = EmbeddingCache(path, model_name)
+        return EMBEDDING_CACHES[key]
+
+
+def encode_sentences(model: Any, texts: Sequence[Any], model_name: Optional[str], cache_path: Optional[str], **encode_kwargs: Any) -> Any:
+    """
+    Encode texts with a sentence transformer, through the embedding cache under cache_path when set and the model is named
+    """
+    if cache_path is None or model_name is None:
+        return model.encode(texts, **encode_kwargs)
+    return embedding_cache(cache_path, model_name).encode(model, texts, **encode_kwargs)
+
+
+def clear_sentence_transformers() -> List[str]:
+    """
+    Drop registered models, returning their names
+    """
+    with _registry_lock:
+        names = list(SENTENCE_TRANSFORMERS.keys())
+        SENTENCE_TRANSFORMERS.clear()
+    return names
@@ -0,0 +1,165 @@
+import json
+import os
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union, cast
+
+import numpy as np
+import pandas as pd
+
+from graphistry.util import setup_logger
+logger = setup_logger(__name__)
+
+
+# A frame, a Parquet file or directory path, or a zero-argument function returning an iterable of frames
+ChunkSource = Union[pd.DataFrame, str, Callable[[], Iterable[pd.DataFrame]]]
+
+
+def iter_chunks(source: ChunkSource, chunk_size: int, columns: Optional[List[Any]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream a source as frames of at most chunk_size rows
+
+    Frames keep their index; Parquet and function sources are indexed by row position across the stream
+    """
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunk_size):
+            chunk = source.iloc[start:start + chunk_size]
+            yield chunk if columns is None else chunk[columns]
+        return
+
+    if isinstance(source, str):
+        import pyarrow.dataset as ds
+        batches: Iterable[Any] = (
+            batch.to_pandas()
+            for batch in ds.dataset(source, format='parquet').to_batches(
+                batch_size=chunk_size, columns=None if columns is None else [str(c) for c in columns]
+            )
+        )
+    elif callable(source):
+        batches = source()
+    else:
+        raise ValueError(f'Expected a DataFrame, Parquet path, or function returning frames, got: {type(source)}')
+
+    offset = 0
+    for batch in batches:
+        # rechunk, as function sources may yield frames of any size
+        for start in range(0, len(batch), chunk_size):
+            chunk = batch.iloc[start:start + chunk_size]
+            chunk = chunk.set_axis(pd.RangeIndex(offset, offset + len(chunk)), axis=0)
+            offset += len(chunk)
+            yield chunk if columns is None else chunk[columns]
+
+
+def sample_rows(source: ChunkSource, n: int, chunk_size: int, seed: Optional[int] = None) -> pd.DataFrame:
+    """
+    Uniform random sample of n rows for frames and Parquet, and the first n rows of function sources
+    """
+    rng = np.random.default_rng(seed)
+    if isinstance(source, pd.DataFrame):
+        if len(source) <= n:
+            return source
+        return source.iloc[np.sort(rng.choice(len(source), n, replace=False))]
+    if isinstance(source, str):
+        import pyarrow.dataset as ds
+        dataset = ds.dataset(source, format='parquet')
+        total = dataset.count_rows()
+        positions = np.arange(total) if total <= n else np.sort(rng.choice(total, n, replace=False))
+        return dataset.take(positions).to_pandas().set_axis(pd.Index(positions), axis=0)
+    chunks = []
+    remaining = n
+    for chunk in iter_chunks(source, chunk_size):
+        chunks.append(chunk.iloc[:remaining])
+        remaining -= len(chunks[-1])
+        if remaining <= 0:
+            break
+    return pd.concat(chunks) if chunks else pd.DataFrame([])
+
+
+class FeatureStore(object):
+    """
+    Out-of-core feature matrix, as Parquet parts written one chunk at a time
+
+    path/features/ and path/target/ hold one part per chunk, read back whole via features()/target(),
+    memory mapped, or streamed via iter_features()/iter_target()
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f'FeatureStore(path={self.path}, rows={len(self)})'
+
+    def __len__(self) -> int:
+        return self.__count('features')
+
+    def clear(self) -> None:
+        for part in ['features', 'target']:
+            for file in self.__files(part):
+                os.remove(file)
+            if os.path.exists(os.path.join(self.__dir(part), 'columns.json')):
+                os.remove(os.path.join(self.__dir(part), 'columns.json'))
+
+    def append(self, X: pd.DataFrame, y: Optional[pd.DataFrame] = None) -> None:
+        self.__write('features', X)
+        if y is not None and len(y.columns):
+            self.__write('target', y)
+
+    def features(self) -> pd.DataFrame:
+        return self.__read('features')
+
+    def target(self) -> Optional[pd.DataFrame]:
+        return self.__read('target') if len(self.__files('target')) else None
+
+    def iter_features(self) -> Iterator[pd.DataFrame]:
+        return self.__iter('features')
+
+    def iter_target(self) -> Iterator[pd.DataFrame]:
+        return self.__iter('target')
+
+    def __dir(self, part: str) -> str:
+        return os.path.join(self.path, part)
+
+    def __files(self, part: str) -> List[str]:
+        if not os.path.isdir(self.__dir(part)):
+            return []
+        return sorted(
+            os.path.join(self.__dir(part), f) for f in os.listdir(self.__dir(part)) if f.endswith('.parquet')
+        )
+
+    def __count(self, part: str) -> int:
+        import pyarrow.parquet as pq
+        return sum(pq.ParquetFile(f).metadata.num_rows for f in self.__files(part))
+
+    def __write(self, part: str, df: pd.DataFrame) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        os.makedirs(self.__dir(part), exist_ok=True)
+        columns_path = os.path.join(self.__dir(part), 'columns.json')
+        if not os.path.exists(columns_path):
+            # Parquet only has string column names, so keep the originals, e.g., ints from edge featurization
+            with open(columns_path, 'w') as f:
+                json.dump([
+                    c.item() if isinstance(c, np.generic) else c if isinstance(c, (int, float, str)) else str(c)
+                    for c in df.columns
+                ], f)
+        if any(isinstance(dtype, pd.SparseDtype) for dtype in df.dtypes):
+            df = cast(Any, df).sparse.to_dense()
+        table = pa.Table.from_pandas(df.set_axis([str(c) for c in df.columns], axis=1), preserve_index=True)
+        pq.write_table(table, os.path.join(self.__dir(part), f'part-{len(self.__files(part)):06d}.parquet'))
+
+    def __columns(self, part: str) -> List[Any]:
+        with open(os.path.join(self.__dir(part), 'columns.json')) as f:
+            return json.load(f)
+
+    def __read_file(self, part: str, file: str) -> pd.DataFrame:
+        import pyarrow.parquet as pq
+        df = pq.read_table(file, memory_map=True).to_pandas()
+        return df.set_axis(self.__columns(part), axis=1)
+
+    def __read(self, part: str) -> pd.DataFrame:
+        files = self.__files(part)
+        if not len(files):
+            return pd.DataFrame([])
+        return pd.concat([self.__read_file(part, f) for f in files], axis=0)
+
+    def __iter(self, part: str) -> Iterator[pd.DataFrame]:
+        for f in self.__files(part):
+            yield self.__read_file(part, f)
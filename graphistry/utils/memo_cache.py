@@ -0,0 +1,285 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Set
+
+from graphistry.constants import CACHE_COERCION_SIZE, MEMO_CACHE_MAX_BYTES
+from graphistry.util import setup_logger
+logger = setup_logger(__name__)
+
+
+MEMO_CACHE_POLICIES = ['lru', 'lfu']
+
+# Rows of a pandas frame's object columns measured deeply, and extrapolated to all rows, by sizeof()
+SIZEOF_SAMPLE_ROWS = 100
+
+
+def frame_sizeof(df: Any) -> int:
+    """
+    Approximate bytes of a dataframe: buffers exactly, and pandas object (string) columns by measuring
+    their contents over an evenly spaced row sample and extrapolating
+    """
+    total = int(df.memory_usage(index=True).sum())
+    n = len(df)
+    if n == 0 or not type(df).__module__.startswith('pandas'):
+        return total
+    deep_cols = [c for c, dtype in df.dtypes.items() if dtype == object or str(dtype) == 'string']
+    if len(deep_cols) == 0:
+        return total
+    sample = df[deep_cols].iloc[::max(1, n // SIZEOF_SAMPLE_ROWS)]
+    shallow = int(df[deep_cols].memory_usage(index=False).sum())
+    deep = int(sample.memory_usage(index=False, deep=True).sum()) * n // len(sample)
+    return total - shallow + deep
+
+
+def sizeof(v: Any, seen: Optional[Set[int]] = None, depth: int = 3) -> int:
+    """
+    Approximate bytes held by a cached value: Arrow tables and arrays, numpy arrays, and dataframes by their buffers,
+    and other objects, such as Plottables, by the sum of such attributes and dict values, up to depth levels down
+
+    Object (string) columns of pandas dataframes are estimated from a row sample, see frame_sizeof()
+    """
+    seen = set() if seen is None else seen
+    if id(v) in seen or depth < 0:
+        return 0
+    seen.add(id(v))
+    nbytes = getattr(v, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    memory_usage = getattr(v, 'memory_usage', None)
+    if callable(memory_usage) and hasattr(v, 'columns'):
+        try:
+            return frame_sizeof(v)
+        except Exception:
+            logger.debug('Failed measuring memory usage of %s', type(v), exc_info=True)
+            return 0
+    attrs = v if isinstance(v, dict) else getattr(v, '__dict__', None)
+    if isinstance(attrs, dict):
+        return sum(sizeof(v2, seen, depth - 1) for v2 in attrs.values())
+    return 0
+
+
+class MemoCache(object):
+    """
+    Bounded memoization cache with strong references, evicting by entry count and approximate byte size
+
+    - policy: 'lru' evicts the least recently used entry, 'lfu' the least frequently used (ties by recency)
+    - max_entries / max_bytes: budgets of this one cache, None for unbounded; each insert is measured,
+      and when the recorded sizes exceed max_bytes, every entry is remeasured before evicting, as cached
+      values such as in-progress Plottables may grow after insertion
+    - pinned entries are never evicted, though they count against the budgets
+    - hits, misses, and evictions are counted, see stats()
+
+    Dict-style access (``in``, ``[]``, ``len``) does not count toward stats; use get() for lookups
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: Optional[int] = CACHE_COERCION_SIZE,
+        max_bytes: Optional[int] = MEMO_CACHE_MAX_BYTES,
+        policy: str = 'lru'
+    ) -> None:
+        self.name = name
+        self.__entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.__sizes: Dict[Hashable, int] = {}
+        self.__uses: Dict[Hashable, int] = {}
+        self.__pinned: Set[Hashable] = set()
+        self.__lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.configure(max_entries, max_bytes, policy)
+
+    def __repr__(self) -> str:
+        return f'MemoCache({self.stats()})'
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__entries
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self.__entries[key]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.put(key, value)
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def keys(self) -> List[Hashable]:
+        with self.__lock:
+            return list(self.__entries.keys())
+
+    def configure(
+        self,
+        max_entries: Optional[int] = CACHE_COERCION_SIZE,
+        max_bytes: Optional[int] = MEMO_CACHE_MAX_BYTES,
+        policy: str = 'lru'
+    ) -> 'MemoCache':
+        """
+        Set budgets and eviction policy, evicting down to the new budgets
+        """
+        if policy not in MEMO_CACHE_POLICIES:
+            raise ValueError(f'Unknown memo cache policy "{policy}", expected one of: {MEMO_CACHE_POLICIES}')
+        with self.__lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self.policy = policy
+            self.__evict()
+        return self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self.__lock:
+            if key not in self.__entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.__uses[key] += 1
+            self.__entries.move_to_end(key)
+            return self.__entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            self.__uses[key] = self.__uses.get(key, 0) + 1
+            self.__sizes[key] = sizeof(value)
+            self.__evict(newest=key)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self.__lock:
+            self.__sizes.pop(key, None)
+            self.__uses.pop(key, None)
+            self.__pinned.discard(key)
+            return self.__entries.pop(key, default)
+
+    def pin(self, key: Hashable) -> None:
+        """
+        Exempt an existing entry from eviction until unpin() or clear()
+        """
+        with self.__lock:
+            if key not in self.__entries:
+                raise KeyError(key)
+            self.__pinned.add(key)
+
+    def pin_value(self, value: Any) -> int:
+        """
+        Pin every entry holding exactly this object, such as a featurized Plottable; returns how many were pinned
+        """
+        with self.__lock:
+            keys = [k for k, v in self.__entries.items() if v is value]
+            self.__pinned.update(keys)
+            return len(keys)
+
+    def unpin(self, key: Hashable) -> None:
+        with self.__lock:
+            self.__pinned.discard(key)
+            self.__evict()
+
+    def clear(self) -> None:
+        """
+        Drop all entries, including pinned ones; counters are kept, see reset_stats()
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__sizes.clear()
+            self.__uses.clear()
+            self.__pinned.clear()
+
+    def reset_stats(self) -> None:
+        with self.__lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def nbytes(self) -> int:
+        with self.__lock:
+            return sum(self.__sizes.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self.__lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'policy': self.policy,
+                'entries': len(self.__entries),
+                'pinned': len(self.__pinned),
+                'bytes': sum(self.__sizes.values()),
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups > 0 else None,
+                'evictions': self.evictions
+            }
+
+    def __victim(self, newest: Optional[Hashable] = None) -> Optional[Hashable]:
+        candidates = [k for k in self.__entries.keys() if k not in self.__pinned]
+        # an insert only evicts itself when it alone exceeds the budgets, as it has had no chance to be used yet
+        if len(candidates) > 1 and newest in candidates:
+            candidates.remove(newest)
+        if len(candidates) == 0:
+            return None
+        if self.policy == 'lru':
+            return candidates[0]
+        # candidates are in recency order, so min() breaks frequency ties by least recent
+        return min(candidates, key=lambda k: self.__uses[k])
+
+    def __evict(self, newest: Optional[Hashable] = None) -> None:
+        if self.max_bytes is not None and sum(self.__sizes.values()) > self.max_bytes:
+            # entries may have grown since insertion
+            self.__sizes = {k: sizeof(v) for k, v in self.__entries.items()}
+        while (
+            (self.max_entries is not None and len(self.__entries) > self.max_entries)
+            or (self.max_bytes is not None and sum(self.__sizes.values()) > self.max_bytes)  # noqa: W503
+        ):
+            victim = self.__victim(newest)
+            if victim is None:
+                logger.debug('Memo cache %s over budget, but all entries are pinned', self.name)
+                break
+            logger.debug('Memo cache %s evicting %s (%s bytes)', self.name, victim, self.__sizes.get(victim))
+            self.pop(victim)
+            self.evictions += 1
+
+
+MEMO_CACHES: Dict[str, MemoCache] = {}
+
+
+def memo_cache(name: str, **kwargs: Any) -> MemoCache:
+    """
+    Get or create the process-wide memoization cache of the given name
+    """
+    if name not in MEMO_CACHES:
+        MEMO_CACHES[name] = MemoCache(name, **kwargs)
+    return MEMO_CACHES[name]
+
+
+def configure_memo_caches(
+    max_entries: Optional[int] = CACHE_COERCION_SIZE,
+    max_bytes: Optional[int] = MEMO_CACHE_MAX_BYTES,
+    policy: str = 'lru',
+    names: Optional[List[str]] = None
+) -> None:
+    """
+    Set budgets and eviction policy of all, or just the named, memoization caches
+
+    Caches include 'pd_hash_to_arrow' and 'cudf_hash_to_arrow' (plot uploads), 'feat_param_to_g' (featurize),
+    and 'umap_param_to_g' (umap)
+    """
+    for name, cache in MEMO_CACHES.items():
+        if names is None or name in names:
+            cache.configure(max_entries, max_bytes, policy)
+
+
+def memo_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Per-cache entries, bytes, budgets, hits, misses, and evictions
+    """
+    return {name: cache.stats() for name, cache in MEMO_CACHES.items()}
+
+
+def clear_memo_caches() -> None:
+    """
+    Drop the entries of all memoization caches, including pinned ones
+    """
+    for cache in MEMO_CACHES.values():
+        cache.clear()
@@ -1,5 +1,7 @@
-import json
+import http.cookiejar, json, os, threading
+from typing import Optional
 import requests
+from requests.adapters import HTTPAdapter
 
 from graphistry.util import setup_logger
 logger = setup_logger(__name__)
@@ -14,3 +16,55 @@ def log_requests_error(resp: requests.Response) -> None:
             logger.error("HTTP %s error - response content (JSON): %s", resp.status_code, json.dumps(error_content, indent=2))
         except json.JSONDecodeError:
             logger.error("HTTP %s error - response content (text): %s", resp.status_code, resp.text)
+
+
+SESSION_POOL_SIZE = 8
+
+_adapter: Optional[HTTPAdapter] = None
+_adapter_pid: Optional[int] = None
+_adapter_lock = threading.Lock()
+
+
+class RejectAllCookiePolicy(http.cookiejar.DefaultCookiePolicy):
+    """
+    Never store or send cookies: upload calls authenticate with bearer tokens only
+    """
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+def pooled_adapter() -> HTTPAdapter:
+    """
+    Process-wide HTTPAdapter whose connection pool upload sessions share
+
+    Sharing it keeps connections alive across the file, dataset, and upload calls of one plot() and
+    across plots, and lets concurrent node/edge uploads each hold a connection. It is recreated after
+    a fork, as pooled sockets cannot be shared across processes.
+    """
+    global _adapter, _adapter_pid
+    with _adapter_lock:
+        if _adapter is None or _adapter_pid != os.getpid():
+            _adapter = HTTPAdapter(pool_connections=SESSION_POOL_SIZE, pool_maxsize=SESSION_POOL_SIZE)
+            _adapter_pid = os.getpid()
+            logger.debug('Created pooled upload adapter (pid %s)', _adapter_pid)
+        return _adapter
+
+
+def session() -> requests.Session:
+    """
+    New requests.Session over the shared connection pool, for one uploader's traffic
+
+    Cookies are rejected, so no state carries across users, servers, or tokens. With no cookie jar
+    and no per-request session mutation, one session may serve the uploader's concurrent node/edge
+    uploads: the remaining shared state is the adapter's urllib3 pool, which is thread-safe.
+    """
+    s = requests.Session()
+    s.cookies.set_policy(RejectAllCookiePolicy())
+    adapter = pooled_adapter()
+    s.mount('http://', adapter)
+    s.mount('https://', adapter)
+    return s